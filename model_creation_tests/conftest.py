@@ -1,14 +1,28 @@
+from dataclasses import dataclass, field
+import hashlib
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 import os
 from pathlib import Path
 import shutil
 import sys
-from typing import Iterator, Optional, cast
+import threading
+from typing import Any, Dict, Iterator, List, Optional, cast
 
 from _pytest.config.argparsing import Parser
 from _pytest.fixtures import SubRequest
+from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.rule import Rule
+from pymusas.taggers.rules.single_word import SingleWordRule
 import pytest
 from pytest_fixture_config import Config, yield_requires_config
 from pytest_virtualenv import VirtualEnv
+import spacy
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
 
 
 class FixtureConfig(Config):
@@ -24,6 +38,44 @@ CONFIG = FixtureConfig(
     virtualenv_executable=os.getenv('VIRTUALENV_FIXTURE_EXECUTABLE', DEFAULT_VIRTUALENV_FIXTURE_EXECUTABLE),
 )
 
+LOCK_FILE = Path(__file__, '..', '..', 'uv.lock').resolve()
+# Written to the virtual environment directory once all of the models and
+# their dependencies have been installed.
+LOCK_FILE_HASH_FILE_NAME = 'uv_lock.sha256'
+# Lexicons of the models within the `language_resource_file` fixture.
+SINGLE_LEXICON = '''lemma\tsemantic_tags\tpos
+Sporting\tA10+\tNOUN
+community\tS5+c\tNOUN
+'''
+MWE_LEXICON = '''mwe_template\tsemantic_tags
+Sporting_NOUN community_NOUN\tDf/S5+c
+'''
+
+
+@dataclass
+class FileServer:
+    '''
+    Serves the files within `directory` at `url`, see the `file_server`
+    fixture. The path of every GET request is appended to `requests`, and
+    `failures` maps a path to the number of its requests that fail, with a
+    503 status, before the file is served.
+    '''
+    directory: Path
+    url: str = ''
+    requests: List[str] = field(default_factory=list)
+    failures: Dict[str, int] = field(default_factory=dict)
+
+
+def get_lock_file_hash() -> str:
+    '''
+    Returns the SHA256 hash of the `uv.lock` file and the Python version, of
+    which a virtual environment can only be reused if it was created with the
+    same hash.
+    '''
+    lock_file_hash = hashlib.sha256(LOCK_FILE.read_bytes())
+    lock_file_hash.update(sys.version.encode('utf-8'))
+    return lock_file_hash.hexdigest()
+
 
 def string_to_path(value: str) -> Path:
     return Path(value).resolve()
@@ -40,10 +92,26 @@ def pytest_addoption(parser: Parser) -> None:
         "--overwrite", action="store_true",
         help="Whether to overwrite the virtual environment directory"
     )
+    parser.addoption(
+        "--reuse-virtual-env", action="store_true",
+        help=("Whether to reuse the virtual environment directory if it was "
+              "created with the same `uv.lock` file, else it is re-created")
+    )
     parser.addoption(
         "--github-ci", action="store_true",
         help="If the test is being ran within the GitHub actions CI"
     )
+    parser.addoption(
+        "--one-model-at-a-time", action="store_true",
+        help=("Whether to create, install, run the model function tests for, "
+              "and then delete each model one at a time, so that only one "
+              "model is stored on disk at any one time")
+    )
+    parser.addoption(
+        "--prune-models", action="store_true",
+        help=("Whether to create the models with the `--prune` option, so that "
+              "the model function tests are ran against the pruned models")
+    )
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -59,12 +127,40 @@ def overwrite(request: SubRequest) -> bool:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def virtual_env_directory(request: SubRequest, overwrite: bool) -> Path:
+def one_model_at_a_time(request: SubRequest) -> bool:
+    return cast(bool,
+                request.config.getoption("--one-model-at-a-time"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prune_models(request: SubRequest) -> bool:
+    return cast(bool,
+                request.config.getoption("--prune-models"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def reuse_virtual_env(request: SubRequest) -> bool:
+    return cast(bool,
+                request.config.getoption("--reuse-virtual-env"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def lock_file_hash() -> str:
+    return get_lock_file_hash()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def virtual_env_directory(request: SubRequest, overwrite: bool,
+                          reuse_virtual_env: bool, lock_file_hash: str) -> Path:
     venv_directory = cast(Optional[Path],
                           request.config.getoption("--virtual-env-directory"))
     if venv_directory is None:
         raise ValueError("--virtual-env-directory command line option is empty.")
-    if venv_directory.exists() and overwrite:
+    venv_lock_file_hash_file = Path(venv_directory, LOCK_FILE_HASH_FILE_NAME)
+    if (reuse_virtual_env and venv_lock_file_hash_file.exists()
+            and venv_lock_file_hash_file.read_text(encoding='utf-8') == lock_file_hash):
+        return venv_directory
+    if venv_directory.exists() and (overwrite or reuse_virtual_env):
         shutil.rmtree(venv_directory)
     elif venv_directory.exists():
         raise FileExistsError("Expecting the virtual environment directory to"
@@ -73,6 +169,15 @@ def virtual_env_directory(request: SubRequest, overwrite: bool) -> Path:
     return venv_directory
 
 
+@pytest.fixture(scope="session")
+def virtual_env_lock_file_hash_file(virtual_env_directory: Path) -> Path:
+    '''
+    The file that stores the `uv.lock` hash that the virtual environment was
+    created with, if the file exists the virtual environment is being reused.
+    '''
+    return Path(virtual_env_directory, LOCK_FILE_HASH_FILE_NAME)
+
+
 @pytest.fixture(scope='session', autouse=True)
 @yield_requires_config(CONFIG, ['virtualenv_executable'])
 def session_virtualenv(virtual_env_directory: Path
@@ -97,3 +202,107 @@ def session_virtualenv(virtual_env_directory: Path
                       delete_workspace=False)
     yield venv
     venv.teardown()
+
+
+@pytest.fixture
+def file_server(tmp_path: Path) -> Iterator[FileServer]:
+    '''
+    A HTTP server, in a background thread, that serves the files within a
+    temporary directory.
+    '''
+    directory = Path(tmp_path, 'file_server')
+    directory.mkdir()
+    file_server = FileServer(directory)
+
+    class RequestHandler(SimpleHTTPRequestHandler):
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, directory=str(directory), **kwargs)
+
+        def do_GET(self) -> None:
+            file_server.requests.append(self.path)
+            if file_server.failures.get(self.path, 0) > 0:
+                file_server.failures[self.path] -= 1
+                self.send_error(503)
+                return
+            super().do_GET()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RequestHandler)
+    file_server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield file_server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+@pytest.fixture
+def rule_based_model_path(tmp_path: Path) -> Path:
+    '''
+    A small English rule based model, with a single word and MWE lexicon,
+    saved to disk.
+    '''
+    nlp = spacy.blank('en')
+    tagger = cast(RuleBasedTagger, nlp.add_pipe('pymusas_rule_based_tagger'))
+    rules: List[Rule] = [SingleWordRule({'Sporting|NOUN': ['A10+'], 'community|NOUN': ['S5+c'],
+                                         'hack|NOUN': ['Q4.2/S2mf', 'Y2', 'K5.1']},
+                                        {'have': ['A9+', 'Z5'], 'hack': ['Y2']}),
+                         MWERule({'Sporting_NOUN community_NOUN': ['Df/S5+c']})]
+    ranker = ContextualRuleBasedRanker(*ContextualRuleBasedRanker.get_construction_arguments(rules))
+    tagger.initialize(rules=rules, ranker=ranker,
+                      default_punctuation_tags=['PUNCT'],
+                      default_number_tags=['NUM'])
+    model_directory = Path(tmp_path, 'model')
+    nlp.to_disk(model_directory)
+    return model_directory
+
+
+@pytest.fixture(scope="session")
+def language_resource_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    '''
+    A language resource file, and its lexicons, with an English single and
+    dual rule based model, whereby both models use the same single word
+    lexicon.
+    '''
+    tmp_path = tmp_path_factory.mktemp('language_resources')
+    single_lexicon = Path(tmp_path, 'single.tsv')
+    single_lexicon.write_text(SINGLE_LEXICON, encoding='utf-8')
+    mwe_lexicon = Path(tmp_path, 'mwe.tsv')
+    mwe_lexicon.write_text(MWE_LEXICON, encoding='utf-8')
+    single_rule = {"rule_type": "single", "pos_mapper": None,
+                   "lexicon_url": str(single_lexicon), "with_pos": True}
+    mwe_rule = {"rule_type": "mwe", "pos_mapper": None, "lexicon_url": str(mwe_lexicon)}
+    models = []
+    for model_name, rules in [('en_single_none_contextual_none', [single_rule]),
+                              ('en_dual_none_contextual_none', [single_rule, mwe_rule])]:
+        models.append({"name": model_name, "model_type": "pymusas_rule_based_tagger",
+                       "resources": {"ranker": "contextual", "rules": rules,
+                                     "default_punctuation_tags": ["PUNCT"],
+                                     "default_number_tags": ["NUM"]}})
+    language_resource_file = Path(tmp_path, 'language_resources.json')
+    srsly.write_json(language_resource_file,
+                     {"language_resources": {"en": {
+                         "models": models,
+                         "language_data": {"description": "English", "macrolanguage": "en",
+                                           "script": "Latn"}}}})
+    return language_resource_file
+
+
+@pytest.fixture(scope="session")
+def created_models_directory(tmp_path_factory: pytest.TempPathFactory,
+                             language_resource_file: Path) -> Path:
+    '''
+    A directory with an English single and dual rule based model created by
+    the `create-models` command.
+    '''
+    models_directory = Path(tmp_path_factory.mktemp('created_models'), 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(models_directory),
+                                             "--language-resource-file",
+                                             str(language_resource_file)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    return models_directory
@@ -0,0 +1,123 @@
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from pymusas_models import artifact_store
+from pymusas_models.catalog import read_catalog
+from pymusas_models.package import package
+
+from .conftest import FileServer
+
+
+# Run in a new Python process so that the model is loaded from the installed
+# package, argv[1] is `lazy` or `eager`.
+LOAD_SCRIPT = '''
+import sys
+
+import en_external_files
+from spacy.tokens import Doc
+
+nlp = en_external_files.load(lazy=sys.argv[1] == 'lazy')
+doc = nlp(Doc(nlp.vocab, words=['Sporting', 'community'], pos=['NOUN', 'NOUN']))
+print([token._.pymusas_tags for token in doc])
+'''
+
+
+@pytest.fixture
+def component_directory(tmp_path: Path) -> Path:
+    component_directory = Path(tmp_path, 'component')
+    Path(component_directory, 'model').mkdir(parents=True)
+    Path(component_directory, 'model', 'config.json').write_text('{}', encoding='utf-8')
+    Path(component_directory, 'model', 'model.safetensors').write_bytes(os.urandom(100))
+    return component_directory
+
+
+def test_externalise_and_materialise(component_directory: Path, tmp_path: Path) -> None:
+    store_directory = Path(tmp_path, 'store')
+    weights = Path(component_directory, 'model', 'model.safetensors').read_bytes()
+    weights_hash = hashlib.sha256(weights).hexdigest()
+    manifest = artifact_store.externalise_files(component_directory, store_directory,
+                                                min_size_bytes=50)
+    assert store_directory.as_uri() == manifest['store_url']
+    assert {'model/model.safetensors': {'sha256': weights_hash, 'size_bytes': 100}} == manifest['files']
+    assert weights == Path(store_directory, 'sha256', weights_hash).read_bytes()
+
+    # The component directory still has all of its files.
+    assert component_directory == artifact_store.materialise_component(component_directory)
+
+    installed_directory = Path(tmp_path, 'installed')
+    shutil.copytree(component_directory, installed_directory)
+    Path(installed_directory, 'model', 'model.safetensors').unlink()
+    cache_directory = Path(tmp_path, 'cache')
+    materialised_directory = artifact_store.materialise_component(installed_directory,
+                                                                  cache_directory=cache_directory)
+    assert weights == Path(materialised_directory, 'model', 'model.safetensors').read_bytes()
+    assert '{}' == Path(materialised_directory, 'model', 'config.json').read_text(encoding='utf-8')
+
+    # Once cached the store is no longer required.
+    shutil.rmtree(store_directory)
+    shutil.rmtree(materialised_directory)
+    assert materialised_directory == artifact_store.materialise_component(installed_directory,
+                                                                          cache_directory=cache_directory)
+    assert weights == Path(materialised_directory, 'model', 'model.safetensors').read_bytes()
+
+
+def test_fetch_file(component_directory: Path, file_server: FileServer,
+                    tmp_path: Path) -> None:
+    store_directory, store_url = file_server.directory, file_server.url
+    weights_file = Path(component_directory, 'model', 'model.safetensors')
+    weights_hash = hashlib.sha256(weights_file.read_bytes()).hexdigest()
+    artifact_store.externalise_files(component_directory, store_directory, store_url,
+                                     min_size_bytes=50)
+
+    cache_file = artifact_store.fetch_file(store_url, weights_hash, Path(tmp_path, 'cache'))
+    assert weights_file.read_bytes() == cache_file.read_bytes()
+
+    # A file that does not match its hash is not cached.
+    Path(store_directory, 'sha256', weights_hash).write_bytes(b'corrupt')
+    with pytest.raises(ValueError):
+        artifact_store.fetch_file(str(store_directory), weights_hash, Path(tmp_path, 'other_cache'))
+    assert [] == list(Path(tmp_path, 'other_cache', 'sha256').iterdir())
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_load_packaged_model_with_external_files(created_models_directory: Path,
+                                                 file_server: FileServer,
+                                                 tmp_path: Path, lazy: bool) -> None:
+    store_directory, store_url = file_server.directory, file_server.url
+    entry = read_catalog(created_models_directory).models['en_dual_none_contextual_none']
+    pipeline_directory = Path(created_models_directory, entry.package_name, entry.name,
+                              entry.package_name)
+    model_directory = Path(tmp_path, 'pipeline')
+    shutil.copytree(pipeline_directory, model_directory)
+    manifest = artifact_store.externalise_files(Path(model_directory, 'pymusas_rule_based_tagger'),
+                                                store_directory, store_url, min_size_bytes=0)
+    assert 'rules.bin' in manifest['files']
+
+    package(model_directory, tmp_path, code_paths=[Path(artifact_store.__file__)],
+            create_sdist=False, create_wheel=True, name='en_external_files', version='0.4.0')
+    wheel_file = next(Path(tmp_path, 'en_external_files-0.4.0', 'dist').glob('*.whl'))
+    with zipfile.ZipFile(wheel_file) as wheel_zip:
+        wheel_files = wheel_zip.namelist()
+    assert any(file_name.endswith('pymusas_rule_based_tagger/external_files.json')
+               for file_name in wheel_files)
+    assert not any(file_name.endswith('pymusas_rule_based_tagger/rules.bin')
+                   for file_name in wheel_files)
+
+    target_directory = Path(tmp_path, 'target')
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps', '--no-cache-dir',
+                    '--target', str(target_directory), str(wheel_file)],
+                   check=True)
+    environment = {**os.environ, 'PYTHONPATH': str(target_directory),
+                   artifact_store.CACHE_ENVIRONMENT_VARIABLE: str(Path(tmp_path, 'cache'))}
+    completed_process = subprocess.run([sys.executable, '-c', LOAD_SCRIPT, 'lazy' if lazy else 'eager'],
+                                       cwd=tmp_path, capture_output=True, text=True, env=environment)
+    assert 0 == completed_process.returncode, completed_process.stderr
+    assert "[['Df/S5+c'], ['Df/S5+c']]\n" == completed_process.stdout
+    assert Path(tmp_path, 'cache', 'sha256', manifest['files']['rules.bin']['sha256']).exists()
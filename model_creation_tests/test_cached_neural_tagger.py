@@ -0,0 +1,100 @@
+import importlib.metadata
+from typing import Any, Dict, List, Optional, cast
+
+from pymusas.spacy_api.taggers.neural import NeuralTagger
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+from pymusas_models.cached_neural_tagger import CachedNeuralTagger, make_cached_neural_tagger
+
+
+torch = pytest.importorskip("torch")
+
+
+TEST_TOKENS = ['Sporting', 'community', '.', 'Sporting', 'community', '.', '\t']
+TEST_SENT_STARTS: List[bool | int | None] = [True, False, False, True, False, False, True]
+
+
+class FakeBaseModel:
+    device = torch.device('cpu')
+
+
+class FakeWSDModel:
+    '''
+    Stands in for the `wsd_torch_models.bem.BEM` model, predicting for each
+    token the token text and its index within the given tokens.
+    '''
+    base_model = FakeBaseModel()
+
+    def __init__(self) -> None:
+        self.number_calls = 0
+
+    def predict(self, tokens: List[str], sub_word_tokenizer: Any,
+                top_n: int) -> List[List[str]]:
+        self.number_calls += 1
+        return [[token, str(index)][:top_n] for index, token in enumerate(tokens)]
+
+
+def create_tagger(component_name: str = CachedNeuralTagger.COMPONENT_NAME,
+                  config: Optional[Dict[str, Any]] = None) -> tuple[NeuralTagger, FakeWSDModel]:
+    nlp = spacy.blank('en')
+    tagger = nlp.add_pipe(component_name, name='pymusas_neural_tagger',
+                          config={'doc_cache_size': 2} if config is None else config)
+    assert isinstance(tagger, NeuralTagger)
+    wsd_model = FakeWSDModel()
+    cast(Any, tagger).wsd_model = wsd_model
+    cast(Any, tagger).tokenizer = object()
+    return tagger, wsd_model
+
+
+@pytest.mark.parametrize("sent_starts", [None, TEST_SENT_STARTS])
+def test_same_output_as_neural_tagger(sent_starts: Optional[List[bool | int | None]]) -> None:
+    tagger, _ = create_tagger()
+    neural_tagger, _ = create_tagger('pymusas_neural_tagger', {})
+    vocab = spacy.blank('en').vocab
+    expected_output = [(token._.pymusas_tags, token._.pymusas_mwe_indexes) for token
+                       in neural_tagger(Doc(vocab, words=TEST_TOKENS, sent_starts=sent_starts))]
+    # Tag twice so that the second time the tags come from the cache.
+    for _ in range(2):
+        assert expected_output == [(token._.pymusas_tags, token._.pymusas_mwe_indexes) for token
+                                   in tagger(Doc(vocab, words=TEST_TOKENS, sent_starts=sent_starts))]
+    # The second `Sporting` is tagged within the context of the whole `Doc`.
+    assert ['Sporting', '3'] == expected_output[3][0]
+
+
+def test_doc_cache() -> None:
+    tagger, wsd_model = create_tagger()
+    assert isinstance(tagger, CachedNeuralTagger)
+    vocab = spacy.blank('en').vocab
+
+    doc = tagger(Doc(vocab, words=TEST_TOKENS, sent_starts=TEST_SENT_STARTS))
+    assert 1 == wsd_model.number_calls
+    assert (0, 1) == (tagger.cache_hits, tagger.cache_misses)
+    assert ['Z9'] == doc[6]._.pymusas_tags
+
+    # The same token texts are found in the cache, whatever their sentence
+    # boundaries, but a repeated sentence within a longer `Doc` is not.
+    tagger(Doc(vocab, words=TEST_TOKENS))
+    assert (1, 1) == (tagger.cache_hits, tagger.cache_misses)
+    tagger(Doc(vocab, words=TEST_TOKENS[:3]))
+    tagger(Doc(vocab, words=TEST_TOKENS[:3] + TEST_TOKENS))
+    assert 3 == wsd_model.number_calls
+    assert 2 == tagger.cache_currsize
+    assert 0.25 == tagger.cache_hit_rate
+    # The least recently used `Doc`, `TEST_TOKENS`, has been removed.
+    tagger(Doc(vocab, words=TEST_TOKENS))
+    assert 4 == wsd_model.number_calls
+
+    tagger.clear_cache()
+    assert 0 == tagger.cache_currsize
+    assert 0.0 == tagger.cache_hit_rate
+
+    with pytest.raises(ValueError):
+        CachedNeuralTagger(doc_cache_size=0)
+
+
+def test_entry_point() -> None:
+    entry_points = importlib.metadata.entry_points(group='spacy_factories',
+                                                   name=CachedNeuralTagger.COMPONENT_NAME)
+    assert [make_cached_neural_tagger] == [entry_point.load() for entry_point in entry_points]
@@ -0,0 +1,160 @@
+import importlib
+from pathlib import Path
+import subprocess
+import sys
+from typing import List, Tuple, cast
+
+from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.rule import Rule
+from pymusas.taggers.rules.single_word import SingleWordRule
+import pytest
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models import COMPONENT_REQUIREMENT
+from pymusas_models.__main__ import app
+from pymusas_models.cached_rule_based_tagger import CachedRuleBasedTagger
+from pymusas_models.catalog import read_catalog
+
+
+TEST_TOKENS = ['Sporting', 'community', 'hack', 'had', '.', 'community', 'hack']
+TEST_POS = ['NOUN', 'NOUN', 'NOUN', 'DET', 'PUNCT', 'NOUN', 'NOUN']
+TEST_LEMMAS = ['sporting', 'community', 'hack', 'have', '.', 'community', 'hack']
+TEST_SPACES = [True] * len(TEST_TOKENS)
+
+SINGLE_LEXICON = {'Sporting|NOUN': ['A10+'], 'community|NOUN': ['S5+c'],
+                  'hack|NOUN': ['Q4.2/S2mf', 'Y2', 'K5.1']}
+SINGLE_LEMMA_LEXICON = {'have': ['A9+', 'Z5']}
+MWE_LEXICON = {'Sporting_NOUN community_NOUN': ['Df/S5+c']}
+
+
+def create_pipeline(rules: List[Rule], lookup_cache_size: int | None) -> Language:
+    nlp = spacy.blank('en')
+    if lookup_cache_size is None:
+        tagger = cast(RuleBasedTagger, nlp.add_pipe('pymusas_rule_based_tagger'))
+    else:
+        tagger = cast(RuleBasedTagger,
+                      nlp.add_pipe(CachedRuleBasedTagger.COMPONENT_NAME,
+                                   name='pymusas_rule_based_tagger',
+                                   config={'lookup_cache_size': lookup_cache_size}))
+    ranker = ContextualRuleBasedRanker(*ContextualRuleBasedRanker.get_construction_arguments(rules))
+    tagger.initialize(rules=rules, ranker=ranker,
+                      default_punctuation_tags=['PUNCT'],
+                      default_number_tags=['NUM'])
+    return nlp
+
+
+def tag(nlp: Language) -> List[Tuple[List[str], List[Tuple[int, int]]]]:
+    doc = Doc(nlp.vocab, words=TEST_TOKENS, spaces=TEST_SPACES,
+              pos=TEST_POS, lemmas=TEST_LEMMAS)
+    return [(token._.pymusas_tags, token._.pymusas_mwe_indexes)
+            for token in nlp(doc)]
+
+
+@pytest.mark.parametrize("with_mwe", [False, True])
+def test_same_output_as_rule_based_tagger(with_mwe: bool) -> None:
+    rules: List[Rule] = [SingleWordRule(SINGLE_LEXICON, SINGLE_LEMMA_LEXICON)]
+    if with_mwe:
+        rules.append(MWERule(MWE_LEXICON))
+    expected_output = tag(create_pipeline(rules, None))
+
+    cached_nlp = create_pipeline(rules, 2)
+    # Tag twice so that the second time some of the tokens come from the cache.
+    assert expected_output == tag(cached_nlp)
+    assert expected_output == tag(cached_nlp)
+
+
+def test_cache_counters_and_mwe_invalidation() -> None:
+    rules: List[Rule] = [SingleWordRule(SINGLE_LEXICON, SINGLE_LEMMA_LEXICON),
+                         MWERule(MWE_LEXICON)]
+    nlp = create_pipeline(rules, 10)
+    tagger = nlp.get_pipe('pymusas_rule_based_tagger')
+    assert isinstance(tagger, CachedRuleBasedTagger)
+
+    output = tag(nlp)
+    # `Sporting community` is a MWE match so only the last `community` token
+    # is looked up in the cache and none of the MWE tags are cached.
+    assert ['Df/S5+c'] == output[1][0]
+    assert ['S5+c'] == output[5][0]
+    assert 1 == tagger.cache_hits
+    assert 4 == tagger.cache_misses
+    assert 4 == tagger.cache_currsize
+
+    tag(nlp)
+    assert 6 == tagger.cache_hits
+    assert 4 == tagger.cache_misses
+
+    # Changing the rules has to invalidate the cache.
+    tagger.rules = [SingleWordRule(SINGLE_LEXICON, SINGLE_LEMMA_LEXICON)]
+    assert 0 == tagger.cache_hits
+    assert 0 == tagger.cache_misses
+    assert 0 == tagger.cache_currsize
+    assert ['S5+c'] == tag(nlp)[1][0]
+
+
+def test_cache_size_bound() -> None:
+    rules: List[Rule] = [SingleWordRule(SINGLE_LEXICON, SINGLE_LEMMA_LEXICON)]
+    nlp = create_pipeline(rules, 2)
+    tag(nlp)
+    tagger = cast(CachedRuleBasedTagger, nlp.get_pipe('pymusas_rule_based_tagger'))
+    assert 2 == tagger.cache_currsize
+
+    with pytest.raises(ValueError):
+        CachedRuleBasedTagger(lookup_cache_size=0)
+
+
+def test_load_cached_models(language_resource_file: Path, tmp_path: Path,
+                            monkeypatch: pytest.MonkeyPatch) -> None:
+    language_resources = srsly.read_json(language_resource_file)
+    for model in language_resources['language_resources']['en']['models']:
+        model['config'] = {'lookup_cache_size': 100}
+    cached_language_resource_file = Path(tmp_path, 'language_resources.json')
+    srsly.write_json(cached_language_resource_file, language_resources)
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory", str(models_directory),
+                                             "--language-resource-file", str(cached_language_resource_file)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    catalog = read_catalog(models_directory)
+    assert ['en_dual_none_contextual_none', 'en_single_none_contextual_none'] == sorted(catalog.models)
+
+    # The component is registered through the `spacy_factories` entry point
+    # of `pymusas_models`, rather than being copied into each package,
+    # therefore both models can be loaded within the same process.
+    for entry in catalog.models.values():
+        assert COMPONENT_REQUIREMENT in entry.requirements
+        package_directory = Path(models_directory, entry.package_name)
+        assert not list(Path(package_directory, entry.name).glob('cached_rule_based_tagger.py'))
+        monkeypatch.syspath_prepend(str(package_directory))
+        nlp = importlib.import_module(entry.name).load()
+        tagger = nlp.get_pipe('pymusas_rule_based_tagger')
+        assert isinstance(tagger, CachedRuleBasedTagger)
+        assert 100 == tagger.lookup_cache_size
+
+    # A new process has not imported the component before loading the models
+    # from the models directory.
+    corpus_file = Path(tmp_path, 'corpus.jsonl')
+    srsly.write_jsonl(corpus_file, [{'tokens': ['Sporting', 'community'], 'pos': ['NOUN', 'NOUN']}])
+    for model_name, expected_tags in [('en_single_none_contextual_none', [['A10+'], ['S5+c']]),
+                                      ('en_dual_none_contextual_none', [['Df/S5+c'], ['Df/S5+c']])]:
+        output_file = Path(tmp_path, f'{model_name}.jsonl')
+        completed_process = subprocess.run([sys.executable, '-m', 'pymusas_models', 'tag-corpus', model_name,
+                                            str(corpus_file), str(output_file), '--corpus-format', 'jsonl',
+                                            '--models-directory', str(models_directory)],
+                                           capture_output=True, text=True)
+        assert 0 == completed_process.returncode, completed_process.stderr
+        assert [expected_tags] == [document['pymusas_tags'] for document in srsly.read_jsonl(output_file)]
+    gold_corpus = Path(tmp_path, 'gold.jsonl')
+    srsly.write_jsonl(gold_corpus, [{'tokens': ['Sporting', 'community'], 'pos': ['NOUN', 'NOUN'],
+                                     'usas_tags': ['Df/S5+c', 'Df/S5+c'], 'mwe_indexes': [[0, 2]]}])
+    completed_process = subprocess.run([sys.executable, '-m', 'pymusas_models', 'evaluate-models',
+                                        str(gold_corpus), '--language', 'en',
+                                        '--models-directory', str(models_directory), '--json'],
+                                       capture_output=True, text=True)
+    assert 0 == completed_process.returncode, completed_process.stderr
+    assert ['en_dual_none_contextual_none', 'en_single_none_contextual_none'] \
+        == sorted(result['name'] for result in srsly.json_loads(completed_process.stdout))
@@ -0,0 +1,73 @@
+from pathlib import Path
+import shutil
+
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog, update_catalog, write_catalog
+from pymusas_models.language_resource import ModelTypes
+
+
+def test_create_models_catalog(created_models_directory: Path) -> None:
+    catalog = read_catalog(created_models_directory)
+    assert ['en_dual_none_contextual_none', 'en_single_none_contextual_none'] == list(catalog.models)
+
+    dual_entry = catalog.models['en_dual_none_contextual_none']
+    assert dual_entry.mwe
+    assert dual_entry.pos_mapper is None
+    assert 'contextual' == dual_entry.ranker
+    assert dual_entry.neural_model is None
+    assert 'English' == dual_entry.language_name
+    assert 2 == len(dual_entry.lexicon_urls)
+    model_directory = Path(created_models_directory, dual_entry.package_name)
+    wheel_file = Path(model_directory, 'dist', dual_entry.wheel.file_name)
+    assert wheel_file.stat().st_size == dual_entry.wheel.size_bytes
+    assert srsly.read_json(Path(model_directory, 'meta.json'))['checksum_whl'] == dual_entry.wheel.sha256
+    assert not catalog.models['en_single_none_contextual_none'].mwe
+
+    # The single model is the cheapest English model and the only one without MWEs.
+    assert (['en_single_none_contextual_none', 'en_dual_none_contextual_none']
+            == [entry.name for entry in catalog.find(language_code='en')])
+    assert ['en_dual_none_contextual_none'] == [entry.name for entry in catalog.find(mwe=True)]
+    assert [] == catalog.find(model_type=ModelTypes.NEURAL)
+    assert [] == catalog.find(language_code='cy')
+
+
+def test_overview_of_models(created_models_directory: Path, tmp_path: Path) -> None:
+    runner_result = CliRunner().invoke(app, ["overview-of-models", "--models-directory",
+                                             str(created_models_directory)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    table_rows = runner_result.output.strip().split('\n')
+    assert 4 == len(table_rows)
+    assert table_rows[2].startswith('| English (en) | en_dual_none_contextual_none | '
+                                    ':heavy_check_mark: | None | Contextual | :x: |')
+
+    runner_result = CliRunner().invoke(app, ["overview-of-models", "--models-directory",
+                                             str(tmp_path)])
+    assert isinstance(runner_result.exception, FileNotFoundError)
+
+
+def test_update_catalog(created_models_directory: Path, tmp_path: Path) -> None:
+    copied_models_directory = Path(tmp_path, 'models')
+    shutil.copytree(created_models_directory, copied_models_directory)
+    catalog = read_catalog(copied_models_directory)
+    single_entry = catalog.models['en_single_none_contextual_none']
+    catalog.models['en_dual_none_contextual_none'].benchmarks = {'tokens_per_second': 1000.0}
+    write_catalog(catalog, copied_models_directory)
+
+    # Benchmarks are kept as the wheel of the model has not changed.
+    dual_entry = catalog.models['en_dual_none_contextual_none'].model_copy(update={'benchmarks': {}})
+    update_catalog(copied_models_directory, dual_entry)
+    assert ({'tokens_per_second': 1000.0}
+            == read_catalog(copied_models_directory).models['en_dual_none_contextual_none'].benchmarks)
+
+    changed_wheel = dual_entry.wheel.model_copy(update={'sha256': 'changed'})
+    update_catalog(copied_models_directory, dual_entry.model_copy(update={'wheel': changed_wheel,
+                                                                          'benchmarks': {}}))
+    assert {} == read_catalog(copied_models_directory).models['en_dual_none_contextual_none'].benchmarks
+
+    # Models that no longer exist are removed from the catalog.
+    shutil.rmtree(Path(copied_models_directory, single_entry.package_name))
+    update_catalog(copied_models_directory, dual_entry)
+    assert ['en_dual_none_contextual_none'] == list(read_catalog(copied_models_directory).models)
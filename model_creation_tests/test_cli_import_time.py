@@ -0,0 +1,50 @@
+from pathlib import Path
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+
+
+# The maximum time, in seconds, that the imports of the `--help` and
+# `overview-of-models` commands can take. The imports take around 0.4 seconds,
+# compared to over 1 second when all of the commands imported their
+# dependencies at the top of `pymusas_models.__main__`.
+IMPORT_TIME_BUDGET = 0.75
+# Modules that only the commands which load or create models should import.
+HEAVY_MODULES = ['spacy', 'thinc', 'torch', 'transformers', 'numpy',
+                 'pymusas.spacy_api', 'pymusas_models.package', 'pymusas_models.server',
+                 'pymusas_models.tag_corpus']
+
+
+def get_import_times(cli_arguments: List[str]) -> Dict[str, float]:
+    '''
+    Returns the cumulative import time, in seconds, of every module imported
+    when running the command line interface with the given arguments,
+    whereby the import times are from `python -X importtime`.
+    '''
+    completed_process = subprocess.run([sys.executable, '-X', 'importtime', '-m',
+                                        'pymusas_models', *cli_arguments],
+                                       capture_output=True, text=True, check=True)
+    import_times: Dict[str, float] = {}
+    for line in completed_process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_time, module_name = line.split('|')
+        import_times[module_name.strip()] = int(cumulative_time) / 1_000_000
+        # Only top level imports count towards the total.
+        if not module_name.startswith('  '):
+            import_times['total'] = import_times.get('total', 0.0) + int(cumulative_time) / 1_000_000
+    return import_times
+
+
+@pytest.mark.parametrize("command", ["help", "overview-of-models"])
+def test_cli_import_time(created_models_directory: Path, command: str) -> None:
+    cli_arguments = ['--help']
+    if command == 'overview-of-models':
+        cli_arguments = ['overview-of-models', '--models-directory', str(created_models_directory)]
+    import_times = get_import_times(cli_arguments)
+
+    for heavy_module in HEAVY_MODULES:
+        assert heavy_module not in import_times
+    assert import_times['total'] < IMPORT_TIME_BUDGET
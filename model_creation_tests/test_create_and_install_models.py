@@ -1,16 +1,28 @@
 import json
+import os
 from pathlib import Path
+import shutil
+from typing import Any, Dict, List, Union
 
+import pytest
 from pytest_virtualenv import VirtualEnv
 from typer.testing import CliRunner
 
 from pymusas_models.__main__ import app
+from pymusas_models.catalog import CatalogEntry, LexiconPackageEntry, read_catalog
 from pymusas_models.language_resource import LanguageResources
 
 
 def test_create_and_install_models(tmp_path: Path,
                                    session_virtualenv: VirtualEnv,
-                                   github_ci: bool) -> None:
+                                   virtual_env_lock_file_hash_file: Path,
+                                   lock_file_hash: str,
+                                   github_ci: bool,
+                                   one_model_at_a_time: bool,
+                                   prune_models: bool) -> None:
+    if one_model_at_a_time:
+        pytest.skip("The models are tested one at a time, see "
+                    "test_create_install_and_test_models_one_at_a_time")
     repo_directory = Path(__file__, '..', '..').resolve()
     # requirements_file = str(Path(repo_directory, 'requirements.txt'))
     # dev_requirements_file = str(Path(repo_directory, 'dev_requirements.txt'))
@@ -53,27 +65,186 @@ def test_create_and_install_models(tmp_path: Path,
                 github_ci_resource_file.write(json.dumps(language_resource))
         language_resource_file = github_ci_language_resource_file
         
+    models_directory = Path(tmp_path, 'models')
     runner = CliRunner()
     command_line_arguments = ["create-models",
                               "--models-directory",
-                              str(tmp_path),
+                              str(models_directory),
                               "--language-resource-file",
                               str(language_resource_file)]
+    if prune_models:
+        command_line_arguments.append("--prune")
     runner_result = runner.invoke(app, command_line_arguments)
     assert 0 == runner_result.exit_code
 
+    # The wheels of all of the models, and of any shared lexicon data
+    # packages, are installed by their file paths, rather than by name, so
+    # that pip cannot install a package of the same name from the index, and
+    # in one pip resolver run so that their dependencies are resolved together.
+    catalog = read_catalog(models_directory)
+    entries: List[Union[CatalogEntry, LexiconPackageEntry]] = [*catalog.models.values(),
+                                                               *catalog.lexicon_packages.values()]
+    wheel_files = sorted(Path(models_directory, entry.package_name, 'dist', entry.wheel.file_name).resolve()
+                         for entry in entries)
+    assert wheel_files
+    assert all(wheel_file.exists() for wheel_file in wheel_files)
+    wheel_file_paths = [str(wheel_file) for wheel_file in wheel_files]
+
+    virtual_env_reused = virtual_env_lock_file_hash_file.exists()
     # Instal torch separately to ensure it installs the CPU version which is
     # a smaller install
     session_virtualenv.install_package("torch", installer="pip", installer_command="install --index-url https://download.pytorch.org/whl/cpu")
-    # Install all of the models
-    for model_directory in tmp_path.iterdir():
-        dist_directory = Path(model_directory, 'dist')
-        if dist_directory.exists():
-            for dist_file in dist_directory.iterdir():
-                if dist_file.suffix == '.whl':
-                    dist_file_path = str(dist_file.resolve())
-                    session_virtualenv.install_package(f"{dist_file_path}",
-                                                       installer="pip")
-    # Required to run the functional tests
-    session_virtualenv.install_package("pytest",
-                                       installer='pip')
+    # Install all of the models, pytest is required to run the functional
+    # tests and pytest-xdist to run them in parallel
+    session_virtualenv.install_package(" ".join(wheel_file_paths + ["pytest", "pytest-xdist"]),
+                                       installer="pip",
+                                       installer_command="install")
+    if virtual_env_reused:
+        # The models have the same version as the ones already installed,
+        # therefore they have to be re-installed, their dependencies are
+        # already installed from the resolver run above.
+        session_virtualenv.install_package(" ".join(wheel_file_paths),
+                                           installer="pip",
+                                           installer_command="install --no-deps --force-reinstall")
+    virtual_env_lock_file_hash_file.write_text(lock_file_hash, encoding='utf-8')
+
+
+def get_hugging_face_hub_cache_directory() -> Path:
+    '''
+    Returns the directory that the Hugging Face Hub downloads the neural
+    models to, following the same environment variables as `huggingface_hub`.
+    '''
+    if 'HF_HUB_CACHE' in os.environ:
+        return Path(os.environ['HF_HUB_CACHE'])
+    if 'HF_HOME' in os.environ:
+        return Path(os.environ['HF_HOME'], 'hub')
+    cache_home = Path(os.environ.get('XDG_CACHE_HOME', Path(Path.home(), '.cache')))
+    return Path(cache_home, 'huggingface', 'hub')
+
+
+class DiskUsageMonitor:
+    '''
+    Records the disk space used on the file system of `path` relative to the
+    space used when the monitor was created.
+
+    # Parameters
+
+    path : `Path`
+        A path on the file system to monitor.
+
+    # Instance Attributes
+
+    peak_bytes : `int`
+        The largest amount of extra disk space used at any `sample`.
+    '''
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.baseline_bytes = shutil.disk_usage(path).used
+        self.peak_bytes = 0
+
+    def sample(self) -> int:
+        '''
+        Returns the extra disk space currently used and updates `peak_bytes`.
+        '''
+        used_bytes = shutil.disk_usage(self.path).used - self.baseline_bytes
+        self.peak_bytes = max(self.peak_bytes, used_bytes)
+        return used_bytes
+
+
+def test_create_install_and_test_models_one_at_a_time(tmp_path: Path,
+                                                      session_virtualenv: VirtualEnv,
+                                                      virtual_env_lock_file_hash_file: Path,
+                                                      lock_file_hash: str,
+                                                      one_model_at_a_time: bool,
+                                                      prune_models: bool,
+                                                      capsys: pytest.CaptureFixture[str],
+                                                      record_property: Any) -> None:
+    '''
+    Creates, installs, runs the model function tests for, and then deletes
+    each model one at a time, so that all of the models can be tested on a
+    machine with little free disk space, see:
+    https://github.com/UCREL/pymusas-models/issues/14
+    '''
+    if not one_model_at_a_time:
+        pytest.skip("Only ran with the --one-model-at-a-time flag")
+
+    repo_directory = Path(__file__, '..', '..').resolve()
+    model_function_tests_directory = Path(repo_directory, 'model_function_tests')
+    language_resource_file = Path(repo_directory, 'language_resources.json')
+    with language_resource_file.open('r', encoding='utf-8') as resource_file:
+        resource_file_data = resource_file.read()
+        LanguageResources.model_validate_json(resource_file_data)
+        language_resources: Dict[str, Any] = json.loads(resource_file_data)["language_resources"]
+
+    hugging_face_hub_cache_directory = get_hugging_face_hub_cache_directory()
+    disk_usage_monitor = DiskUsageMonitor(tmp_path)
+    python = str(session_virtualenv.python)
+    # Instal torch separately to ensure it installs the CPU version which is
+    # a smaller install, pytest is required to run the functional tests
+    session_virtualenv.install_package("torch", installer="pip",
+                                       installer_command="install --no-cache-dir --index-url https://download.pytorch.org/whl/cpu")
+    session_virtualenv.install_package("pytest", installer="pip",
+                                       installer_command="install --no-cache-dir")
+
+    model_peak_bytes: Dict[str, int] = {}
+    for language_code, language_resource in language_resources.items():
+        for model in language_resource["models"]:
+            model_name = model["name"]
+            single_model_resource = {**language_resource, "models": [model]}
+            single_model_resource_file = Path(tmp_path, 'language_resources.json')
+            single_model_resource_file.write_text(
+                json.dumps({"language_resources": {language_code: single_model_resource}}),
+                encoding='utf-8')
+
+            existing_hub_downloads = set()
+            if hugging_face_hub_cache_directory.exists():
+                existing_hub_downloads = set(hugging_face_hub_cache_directory.iterdir())
+
+            models_directory = Path(tmp_path, 'models')
+            runner = CliRunner()
+            runner_result = runner.invoke(app, ["create-models",
+                                                "--models-directory",
+                                                str(models_directory),
+                                                "--language-resource-file",
+                                                str(single_model_resource_file),
+                                                *(["--prune"] if prune_models else [])])
+            assert 0 == runner_result.exit_code, model_name
+            model_peak_bytes[model_name] = disk_usage_monitor.sample()
+
+            # The model and, if it has `lite` meta data, its lite variant are
+            # each installed, tested, and uninstalled.
+            catalog_entries = list(read_catalog(models_directory).models.values())
+            assert model_name in [entry.name for entry in catalog_entries]
+            for entry in catalog_entries:
+                assert entry.wheel is not None, entry.name
+                wheel_file = Path(models_directory, entry.package_name, 'dist', entry.wheel.file_name)
+                session_virtualenv.install_package(str(wheel_file.resolve()),
+                                                   installer="pip",
+                                                   installer_command="install --no-cache-dir")
+                model_peak_bytes[model_name] = max(model_peak_bytes[model_name],
+                                                   disk_usage_monitor.sample())
+
+                session_virtualenv.run([python, '-m', 'pytest', '-p', 'no:cacheprovider',
+                                        str(model_function_tests_directory),
+                                        '--model', entry.name],
+                                       cd=str(repo_directory))
+
+                session_virtualenv.run([python, '-m', 'pip', 'uninstall', '-y', entry.name])
+            shutil.rmtree(models_directory)
+            # Only remove the neural model downloads that this model created.
+            if hugging_face_hub_cache_directory.exists():
+                for hub_download in hugging_face_hub_cache_directory.iterdir():
+                    if hub_download.is_dir() and hub_download not in existing_hub_downloads:
+                        shutil.rmtree(hub_download)
+            disk_usage_monitor.sample()
+
+    assert model_peak_bytes
+    # All of the models have been uninstalled, therefore only the dependencies
+    # remain which can be reused.
+    virtual_env_lock_file_hash_file.write_text(lock_file_hash, encoding='utf-8')
+    record_property("peak_disk_usage_bytes", disk_usage_monitor.peak_bytes)
+    with capsys.disabled():
+        print("\nPeak disk usage, relative to the start of the test, per model:")
+        for model_name, peak_bytes in model_peak_bytes.items():
+            print(f"{model_name}: {peak_bytes / 1024 ** 2:.1f}MB")
+        print(f"Peak disk usage across all models: {disk_usage_monitor.peak_bytes / 1024 ** 2:.1f}MB")
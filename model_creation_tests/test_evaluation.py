@@ -0,0 +1,112 @@
+import hashlib
+import json
+from pathlib import Path
+import shutil
+import zipfile
+
+import pytest
+import spacy
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.evaluation import EvaluationResult, read_gold_corpus
+
+
+GOLD_CORPUS = [{'tokens': ['Sporting', 'community', '.'], 'pos': ['NOUN', 'NOUN', 'PUNCT'],
+                'usas_tags': ['Df/S5+c', 'Df/S5+c', None], 'mwe_indexes': [[0, 2]]},
+               {'tokens': ['community', 'Sporting'], 'pos': ['NOUN', 'NOUN'],
+                'usas_tags': ['S5+c', 'Z99']}]
+
+
+@pytest.fixture
+def gold_corpus(tmp_path: Path) -> Path:
+    gold_corpus = Path(tmp_path, 'gold.jsonl')
+    srsly.write_jsonl(gold_corpus, GOLD_CORPUS)
+    return gold_corpus
+
+
+def test_read_gold_corpus(gold_corpus: Path, tmp_path: Path) -> None:
+    nlp = spacy.blank('en')
+    with gold_corpus.open('r', encoding='utf-8') as gold_corpus_file:
+        gold_documents = read_gold_corpus(gold_corpus_file, nlp)
+    assert [['Sporting', 'community', '.'], ['community', 'Sporting']] == [
+        [token.text for token in gold_document.doc] for gold_document in gold_documents]
+    assert ['NOUN', 'NOUN', 'PUNCT'] == [token.pos_ for token in gold_documents[0].doc]
+    assert [['Df/S5+c', 'Df/S5+c', None], ['S5+c', 'Z99']] == [
+        gold_document.usas_tags for gold_document in gold_documents]
+    assert [{(0, 2)}, set()] == [gold_document.mwe_indexes for gold_document in gold_documents]
+
+    invalid_corpus = Path(tmp_path, 'invalid.jsonl')
+    for invalid_document in [{'text': 'Sporting community', 'usas_tags': ['A10+', 'S5+c']},
+                             {'tokens': ['Sporting', 'community'], 'usas_tags': ['A10+']}]:
+        srsly.write_jsonl(invalid_corpus, [invalid_document])
+        with invalid_corpus.open('r', encoding='utf-8') as invalid_corpus_file:
+            with pytest.raises(ValueError):
+                read_gold_corpus(invalid_corpus_file, nlp)
+
+
+def test_evaluate_models(created_models_directory: Path, gold_corpus: Path, tmp_path: Path) -> None:
+    models_directory = Path(tmp_path, 'models')
+    shutil.copytree(created_models_directory, models_directory)
+    runner_result = CliRunner().invoke(app, ["evaluate-models", str(gold_corpus), "--language", "en",
+                                             "--models-directory", str(models_directory), "--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    results = {result['name']: EvaluationResult.model_validate(result)
+               for result in json.loads(runner_result.output)}
+    assert ['en_dual_none_contextual_none', 'en_single_none_contextual_none'] == sorted(results)
+    single_result = results['en_single_none_contextual_none']
+    dual_result = results['en_dual_none_contextual_none']
+    for result in results.values():
+        assert ('gold.jsonl', 2, 5, 4) == (result.corpus, result.documents,
+                                           result.tokens, result.evaluated_tokens)
+        assert result.speed > 0
+    # The single word model tags `Sporting community` as `A10+` and `S5+c`.
+    assert (0.25, 0.25, 0.0, 0.0, 0.0) == (single_result.usas_top_1_accuracy, single_result.usas_top_5_accuracy,
+                                           single_result.mwe_precision, single_result.mwe_recall,
+                                           single_result.mwe_f1)
+    assert (0.75, 0.75, 1.0, 1.0, 1.0) == (dual_result.usas_top_1_accuracy, dual_result.usas_top_5_accuracy,
+                                           dual_result.mwe_precision, dual_result.mwe_recall,
+                                           dual_result.mwe_f1)
+
+    catalog = read_catalog(models_directory)
+    dual_entry = catalog.models['en_dual_none_contextual_none']
+    assert {'usas_top_1_accuracy': 0.75, 'usas_top_5_accuracy': 0.75, 'mwe_precision': 1.0,
+            'mwe_recall': 1.0, 'mwe_f1': 1.0,
+            'tokens_per_second': pytest.approx(dual_result.speed)} == dual_entry.benchmarks
+    model_directory = Path(models_directory, dual_entry.package_name)
+    for meta_file in [Path(model_directory, 'meta.json'),
+                      Path(model_directory, dual_entry.name, 'meta.json'),
+                      Path(model_directory, dual_entry.name, f'{dual_entry.name}-{dual_entry.version}', 'meta.json')]:
+        meta = srsly.read_json(meta_file)
+        assert 0.75 == meta['performance']['usas_top_1_accuracy']
+        assert pytest.approx(dual_result.speed) == meta['performance']['speed']
+        assert {'corpus': 'gold.jsonl', 'documents': 2, 'tokens': 5, 'evaluated_tokens': 4} == meta['evaluation']
+    readme = Path(model_directory, 'README.md').read_text(encoding='utf-8')
+    assert '### Accuracy' in readme
+    assert '| `USAS_TOP_1_ACCURACY` | 75.00 |' in readme
+    assert 'SPEED' not in readme
+    # The wheel is re-built with the scores, and its checksum is updated.
+    original_entry = read_catalog(created_models_directory).models[dual_entry.name]
+    wheel_file = Path(model_directory, 'dist', dual_entry.wheel.file_name)
+    assert hashlib.sha256(wheel_file.read_bytes()).hexdigest() == dual_entry.wheel.sha256
+    assert original_entry.wheel.sha256 != dual_entry.wheel.sha256
+    assert dual_entry.wheel.sha256 in readme
+    with zipfile.ZipFile(wheel_file) as wheel:
+        packaged_meta = json.loads(wheel.read(f'{dual_entry.name}/meta.json'))
+    assert 0.75 == packaged_meta['performance']['usas_top_1_accuracy']
+
+    runner_result = CliRunner().invoke(app, ["overview-of-models", "--models-directory", str(models_directory)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    table_rows = runner_result.output.strip().split('\n')
+    assert table_rows[0].endswith('| File Size | Top 1 Accuracy | MWE F1 | Tokens/sec |')
+    assert '| 75.00 | 100.00 |' in table_rows[2]
+
+    runner_result = CliRunner().invoke(app, ["evaluate-models", str(gold_corpus), "--language", "cy",
+                                             "--models-directory", str(models_directory)])
+    assert 0 != runner_result.exit_code
+    runner_result = CliRunner().invoke(app, ["evaluate-models", str(gold_corpus), "--language", "en",
+                                             "--models-directory", str(models_directory),
+                                             "--model", "cy_single_none_contextual_none"])
+    assert 0 != runner_result.exit_code
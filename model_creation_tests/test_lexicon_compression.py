@@ -0,0 +1,169 @@
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import pytest
+import srsly
+from typer.testing import CliRunner
+import zstandard
+
+from pymusas_models import lexicon_compression
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.compression_benchmark import CompressionBenchmarkResult
+from pymusas_models.language_resource import LexiconCompression
+from pymusas_models.size_report import PACKAGE_PART_NAME, create_size_report
+
+
+# Run in a new Python process so that the model is loaded from the installed
+# package, argv[1] is `lazy` or `eager`.
+LOAD_SCRIPT = '''
+import sys
+
+import en_dual_none_contextual_none
+from spacy.tokens import Doc
+
+nlp = en_dual_none_contextual_none.load(lazy=sys.argv[1] == 'lazy')
+doc = nlp(Doc(nlp.vocab, words=['Sporting', 'community'], pos=['NOUN', 'NOUN']))
+print([token._.pymusas_tags for token in doc])
+'''
+
+
+@pytest.fixture(scope="module")
+def compressed_models_directory(tmp_path_factory: pytest.TempPathFactory,
+                                language_resource_file: Path) -> Path:
+    '''
+    A directory with the models of the `language_resource_file` fixture,
+    whereby the dual model compresses its lexicons.
+    '''
+    tmp_path = tmp_path_factory.mktemp('compressed_models')
+    language_resources = srsly.read_json(language_resource_file)
+    for model in language_resources['language_resources']['en']['models']:
+        if model['name'] == 'en_dual_none_contextual_none':
+            model['lexicon_compression'] = {'level': 19}
+    compressed_language_resource_file = Path(tmp_path, 'language_resources.json')
+    srsly.write_json(compressed_language_resource_file, language_resources)
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(models_directory),
+                                             "--language-resource-file",
+                                             str(compressed_language_resource_file)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    return models_directory
+
+
+def test_compress_and_decompress(rule_based_model_path: Path, tmp_path: Path) -> None:
+    component_directory = Path(rule_based_model_path, 'pymusas_rule_based_tagger')
+    rules = Path(component_directory, 'rules.bin').read_bytes()
+    manifest = lexicon_compression.compress_files(component_directory)
+    assert {'level': 19, 'dictionary': None,
+            'files': {'rules.bin': {'size_bytes': len(rules),
+                                    'compressed_size_bytes': Path(component_directory,
+                                                                  'rules.bin.zst').stat().st_size}}} == manifest
+    assert manifest == json.loads(Path(component_directory, 'compressed_files.json').read_text(encoding='utf-8'))
+    assert {Path(component_directory, 'rules.bin')} == lexicon_compression.get_compressed_files(rule_based_model_path)
+
+    # The component directory still has all of its files.
+    with lexicon_compression.decompressed_component(component_directory) as decompressed_directory:
+        assert component_directory == decompressed_directory
+
+    installed_directory = Path(tmp_path, 'installed')
+    shutil.copytree(component_directory, installed_directory)
+    Path(installed_directory, 'rules.bin').unlink()
+    with lexicon_compression.decompressed_component(installed_directory) as decompressed_directory:
+        assert rules == Path(decompressed_directory, 'rules.bin').read_bytes()
+        assert (Path(installed_directory, 'ranker.bin').read_bytes()
+                == Path(decompressed_directory, 'ranker.bin').read_bytes())
+        assert not Path(decompressed_directory, 'rules.bin.zst').exists()
+    assert not decompressed_directory.exists()
+
+    # A decompressed file that does not match its size is an error.
+    Path(installed_directory, 'rules.bin.zst').write_bytes(zstandard.ZstdCompressor().compress(rules[:-1]))
+    with pytest.raises(ValueError):
+        with lexicon_compression.decompressed_component(installed_directory):
+            pass
+
+
+def test_compress_with_dictionary(tmp_path: Path) -> None:
+    component_directory = Path(tmp_path, 'component')
+    component_directory.mkdir()
+    payloads = {}
+    for file_name in ['single.bin', 'mwe.bin']:
+        payload = '\n'.join(f'{file_name}\tlemma_{index}\tZ{index % 10}\tNOUN'
+                            for index in range(20000)).encode('utf-8')
+        Path(component_directory, file_name).write_bytes(payload)
+        payloads[file_name] = payload
+    manifest = lexicon_compression.compress_files(component_directory, level=3,
+                                                  dictionary_size_bytes=8192,
+                                                  file_names=['single.bin', 'mwe.bin', 'missing.bin'])
+    assert 'zstd_dictionary.bin' == manifest['dictionary']
+    assert ['single.bin', 'mwe.bin'] == list(manifest['files'])
+    assert Path(component_directory, 'zstd_dictionary.bin').stat().st_size <= 8192
+
+    installed_directory = Path(tmp_path, 'installed')
+    shutil.copytree(component_directory, installed_directory)
+    for file_name in payloads:
+        Path(installed_directory, file_name).unlink()
+    with lexicon_compression.decompressed_component(installed_directory) as decompressed_directory:
+        for file_name, payload in payloads.items():
+            assert payload == Path(decompressed_directory, file_name).read_bytes()
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_load_packaged_model_with_compressed_lexicons(compressed_models_directory: Path,
+                                                      tmp_path: Path, lazy: bool) -> None:
+    catalog = read_catalog(compressed_models_directory)
+    assert catalog.models['en_single_none_contextual_none'].lexicon_compression is None
+    entry = catalog.models['en_dual_none_contextual_none']
+    assert LexiconCompression(level=19) == entry.lexicon_compression
+    assert lexicon_compression.REQUIREMENT in entry.requirements
+
+    wheel_file = Path(compressed_models_directory, entry.package_name, 'dist', entry.wheel.file_name)
+    with zipfile.ZipFile(wheel_file) as wheel_zip:
+        wheel_files = wheel_zip.namelist()
+    assert any(file_name.endswith('pymusas_rule_based_tagger/rules.bin.zst') for file_name in wheel_files)
+    assert not any(file_name.endswith('pymusas_rule_based_tagger/rules.bin') for file_name in wheel_files)
+    # The pipeline size is the size of the pipeline data within the wheel.
+    size_report = create_size_report(entry, compressed_models_directory)
+    assert entry.pipeline_size_bytes == sum(part.size_bytes for part in size_report.parts
+                                            if part.name != PACKAGE_PART_NAME)
+
+    target_directory = Path(tmp_path, 'target')
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps', '--no-cache-dir',
+                    '--target', str(target_directory), str(wheel_file)],
+                   check=True)
+    completed_process = subprocess.run([sys.executable, '-c', LOAD_SCRIPT, 'lazy' if lazy else 'eager'],
+                                       cwd=tmp_path, capture_output=True, text=True,
+                                       env={**os.environ, 'PYTHONPATH': str(target_directory)})
+    assert 0 == completed_process.returncode, completed_process.stderr
+    assert "[['Df/S5+c'], ['Df/S5+c']]\n" == completed_process.stdout
+
+
+def test_compression_benchmark(compressed_models_directory: Path) -> None:
+    runner_result = CliRunner().invoke(app, ["compression-benchmark", "--models-directory",
+                                             str(compressed_models_directory), "--model",
+                                             "en_dual_none_contextual_none", "--level", "1",
+                                             "--level", "19", "--repeats", "1", "--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    results = [CompressionBenchmarkResult.model_validate(result)
+               for result in json.loads(runner_result.output)]
+    assert ['none', 'zstd 1', 'zstd 19'] == [result.setting for result in results]
+    assert [None, LexiconCompression(level=1), LexiconCompression(level=19)] == [
+        result.lexicon_compression for result in results]
+    for result in results:
+        assert result.wheel_size_bytes > 0
+        assert result.installed_size_bytes > 0
+        assert result.load_seconds > 0
+
+    runner_result = CliRunner().invoke(app, ["compression-benchmark", "--models-directory",
+                                             str(compressed_models_directory), "--model",
+                                             "en_dual_none_contextual_none", "--level", "23"])
+    assert 0 != runner_result.exit_code
+    runner_result = CliRunner().invoke(app, ["compression-benchmark", "--models-directory",
+                                             str(compressed_models_directory), "--model",
+                                             "cy_single_none_contextual_none"])
+    assert 0 != runner_result.exit_code
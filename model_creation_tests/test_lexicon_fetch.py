@@ -0,0 +1,97 @@
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.language_resource import LanguageResources
+from pymusas_models.lexicon_fetch import get_lexicon_urls, prefetch_lexicons
+
+from .conftest import MWE_LEXICON, SINGLE_LEXICON, FileServer
+
+
+@pytest.fixture
+def lexicon_server(file_server: FileServer) -> FileServer:
+    Path(file_server.directory, 'single.tsv').write_text(SINGLE_LEXICON, encoding='utf-8')
+    Path(file_server.directory, 'mwe.tsv').write_text(MWE_LEXICON, encoding='utf-8')
+    return file_server
+
+
+def test_get_lexicon_urls(language_resource_file: Path) -> None:
+    language_resources_data = srsly.read_json(language_resource_file)
+    models = language_resources_data['language_resources']['en']['models']
+    for model in models:
+        for rule in model['resources']['rules']:
+            rule['lexicon_url'] = f'https://example.com/{Path(rule["lexicon_url"]).name}'
+    models[0]['resources']['rules'].append({"rule_type": "mwe", "pos_mapper": None,
+                                            "lexicon_url": "./local_mwe.tsv"})
+    language_resources = LanguageResources.model_validate(language_resources_data)
+    assert (['https://example.com/single.tsv', 'https://example.com/mwe.tsv']
+            == get_lexicon_urls(language_resources))
+
+
+def test_prefetch_lexicons(lexicon_server: FileServer, tmp_path: Path) -> None:
+    lexicon_urls = [f'{lexicon_server.url}/single.tsv', f'{lexicon_server.url}/mwe.tsv']
+    cache_directory = Path(tmp_path, 'cache')
+    lexicon_server.failures['/mwe.tsv'] = 2
+    lexicon_files = prefetch_lexicons(lexicon_urls, cache_directory, max_workers=2,
+                                      backoff_seconds=0)
+    assert lexicon_urls == list(lexicon_files)
+    assert SINGLE_LEXICON == lexicon_files[lexicon_urls[0]].read_text(encoding='utf-8')
+    assert MWE_LEXICON == lexicon_files[lexicon_urls[1]].read_text(encoding='utf-8')
+    assert ['/mwe.tsv'] * 3 + ['/single.tsv'] == sorted(lexicon_server.requests)
+
+    # The cached lexicons are not downloaded again.
+    assert lexicon_files == prefetch_lexicons(lexicon_urls, cache_directory, backoff_seconds=0)
+    assert 4 == len(lexicon_server.requests)
+    assert sorted(lexicon_files.values()) == sorted(cache_directory.iterdir())
+
+
+def test_prefetch_lexicons_errors(lexicon_server: FileServer, tmp_path: Path) -> None:
+    cache_directory = Path(tmp_path, 'cache')
+    # A client error is not retried.
+    with pytest.raises(HTTPError):
+        prefetch_lexicons([f'{lexicon_server.url}/missing.tsv'], cache_directory,
+                          backoff_seconds=0)
+    assert ['/missing.tsv'] == lexicon_server.requests
+
+    lexicon_server.failures['/mwe.tsv'] = 3
+    with pytest.raises(HTTPError):
+        prefetch_lexicons([f'{lexicon_server.url}/mwe.tsv'], cache_directory,
+                          backoff_seconds=0)
+    assert 4 == len(lexicon_server.requests)
+
+    # A file that is not a lexicon is retried and never cached.
+    Path(lexicon_server.directory, 'not_a_lexicon.tsv').write_text('<html></html>\n',
+                                                                   encoding='utf-8')
+    with pytest.raises(ValueError, match='field headings'):
+        prefetch_lexicons([f'{lexicon_server.url}/not_a_lexicon.tsv'], cache_directory,
+                          attempts=2, backoff_seconds=0)
+    assert 6 == len(lexicon_server.requests)
+    assert [] == list(cache_directory.iterdir())
+
+
+def test_create_models_from_lexicon_urls(language_resource_file: Path,
+                                         lexicon_server: FileServer, tmp_path: Path) -> None:
+    language_resources_data = srsly.read_json(language_resource_file)
+    for model in language_resources_data['language_resources']['en']['models']:
+        for rule in model['resources']['rules']:
+            rule['lexicon_url'] = f'{lexicon_server.url}/{Path(rule["lexicon_url"]).name}'
+    url_language_resource_file = Path(tmp_path, 'language_resources.json')
+    srsly.write_json(url_language_resource_file, language_resources_data)
+
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(models_directory),
+                                             "--language-resource-file",
+                                             str(url_language_resource_file),
+                                             "--lexicon-download-workers", "2"],
+                                       env={'PYMUSAS_MODELS_CACHE': str(Path(tmp_path, 'cache'))})
+    assert 0 == runner_result.exit_code, runner_result.output
+    # Each lexicon is downloaded once even though both models use the
+    # single word lexicon.
+    assert ['/mwe.tsv', '/single.tsv'] == sorted(lexicon_server.requests)
+    assert 2 == len(list(Path(tmp_path, 'cache', 'lexicons').iterdir()))
+    assert 2 == len(list(models_directory.glob('en_*')))
@@ -0,0 +1,115 @@
+import importlib
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.lexicon_package import lexicon_packages_importable
+
+
+# Run in a new Python process so that the models are loaded from the
+# installed packages.
+LOAD_SCRIPT = '''
+import en_dual_none_contextual_none
+import en_single_none_contextual_none
+from spacy.tokens import Doc
+
+taggers = []
+for model_package in [en_single_none_contextual_none, en_dual_none_contextual_none]:
+    nlp = model_package.load()
+    doc = nlp(Doc(nlp.vocab, words=['Sporting', 'community'], pos=['NOUN', 'NOUN']))
+    taggers.append(nlp.get_pipe('pymusas_rule_based_tagger'))
+    print([token._.pymusas_tags for token in doc])
+# Both models use the same single word rule from the data package.
+assert taggers[0].rules[0] is taggers[1].rules[0]
+'''
+
+
+def test_shared_lexicons(created_models_directory: Path, language_resource_file: Path,
+                         tmp_path: Path) -> None:
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(models_directory),
+                                             "--language-resource-file",
+                                             str(language_resource_file),
+                                             "--shared-lexicons"])
+    assert 0 == runner_result.exit_code, runner_result.output
+
+    catalog = read_catalog(models_directory)
+    lexicon_package = catalog.lexicon_packages['pymusas_lexicon_en']
+    lexicon_package_directory = Path(models_directory, lexicon_package.package_name)
+    # Only the single word rule is used by both models.
+    assert 1 == len(list(Path(lexicon_package_directory, 'pymusas_lexicon_en', 'rules').iterdir()))
+
+    # The models can be loaded from the models directory by the commands.
+    original_sys_path = list(sys.path)
+    corpus_file = Path(tmp_path, 'corpus.jsonl')
+    srsly.write_jsonl(corpus_file, [{'tokens': ['Sporting', 'community'], 'pos': ['NOUN', 'NOUN']}])
+    output_file = Path(tmp_path, 'output.jsonl')
+    for model_name, expected_tags in [('en_single_none_contextual_none', [['A10+'], ['S5+c']]),
+                                      ('en_dual_none_contextual_none', [['Df/S5+c'], ['Df/S5+c']])]:
+        runner_result = CliRunner().invoke(app, ["tag-corpus", model_name, str(corpus_file), str(output_file),
+                                                 "--corpus-format", "jsonl",
+                                                 "--models-directory", str(models_directory)])
+        assert 0 == runner_result.exit_code, runner_result.output
+        assert [expected_tags] == [document['pymusas_tags'] for document in srsly.read_jsonl(output_file)]
+        runner_result = CliRunner().invoke(app, ["profile-model", model_name, str(corpus_file),
+                                                 "--corpus-format", "jsonl",
+                                                 "--models-directory", str(models_directory)])
+        assert 0 == runner_result.exit_code, runner_result.output
+    assert original_sys_path == sys.path
+    assert 'pymusas_lexicon_en' not in sys.modules
+
+    unshared_catalog = read_catalog(created_models_directory)
+    wheel_files = [Path(lexicon_package_directory, 'dist', lexicon_package.wheel.file_name)]
+    for model_name, entry in catalog.models.items():
+        lexicon_requirement = f'pymusas_lexicon_en=={lexicon_package.version}'
+        assert lexicon_requirement in entry.requirements
+        meta_data = srsly.read_json(Path(models_directory, entry.package_name, 'meta.json'))
+        assert lexicon_requirement in meta_data['requirements']
+        assert entry.pipeline_size_bytes < unshared_catalog.models[model_name].pipeline_size_bytes
+        wheel_files.append(Path(models_directory, entry.package_name, 'dist', entry.wheel.file_name))
+
+    target_directory = Path(tmp_path, 'target')
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps', '--no-cache-dir',
+                    '--target', str(target_directory), *[str(wheel_file) for wheel_file in wheel_files]],
+                   check=True)
+    completed_process = subprocess.run([sys.executable, '-c', LOAD_SCRIPT],
+                                       cwd=tmp_path, capture_output=True, text=True,
+                                       env={**os.environ, 'PYTHONPATH': str(target_directory)})
+    assert 0 == completed_process.returncode, completed_process.stderr
+    assert ("[['A10+'], ['S5+c']]\n[['Df/S5+c'], ['Df/S5+c']]\n"
+            == completed_process.stdout)
+
+
+def test_lexicon_packages_importable(tmp_path: Path) -> None:
+    models_directory = Path(tmp_path, 'models')
+    package_directory = Path(models_directory, 'pymusas_lexicon_en-0.4.0')
+    Path(package_directory, 'pymusas_lexicon_en').mkdir(parents=True)
+    Path(package_directory, 'pymusas_lexicon_en', '__init__.py').write_text('', encoding='utf-8')
+    distribution_file = {'file_name': 'file', 'size_bytes': 1, 'sha256': ''}
+    srsly.write_json(Path(models_directory, 'catalog.json'),
+                     {'models': {}, 'lexicon_packages': {'pymusas_lexicon_en': {
+                         'name': 'pymusas_lexicon_en', 'version': '0.4.0',
+                         'package_name': 'pymusas_lexicon_en-0.4.0', 'language_code': 'en',
+                         'wheel': distribution_file, 'sdist': distribution_file}}})
+    original_sys_path = list(sys.path)
+    with lexicon_packages_importable(models_directory, 'cy') as package_directories:
+        assert [] == package_directories
+    # The data package is removed from `sys.path` and `sys.modules` even if
+    # an error is raised.
+    with pytest.raises(ValueError):
+        with lexicon_packages_importable(models_directory) as package_directories:
+            assert [package_directory] == package_directories
+            importlib.import_module('pymusas_lexicon_en')
+            raise ValueError()
+    assert original_sys_path == sys.path
+    assert 'pymusas_lexicon_en' not in sys.modules
+    with lexicon_packages_importable(None) as package_directories:
+        assert [] == package_directories
@@ -0,0 +1,140 @@
+from pathlib import Path
+
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.single_word import SingleWordRule
+import pytest
+import spacy
+from spacy.tokens import Doc
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.language_resource import LiteVariant
+from pymusas_models.lite_variant import (
+    LiteVariantMeta,
+    create_lite_rules,
+    get_covering_words,
+    get_lite_model_name,
+    get_token_coverage,
+    prune_lexicon,
+    read_frequency_list,
+)
+from pymusas_models.tag_corpus import get_model_path
+
+
+FREQUENCY_LIST = '''word\tfrequency
+sporting\t60
+the\t30
+Sporting\t5
+community\t5
+'''
+
+
+@pytest.fixture
+def frequency_list(tmp_path: Path) -> Path:
+    frequency_list = Path(tmp_path, 'frequencies.tsv')
+    frequency_list.write_text(FREQUENCY_LIST, encoding='utf-8')
+    return frequency_list
+
+
+def test_read_frequency_list(frequency_list: Path, tmp_path: Path) -> None:
+    assert {'sporting': 65, 'the': 30, 'community': 5} == read_frequency_list(frequency_list)
+    no_header_list = Path(tmp_path, 'no_header.tsv')
+    no_header_list.write_text('sporting\t60\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_frequency_list(no_header_list)
+
+
+def test_get_covering_words() -> None:
+    frequencies = {'sporting': 65, 'the': 30, 'community': 5}
+    assert {'sporting'} == get_covering_words(frequencies, 0.6)
+    assert {'sporting', 'the'} == get_covering_words(frequencies, 0.95)
+    assert {'sporting', 'the', 'community'} == get_covering_words(frequencies, 0.99)
+    assert {'sporting', 'the', 'community'} == get_covering_words(frequencies, 1.0)
+    assert 0.7 == pytest.approx(get_token_coverage(frequencies, {'sporting', 'community'}))
+    assert 0.0 == get_token_coverage({}, {'sporting'})
+
+
+def test_prune_lexicon() -> None:
+    lexicon = {'Sporting|NOUN': ['A10+'], 'community|NOUN': ['S5+c'], 'a|b|DET': ['Z5']}
+    assert ({'Sporting|NOUN': ['A10+'], 'a|b|DET': ['Z5']}
+            == prune_lexicon(lexicon, {'sporting', 'a|b'}, include_pos=True))
+    assert {'community': ['S5+c']} == prune_lexicon({'Sporting': ['A10+'], 'community': ['S5+c']},
+                                                    {'community'}, include_pos=False)
+
+
+def test_create_lite_rules(tmp_path: Path) -> None:
+    lexicon = {f'word{index}|NOUN': ['Z99'] for index in range(2000)}
+    lemma_lexicon = {f'word{index}': ['Z99'] for index in range(2000)}
+    rules = [SingleWordRule(lexicon, lemma_lexicon), MWERule({'word0_NOUN word1_NOUN': ['Z5']})]
+    frequency_list = Path(tmp_path, 'frequencies.tsv')
+    frequency_list.write_text('word\tfrequency\n' + ''.join(f'word{index}\t{2000 - index}\n'
+                                                            for index in range(2000)),
+                              encoding='utf-8')
+    lite_rules, lite_meta = create_lite_rules(rules, LiteVariant(frequency_list=str(frequency_list),
+                                                                 coverage=0.5))
+    assert rules[1] is lite_rules[1]
+    lite_rule = lite_rules[0]
+    assert isinstance(lite_rule, SingleWordRule)
+    assert 586 == len(lite_rule.lexicon_collection) == len(lite_rule.lemma_lexicon_collection)
+    assert 'frequencies.tsv' == lite_meta.frequency_list
+    assert 586 == lite_meta.covering_words
+    assert 2 * 586 == lite_meta.lexicon_entries
+    assert 4000 == lite_meta.full_lexicon_entries
+    assert 1.0 == lite_meta.full_token_coverage
+    assert 0.5 <= lite_meta.token_coverage < 0.501
+    assert lite_meta.full_token_coverage - lite_meta.token_coverage == lite_meta.coverage_loss
+    assert 0 < lite_meta.memory_bytes < lite_meta.full_memory_bytes
+    assert 0.5 < lite_meta.memory_saving
+
+
+def test_create_lite_models(language_resource_file: Path, frequency_list: Path,
+                            tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    language_resources = srsly.read_json(language_resource_file)
+    for model in language_resources['language_resources']['en']['models']:
+        model['lite'] = {'frequency_list': str(frequency_list), 'coverage': 0.9}
+    lite_language_resource_file = Path(tmp_path, 'language_resources.json')
+    srsly.write_json(lite_language_resource_file, language_resources)
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(models_directory),
+                                             "--language-resource-file",
+                                             str(lite_language_resource_file),
+                                             "--shared-lexicons"])
+    assert 0 == runner_result.exit_code, runner_result.output
+
+    catalog = read_catalog(models_directory)
+    # The full models load their shared rules from the lexicon data package.
+    monkeypatch.syspath_prepend(str(Path(models_directory,
+                                         catalog.lexicon_packages['pymusas_lexicon_en'].package_name)))
+    assert ['en_dual_none_contextual_none', 'en_dual_none_contextual_none_lite',
+            'en_single_none_contextual_none', 'en_single_none_contextual_none_lite'] == sorted(catalog.models)
+    for model_name in ['en_single_none_contextual_none', 'en_dual_none_contextual_none']:
+        lite_model_name = get_lite_model_name(model_name)
+        # The single word rule of the lite variant is not the shared rule.
+        assert any(requirement.startswith('pymusas_lexicon_en==')
+                   for requirement in catalog.models[model_name].requirements)
+        assert not any(requirement.startswith('pymusas_lexicon_en==')
+                       for requirement in catalog.models[lite_model_name].requirements)
+        nlp = spacy.load(get_model_path(model_name, models_directory))
+        lite_nlp = spacy.load(get_model_path(lite_model_name, models_directory))
+        assert 'lite' not in nlp.meta
+        lite_meta = LiteVariantMeta.model_validate(lite_nlp.meta['lite'])
+        assert 0.9 == lite_meta.coverage
+        assert 2 == lite_meta.covering_words
+        assert 0.7 == pytest.approx(lite_meta.full_token_coverage)
+        assert 0.65 == pytest.approx(lite_meta.token_coverage)
+        assert 0.05 == pytest.approx(lite_meta.coverage_loss)
+        assert lite_meta.memory_bytes < lite_meta.full_memory_bytes
+
+        words = ['Sporting', 'community']
+        pos = ['NOUN', 'NOUN']
+        tags = [token._.pymusas_tags for token in nlp(Doc(nlp.vocab, words=words, pos=pos))]
+        lite_tags = [token._.pymusas_tags for token in lite_nlp(Doc(lite_nlp.vocab, words=words, pos=pos))]
+        if model_name.startswith('en_dual'):
+            # The MWE lexicon is kept.
+            assert [['Df/S5+c'], ['Df/S5+c']] == tags == lite_tags
+        else:
+            assert [['A10+'], ['S5+c']] == tags
+            assert [['A10+'], ['Z99']] == lite_tags
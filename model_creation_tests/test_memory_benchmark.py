@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.memory_benchmark import MemoryBenchmarkResult, measure_memory
+
+
+def test_measure_memory(created_models_directory: Path) -> None:
+    entries = list(read_catalog(created_models_directory).models.values())
+    result = measure_memory(entries, created_models_directory, repeats=1)
+    assert [entry.name for entry in entries] == result.models
+    assert result.separate_rss_bytes > 0
+    assert result.shared_rss_bytes > 0
+    assert 1 - result.shared_rss_bytes / result.separate_rss_bytes == result.reduction
+    assert 0.0 == MemoryBenchmarkResult(models=[], separate_rss_bytes=0, shared_rss_bytes=0).reduction
+
+
+def test_memory_benchmark(created_models_directory: Path) -> None:
+    arguments = ["memory-benchmark", "--models-directory", str(created_models_directory),
+                 "--model", "en_single_none_contextual_none", "--repeats", "1"]
+    runner_result = CliRunner().invoke(app, [*arguments, "--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    result = json.loads(runner_result.stdout)
+    assert ['en_single_none_contextual_none'] == result['models']
+    assert result['separate_rss_bytes'] > 0
+    assert result['shared_rss_bytes'] > 0
+
+    runner_result = CliRunner().invoke(app, arguments)
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert '1 models' in runner_result.stdout
+    assert 'MultiLanguageModels' in runner_result.stdout
+
+    runner_result = CliRunner().invoke(app, ["memory-benchmark", "--models-directory",
+                                             str(created_models_directory), "--model", "unknown"])
+    assert 0 != runner_result.exit_code
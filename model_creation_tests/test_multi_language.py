@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import Dict, List, cast
+
+from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.rule import Rule
+from pymusas.taggers.rules.single_word import SingleWordRule
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+from pymusas_models.multi_language import LanguageDocument, MultiLanguageModels, get_language_code, get_spacy_language
+
+
+def create_model(model_directory: Path, spacy_language: str, with_mwe: bool) -> Path:
+    nlp = spacy.blank(spacy_language)
+    tagger = cast(RuleBasedTagger, nlp.add_pipe('pymusas_rule_based_tagger'))
+    rules: List[Rule] = [SingleWordRule({'Sporting|NOUN': ['A10+'], 'hack|NOUN': ['Q4.2/S2mf', 'Y2']},
+                                        {'hack': ['Y2'], 'haciad': ['Y2']})]
+    if with_mwe:
+        rules.append(MWERule({'Sporting_NOUN community_NOUN': ['Df/S5+c']}))
+    ranker = ContextualRuleBasedRanker(*ContextualRuleBasedRanker.get_construction_arguments(rules))
+    tagger.initialize(rules=rules, ranker=ranker,
+                      default_punctuation_tags=['PUNCT'],
+                      default_number_tags=['NUM'])
+    nlp.to_disk(model_directory)
+    return model_directory
+
+
+@pytest.fixture
+def model_paths(tmp_path: Path) -> Dict[str, Path]:
+    return {'en_single_none_contextual_none': create_model(Path(tmp_path, 'en_single'), 'en', False),
+            'en_dual_none_contextual_none': create_model(Path(tmp_path, 'en_dual'), 'en', True),
+            'cy_single_none_contextual_none': create_model(Path(tmp_path, 'cy_single'), 'xx', False)}
+
+
+def test_get_language_code() -> None:
+    assert 'cy' == get_language_code('cy_dual_basiccorcencc2usas_contextual_none')
+    assert 'cmn' == get_language_code('cmn_single_upos2usas_contextual_none')
+
+
+def test_get_spacy_language(model_paths: Dict[str, Path]) -> None:
+    assert 'en' == get_spacy_language(model_paths['en_dual_none_contextual_none'])
+    assert 'xx' == get_spacy_language(str(model_paths['cy_single_none_contextual_none']))
+
+
+def test_multi_language_models_sharing(model_paths: Dict[str, Path]) -> None:
+    multi_language_models = MultiLanguageModels()
+    for model_name, model_path in model_paths.items():
+        multi_language_models.load(model_name, model_path)
+    en_single = multi_language_models.models['en_single_none_contextual_none']
+    en_dual = multi_language_models.models['en_dual_none_contextual_none']
+    cy_single = multi_language_models.models['cy_single_none_contextual_none']
+
+    assert en_single.vocab is en_dual.vocab
+    assert en_single.vocab is not cy_single.vocab
+
+    en_single_rules = cast(List[Rule], cast(RuleBasedTagger, en_single.pipeline[-1][1]).rules)
+    en_dual_rules = cast(List[Rule], cast(RuleBasedTagger, en_dual.pipeline[-1][1]).rules)
+    cy_single_rules = cast(List[Rule], cast(RuleBasedTagger, cy_single.pipeline[-1][1]).rules)
+    # The single word rules of all of the models are identical.
+    assert en_single_rules[0] is en_dual_rules[0]
+    assert en_single_rules[0] is cy_single_rules[0]
+    assert isinstance(en_dual_rules[1], MWERule)
+
+    # The same list of semantic tags is shared between lexicon entries.
+    single_word_rule = cast(SingleWordRule, en_single_rules[0])
+    assert (single_word_rule.lemma_lexicon_collection['hack']
+            is single_word_rule.lemma_lexicon_collection['haciad'])
+
+
+def test_multi_language_models_pipe(model_paths: Dict[str, Path]) -> None:
+    multi_language_models = MultiLanguageModels()
+    for model_name, model_path in model_paths.items():
+        multi_language_models.load(model_name, model_path)
+    assert {'en': 'en_single_none_contextual_none',
+            'cy': 'cy_single_none_contextual_none'} == multi_language_models.language_models
+
+    multi_language_models.language_models['en'] = 'en_dual_none_contextual_none'
+    en_dual = multi_language_models.get_model('en')
+    cy_single = multi_language_models.get_model('cy')
+    assert multi_language_models.models['en_dual_none_contextual_none'] is en_dual
+
+    documents: List[LanguageDocument] = [
+        (Doc(en_dual.vocab, words=['Sporting', 'community'], pos=['NOUN', 'NOUN']), 'en'),
+        ('haciad', 'cy'),
+        (Doc(en_dual.vocab, words=['hack'], pos=['NOUN']), 'en'),
+        ('hack', 'cy')
+    ]
+    tagged_documents = list(multi_language_models.pipe(documents, batch_size=3))
+    assert [['Df/S5+c'], ['Df/S5+c']] == [token._.pymusas_tags for token in tagged_documents[0]]
+    assert [['Y2']] == [token._.pymusas_tags for token in tagged_documents[1]]
+    assert [['Q4.2/S2mf', 'Y2']] == [token._.pymusas_tags for token in tagged_documents[2]]
+    assert [['Y2']] == [token._.pymusas_tags for token in tagged_documents[3]]
+    assert cy_single.vocab is tagged_documents[1].vocab
+
+    with pytest.raises(ValueError):
+        list(multi_language_models.pipe([('hack', 'fr')]))
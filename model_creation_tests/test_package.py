@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from pymusas_models.catalog import read_catalog
+
+
+# Run in a new Python process so that the modules imported by the model
+# package can be checked.
+LOAD_SCRIPT = '''
+import sys
+
+import en_dual_none_contextual_none as model_package
+
+lazy = sys.argv[1] == 'lazy'
+assert 'spacy' not in sys.modules
+assert sys.argv[2] == model_package.__version__
+assert 'en_dual_none_contextual_none' == model_package.get_meta()['name']
+
+from spacy.tokens import Doc
+
+nlp = model_package.load(lazy=lazy)
+tagger = nlp.get_pipe('pymusas_rule_based_tagger')
+assert (tagger.rules is None) == lazy
+doc = nlp(Doc(nlp.vocab, words=['Sporting', 'community'], pos=['NOUN', 'NOUN']))
+assert [['Df/S5+c'], ['Df/S5+c']] == [token._.pymusas_tags for token in doc]
+assert tagger.rules is not None
+# The deferred class of the component is replaced by the original class once
+# the component has been used.
+assert type(tagger).__module__.startswith('pymusas.')
+
+# Like `spacy.load`, loading the model warns if it is not compatible with the
+# installed version of spaCy.
+import json
+from pathlib import Path
+import warnings
+
+meta_file = Path(Path(model_package.__file__).parent, 'meta.json')
+meta = json.loads(meta_file.read_text(encoding='utf-8'))
+meta['spacy_version'] = '>=99.0.0'
+meta_file.write_text(json.dumps(meta), encoding='utf-8')
+with warnings.catch_warnings(record=True) as caught_warnings:
+    warnings.simplefilter('always')
+    model_package.load(lazy=lazy)
+assert any('W095' in str(caught_warning.message) for caught_warning in caught_warnings)
+'''
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_load_packaged_model(created_models_directory: Path, tmp_path: Path,
+                             lazy: bool) -> None:
+    dual_entry = read_catalog(created_models_directory).models['en_dual_none_contextual_none']
+    wheel_file = Path(created_models_directory, dual_entry.package_name, 'dist',
+                      dual_entry.wheel.file_name)
+    target_directory = Path(tmp_path, 'target')
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps', '--no-cache-dir',
+                    '--target', str(target_directory), str(wheel_file)],
+                   check=True)
+    subprocess.run([sys.executable, '-c', LOAD_SCRIPT, 'lazy' if lazy else 'eager',
+                    dual_entry.version],
+                   cwd=tmp_path, env={**os.environ, 'PYTHONPATH': str(target_directory)}, check=True)
@@ -0,0 +1,53 @@
+import hashlib
+from pathlib import Path
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.package_index import normalize_project_name
+
+
+def test_normalize_project_name() -> None:
+    assert 'en-dual-none-contextual-none' == normalize_project_name('en_dual_none_contextual_none')
+    assert 'a-b-c' == normalize_project_name('A_.B--c')
+
+
+def test_package_index(created_models_directory: Path, tmp_path: Path) -> None:
+    index_directory = Path(tmp_path, 'index')
+    stale_project_directory = Path(index_directory, 'simple', 'fr-single-none-contextual-none')
+    stale_project_directory.mkdir(parents=True)
+    Path(stale_project_directory, 'index.html').touch()
+
+    runner_result = CliRunner().invoke(app, ["package-index", "--models-directory",
+                                             str(created_models_directory),
+                                             "--index-directory", str(index_directory)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert not stale_project_directory.exists()
+
+    root_page = Path(index_directory, 'simple', 'index.html').read_text(encoding='utf-8')
+    assert '<a href="en-dual-none-contextual-none/">en-dual-none-contextual-none</a>' in root_page
+    assert '<a href="en-single-none-contextual-none/">en-single-none-contextual-none</a>' in root_page
+
+    dual_entry = read_catalog(created_models_directory).models['en_dual_none_contextual_none']
+    project_directory = Path(index_directory, 'simple', 'en-dual-none-contextual-none')
+    project_page = Path(project_directory, 'index.html').read_text(encoding='utf-8')
+    for dist_file in [dual_entry.wheel, dual_entry.sdist]:
+        index_file = Path(project_directory, dist_file.file_name)
+        assert dist_file.sha256 == hashlib.sha256(index_file.read_bytes()).hexdigest()
+        assert f'<a href="{dist_file.file_name}#sha256={dist_file.sha256}">' in project_page
+
+    requirements = Path(index_directory, 'requirements.txt').read_text(encoding='utf-8')
+    assert (f'en_dual_none_contextual_none=={dual_entry.version} \\\n'
+            f'    --hash=sha256:{dual_entry.wheel.sha256}') in requirements
+
+    # The models can be installed from the index with hash checking.
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps', '--no-cache-dir',
+                    '--target', str(Path(tmp_path, 'target')),
+                    '--index-url', f'{Path(index_directory, "simple").as_uri()}/',
+                    '--require-hashes', '-r', str(Path(index_directory, 'requirements.txt'))],
+                   check=True)
+    assert Path(tmp_path, 'target', 'en_dual_none_contextual_none').exists()
+    assert Path(tmp_path, 'target', 'en_single_none_contextual_none').exists()
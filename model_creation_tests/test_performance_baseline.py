@@ -0,0 +1,137 @@
+import json
+from pathlib import Path
+
+import pytest
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.performance_baseline import (
+    HostFingerprint,
+    ModelPerformance,
+    PerformanceBaseline,
+    PerformanceRegression,
+    compare_to_baseline,
+    get_host_fingerprint,
+    get_latest_baseline_file,
+    get_models_without_baseline,
+    read_baseline,
+    write_baseline,
+)
+
+
+CORPUS = [{'tokens': ['Sporting', 'community', '.'], 'pos': ['NOUN', 'NOUN', 'PUNCT']},
+          {'text': 'community Sporting'}]
+MAX_REGRESSIONS = {'tokens_per_second': 0.1, 'load_seconds': 0.2, 'rss_bytes': 0.1}
+
+
+def test_compare_to_baseline() -> None:
+    baseline_performance = ModelPerformance(name='en_single', version='0.4.0', tokens=10,
+                                            tokens_per_second=1000.0, load_seconds=1.0,
+                                            rss_bytes=100)
+    baseline = PerformanceBaseline(version='0.4.0', pymusas_version='0.4.1', spacy_version='3.8.0',
+                                   python_version='3.12.1', corpus='corpus.jsonl',
+                                   models={'en_single': baseline_performance})
+    performances = [baseline_performance.model_copy(update={'tokens_per_second': 850.0,
+                                                            'load_seconds': 1.1, 'rss_bytes': 90}),
+                    baseline_performance.model_copy(update={'name': 'en_dual'})]
+    regressions = compare_to_baseline(baseline, performances, MAX_REGRESSIONS)
+    # Models that are not within the baseline are not compared.
+    assert ['en_single'] * 3 == [regression.name for regression in regressions]
+    tokens_per_second, load_seconds, rss_bytes = regressions
+    assert ('tokens_per_second', True) == (tokens_per_second.metric, tokens_per_second.regressed)
+    assert pytest.approx(0.15) == tokens_per_second.change
+    assert ('load_seconds', False) == (load_seconds.metric, load_seconds.regressed)
+    assert pytest.approx(0.1) == load_seconds.change
+    assert ('rss_bytes', False) == (rss_bytes.metric, rss_bytes.regressed)
+    assert pytest.approx(-0.1) == rss_bytes.change
+
+
+def test_get_latest_baseline_file(tmp_path: Path) -> None:
+    assert get_latest_baseline_file(tmp_path) is None
+    for version in ['0.3.0', '0.4.0', '0.10.0']:
+        Path(tmp_path, f'{version}.json').write_text('{}', encoding='utf-8')
+    assert '0.10.0.json' == get_latest_baseline_file(tmp_path).name  # type: ignore[union-attr]
+    assert '0.4.0.json' == get_latest_baseline_file(tmp_path, '0.4.1').name  # type: ignore[union-attr]
+    assert get_latest_baseline_file(tmp_path, '0.2.0') is None
+
+
+def test_record_baseline_and_check_performance(created_models_directory: Path, tmp_path: Path) -> None:
+    corpus_file = Path(tmp_path, 'corpus.jsonl')
+    srsly.write_jsonl(corpus_file, CORPUS)
+    baselines_directory = Path(tmp_path, 'baselines')
+    arguments = [str(corpus_file), "--corpus-format", "jsonl", "--models-directory",
+                 str(created_models_directory), "--model", "en_single_none_contextual_none",
+                 "--baselines-directory", str(baselines_directory), "--repeats", "1"]
+    runner_result = CliRunner().invoke(app, ["record-baseline", *arguments])
+    assert 0 == runner_result.exit_code, runner_result.output
+    baseline_file = Path(baselines_directory, '0.4.0.json')
+    baseline = read_baseline(baseline_file)
+    assert ('0.4.0', 'corpus.jsonl', ['en_single_none_contextual_none']) == (
+        baseline.version, baseline.corpus, list(baseline.models))
+    performance = baseline.models['en_single_none_contextual_none']
+    assert 5 == performance.tokens
+    assert performance.tokens_per_second > 0
+    assert performance.load_seconds > 0
+    assert performance.rss_bytes > 0
+    assert get_host_fingerprint() == baseline.host
+
+    no_regression_arguments = ["--max-throughput-regression", "100", "--max-load-time-regression", "100",
+                               "--max-rss-regression", "100"]
+    runner_result = CliRunner().invoke(app, ["check-performance", *arguments, *no_regression_arguments,
+                                             "--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    regressions = [PerformanceRegression.model_validate(regression)
+                   for regression in json.loads(runner_result.output)]
+    assert ['tokens_per_second', 'load_seconds', 'rss_bytes'] == [regression.metric
+                                                                  for regression in regressions]
+    assert not any(regression.regressed for regression in regressions)
+
+    # A baseline measured on another host is not comparable.
+    for other_host in [HostFingerprint(cpu='Other CPU', cpu_count=1, platform='Other x86_64'), None]:
+        srsly.write_json(baseline_file, baseline.model_copy(update={'host': other_host}).model_dump(mode='json'))
+        runner_result = CliRunner().invoke(app, ["check-performance", *arguments, *no_regression_arguments])
+        assert 2 == runner_result.exit_code
+        assert '--allow-other-host' in runner_result.output
+        runner_result = CliRunner().invoke(app, ["check-performance", *arguments, *no_regression_arguments,
+                                                 "--allow-other-host"])
+        assert 0 == runner_result.exit_code, runner_result.output
+        assert 'Warning: The baseline' in runner_result.output
+
+    # A baseline that is 100 times faster.
+    faster_performance = performance.model_copy(update={'tokens_per_second': 100 * performance.tokens_per_second})
+    srsly.write_json(baseline_file, baseline.model_copy(
+        update={'models': {faster_performance.name: faster_performance}}).model_dump(mode='json'))
+    runner_result = CliRunner().invoke(app, ["check-performance", *arguments])
+    assert 1 == runner_result.exit_code
+    assert '| en_single_none_contextual_none | tokens_per_second |' in runner_result.output
+
+    other_corpus_file = Path(tmp_path, 'other.jsonl')
+    srsly.write_jsonl(other_corpus_file, CORPUS)
+    runner_result = CliRunner().invoke(app, ["check-performance", str(other_corpus_file), *arguments[1:]])
+    assert 0 != runner_result.exit_code
+    runner_result = CliRunner().invoke(app, ["check-performance", *arguments[:-4], "--baselines-directory",
+                                             str(Path(tmp_path, 'no_baselines')), "--repeats", "1"])
+    assert 0 != runner_result.exit_code
+    assert 'Cannot find any baselines' in runner_result.output
+    # Every model has to be within the baseline.
+    runner_result = CliRunner().invoke(app, ["check-performance", str(corpus_file), "--corpus-format", "jsonl",
+                                             "--models-directory", str(created_models_directory),
+                                             "--baselines-directory", str(baselines_directory),
+                                             "--repeats", "1"])
+    assert 2 == runner_result.exit_code
+    assert 'does not contain the models' in runner_result.output
+    assert 'en_dual_none_contextual_none' in runner_result.output
+
+
+def test_get_models_without_baseline(created_models_directory: Path, tmp_path: Path) -> None:
+    entries = sorted(read_catalog(created_models_directory).models.values(), key=lambda entry: entry.name)
+    model_names = [entry.name for entry in entries]
+    assert model_names == get_models_without_baseline(entries, tmp_path)
+    performance = ModelPerformance(name=model_names[0], version=entries[0].version, tokens=10,
+                                   tokens_per_second=1000.0, load_seconds=1.0, rss_bytes=100)
+    write_baseline(PerformanceBaseline(version=entries[0].version, pymusas_version='0.4.1',
+                                       spacy_version='3.8.0', python_version='3.12.1', corpus='corpus.jsonl',
+                                       models={performance.name: performance}), tmp_path)
+    assert model_names[1:] == get_models_without_baseline(entries, tmp_path)
@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import spacy
+from spacy.tokens import Doc
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.prune import get_load_exclude, get_prunable_data
+from pymusas_models.tag_corpus import get_model_path
+
+
+TEXT = "Sporting community, isn't it? Email ucrel@lancaster.ac.uk :)"
+# Run in a new Python process so that the model is loaded from the installed
+# package.
+LOAD_SCRIPT = f'''
+import en_dual_none_contextual_none
+
+nlp = en_dual_none_contextual_none.load()
+print([token.text for token in nlp({TEXT!r})])
+'''
+
+
+def tag(nlp: spacy.Language) -> list[tuple[str, list[str]]]:
+    doc = nlp(TEXT)
+    tagged_doc = nlp(Doc(nlp.vocab, words=['Sporting', 'community'], pos=['NOUN', 'NOUN']))
+    return ([(token.text, token._.pymusas_tags) for token in doc]
+            + [(token.text, token._.pymusas_tags) for token in tagged_doc])
+
+
+def test_get_prunable_data() -> None:
+    nlp = spacy.blank('en')
+    assert ['tokenizer', 'vocab'] == get_prunable_data(nlp)
+    nlp.tokenizer.add_special_case('USAS-tagger', [{'ORTH': 'USAS-tagger'}])  # type: ignore[union-attr]
+    nlp.vocab.lookups.add_table('lexeme_norm', {'a': 'b'})
+    assert [] == get_prunable_data(nlp)
+    assert ['tokenizer', 'vocab'] == get_prunable_data(spacy.blank('zh'))
+
+
+def test_get_load_exclude(created_models_directory: Path, tmp_path: Path) -> None:
+    model_path = get_model_path('en_dual_none_contextual_none', created_models_directory)
+    assert [] == get_load_exclude(model_path)
+    assert [] == get_load_exclude('en_dual_none_contextual_none')
+    Path(tmp_path, 'config.cfg').touch()
+    assert ['tokenizer'] == get_load_exclude(tmp_path)
+
+
+def test_create_pruned_models(created_models_directory: Path, language_resource_file: Path,
+                              tmp_path: Path) -> None:
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(models_directory),
+                                             "--language-resource-file",
+                                             str(language_resource_file),
+                                             "--prune"])
+    assert 0 == runner_result.exit_code, runner_result.output
+
+    catalog = read_catalog(models_directory)
+    unpruned_catalog = read_catalog(created_models_directory)
+    for model_name, entry in catalog.models.items():
+        model_path = Path(get_model_path(model_name, models_directory))
+        assert not Path(model_path, 'tokenizer').exists()
+        assert not Path(model_path, 'vocab').exists()
+        unpruned_entry = unpruned_catalog.models[model_name]
+        assert entry.pipeline_size_bytes < unpruned_entry.pipeline_size_bytes
+        assert entry.wheel.size_bytes < unpruned_entry.wheel.size_bytes
+
+        unpruned_nlp = spacy.load(get_model_path(model_name, created_models_directory))
+        nlp = spacy.load(model_path, exclude=get_load_exclude(model_path))
+        assert tag(unpruned_nlp) == tag(nlp)
+
+    # The pruned model loads from its package.
+    entry = catalog.models['en_dual_none_contextual_none']
+    wheel_file = Path(models_directory, entry.package_name, 'dist', entry.wheel.file_name)
+    target_directory = Path(tmp_path, 'target')
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps', '--no-cache-dir',
+                    '--target', str(target_directory), str(wheel_file)],
+                   check=True)
+    completed_process = subprocess.run([sys.executable, '-c', LOAD_SCRIPT],
+                                       cwd=tmp_path, capture_output=True, text=True,
+                                       env={**os.environ, 'PYTHONPATH': str(target_directory)})
+    assert 0 == completed_process.returncode, completed_process.stderr
+    expected_tokens = [token_text for token_text, _ in tag(nlp)][:-2]
+    assert f'{expected_tokens}\n' == completed_process.stdout
+
+    # The pruned model is tagged through the `tag-corpus` command.
+    corpus_file = Path(tmp_path, 'corpus.txt')
+    corpus_file.write_text(f'{TEXT}\n', encoding='utf-8')
+    output_file = Path(tmp_path, 'output.jsonl')
+    runner_result = CliRunner().invoke(app, ["tag-corpus", "en_dual_none_contextual_none",
+                                             str(corpus_file), str(output_file),
+                                             "--models-directory", str(models_directory)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert output_file.read_text(encoding='utf-8')
@@ -0,0 +1,132 @@
+import hashlib
+import io
+from pathlib import Path
+import tarfile
+import time
+import zipfile
+
+import pytest
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.reproducible_build import (
+    DEFAULT_SOURCE_DATE_EPOCH,
+    get_source_date_epoch,
+    normalise_distributions,
+    normalise_sdist,
+    normalise_wheel,
+)
+from pymusas_models.update_lexicon import rebuild_distributions
+
+
+def get_dist_file_hashes(models_directory: Path) -> dict[str, str]:
+    return {dist_file.name: hashlib.sha256(dist_file.read_bytes()).hexdigest()
+            for dist_file in sorted(models_directory.glob('*/dist/*'))}
+
+
+def write_sdist(sdist_file: Path, mtime: float, owner: str) -> None:
+    with tarfile.open(sdist_file, 'w:gz', format=tarfile.PAX_FORMAT) as sdist:
+        for name, content in [('package-0.1.0/setup.py', b'setup()'), ('package-0.1.0/PKG-INFO', b'1.0')]:
+            member = tarfile.TarInfo(name)
+            member.size = len(content)
+            member.mtime = mtime
+            member.uname = owner
+            member.mode = 0o664
+            sdist.addfile(member, io.BytesIO(content))
+
+
+def write_wheel(wheel_file: Path, date_time: tuple[int, int, int, int, int, int]) -> None:
+    with zipfile.ZipFile(wheel_file, 'w', compression=zipfile.ZIP_DEFLATED) as wheel:
+        for name in ['package-0.1.0.dist-info/RECORD', 'package-0.1.0.dist-info/METADATA',
+                     'package/__init__.py']:
+            member = zipfile.ZipInfo(name, date_time=date_time)
+            member.external_attr = 0o100664 << 16
+            wheel.writestr(member, name)
+
+
+def test_normalise_archives(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    for directory_name, mtime, owner in [('first', time.time(), 'runner'), ('second', 1234.5, 'builder')]:
+        dist_directory = Path(tmp_path, directory_name)
+        dist_directory.mkdir()
+        write_sdist(Path(dist_directory, 'package-0.1.0.tar.gz'), mtime, owner)
+        write_wheel(Path(dist_directory, 'package-0.1.0-py3-none-any.whl'), time.gmtime(mtime + 315532800)[:6])
+        Path(dist_directory, 'notes.txt').write_text(directory_name, encoding='utf-8')
+        assert ([Path(dist_directory, 'package-0.1.0-py3-none-any.whl'),
+                 Path(dist_directory, 'package-0.1.0.tar.gz')] == normalise_distributions(dist_directory))
+    for file_name in ['package-0.1.0.tar.gz', 'package-0.1.0-py3-none-any.whl']:
+        assert (Path(tmp_path, 'first', file_name).read_bytes()
+                == Path(tmp_path, 'second', file_name).read_bytes())
+
+    with tarfile.open(Path(tmp_path, 'first', 'package-0.1.0.tar.gz')) as sdist:
+        assert ([('package-0.1.0/PKG-INFO', DEFAULT_SOURCE_DATE_EPOCH, 'root', 0o644),
+                 ('package-0.1.0/setup.py', DEFAULT_SOURCE_DATE_EPOCH, 'root', 0o644)]
+                == [(member.name, member.mtime, member.uname, member.mode) for member in sdist.getmembers()])
+        assert b'setup()' == sdist.extractfile('package-0.1.0/setup.py').read()  # type: ignore[union-attr]
+    with zipfile.ZipFile(Path(tmp_path, 'first', 'package-0.1.0-py3-none-any.whl')) as wheel:
+        # The `RECORD` file is the last file.
+        assert ['package/__init__.py', 'package-0.1.0.dist-info/METADATA', 'package-0.1.0.dist-info/RECORD'] \
+            == wheel.namelist()
+        assert {(1980, 1, 1, 0, 0, 0)} == {member.date_time for member in wheel.infolist()}
+        assert {0o100644} == {member.external_attr >> 16 for member in wheel.infolist()}
+        assert b'package/__init__.py' == wheel.read('package/__init__.py')
+
+    sdist_file = Path(tmp_path, 'first', 'package-0.1.0.tar.gz')
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    assert 1700000000 == get_source_date_epoch()
+    normalise_sdist(sdist_file)
+    with tarfile.open(sdist_file) as sdist:
+        assert {1700000000} == {member.mtime for member in sdist.getmembers()}
+    wheel_file = Path(tmp_path, 'first', 'package-0.1.0-py3-none-any.whl')
+    normalise_wheel(wheel_file)
+    with zipfile.ZipFile(wheel_file) as wheel:
+        assert {time.gmtime(1700000000)[:6]} == {member.date_time for member in wheel.infolist()}
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', 'yesterday')
+    with pytest.raises(ValueError):
+        get_source_date_epoch()
+    monkeypatch.delenv('SOURCE_DATE_EPOCH')
+    assert DEFAULT_SOURCE_DATE_EPOCH == get_source_date_epoch()
+
+
+def test_reproducible_build(language_resource_file: Path, tmp_path: Path,
+                            monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+    models_directories = [Path(tmp_path, 'first', 'models'), Path(tmp_path, 'second', 'models')]
+    for models_directory in models_directories:
+        runner_result = CliRunner().invoke(app, ["create-models", "--models-directory", str(models_directory),
+                                                 "--language-resource-file", str(language_resource_file),
+                                                 "--shared-lexicons"])
+        assert 0 == runner_result.exit_code, runner_result.output
+        # The files of the second build are created at a later time.
+        time.sleep(1)
+    first_hashes, second_hashes = [get_dist_file_hashes(models_directory)
+                                   for models_directory in models_directories]
+    # The two models and the lexicon data package, each with a wheel and sdist.
+    assert 6 == len(first_hashes)
+    assert first_hashes == second_hashes
+    first_catalog, second_catalog = [read_catalog(models_directory) for models_directory in models_directories]
+    assert first_catalog.models == second_catalog.models
+    for entry in first_catalog.models.values():
+        readme = Path(models_directories[0], entry.package_name, 'README.md').read_text(encoding='utf-8')
+        assert entry.wheel.sha256 in readme
+        assert entry.sdist.sha256 in readme
+
+    # A model, whose lexicons have not changed, is not updated, and
+    # re-building it creates the same files.
+    unshared_models_directory = Path(tmp_path, 'unshared', 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory",
+                                             str(unshared_models_directory),
+                                             "--language-resource-file", str(language_resource_file)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    unshared_hashes = get_dist_file_hashes(unshared_models_directory)
+    time.sleep(1)
+    runner_result = CliRunner().invoke(app, ["update-lexicon", "--models-directory",
+                                             str(unshared_models_directory),
+                                             "--language-resource-file", str(language_resource_file),
+                                             "--model", "en_dual_none_contextual_none"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert 'have not changed' in runner_result.output
+    assert unshared_hashes == get_dist_file_hashes(unshared_models_directory)
+    rebuild_distributions(Path(unshared_models_directory, 'en_dual_none_contextual_none-0.4.0'))
+    assert unshared_hashes == get_dist_file_hashes(unshared_models_directory)
+    assert not any(temp_file.suffix == '.tmp' for temp_file in unshared_models_directory.glob('*/dist/*'))
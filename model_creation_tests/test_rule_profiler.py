@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import cast
+
+import pytest
+import spacy
+from spacy.tokens import Doc
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.cached_rule_based_tagger import CachedRuleBasedTagger
+from pymusas_models.rule_profiler import ModelProfile, get_rule_based_tagger, profile_rule_based_tagger
+from pymusas_models.tag_corpus import get_model_path
+
+
+CORPUS = [{'tokens': ['Sporting', 'community', 'hack', '.'], 'pos': ['NOUN', 'NOUN', 'NOUN', 'PUNCT']},
+          {'tokens': ['community', 'Sporting'], 'pos': ['NOUN', 'VERB']}]
+
+
+def test_profile_rule_based_tagger(created_models_directory: Path) -> None:
+    nlp = spacy.load(get_model_path('en_dual_none_contextual_none', created_models_directory))
+    docs = [Doc(nlp.vocab, words=document['tokens'], pos=document['pos']) for document in CORPUS]
+    profile = profile_rule_based_tagger(nlp, docs, name='en_dual_none_contextual_none', corpus='corpus')
+    assert ('en_dual_none_contextual_none', 'corpus', 2, 6) == (profile.name, profile.corpus,
+                                                                profile.documents, profile.tokens)
+    assert ['0: SingleWordRule', '1: MWERule', 'ranker', 'other'] == list(profile.step_seconds)
+    assert all(seconds >= 0 for seconds in profile.step_seconds.values())
+    assert pytest.approx(sum(profile.step_seconds.values())) == profile.seconds
+    # `hack` is tagged Z99 and `.` as punctuation.
+    assert (1, 1, 0) == (profile.unknown_tokens, profile.punctuation_tokens, profile.numeric_tokens)
+    assert pytest.approx(1 / 6) == profile.unknown_rate
+
+    single_word_profile, mwe_profile = profile.rules
+    assert '0: SingleWordRule' == single_word_profile.name
+    assert 4 == single_word_profile.tokens_with_candidates
+    assert single_word_profile.candidates >= 4
+    # The MWE rule tags `Sporting community` within the first document.
+    assert (2, 2) == (single_word_profile.hits, mwe_profile.hits)
+    assert (2, 2) == (mwe_profile.tokens_with_candidates, mwe_profile.candidates)
+    assert pytest.approx(2 / 6) == single_word_profile.unknown_rate == mwe_profile.unknown_rate
+    assert pytest.approx(2 / 6) == mwe_profile.hit_rate
+
+    # The profiled documents are tagged the same as the tagger tags them.
+    profiled_tags = [[token._.pymusas_tags for token in doc] for doc in docs]
+    tagged_docs = [nlp(Doc(nlp.vocab, words=document['tokens'], pos=document['pos'])) for document in CORPUS]
+    assert [[token._.pymusas_tags for token in doc] for doc in tagged_docs] == profiled_tags
+    assert [[['Df/S5+c'], ['Df/S5+c'], ['Z99'], ['PUNCT']], [['S5+c'], ['A10+']]] == profiled_tags
+
+    with pytest.raises(ValueError):
+        get_rule_based_tagger(spacy.blank('en'))
+
+
+def test_profile_cached_rule_based_tagger(created_models_directory: Path) -> None:
+    nlp = spacy.load(get_model_path('en_dual_none_contextual_none', created_models_directory))
+    tagger = get_rule_based_tagger(nlp)
+    cached_nlp = spacy.blank('en')
+    cached_tagger = cast(CachedRuleBasedTagger,
+                         cached_nlp.add_pipe(CachedRuleBasedTagger.COMPONENT_NAME))
+    cached_tagger.rules = tagger.rules
+    cached_tagger.ranker = tagger.ranker
+    cached_tagger.default_punctuation_tags = tagger.default_punctuation_tags
+    cached_tagger.default_number_tags = tagger.default_number_tags
+    # The corpus is profiled twice, whereby the second time every single word
+    # lookup is found in the cache.
+    docs = [Doc(cached_nlp.vocab, words=document['tokens'], pos=document['pos'])
+            for document in CORPUS + CORPUS]
+    profile = profile_rule_based_tagger(cached_nlp, docs)
+    assert 12 == profile.tokens
+    assert (2, 2, 0) == (profile.unknown_tokens, profile.punctuation_tokens, profile.numeric_tokens)
+    single_word_profile, mwe_profile = profile.rules
+    # Only `hack`, `.`, `community`, and `Sporting` within the second document
+    # are not found in the cache, as `Sporting community` is a MWE match.
+    assert (2, 2) == (single_word_profile.tokens_with_candidates, single_word_profile.hits)
+    assert (4, 4) == (mwe_profile.tokens_with_candidates, mwe_profile.hits)
+    assert 2 * [[['Df/S5+c'], ['Df/S5+c'], ['Z99'], ['PUNCT']], [['S5+c'], ['A10+']]] \
+        == [[token._.pymusas_tags for token in doc] for doc in docs]
+    # The original rules and ranker are restored.
+    assert tagger.rules is cached_tagger.rules and tagger.ranker is cached_tagger.ranker
+
+    cached_tagger.ranker = None
+    with pytest.raises(ValueError):
+        profile_rule_based_tagger(cached_nlp, docs)
+
+
+def test_profile_model_command(created_models_directory: Path, tmp_path: Path) -> None:
+    corpus_file = Path(tmp_path, 'corpus.jsonl')
+    srsly.write_jsonl(corpus_file, CORPUS)
+    arguments = ["profile-model", "en_single_none_contextual_none", str(corpus_file),
+                 "--corpus-format", "jsonl", "--models-directory", str(created_models_directory)]
+    runner_result = CliRunner().invoke(app, arguments + ["--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    profile = ModelProfile.model_validate_json(runner_result.output)
+    assert ['0: SingleWordRule'] == [rule_profile.name for rule_profile in profile.rules]
+    assert 4 == profile.rules[0].hits
+
+    runner_result = CliRunner().invoke(app, arguments)
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert '| 0: SingleWordRule |' in runner_result.output
+    assert '| total |' in runner_result.output
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+import random
+
+import pytest
+import spacy
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.scaling_benchmark import (
+    ScalingResult,
+    generate_document,
+    get_lexicon_entries,
+    get_scaling_exponent,
+)
+from pymusas_models.tag_corpus import get_model_path
+
+
+def test_get_scaling_exponent() -> None:
+    lengths = [100, 1000, 10000]
+    assert pytest.approx(1.0) == get_scaling_exponent(lengths, [2e-6 * length for length in lengths])
+    assert pytest.approx(2.0) == get_scaling_exponent(lengths, [3e-9 * length ** 2 for length in lengths])
+    with pytest.raises(ValueError):
+        get_scaling_exponent([100, 100], [1.0, 2.0])
+    with pytest.raises(ValueError):
+        get_scaling_exponent([100, 1000], [1.0])
+
+
+def test_generate_document(created_models_directory: Path) -> None:
+    nlp = spacy.load(get_model_path('en_dual_none_contextual_none', created_models_directory))
+    single_word_entries, mwe_entries = get_lexicon_entries(nlp)
+    assert (('Sporting', 'NOUN'), ('community', 'NOUN')) in mwe_entries
+    assert all(len(single_word_entry) == 1 for single_word_entry in single_word_entries)
+
+    document = generate_document(single_word_entries, mwe_entries, 100, 0.5, random.Random(0))
+    assert 100 == len(document)
+    assert document == generate_document(single_word_entries, mwe_entries, 100, 0.5, random.Random(0))
+    assert all((token_pos,) in single_word_entries for token_pos in
+               generate_document(single_word_entries, mwe_entries, 50, 0.0, random.Random(0)))
+
+    with pytest.raises(ValueError):
+        get_lexicon_entries(spacy.load(get_model_path('en_single_none_contextual_none',
+                                                      created_models_directory)))
+
+
+def test_scaling_benchmark_command(created_models_directory: Path) -> None:
+    arguments = ["scaling-benchmark", "--models-directory", str(created_models_directory),
+                 "--length", "50", "--length", "200", "--mwe-density", "0.0", "--mwe-density", "0.5",
+                 "--repeats", "1"]
+    runner_result = CliRunner().invoke(app, arguments + ["--max-exponent", "100", "--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    results = [ScalingResult.model_validate(result) for result in json.loads(runner_result.output)]
+    assert ['en_dual_none_contextual_none'] == [result.name for result in results]
+    result = results[0]
+    assert result.passed
+    assert ['0.0', '0.5'] == list(result.exponents)
+    assert [(0.0, 50), (0.0, 200), (0.5, 50), (0.5, 200)] == [
+        (measurement.mwe_density, measurement.length) for measurement in result.measurements]
+    # The generated MWEs, `Sporting community`, are tagged as MWEs.
+    assert all(measurement.mwe_token_share > 0.4 for measurement in result.measurements[2:])
+
+    runner_result = CliRunner().invoke(app, arguments + ["--max-exponent", "-100"])
+    assert 1 == runner_result.exit_code
+    assert '### en_dual_none_contextual_none: failed' in runner_result.output
+
+    runner_result = CliRunner().invoke(app, ["scaling-benchmark", "--models-directory",
+                                             str(created_models_directory),
+                                             "--model", "en_single_none_contextual_none"])
+    assert 0 != runner_result.exit_code
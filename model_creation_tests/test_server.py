@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+import srsly
+
+from pymusas_models import server as server_module
+from pymusas_models.server import Histogram, TaggingServer, find_models
+
+
+async def request(port: int, method: str, path: str,
+                  body: Any = None) -> Tuple[int, bytes]:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body_bytes = b'' if body is None else srsly.json_dumps(body).encode('utf-8')
+    writer.write((f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+                  f'Content-Length: {len(body_bytes)}\r\nConnection: close\r\n\r\n'
+                  ).encode('latin-1') + body_bytes)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, response_body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), response_body
+
+
+def test_tagging_server(rule_based_model_path: Path) -> None:
+    async def run() -> None:
+        server = TaggingServer({'en_test': rule_based_model_path}, port=0,
+                               max_batch_size=4, max_latency=0.5)
+        await server.start()
+        try:
+            bodies: List[Any] = [{'tokens': ['Sporting', 'community'], 'pos': ['NOUN', 'NOUN']},
+                                 {'text': 'hack'}, {'id': 'a', 'text': 'had hack'},
+                                 {'tokens': ['hack'], 'pos': ['NOUN']}, {'text': 'hack'}]
+            responses = await asyncio.gather(*[request(server.port, 'POST', '/tag/en_test', body)
+                                               for body in bodies])
+            assert [200] * 5 == [status for status, _ in responses]
+            results = [srsly.json_loads(response_body) for _, response_body in responses]
+            assert [['Df/S5+c'], ['Df/S5+c']] == results[0]['pymusas_tags']
+            assert [[[0, 2]], [[0, 2]]] == results[0]['pymusas_mwe_indexes']
+            assert 'a' == results[2]['id']
+            assert [['Z99'], ['Y2']] == results[2]['pymusas_tags']
+            assert [['Q4.2/S2mf', 'Y2', 'K5.1']] == results[3]['pymusas_tags']
+
+            status, response_body = await request(server.port, 'POST', '/tag/en_test', {'id': 'a'})
+            assert 400 == status
+            assert 'error' in srsly.json_loads(response_body)
+            assert 404 == (await request(server.port, 'POST', '/tag/cy_test', {'text': 'a'}))[0]
+            assert 400 == (await request(server.port, 'POST', '/tag/en_test', ['a']))[0]
+
+            status, response_body = await request(server.port, 'GET', '/models')
+            assert ['en_test'] == srsly.json_loads(response_body)
+
+            status, response_body = await request(server.port, 'GET', '/metrics')
+            metrics = response_body.decode('utf-8')
+            assert 200 == status
+            assert 'pymusas_queue_depth{model="en_test"} 0' in metrics
+            # The 5 concurrent requests are tagged in batches of at most 4.
+            assert 'pymusas_batch_size_bucket{model="en_test",le="4"} 3' in metrics
+            assert 'pymusas_batch_size_sum{model="en_test"} 6.0' in metrics
+            assert 'pymusas_request_latency_seconds_count{model="en_test"} 6' in metrics
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def get_worker_model_names() -> List[str]:
+    return list(server_module._WORKER_MODELS.models)
+
+
+def test_tagging_server_start(rule_based_model_path: Path, tmp_path: Path) -> None:
+    async def run() -> None:
+        server = TaggingServer({'en_test': rule_based_model_path}, port=0, n_process=2)
+        await server.start()
+        try:
+            # Every worker has loaded the model before the server is started.
+            assert server._executor is not None
+            loop = asyncio.get_running_loop()
+            worker_model_names = await asyncio.gather(*[loop.run_in_executor(server._executor,
+                                                                             get_worker_model_names)
+                                                        for _ in range(4)])
+            assert [['en_test']] * 4 == worker_model_names
+        finally:
+            await server.stop()
+
+        # A worker that cannot load the models stops the server starting,
+        # rather than it waiting forever.
+        server = TaggingServer({'en_test': Path(tmp_path, 'missing')}, port=0, n_process=2)
+        with pytest.raises(BrokenProcessPool):
+            await server.start()
+        assert server._server is None
+    asyncio.run(run())
+
+
+def test_find_models(tmp_path: Path) -> None:
+    for model_name in ['en_dual_none_contextual_none', 'en_single_none_contextual_none',
+                       'cy_dual_basiccorcencc2usas_contextual_none']:
+        pipeline_directory = Path(tmp_path, f'{model_name}-0.4.0', model_name, f'{model_name}-0.4.0')
+        pipeline_directory.mkdir(parents=True)
+        Path(pipeline_directory, 'config.cfg').touch()
+
+    models = find_models(['en_dual_*', 'cy_dual_*', 'xx_installed_model'], tmp_path)
+    assert ['en_dual_none_contextual_none', 'cy_dual_basiccorcencc2usas_contextual_none',
+            'xx_installed_model'] == list(models)
+    assert Path(tmp_path, 'en_dual_none_contextual_none-0.4.0', 'en_dual_none_contextual_none',
+                'en_dual_none_contextual_none-0.4.0') == models['en_dual_none_contextual_none']
+    assert 'xx_installed_model' == models['xx_installed_model']
+
+    with pytest.raises(ValueError):
+        find_models(['fr_*'], tmp_path)
+
+
+def test_histogram() -> None:
+    histogram = Histogram([1, 5])
+    for value in [0.5, 3, 10]:
+        histogram.observe(value)
+    assert ['metric_bucket{model="a",le="1"} 1',
+            'metric_bucket{model="a",le="5"} 2',
+            'metric_bucket{model="a",le="+Inf"} 3',
+            'metric_sum{model="a"} 13.5',
+            'metric_count{model="a"} 3'] == histogram.to_prometheus('metric', 'model="a"')
@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.size_report import PACKAGE_PART_NAME, ModelSizeReport, format_size
+
+
+def test_format_size() -> None:
+    assert '0.5KB' == format_size(512)
+    assert '1024.0KB' == format_size(2 ** 20 - 1)
+    assert '1.50MB' == format_size(3 * 2 ** 19)
+
+
+def test_size_report(created_models_directory: Path, tmp_path: Path) -> None:
+    runner_result = CliRunner().invoke(app, ["size-report", "--models-directory",
+                                             str(created_models_directory), "--json"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    reports = [ModelSizeReport.model_validate(report) for report in json.loads(runner_result.output)]
+    catalog = read_catalog(created_models_directory)
+    assert list(catalog.models) == [report.name for report in reports]
+    dual_report = reports[0]
+    assert catalog.models[dual_report.name].wheel.size_bytes == dual_report.wheel_size_bytes
+    part_names = {part.name for part in dual_report.parts}
+    assert {'pymusas_rule_based_tagger', 'tokenizer', 'vocab', 'config.cfg', 'meta.json', 'README.md',
+            PACKAGE_PART_NAME} == part_names
+    assert dual_report.size_bytes == sum(part.size_bytes for part in dual_report.parts)
+    assert (sorted((part.size_bytes for part in dual_report.parts), reverse=True)
+            == [part.size_bytes for part in dual_report.parts])
+    # The pipeline data of the wheel is the same as the pipeline directory.
+    assert (catalog.models[dual_report.name].pipeline_size_bytes
+            == sum(part.size_bytes for part in dual_report.parts if part.name != PACKAGE_PART_NAME))
+
+    runner_result = CliRunner().invoke(app, ["size-report", "--models-directory",
+                                             str(created_models_directory), "--model",
+                                             "en_single_none_contextual_none", "--by-file"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert runner_result.output.startswith('### en_single_none_contextual_none: ')
+    assert '| vocab/strings.json |' in runner_result.output
+    assert '| pymusas_rule_based_tagger/rules.bin |' in runner_result.output
+    assert 'en_dual_none_contextual_none' not in runner_result.output
+
+    runner_result = CliRunner().invoke(app, ["size-report", "--models-directory",
+                                             str(created_models_directory), "--model",
+                                             "cy_single_none_contextual_none"])
+    assert 0 != runner_result.exit_code
+
+    runner_result = CliRunner().invoke(app, ["size-report", "--models-directory", str(tmp_path)])
+    assert isinstance(runner_result.exception, FileNotFoundError)
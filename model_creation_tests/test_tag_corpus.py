@@ -0,0 +1,135 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.tag_corpus import CorpusWriter, get_model_path
+
+
+CONLLU_CORPUS = '''# sent_id = first
+1\tSporting\tsporting\tNOUN\t_\t_\t_\t_\t_\t_
+2\tcommunity\tcommunity\tNOUN\t_\t_\t_\t_\t_\tSpaceAfter=No
+3\t.\t.\tPUNCT\t_\t_\t_\t_\t_\t_
+
+1-2\thacked\t_\t_\t_\t_\t_\t_\t_\t_
+1\thack\thack\tNOUN\t_\t_\t_\t_\t_\t_
+2\ted\thave\tVERB\t_\t_\t_\t_\t_\t_
+'''
+
+
+def tag(rule_based_model_path: Path, corpus_file: Path, corpus_format: str,
+        *extra_arguments: str) -> List[Dict[str, Any]]:
+    output_file = Path(corpus_file.parent, 'output.jsonl')
+    runner = CliRunner()
+    runner_result = runner.invoke(app, ["tag-corpus", str(rule_based_model_path),
+                                        str(corpus_file), str(output_file),
+                                        "--corpus-format", corpus_format,
+                                        *extra_arguments])
+    assert 0 == runner_result.exit_code, runner_result.output
+    return list(srsly.read_jsonl(output_file))
+
+
+def test_tag_text_corpus(tmp_path: Path, rule_based_model_path: Path) -> None:
+    corpus_file = Path(tmp_path, 'corpus.txt')
+    corpus_file.write_text('Sporting community\n\nhack had\n', encoding='utf-8')
+    output = tag(rule_based_model_path, corpus_file, 'text', '--batch-size', '1',
+                 '--report-every', '1')
+    # Without POS tags only the lemma lexicon can match.
+    assert [{'id': '1', 'tokens': ['Sporting', 'community'],
+             'pymusas_tags': [['Z99'], ['Z99']],
+             'pymusas_mwe_indexes': [[[0, 1]], [[1, 2]]]},
+            {'id': '3', 'tokens': ['hack', 'had'],
+             'pymusas_tags': [['Y2'], ['Z99']],
+             'pymusas_mwe_indexes': [[[0, 1]], [[1, 2]]]}] == output
+
+
+def test_tag_jsonl_corpus(tmp_path: Path, rule_based_model_path: Path) -> None:
+    corpus_file = Path(tmp_path, 'corpus.jsonl')
+    srsly.write_jsonl(corpus_file, [{'id': 'a', 'tokens': ['Sporting', 'community', 'had'],
+                                     'pos': ['NOUN', 'NOUN', 'VERB'],
+                                     'lemmas': ['sporting', 'community', 'have']},
+                                    {'text': 'hack'}])
+    output = tag(rule_based_model_path, corpus_file, 'jsonl')
+    assert ['a', '2'] == [document['id'] for document in output]
+    assert [['Df/S5+c'], ['Df/S5+c'], ['A9+', 'Z5']] == output[0]['pymusas_tags']
+    assert [[[0, 2]], [[0, 2]], [[2, 3]]] == output[0]['pymusas_mwe_indexes']
+    assert [['Y2']] == output[1]['pymusas_tags']
+
+    srsly.write_jsonl(corpus_file, [{'id': 'a'}])
+    runner_result = CliRunner().invoke(app, ["tag-corpus", str(rule_based_model_path),
+                                             str(corpus_file),
+                                             str(Path(tmp_path, 'output.jsonl')),
+                                             "--corpus-format", "jsonl"])
+    assert isinstance(runner_result.exception, ValueError)
+
+
+def test_tag_conllu_corpus(tmp_path: Path, rule_based_model_path: Path) -> None:
+    corpus_file = Path(tmp_path, 'corpus.conllu')
+    corpus_file.write_text(CONLLU_CORPUS, encoding='utf-8')
+    output = tag(rule_based_model_path, corpus_file, 'conllu', '--n-process', '2',
+                 '--batch-size', '1')
+    assert ['first', '2'] == [document['id'] for document in output]
+    assert [['Df/S5+c'], ['Df/S5+c'], ['PUNCT']] == output[0]['pymusas_tags']
+    assert ['hack', 'ed'] == output[1]['tokens']
+    assert [['Q4.2/S2mf', 'Y2', 'K5.1'], ['A9+', 'Z5']] == output[1]['pymusas_tags']
+
+
+def test_get_model_path(tmp_path: Path) -> None:
+    model_name = 'en_single_none_contextual_none'
+    assert model_name == get_model_path(model_name, None)
+    assert model_name == get_model_path(model_name, tmp_path)
+
+    pipeline_directory = Path(tmp_path, f'{model_name}-0.4.0', model_name, f'{model_name}-0.4.0')
+    pipeline_directory.mkdir(parents=True)
+    Path(pipeline_directory, 'config.cfg').touch()
+    assert pipeline_directory == get_model_path(model_name, tmp_path)
+
+
+def test_corpus_writer() -> None:
+    # A writer has to implement both `write` and `close`.
+    with pytest.raises(TypeError):
+        CorpusWriter()  # type: ignore[abstract]
+
+    class NoCloseWriter(CorpusWriter):
+        def write(self, doc: Any, document_id: str) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        NoCloseWriter()  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_tag_corpus_columnar_output(tmp_path: Path, rule_based_model_path: Path,
+                                    output_format: str) -> None:
+    pyarrow = pytest.importorskip("pyarrow")
+    pytest.importorskip("pyarrow.ipc")
+    pytest.importorskip("pyarrow.parquet")
+
+    corpus_file = Path(tmp_path, 'corpus.conllu')
+    corpus_file.write_text(CONLLU_CORPUS, encoding='utf-8')
+    output_file = Path(tmp_path, f'output.{output_format}')
+    runner_result = CliRunner().invoke(app, ["tag-corpus", str(rule_based_model_path),
+                                             str(corpus_file), str(output_file),
+                                             "--corpus-format", "conllu",
+                                             "--output-format", output_format,
+                                             "--row-group-size", "2"])
+    assert 0 == runner_result.exit_code, runner_result.output
+
+    if output_format == 'parquet':
+        parquet_file = pyarrow.parquet.ParquetFile(output_file)
+        # 5 tokens in row groups of 2
+        assert 3 == parquet_file.num_row_groups
+        table = parquet_file.read()
+    else:
+        with pyarrow.memory_map(str(output_file), 'r') as source:
+            table = pyarrow.ipc.open_file(source).read_all()
+    rows = table.to_pylist()
+    assert ['first', 'first', 'first', '2', '2'] == [row['id'] for row in rows]
+    assert {'id': 'first', 'token_index': 1, 'start_char': 9, 'end_char': 18,
+            'text': 'community', 'lemma': 'community', 'pos': 'NOUN',
+            'pymusas_tags': ['Df/S5+c'],
+            'pymusas_mwe_indexes': [{'start': 0, 'end': 2}]} == rows[1]
+    assert ['A9+', 'Z5'] == rows[4]['pymusas_tags']
@@ -0,0 +1,164 @@
+import hashlib
+from pathlib import Path
+
+import pymusas
+import pytest
+import spacy
+from spacy.tokens import Doc
+import srsly
+from typer.testing import CliRunner
+
+from pymusas_models.__main__ import app
+from pymusas_models.catalog import read_catalog
+from pymusas_models.evaluation import EvaluationResult, write_performance
+from pymusas_models.language_resource import ModelTypes
+from pymusas_models.lite_variant import LiteVariantMeta
+from pymusas_models.tag_corpus import get_model_path
+from pymusas_models.update_lexicon import check_updatable, get_meta_files, get_updated_version
+
+
+UPDATED_SINGLE_LEXICON = '''lemma\tsemantic_tags\tpos
+Sporting\tK5.1\tNOUN
+community\tS5+c\tNOUN
+'''
+FREQUENCY_LIST = '''word\tfrequency
+sporting\t60
+community\t5
+'''
+
+
+def get_tags(model_name: str, models_directory: Path, words: list[str]) -> list[list[str]]:
+    nlp = spacy.load(get_model_path(model_name, models_directory))
+    doc = nlp(Doc(nlp.vocab, words=words, pos=['NOUN'] * len(words)))
+    return [token._.pymusas_tags for token in doc]
+
+
+def test_update_lexicon(language_resource_file: Path, tmp_path: Path) -> None:
+    language_resources = srsly.read_json(language_resource_file)
+    frequency_list = Path(tmp_path, 'frequencies.tsv')
+    frequency_list.write_text(FREQUENCY_LIST, encoding='utf-8')
+    single_model, dual_model = language_resources['language_resources']['en']['models']
+    dual_model['lite'] = {'frequency_list': str(frequency_list), 'coverage': 0.9}
+    dual_model['lexicon_compression'] = {'level': 3, 'dictionary_size_bytes': 0}
+    original_language_resource_file = Path(tmp_path, 'original_language_resources.json')
+    srsly.write_json(original_language_resource_file, language_resources)
+    models_directory = Path(tmp_path, 'models')
+    runner_result = CliRunner().invoke(app, ["create-models", "--models-directory", str(models_directory),
+                                             "--language-resource-file",
+                                             str(original_language_resource_file)])
+    assert 0 == runner_result.exit_code, runner_result.output
+    original_catalog = read_catalog(models_directory)
+    # The dual model has been evaluated.
+    dual_result = EvaluationResult(name='en_dual_none_contextual_none', corpus='gold.jsonl', documents=1,
+                                   tokens=2, evaluated_tokens=2, usas_top_1_accuracy=1.0,
+                                   usas_top_5_accuracy=1.0, mwe_precision=1.0, mwe_recall=1.0, mwe_f1=1.0,
+                                   speed=100.0)
+    write_performance(original_catalog.models['en_dual_none_contextual_none'], models_directory, dual_result)
+
+    # Only the single word lexicon of the dual model, and so its lite
+    # variant, is updated.
+    updated_single_lexicon = Path(tmp_path, 'updated_single.tsv')
+    updated_single_lexicon.write_text(UPDATED_SINGLE_LEXICON, encoding='utf-8')
+    dual_model['resources']['rules'][0] = dict(dual_model['resources']['rules'][0],
+                                               lexicon_url=str(updated_single_lexicon))
+    updated_language_resource_file = Path(tmp_path, 'language_resources.json')
+    srsly.write_json(updated_language_resource_file, language_resources)
+    arguments = ["update-lexicon", "--models-directory", str(models_directory),
+                 "--language-resource-file", str(updated_language_resource_file)]
+    runner_result = CliRunner().invoke(app, arguments)
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert 'Updated the lexicons of en_dual_none_contextual_none, version 0.4.0 to 0.4.1' in runner_result.output
+    assert 'Updated the lexicons of en_dual_none_contextual_none_lite, version 0.4.0 to 0.4.1' \
+        in runner_result.output
+    assert 'en_single_none_contextual_none ' not in runner_result.output
+
+    catalog = read_catalog(models_directory)
+    single_name = single_model['name']
+    assert original_catalog.models[single_name] == catalog.models[single_name]
+    for model_name in ['en_dual_none_contextual_none', 'en_dual_none_contextual_none_lite']:
+        entry = catalog.models[model_name]
+        original_entry = original_catalog.models[model_name]
+        assert [str(updated_single_lexicon), dual_model['resources']['rules'][1]['lexicon_url']] \
+            == entry.lexicon_urls
+        assert entry.lexicon_compression is not None
+        assert entry.wheel is not None and original_entry.wheel is not None
+        assert entry.wheel.sha256 != original_entry.wheel.sha256
+        # The updated model has a new version, and the package of the
+        # original version, which may have been released, is unchanged.
+        assert ('0.4.1', f'{model_name}-0.4.1') == (entry.version, entry.package_name)
+        assert f'{model_name}-0.4.1-py3-none-any.whl' == entry.wheel.file_name
+        original_wheel_file = Path(models_directory, original_entry.package_name, 'dist',
+                                   original_entry.wheel.file_name)
+        assert hashlib.sha256(original_wheel_file.read_bytes()).hexdigest() == original_entry.wheel.sha256
+        model_directory = Path(models_directory, entry.package_name)
+        wheel_file = Path(model_directory, 'dist', entry.wheel.file_name)
+        assert hashlib.sha256(wheel_file.read_bytes()).hexdigest() == entry.wheel.sha256
+        assert entry.wheel.sha256 in Path(model_directory, 'README.md').read_text(encoding='utf-8')
+        assert original_entry.wheel.sha256 not in Path(model_directory, 'README.md').read_text(encoding='utf-8')
+        # The scores of the evaluated dual model no longer apply to the new
+        # lexicons.
+        assert {} == entry.benchmarks
+        for meta_file in get_meta_files(entry, models_directory):
+            meta = srsly.read_json(meta_file)
+            assert 'performance' not in meta and 'evaluation' not in meta
+            assert (model_name == 'en_dual_none_contextual_none') == meta.get('requires_evaluation', False)
+        readme = Path(model_directory, 'README.md').read_text(encoding='utf-8')
+        assert (model_name == 'en_dual_none_contextual_none') == ('has to be re-evaluated' in readme)
+        # The MWE rule still tags `Sporting community`.
+        assert ([['Df/S5+c'], ['Df/S5+c'], ['K5.1']]
+                == get_tags(model_name, models_directory, ['Sporting', 'community', 'Sporting']))
+    assert [['A10+']] == get_tags(single_name, models_directory, ['Sporting'])
+    lite_nlp = spacy.load(get_model_path('en_dual_none_contextual_none_lite', models_directory))
+    assert 1 == LiteVariantMeta.model_validate(lite_nlp.meta['lite']).covering_words
+    assert [['Z99']] == get_tags('en_dual_none_contextual_none_lite', models_directory, ['community'])
+
+    runner_result = CliRunner().invoke(app, arguments)
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert 'The lexicons of every rule based model are up to date.' in runner_result.output
+
+    # A model whose rule data has not changed is not updated.
+    runner_result = CliRunner().invoke(app, arguments + ["--model", single_name])
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert f'The lexicons of {single_name} have not changed' in runner_result.output
+    assert original_catalog.models[single_name] == read_catalog(models_directory).models[single_name]
+
+    # A released version is never re-built with other lexicons.
+    Path(updated_single_lexicon).write_text(UPDATED_SINGLE_LEXICON.replace('K5.1', 'K5.2'), encoding='utf-8')
+    dual_arguments = arguments + ["--model", "en_dual_none_contextual_none"]
+    runner_result = CliRunner().invoke(app, dual_arguments + ["--model-version", "1"])
+    assert 2 == runner_result.exit_code
+    assert 'current version 0.4.1' in runner_result.output
+    runner_result = CliRunner().invoke(app, dual_arguments + ["--model-version", "0"])
+    assert 2 == runner_result.exit_code
+    assert 'already exists' in runner_result.output
+    runner_result = CliRunner().invoke(app, dual_arguments + ["--model-version", "5"])
+    assert 0 == runner_result.exit_code, runner_result.output
+    assert '0.4.5' == read_catalog(models_directory).models['en_dual_none_contextual_none'].version
+    assert [['K5.2']] == get_tags('en_dual_none_contextual_none', models_directory, ['Sporting'])
+
+    runner_result = CliRunner().invoke(app, arguments + ["--model", "en_unknown"])
+    assert 2 == runner_result.exit_code
+    assert 'en_unknown' in runner_result.output
+
+
+def test_check_updatable(created_models_directory: Path) -> None:
+    entry = read_catalog(created_models_directory).models['en_dual_none_contextual_none']
+    check_updatable(entry)
+    with pytest.raises(ValueError, match='shared lexicon'):
+        check_updatable(entry.model_copy(update={'requirements': [*entry.requirements,
+                                                                  f'pymusas_lexicon_en=={entry.version}']}))
+    major_version = int(pymusas.__version__.split('.')[0])
+    with pytest.raises(ValueError, match='different version of PyMUSAS'):
+        check_updatable(entry.model_copy(update={'version': f'{major_version + 1}.0.0'}))
+    with pytest.raises(ValueError, match='not a rule based model'):
+        check_updatable(entry.model_copy(update={'model_type': ModelTypes.NEURAL}))
+
+
+def test_get_updated_version() -> None:
+    assert '0.4.1' == get_updated_version('0.4.0')
+    assert '0.4.10' == get_updated_version('0.4.9')
+    assert '0.4.3' == get_updated_version('0.4.0', '3')
+    with pytest.raises(ValueError, match='has to differ'):
+        get_updated_version('0.4.0', '0')
+    with pytest.raises(ValueError, match='Cannot increment'):
+        get_updated_version('0.4.0a')
@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_POS = ['NOUN', 'VERB', 'VERB', 'NOUN', 'NOUN', 'PUNCT', 'VERB', 'VERB', 'NU
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    chinese_model = spacy.load("cmn_single_upos2usas_contextual_none")
+@pytest.mark.model("cmn_single_upos2usas_contextual_none")
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = chinese_model(doc)
+    output = model(doc)
     expected_output = [
         ['Z99'],
         ['A3', 'Z5'],
@@ -30,10 +31,10 @@ def test_single_UPOS_contextual() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
-def test_dual_UPOS_contextual() -> None:
-    chinese_model = spacy.load("cmn_dual_upos2usas_contextual_none")
+@pytest.mark.model("cmn_dual_upos2usas_contextual_none")
+def test_dual_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = chinese_model(doc)
+    output = model(doc)
     expected_output = [
         ['Z99'],
         ['A3', 'Z5'],
@@ -1,5 +1,42 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
 from _pytest.config.argparsing import Parser
+from _pytest.fixtures import SubRequest
 import pytest
+import spacy
+from spacy.language import Language
+
+
+class ModelRegistry:
+    '''
+    Loads each model, with a given config, at most once and then returns the
+    same loaded model every time it is requested.
+    '''
+    def __init__(self) -> None:
+        self._models: Dict[Tuple[str, str], Language] = {}
+
+    def load(self, name: str, config: Optional[Dict[str, Any]] = None) -> Language:
+        '''
+        Returns the model, loaded through `spacy.load(name, config=config)`.
+
+        # Parameters
+
+        name : `str`
+            Name of the installed model.
+        config : `Dict[str, Any]`, optional (default = `None`)
+            Config overrides that are passed to `spacy.load`.
+
+        # Returns
+
+        `Language`
+        '''
+        if config is None:
+            config = {}
+        key = (name, json.dumps(config, sort_keys=True))
+        if key not in self._models:
+            self._models[key] = spacy.load(name, config=config)
+        return self._models[key]
 
 
 def pytest_addoption(parser: Parser) -> None:
@@ -7,16 +44,70 @@ def pytest_addoption(parser: Parser) -> None:
         "--github-ci", action="store_true",
         help="If the test is being ran within the GitHub actions CI"
     )
+    parser.addoption(
+        "--model", action="append", default=[],
+        help=("Only run the tests for this model, can be given more than once, "
+              "by default the tests for all models are ran")
+    )
 
 
 def pytest_configure(config):  # type: ignore
     config.addinivalue_line("markers", "ci: mark test as ci")
+    config.addinivalue_line("markers",
+                            ("model(name, config=None): the name of the model the test "
+                             "requires and any config overrides to load it with"))
 
 
+# Ran first so that the `xdist_group` markers are added before `pytest-xdist`
+# groups the tests.
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):  # type: ignore
+    models_to_test = config.getoption("--model")
+    if models_to_test:
+        selected_items = []
+        deselected_items = []
+        for item in items:
+            model_marker = item.get_closest_marker("model")
+            if model_marker is not None and model_marker.args[0] in models_to_test:
+                selected_items.append(item)
+            else:
+                deselected_items.append(item)
+        config.hook.pytest_deselected(items=deselected_items)
+        items[:] = selected_items
+
+    # When ran with `pytest-xdist` and `--dist loadgroup` all of the tests for
+    # the same model are ran on the same worker, so each model is only loaded
+    # once across all of the workers.
+    if config.pluginmanager.hasplugin("xdist"):
+        for item in items:
+            model_marker = item.get_closest_marker("model")
+            if model_marker is not None:
+                item.add_marker(pytest.mark.xdist_group(model_marker.args[0]))
+
     if not config.getoption("--github-ci"):
         return
     skip_ci = pytest.mark.skip(reason="GitHub CI therefore skipping test, could not download model in disk capacity on runner")
     for item in items:
         if "ci" in item.keywords:
             item.add_marker(skip_ci)
+
+
+@pytest.fixture(scope="session")
+def model_registry() -> ModelRegistry:
+    '''
+    A registry of the loaded models, as the fixture is session scoped each
+    model is loaded at most once per `pytest-xdist` worker.
+    '''
+    return ModelRegistry()
+
+
+@pytest.fixture
+def model(request: SubRequest, model_registry: ModelRegistry) -> Language:
+    '''
+    The model that is stated in the `model` marker of the test.
+    '''
+    model_marker = request.node.get_closest_marker("model")
+    if model_marker is None:
+        raise ValueError(f"The test {request.node.nodeid} requires a "
+                         "`pytest.mark.model` marker to use the `model` fixture.")
+    return model_registry.load(*model_marker.args, **model_marker.kwargs)
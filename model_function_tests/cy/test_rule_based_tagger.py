@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,11 +9,11 @@ TEST_TAGS = ['E', 'E', 'Atd', 'E', 'Ans', 'Atd', 'Rhi']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    welsh_model = spacy.load("cy_single_basiccorcencc2usas_contextual_none",
-                             config={"components.pymusas_rule_based_tagger.pos_attribute": "tag_"})
+@pytest.mark.model("cy_single_basiccorcencc2usas_contextual_none",
+                   config={"components.pymusas_rule_based_tagger.pos_attribute": "tag_"})
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, tags=TEST_TAGS)
-    output = welsh_model(doc)
+    output = model(doc)
     expected_output = [
         ['A1.1.1', 'B3/X1'],
         ['B2', 'X9.2'],
@@ -29,11 +30,11 @@ def test_single_UPOS_contextual() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
-def test_dual_UPOS_contextual() -> None:
-    welsh_model = spacy.load("cy_dual_basiccorcencc2usas_contextual_none",
-                             config={"components.pymusas_rule_based_tagger.pos_attribute": "tag_"})
+@pytest.mark.model("cy_dual_basiccorcencc2usas_contextual_none",
+                   config={"components.pymusas_rule_based_tagger.pos_attribute": "tag_"})
+def test_dual_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, tags=TEST_TAGS)
-    output = welsh_model(doc)
+    output = model(doc)
     expected_output = [
         ['G1.1'],
         ['G1.1'],
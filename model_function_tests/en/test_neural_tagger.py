@@ -1,5 +1,5 @@
 import pytest
-import spacy
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -9,10 +9,10 @@ TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
 #  @pytest.mark.ci
-def test_small_neural() -> None:
-    english_model = spacy.load("en_none_none_none_englishsmallbem")
+@pytest.mark.model("en_none_none_none_englishsmallbem")
+def test_small_neural(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES)
-    output = english_model(doc)
+    output = model(doc)
     expected_output = [
         ['K5.1', 'G2.2', 'A6.2', 'S2', 'O4.2'],
         ['S5', 'S1.1.1', 'S2', 'K1', 'O2'],
@@ -29,11 +29,11 @@ def test_small_neural() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
+@pytest.mark.model("en_none_none_none_englishbasebem")
 @pytest.mark.ci
-def test_base_neural() -> None:
-    english_model = spacy.load("en_none_none_none_englishbasebem")
+def test_base_neural(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES)
-    output = english_model(doc)
+    output = model(doc)
     expected_output = [
         ['K5.1', 'G2.2', 'F1', 'A1.1.1', 'A9'],
         ['S5', 'A4.1', 'O2', 'P1', 'K5.1'],
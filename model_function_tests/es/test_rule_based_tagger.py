@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_POS = ['X', 'ADP', 'DET', 'NOUN', 'PUNCT', 'NUM']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    spanish_model = spacy.load("es_single_upos2usas_contextual_none")
+@pytest.mark.model("es_single_upos2usas_contextual_none")
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = spanish_model(doc)
+    output = model(doc)
     expected_output = [
         ['Z99'],
         ['Z5'],
@@ -27,10 +28,10 @@ def test_single_UPOS_contextual() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
-def test_dual_UPOS_contextual() -> None:
-    spanish_model = spacy.load("es_dual_upos2usas_contextual_none")
+@pytest.mark.model("es_dual_upos2usas_contextual_none")
+def test_dual_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = spanish_model(doc)
+    output = model(doc)
     expected_output = [
         ['X5', 'E2'],
         ['X5', 'E2'],
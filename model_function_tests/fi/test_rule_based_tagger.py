@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_POS = ['NOUN', 'AUX', 'NOUN', 'PUNCT', 'PRON', 'VERB', 'NOUN', 'PUNCT', 'AD
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    finnish_model = spacy.load("fi_single_upos2usas_contextual_none")
+@pytest.mark.model("fi_single_upos2usas_contextual_none")
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = finnish_model(doc)
+    output = model(doc)
     expected_output = [
         ['I1/H1', 'K5.2/I1.1'],
         ['Z99'],
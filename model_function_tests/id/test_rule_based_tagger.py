@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_TAGS = ['NNP', 'VB', 'NND', 'NN', 'NN', 'SC', 'Z', 'CD']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    indonesian_model = spacy.load("id_single_none_contextual_none")
+@pytest.mark.model("id_single_none_contextual_none")
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, tags=TEST_TAGS)
-    output = indonesian_model(doc)
+    output = model(doc)
     expected_output = [
         ['Z99'],
         ['Z99'],
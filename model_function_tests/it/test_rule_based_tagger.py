@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_POS = ['ADP', 'ADJ', 'NOUN', 'PUNCT', 'NUM']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    italian_model = spacy.load("it_single_upos2usas_contextual_none")
+@pytest.mark.model("it_single_upos2usas_contextual_none")
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = italian_model(doc)
+    output = model(doc)
     expected_output = [
         ['Z5'],
         ['N5-', 'T1.3-', 'N3.7-', 'N3.3-', 'S1.2.4-', 'N3.8+@', 'F1%', 'N3.7-%'],
@@ -26,10 +27,10 @@ def test_single_UPOS_contextual() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
-def test_dual_UPOS_contextual() -> None:
-    italian_model = spacy.load("it_dual_upos2usas_contextual_none")
+@pytest.mark.model("it_dual_upos2usas_contextual_none")
+def test_dual_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = italian_model(doc)
+    output = model(doc)
     expected_output = [
         ['T1.3-'],
         ['T1.3-'],
@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_POS = ['NUM', 'NOUN', 'ADP', 'NOUN', 'PUNCT', 'NUM', 'NOUN']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_UPOS_contextual() -> None:
-    portuguese_model = spacy.load("pt_single_upos2usas_contextual_none")
+@pytest.mark.model("pt_single_upos2usas_contextual_none")
+def test_single_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = portuguese_model(doc)
+    output = model(doc)
     expected_output = [
         ['N1'],
         ['T1'],
@@ -28,10 +29,10 @@ def test_single_UPOS_contextual() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
-def test_dual_UPOS_contextual() -> None:
-    portuguese_model = spacy.load("pt_dual_upos2usas_contextual_none")
+@pytest.mark.model("pt_dual_upos2usas_contextual_none")
+def test_dual_UPOS_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = portuguese_model(doc)
+    output = model(doc)
     expected_output = [
         ['T2+++'],
         ['T2+++'],
@@ -1,5 +1,5 @@
 import pytest
-import spacy
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,11 +8,11 @@ TEST_TOKENS = ['Sporting', 'community', 'hack', 'had', '.', '49557282', '\t']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
+@pytest.mark.model("xx_none_none_none_multilingualsmallbem")
 @pytest.mark.ci
-def test_small_neural() -> None:
-    multi_ling_model = spacy.load("xx_none_none_none_multilingualsmallbem")
+def test_small_neural(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES)
-    output = multi_ling_model(doc)
+    output = model(doc)
     expected_output = [
         ['K5.1', 'A6.2', 'Z3', 'G2.2', 'S5'],
         ['S5', 'K5.1', 'A10', 'Z3', 'X2.1'],
@@ -29,11 +29,11 @@ def test_small_neural() -> None:
         assert [(token_index, token_index + 1)] == token._.pymusas_mwe_indexes
 
 
+@pytest.mark.model("xx_none_none_none_multilingualbasebem")
 @pytest.mark.ci
-def test_base_neural() -> None:
-    multi_ling_model = spacy.load("xx_none_none_none_multilingualbasebem")
+def test_base_neural(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES)
-    output = multi_ling_model(doc)
+    output = model(doc)
     expected_output = [
         ['K5.1', 'G2.2', 'Z3', 'O4.2', 'A1.1.1'],
         ['S5', 'S1.1.1', 'G1.1', 'O2', 'S2'],
@@ -1,4 +1,5 @@
-import spacy
+import pytest
+from spacy.language import Language
 from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
@@ -8,10 +9,10 @@ TEST_POS = ['NOUN', 'NOUN', 'NUM', 'PART', 'ADJ', 'PUNCT']
 TEST_SPACES = [True] * len(TEST_TOKENS)
 
 
-def test_single_none_contextual() -> None:
-    malay_model = spacy.load("zsm_single_none_contextual_none")
+@pytest.mark.model("zsm_single_none_contextual_none")
+def test_single_none_contextual(model: Language) -> None:
     doc = Doc(Vocab(), words=TEST_TOKENS, spaces=TEST_SPACES, pos=TEST_POS)
-    output = malay_model(doc)
+    output = model(doc)
     expected_output = [
         ['T1.1.3'],
         ['X9.2+/S7.3', 'X9.2+/G3', 'S7.1+', 'E3-', 'A1.1.1', 'A5.1++', 'B1'],
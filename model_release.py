@@ -5,6 +5,9 @@ from typing import List
 from fastcore.net import HTTP4xxClientError
 from ghapi.all import GhApi, paged
 
+from pymusas_models.catalog import CatalogEntry, LexiconPackageEntry, read_catalog
+from pymusas_models.performance_baseline import get_models_without_baseline
+
 
 PAT_FILE = Path(__file__, '..', 'GITHUB_TOKEN.json').resolve()
 PAT = ''
@@ -25,13 +28,30 @@ tag_names_uploaded: List[str] = []
 
 
 models_folder = Path(__file__, '..', 'models').resolve()
-for model_folder in models_folder.iterdir():
-    tag_name = model_folder.name
+catalog = read_catalog(models_folder)
+if not catalog.models:
+    raise ValueError(f'Cannot find any models within the catalog of {models_folder}, '
+                     'the catalog is created by the `create-models` command.')
+# Each released model version has a stored performance baseline, which the
+# `check-performance` command compares the next model version against.
+baselines_folder = Path(__file__, '..', 'performance_baselines').resolve()
+models_without_baseline = get_models_without_baseline(list(catalog.models.values()), baselines_folder)
+if models_without_baseline:
+    raise ValueError(f'Cannot find the performance of the models {models_without_baseline} within the '
+                     f'baselines of {baselines_folder}, record and commit their baseline with the '
+                     '`record-baseline` command before releasing them.')
+# The shared lexicon data packages are released in the same way as the models.
+catalog_entries: List[CatalogEntry | LexiconPackageEntry] = [*catalog.models.values(),
+                                                             *catalog.lexicon_packages.values()]
+for catalog_entry in catalog_entries:
+    tag_name = catalog_entry.package_name
+    model_folder = Path(models_folder, tag_name)
     readme_text = ''
     with Path(model_folder, 'README.md').open('r', encoding='utf-8') as readme_fp:
         readme_text = readme_fp.read()
 
-    model_assets = [str(asset_file_name) for asset_file_name in Path(model_folder, 'dist').iterdir()]
+    model_assets = [str(Path(model_folder, 'dist', dist_file.file_name))
+                    for dist_file in [catalog_entry.wheel, catalog_entry.sdist]]
     try:
         api.create_release(tag_name=tag_name, branch='main', name=tag_name,
                            body=readme_text, draft=False, prerelease=False,
@@ -2,3 +2,8 @@ import importlib.metadata
 
 
 __version__ = importlib.metadata.version("pymusas_models")
+# The requirement added to the models that use a spaCy component of
+# `pymusas_models`, e.g. `pymusas_cached_rule_based_tagger`, as the factories
+# of these components are registered through the `spacy_factories` entry
+# points of `pymusas_models` rather than being copied into each model.
+COMPONENT_REQUIREMENT = f'pymusas_models>={__version__}'
@@ -1,40 +1,44 @@
+'''
+The `pymusas-models` command line interface.
 
+Only the dependencies that are required to build the interface, and the
+`overview-of-models` and `package-index` commands, are imported when this
+module is imported. The heavy dependencies of the other commands, e.g. spaCy,
+the PyMUSAS taggers, and the tagging server, are imported within each command
+so that `--help`, and the commands that do not use them, start quickly.
+'''
+from collections import Counter
 import hashlib
 import math
 from pathlib import Path
 import tempfile
-from typing import Any, Dict, List, Tuple, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, cast
 
 import pymusas
-from pymusas.lexicon_collection import LexiconCollection, MWELexiconCollection
-from pymusas.pos_mapper import (
-    BASIC_CORCENCC_TO_USAS_CORE,
-    UPOS_TO_USAS_CORE,
-    USAS_CORE_TO_BASIC_CORCENCC,
-    USAS_CORE_TO_UPOS,
-)
-from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker
-from pymusas.spacy_api.taggers import neural, rule_based  # noqa: F401
-from pymusas.taggers.rules.mwe import MWERule as PymusasMWERule
-from pymusas.taggers.rules.rule import Rule as PymusasRule
-from pymusas.taggers.rules.single_word import SingleWordRule as PymusasSingleWordRule
-import spacy
-import srsly
 import typer
 from wasabi import MarkdownRenderer
 
+from pymusas_models.catalog import CATALOG_FILE_NAME, CatalogEntry, read_catalog
+from pymusas_models.corpus_format import CorpusFormat, OutputFormat
 from pymusas_models.language_resource import (
     LanguageResources,
+    Model,
     ModelTypes,
     MWERule,
     NeuralModel,
     POSMapper,
+    Rule,
     RuleModel,
     RuleRankers,
     RuleType,
     SingleRule,
 )
-from pymusas_models.package import generate_readme, package
+from pymusas_models.package_index import create_package_index
+from pymusas_models.size_report import create_size_report, format_size
+
+
+if TYPE_CHECKING:
+    from pymusas.taggers.rules.rule import Rule as PymusasRule
 
 
 REPO_DIRECTORY = Path(__file__, '..', '..').resolve()
@@ -53,6 +57,10 @@ PYMUSAS_LANG_TO_SPACY = {
     'xx': 'xx',
     'zsm': 'ms'
 }
+POS_MAPPER_TO_DISPLAY_NAME = {
+    POSMapper.UPOS2USAS: 'UPOS 2 USAS',
+    POSMapper.BASICCORCENCC2USAS: 'Basic CorCenCC 2 USAS'
+}
 POS_MAPPER_TO_NAME = {
     'UPOS': 'upos2usas',
     'BasicCorCenCC': 'basiccorcencc2usas',
@@ -129,6 +137,10 @@ def add_model_specific_meta_data(model_directory: Path, language_name: str,
     * Description - see `create_description` function.
     * Notes - see `create_notes` function.
     '''
+    import srsly
+
+    from pymusas_models.package import generate_readme
+
     model_meta_file = Path(model_directory, 'meta.json')
     if not model_meta_file.exists():  # pragma: no cover
         file_err = (f'Could not find the model meta file {model_meta_file}.')
@@ -240,6 +252,34 @@ The value of the model version. This is the `c` element as described in
 `Model versioning` within the main README. The `a` and `b` element come from
 the PyMUSAS version used.
 '''
+NEURAL_WEIGHTS_STORE_HELP = '''
+A local directory, the artifact store, to store the weights, and any other
+large files, of the neural models in, rather than within the model packages.
+The models fetch the files from the store when they are first loaded, see
+`pymusas_models/artifact_store.py`.
+'''
+NEURAL_WEIGHTS_URL_HELP = '''
+The location, a local directory or HTTP(S) URL, that the neural models fetch
+the files of the `--neural-weights-store` from by default, if not given the
+`--neural-weights-store` directory is used.
+'''
+LEXICON_DOWNLOAD_WORKERS_HELP = '''
+The maximum number of lexicons to download at the same time, all of the
+lexicons are downloaded, and cached, before any of the models are created,
+see `pymusas_models/lexicon_fetch.py`.
+'''
+PRUNE_HELP = '''
+Do not include the pipeline data that the PyMUSAS components never use, the
+vocabulary if it has no vectors or lookup tables, and the tokenizer if it is
+the tokenizer created from the config of the pipeline, within the models, see
+`pymusas_models/prune.py`.
+'''
+SHARED_LEXICONS_HELP = '''
+Store the lexicons that are used by more than one model of a language, e.g.
+the single word lexicon of the `single` and `dual` models, once within a
+shared lexicon data package per language, e.g. `pymusas_lexicon_en`, that
+the models depend on, rather than within every model.
+'''
 
 
 def get_pos_mapper(pos_mapper: POSMapper,
@@ -284,6 +324,13 @@ def get_pos_mapper(pos_mapper: POSMapper,
     `ValueError`
         If the POSMapper is not recognized.
     '''
+    from pymusas.pos_mapper import (
+        BASIC_CORCENCC_TO_USAS_CORE,
+        UPOS_TO_USAS_CORE,
+        USAS_CORE_TO_BASIC_CORCENCC,
+        USAS_CORE_TO_UPOS,
+    )
+
     if pos_mapper == POSMapper.UPOS2USAS:
         if rule_type == RuleType.SINGLE:
             return UPOS_TO_USAS_CORE
@@ -298,6 +345,49 @@ def get_pos_mapper(pos_mapper: POSMapper,
         raise ValueError(f"Cannot find this pos mapper: {pos_mapper}")
 
 
+def create_pymusas_rule(rule: Rule, lexicon_files: Dict[str, Path]) -> "PymusasRule":
+    '''
+    Returns the PyMUSAS rule, with its lexicon, of the rule meta data.
+
+    # Parameters
+
+    rule : `Rule`
+        The rule meta data from the language resource file.
+    lexicon_files : `Dict[str, Path]`
+        The lexicon URL to the path of the downloaded lexicon, a lexicon URL
+        that is not within it is read directly.
+
+    # Returns
+
+    `pymusas.taggers.rules.rule.Rule`
+
+    # Raises
+
+    `ValueError`
+        If the rule type is not recognized.
+    '''
+    from pymusas.lexicon_collection import LexiconCollection, MWELexiconCollection
+    from pymusas.taggers.rules.mwe import MWERule as PymusasMWERule
+    from pymusas.taggers.rules.single_word import SingleWordRule as PymusasSingleWordRule
+
+    rule_type = rule.rule_type
+    pos_mapper_data: None | Dict[str, List[str]] = None
+    if isinstance(rule, (SingleRule, MWERule)) and rule.pos_mapper is not None:
+        pos_mapper_data = get_pos_mapper(rule.pos_mapper, rule_type)
+    if isinstance(rule, SingleRule):
+        lexicon_file = lexicon_files.get(rule.lexicon_url, rule.lexicon_url)
+        lemma_lexicon = LexiconCollection.from_tsv(lexicon_file, include_pos=False)
+        lexicon_collection = {}
+        if rule.with_pos:
+            lexicon_collection = LexiconCollection.from_tsv(lexicon_file, include_pos=True)
+        return PymusasSingleWordRule(lexicon_collection, lemma_lexicon, pos_mapper=pos_mapper_data)
+    elif isinstance(rule, MWERule):
+        lexicon_file = lexicon_files.get(rule.lexicon_url, rule.lexicon_url)
+        mwe_lexicon_collection = MWELexiconCollection.from_tsv(lexicon_file)
+        return PymusasMWERule(mwe_lexicon_collection, pos_mapper=pos_mapper_data)
+    raise ValueError(f"Cannot find this rule type: {rule_type}")  # pragma: no cover
+
+
 @app.command("create-models")
 def create_models(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
                                                   help=MODEL_DIRECTORY_HELP,
@@ -308,13 +398,89 @@ def create_models(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models')
                                                         exists=True, file_okay=True,
                                                         dir_okay=False, writable=False,
                                                         readable=True, resolve_path=True),
-                  model_version: str = OPTION('0', help=MODEL_VERSION_HELP)
+                  model_version: str = OPTION('0', help=MODEL_VERSION_HELP),
+                  shared_lexicons: bool = OPTION(False, help=SHARED_LEXICONS_HELP),
+                  neural_weights_store: Optional[Path] = OPTION(None, help=NEURAL_WEIGHTS_STORE_HELP,
+                                                                file_okay=False, dir_okay=True,
+                                                                resolve_path=True),
+                  neural_weights_url: Optional[str] = OPTION(None, help=NEURAL_WEIGHTS_URL_HELP),
+                  lexicon_download_workers: int = OPTION(8, help=LEXICON_DOWNLOAD_WORKERS_HELP, min=1),
+                  prune: bool = OPTION(False, help=PRUNE_HELP)
                   ) -> None:
     '''
     Creates all of the PyMUSAS models, based on the meta data within the
     `language_resource_file`, and stores all of these models within the given
-    `models_directory`.
+    `models_directory`. With `--shared-lexicons` the rules, and therefore
+    lexicons, that are used by more than one model of a language are stored
+    once within a shared lexicon data package, e.g. `pymusas_lexicon_en`,
+    that the models depend on. With `--neural-weights-store` the weights of
+    the neural models are stored within an artifact store, and fetched when
+    the model is first loaded, rather than within the model package. With
+    `--prune` the pipeline data that the PyMUSAS components never use is not
+    included in the models. The rule based models with `lexicon_compression`
+    in the `language_resource_file` store their lexicons zstd compressed, and
+    the rule based models with `lite` also have a lite variant,
+    `{model name}_lite`, that only keeps the frequent single word lexicon
+    entries.
+
+    The lexicons of all of the models are downloaded concurrently, and
+    cached, before any of the models are created.
     '''
+    from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker
+    from pymusas.spacy_api.taggers import neural, rule_based  # noqa: F401
+    from pymusas.taggers.rules.rule import Rule as PymusasRule
+    import spacy
+
+    from pymusas_models import (
+        COMPONENT_REQUIREMENT,
+        artifact_store,
+        cached_neural_tagger,
+        cached_rule_based_tagger,
+        lexicon_compression,
+    )
+    from pymusas_models.catalog import create_catalog_entry, create_lexicon_package_entry, update_catalog
+    from pymusas_models.lexicon_fetch import get_lexicon_urls, prefetch_lexicons
+    from pymusas_models.lexicon_package import (
+        create_lexicon_package,
+        get_lexicon_package_name,
+        get_rule_id,
+        lexicon_packages_importable,
+        share_rules,
+    )
+    from pymusas_models.lite_variant import create_lite_rules, get_lite_model_name
+    from pymusas_models.package import package
+    from pymusas_models.prune import prune_pipeline
+
+    # The lexicon URL to the path of the downloaded lexicon.
+    lexicon_files: Dict[str, Path] = {}
+    # The PyMUSAS rules of the current language that are stored within the
+    # shared lexicon data package, keyed by the JSON of the rule meta data.
+    shared_pymusas_rules: Dict[str, PymusasRule] = {}
+
+    def create_shared_pymusas_rule(rule: Rule) -> PymusasRule:
+        rule_key = rule.model_dump_json()
+        if rule_key in shared_pymusas_rules:
+            return shared_pymusas_rules[rule_key]
+        return create_pymusas_rule(rule, lexicon_files)
+
+    def get_shared_rules(models: List[Model]) -> List[Rule]:
+        '''
+        Returns the rules that are used by more than one of the rule based
+        `models`, these rules are stored in the shared lexicon data package.
+        '''
+        rule_counts: Counter[str] = Counter()
+        rules: Dict[str, Rule] = {}
+        for model in models:
+            if not isinstance(model, RuleModel):
+                continue
+            for rule in model.resources.rules:
+                rules[rule.model_dump_json()] = rule
+            rule_counts.update({rule.model_dump_json() for rule in model.resources.rules})
+        return [rules[rule_key] for rule_key, count in rule_counts.items() if count > 1]
+
+    full_model_version_list = pymusas.__version__.split('.')[:2]
+    full_model_version_list.append(model_version)
+    full_model_version = '.'.join(full_model_version_list)
 
     meta_data: str = ""
     with language_resource_file.open('r', encoding='utf-8') as _file:
@@ -322,102 +488,290 @@ def create_models(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models')
     assert meta_data, f'The {language_resource_file} is empty.'
     language_data = LanguageResources.model_validate_json(meta_data)
 
+    lexicon_files.update(prefetch_lexicons(get_lexicon_urls(language_data),
+                                           Path(artifact_store.get_cache_directory(), 'lexicons'),
+                                           max_workers=lexicon_download_workers))
+
     for language_code, language_resource in language_data.language_resources.items():
         spacy_version = language_resource.spacy_version
+
+        shared_pymusas_rules.clear()
+        lexicon_package_name = get_lexicon_package_name(language_code)
+        shared_rule_ids: Set[str] = set()
+        shared_rules = get_shared_rules(language_resource.models) if shared_lexicons else []
+        if shared_rules:
+            serialised_rules: List[bytes] = []
+            for rule in shared_rules:
+                pymusas_rule = create_shared_pymusas_rule(rule)
+                shared_pymusas_rules[rule.model_dump_json()] = pymusas_rule
+                serialised_rules.append(PymusasRule.serialise_object_to_bytes(pymusas_rule))
+            shared_rule_ids = {get_rule_id(serialised_rule) for serialised_rule in serialised_rules}
+            models_directory.mkdir(parents=True, exist_ok=True)
+            lexicon_package_directory = create_lexicon_package(
+                models_directory, language_code, language_resource.language_data.description,
+                full_model_version, serialised_rules, [f"pymusas{get_pymusas_version_bounds()}"],
+                [model.name for model in language_resource.models])
+            update_catalog(models_directory,
+                           create_lexicon_package_entry(lexicon_package_directory, lexicon_package_name,
+                                                        full_model_version, language_code))
+
+        # Each model, and the lite variant, `lite` is `True`, of each rule
+        # based model with `lite` meta data.
+        model_variants: List[Tuple[Model, bool]] = []
         for model in language_resource.models:
-            model_name = model.name
+            model_variants.append((model, False))
+            if isinstance(model, RuleModel) and model.lite is not None:
+                model_variants.append((model, True))
+
+        # The data package has to be importable when the models are
+        # packaged, as packaging loads each model.
+        with lexicon_packages_importable(models_directory, language_code):
+            for model, lite in model_variants:
+                model_name = get_lite_model_name(model.name) if lite else model.name
 
-            spacy_pipeline = spacy.blank(PYMUSAS_LANG_TO_SPACY[language_code])
+                spacy_pipeline = spacy.blank(PYMUSAS_LANG_TO_SPACY[language_code])
+                uses_shared_rules = False
+                # Python files with custom components that are copied into the model package.
+                code_paths: List[Path] = []
             
-            model_type = model.model_type
-            if model_type == ModelTypes.RULE:
-                model = cast(RuleModel, model)
-
-                model_config = model.config
-                rule_tagger = cast(rule_based.RuleBasedTagger,
-                                   spacy_pipeline.add_pipe(model_type.value,
-                                                           config=model_config.model_dump()))
+                model_type = model.model_type
+                if model_type == ModelTypes.RULE:
+                    model = cast(RuleModel, model)
+
+                    model_config = model.config
+                    rule_tagger_factory = model_type.value
+                    rule_tagger_config = model_config.model_dump(exclude={'lookup_cache_size'})
+                    if model_config.lookup_cache_size is not None:
+                        rule_tagger_factory = cached_rule_based_tagger.CachedRuleBasedTagger.COMPONENT_NAME
+                        rule_tagger_config['lookup_cache_size'] = model_config.lookup_cache_size
+                    rule_tagger = cast(rule_based.RuleBasedTagger,
+                                       spacy_pipeline.add_pipe(rule_tagger_factory,
+                                                               name=model_type.value,
+                                                               config=rule_tagger_config))
                 
-                model_rules = model.resources.rules
+                    model_rules = model.resources.rules
                 
-                pymusas_rules: list[PymusasRule] = []
-                for rule in model_rules:
-                    rule_type = rule.rule_type
-                    pos_mapper_data: None | Dict[str, List[str]] = None
-                    if rule_type == RuleType.SINGLE:
-                        rule = cast(SingleRule, rule)
-                        pos_mapper = rule.pos_mapper
-                        if pos_mapper is not None:
-                            pos_mapper_data = get_pos_mapper(pos_mapper, rule_type)
-                        lemma_lexicon = LexiconCollection.from_tsv(rule.lexicon_url, include_pos=False)
-                        lexicon_collection = {}
-                        if rule.with_pos:
-                            lexicon_collection = LexiconCollection.from_tsv(rule.lexicon_url, include_pos=True)
-                        pymusas_single_rule = PymusasSingleWordRule(lexicon_collection, lemma_lexicon, pos_mapper=pos_mapper_data)
-                        pymusas_rules.append(pymusas_single_rule)
-                    elif rule_type == RuleType.MWE:
-                        rule = cast(MWERule, rule)
-                        pos_mapper = rule.pos_mapper
-                        if pos_mapper is not None:
-                            pos_mapper_data = get_pos_mapper(pos_mapper, rule_type)
-                        mwe_lexicon_collection = MWELexiconCollection.from_tsv(rule.lexicon_url)
-                        pymusas_mwe_rule = PymusasMWERule(mwe_lexicon_collection, pos_mapper=pos_mapper_data)
-                        pymusas_rules.append(pymusas_mwe_rule)
-                    else:  # pragma: no cover
-                        raise ValueError(f"Cannot find this rule type: {rule_type} for {model_name}")
-                    
-                if not pymusas_rules:
-                    raise ValueError(f"Cannot find any rules for: {model_name}")
+                    pymusas_rules = [create_shared_pymusas_rule(rule) for rule in model_rules]
+                    if not pymusas_rules:
+                        raise ValueError(f"Cannot find any rules for: {model_name}")
+                    if lite:
+                        assert model.lite is not None
+                        pymusas_rules, lite_meta = create_lite_rules(pymusas_rules, model.lite)
+                        spacy_pipeline.meta['lite'] = lite_meta.model_dump()
+                    uses_shared_rules = any(pymusas_rule is shared_pymusas_rule
+                                            for pymusas_rule in pymusas_rules
+                                            for shared_pymusas_rule in shared_pymusas_rules.values())
                     
-                pymusas_ranker: None | ContextualRuleBasedRanker = None
-                if model.resources.ranker == RuleRankers.CONTEXTUAL:
-                    pymusas_ranker = ContextualRuleBasedRanker(*ContextualRuleBasedRanker.get_construction_arguments(pymusas_rules))
+                    pymusas_ranker: None | ContextualRuleBasedRanker = None
+                    if model.resources.ranker == RuleRankers.CONTEXTUAL:
+                        pymusas_ranker = ContextualRuleBasedRanker(*ContextualRuleBasedRanker.get_construction_arguments(pymusas_rules))
                 
-                if pymusas_ranker is None:
-                    raise ValueError(f"Ranker found: {model.resources.ranker} "
-                                     f"the only rankers supported are {list(RuleRankers)} "
-                                     f"for: {model_name}")
-                rule_tagger.initialize(rules=pymusas_rules,
-                                       ranker=pymusas_ranker,
-                                       default_punctuation_tags=model.resources.default_punctuation_tags,
-                                       default_number_tags=model.resources.default_number_tags)
-            elif model_type == ModelTypes.NEURAL:
-                model = cast(NeuralModel, model)
-                neural_tagger = cast(neural.NeuralTagger,
-                                     spacy_pipeline.add_pipe(model_type.value,
-                                                             config=model.config.model_dump()))
-                neural_tagger.initialize(pretrained_model_name_or_path=model.pretrained_model_name_or_path)
-            else:
-                raise ValueError(f"Cannot find this model type: {model_type} for: {model_name}")
-
-            add_default_meta_data(spacy_pipeline.meta, model_type)
-            spacy_pipeline.meta['spacy_version'] = spacy_version
-
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_dir_path = Path(temp_dir)
-                spacy_pipeline.to_disk(temp_dir_path)
-
-                full_model_version_list = pymusas.__version__.split('.')[:2]
-                full_model_version_list.append(model_version)
-                full_model_version = '.'.join(full_model_version_list)
-                package_name = f'{model_name}-{full_model_version}'
+                    if pymusas_ranker is None:
+                        raise ValueError(f"Ranker found: {model.resources.ranker} "
+                                         f"the only rankers supported are {list(RuleRankers)} "
+                                         f"for: {model_name}")
+                    rule_tagger.initialize(rules=pymusas_rules,
+                                           ranker=pymusas_ranker,
+                                           default_punctuation_tags=model.resources.default_punctuation_tags,
+                                           default_number_tags=model.resources.default_number_tags)
+                    if model.lexicon_compression is not None:
+                        code_paths.append(Path(lexicon_compression.__file__))
+                elif model_type == ModelTypes.NEURAL:
+                    model = cast(NeuralModel, model)
+
+                    neural_config = model.config
+                    neural_tagger_factory = model_type.value
+                    neural_tagger_config = neural_config.model_dump(exclude={'doc_cache_size'})
+                    if neural_config.doc_cache_size is not None:
+                        neural_tagger_factory = cached_neural_tagger.CachedNeuralTagger.COMPONENT_NAME
+                        neural_tagger_config['doc_cache_size'] = neural_config.doc_cache_size
+                    neural_tagger = cast(neural.NeuralTagger,
+                                         spacy_pipeline.add_pipe(neural_tagger_factory,
+                                                                 name=model_type.value,
+                                                                 config=neural_tagger_config))
+                    neural_tagger.initialize(pretrained_model_name_or_path=model.pretrained_model_name_or_path)
+                    if neural_weights_store is not None:
+                        code_paths.append(Path(artifact_store.__file__))
+                else:
+                    raise ValueError(f"Cannot find this model type: {model_type} for: {model_name}")
+
+                add_default_meta_data(spacy_pipeline.meta, model_type)
+                spacy_pipeline.meta['spacy_version'] = spacy_version
+                if uses_shared_rules:
+                    spacy_pipeline.meta['requirements'].append(f'{lexicon_package_name}=={full_model_version}')
+                if isinstance(model, RuleModel) and model.lexicon_compression is not None:
+                    spacy_pipeline.meta['requirements'].append(lexicon_compression.REQUIREMENT)
+                if isinstance(model, RuleModel) and model.config.lookup_cache_size is not None:
+                    spacy_pipeline.meta['requirements'].append(COMPONENT_REQUIREMENT)
+                if isinstance(model, NeuralModel) and model.config.doc_cache_size is not None:
+                    spacy_pipeline.meta['requirements'].append(COMPONENT_REQUIREMENT)
+
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    temp_dir_path = Path(temp_dir)
+                    spacy_pipeline.to_disk(temp_dir_path)
+                    if prune:
+                        prune_pipeline(spacy_pipeline, temp_dir_path)
+                    if uses_shared_rules:
+                        share_rules(Path(temp_dir_path, model_type.value), lexicon_package_name,
+                                    shared_rule_ids)
+                    if model_type == ModelTypes.NEURAL and neural_weights_store is not None:
+                        artifact_store.externalise_files(Path(temp_dir_path, model_type.value),
+                                                         neural_weights_store, neural_weights_url)
+                    if isinstance(model, RuleModel) and model.lexicon_compression is not None:
+                        lexicon_compression.compress_files(Path(temp_dir_path, model_type.value),
+                                                           model.lexicon_compression.level,
+                                                           model.lexicon_compression.dictionary_size_bytes)
+
+                    package_name = f'{model_name}-{full_model_version}'
                 
-                # Create model
-                models_directory.mkdir(parents=True, exist_ok=True)
-                package(temp_dir_path, models_directory,
-                        create_sdist=True,
-                        create_wheel=True, name=model_name,
-                        version=full_model_version)
-                model_directory = Path(models_directory, f'{package_name}')
-                add_model_specific_meta_data(model_directory,
-                                             language_resource.language_data.description,
-                                             package_name)
+                    # Create model
+                    models_directory.mkdir(parents=True, exist_ok=True)
+                    package(temp_dir_path, models_directory,
+                            code_paths=code_paths,
+                            create_sdist=True,
+                            create_wheel=True, name=model_name,
+                            version=full_model_version)
+                    model_directory = Path(models_directory, f'{package_name}')
+                    add_model_specific_meta_data(model_directory,
+                                                 language_resource.language_data.description,
+                                                 package_name)
+                    update_catalog(models_directory,
+                                   create_catalog_entry(model_directory, model, language_code))
 
 
 EXISTING_MODEL_DIRECTORY_HELP = '''
 A path to a directory that is storing the PyMUSAS models.
 '''
 
+UPDATE_MODEL_HELP = '''
+The name of a rule based model, within the models catalog, to update, can be
+given more than once, if not given every rule based model whose lexicon URLs,
+within the `--language-resource-file`, differ from those it was created with
+is updated.
+'''
+UPDATE_MODEL_VERSION_HELP = '''
+The model version, the `c` element as described in `Model versioning` within
+the main README, of the updated models, if not given the model version of
+each updated model is incremented by one, e.g. `0.4.0` to `0.4.1`.
+'''
+
+
+@app.command("update-lexicon")
+def update_lexicon(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                   help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                   exists=True, file_okay=False,
+                                                   dir_okay=True, resolve_path=True),
+                   language_resource_file: Path = OPTION(Path(REPO_DIRECTORY, 'language_resources.json'),
+                                                         help=LANGUAGE_RESOURCE_FILE_HELP,
+                                                         exists=True, file_okay=True,
+                                                         dir_okay=False, writable=False,
+                                                         readable=True, resolve_path=True),
+                   model: Optional[List[str]] = OPTION(None, "--model", help=UPDATE_MODEL_HELP),
+                   model_version: Optional[str] = OPTION(None, help=UPDATE_MODEL_VERSION_HELP),
+                   lexicon_download_workers: int = OPTION(8, help=LEXICON_DOWNLOAD_WORKERS_HELP, min=1)
+                   ) -> None:
+    '''
+    Updates the lexicons of the rule based models, within the models
+    catalog, `catalog.json`, of the `models_directory`, to the lexicons of
+    the `language_resource_file`, within copies of their existing packages
+    with a new model version rather than re-creating them: only the rules,
+    and the ranker, of the rule based tagger are re-written, keeping the lite
+    variant and lexicon compression of each model, then the sdist and wheel,
+    README checksums, and catalog entry of each updated model are re-built.
+    Models whose rule data has not changed are not updated. Models whose
+    rules are within a shared lexicon data package have to be re-created
+    with `create-models`.
+    '''
+    import time
+
+    from pymusas.taggers.rules.rule import Rule as PymusasRule
+
+    from pymusas_models import artifact_store
+    from pymusas_models.catalog import create_catalog_entry, update_catalog
+    from pymusas_models.lexicon_fetch import is_url, prefetch_lexicons
+    from pymusas_models.lite_variant import get_lite_model_name
+    from pymusas_models.update_lexicon import (
+        check_updatable,
+        get_model_lexicon_urls,
+        get_updated_version,
+        rebuild_distributions,
+        update_model_lexicons,
+    )
+
+    language_data = LanguageResources.model_validate_json(language_resource_file.read_text(encoding='utf-8'))
+    catalog = read_catalog(models_directory)
+    # The catalog entry, language code, and language resource meta data of
+    # each model, and lite variant, to update.
+    updates: List[Tuple[CatalogEntry, str, RuleModel]] = []
+    found_model_names: Set[str] = set()
+    for language_code, language_resource in language_data.language_resources.items():
+        for language_model in language_resource.models:
+            if not isinstance(language_model, RuleModel):
+                continue
+            lexicon_urls = get_model_lexicon_urls(language_model)
+            for model_name in [language_model.name, get_lite_model_name(language_model.name)]:
+                entry = catalog.models.get(model_name)
+                if entry is None:
+                    continue
+                found_model_names.add(model_name)
+                # The models given by `--model` are always updated, else only
+                # the models whose lexicon URLs have changed.
+                needs_update = model_name in model if model else entry.lexicon_urls != lexicon_urls
+                if needs_update:
+                    updates.append((entry, language_code, language_model))
+    unknown_model_names = [model_name for model_name in model or [] if model_name not in found_model_names]
+    if unknown_model_names:
+        raise typer.BadParameter(f'Cannot find the rule based models {unknown_model_names} within both the '
+                                 f'catalog {Path(models_directory, CATALOG_FILE_NAME)} and the language '
+                                 f'resource file {language_resource_file}.', param_hint='--model')
+    for entry, _, _ in updates:
+        try:
+            check_updatable(entry)
+        except ValueError as error:
+            raise typer.BadParameter(str(error), param_hint='--model') from error
+        try:
+            get_updated_version(entry.version, model_version)
+        except ValueError as error:
+            raise typer.BadParameter(str(error), param_hint='--model-version') from error
+    if not updates:
+        typer.echo('The lexicons of every rule based model are up to date.', err=True)
+        return
+
+    lexicon_files = prefetch_lexicons(sorted({lexicon_url for _, _, language_model in updates
+                                              for lexicon_url in get_model_lexicon_urls(language_model)
+                                              if is_url(lexicon_url)}),
+                                      Path(artifact_store.get_cache_directory(), 'lexicons'),
+                                      max_workers=lexicon_download_workers)
+    # The PyMUSAS rules keyed by the JSON of the rule meta data, so that each
+    # lexicon is only read once.
+    pymusas_rules: Dict[str, PymusasRule] = {}
+    for entry, language_code, language_model in updates:
+        start_time = time.perf_counter()
+        rules: List[PymusasRule] = []
+        for rule in language_model.resources.rules:
+            rule_key = rule.model_dump_json()
+            if rule_key not in pymusas_rules:
+                pymusas_rules[rule_key] = create_pymusas_rule(rule, lexicon_files)
+            rules.append(pymusas_rules[rule_key])
+        try:
+            updated_entry = update_model_lexicons(entry, language_model, models_directory, rules,
+                                                  model_version=model_version)
+        except ValueError as error:
+            raise typer.BadParameter(str(error), param_hint='--model-version') from error
+        if updated_entry is None:
+            # The lexicon URLs may have changed without their lexicons
+            # changing, the package of the model is left as it is.
+            update_catalog(models_directory,
+                           entry.model_copy(update={'lexicon_urls': get_model_lexicon_urls(language_model)}))
+            typer.echo(f'The lexicons of {entry.name} have not changed, it has not been updated.', err=True)
+            continue
+        model_directory = Path(models_directory, updated_entry.package_name)
+        rebuild_distributions(model_directory)
+        add_model_specific_meta_data(model_directory, entry.language_name, updated_entry.package_name)
+        update_catalog(models_directory, create_catalog_entry(model_directory, language_model, language_code))
+        typer.echo(f'Updated the lexicons of {entry.name}, version {entry.version} to {updated_entry.version}, '
+                   f'in {time.perf_counter() - start_time:.2f}s', err=True)
+
 
 @app.command("overview-of-models")
 def overview_of_models(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
@@ -436,63 +790,940 @@ def overview_of_models(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'mod
     5. Ranker
     6. Neural Model
     7. File Size
+
+    If any of the models have been evaluated, by the `evaluate-models`
+    command, every row also contains the USAS top 1 accuracy, MWE F1, and
+    tokens per second of the model.
+
+    All of this information is read from the model catalog, `catalog.json`,
+    that the `create-models` command writes to the `models_directory`.
     '''
     md = MarkdownRenderer()
     headers = ["Language (BCP 47 language code)", "Model Name",
                "MWE", "POS Mapper", "Ranker", "Neural Model", "File Size"]
     table_data: List[List[str]] = []
 
-    models_directories = sorted(models_directory.iterdir(),
-                                key=lambda x: (x.name.split('_')[0],
-                                               x.name.split('_')[1]))
-    
-    neural_model_mapper = {
-        "englishsmallbem": "[ucrelnlp/PyMUSAS-Neural-English-Small-BEM](https://huggingface.co/ucrelnlp/PyMUSAS-Neural-English-Small-BEM)",
-        "englishbasebem": "[ucrelnlp/PyMUSAS-Neural-English-Base-BEM](https://huggingface.co/ucrelnlp/PyMUSAS-Neural-English-Base-BEM)",
-        "multilingualsmallbem": "[ucrelnlp/PyMUSAS-Neural-Multilingual-Small-BEM](https://huggingface.co/ucrelnlp/PyMUSAS-Neural-Multilingual-Small-BEM)",
-        "multilingualbasebem": "[ucrelnlp/PyMUSAS-Neural-Multilingual-Base-BEM](https://huggingface.co/ucrelnlp/PyMUSAS-Neural-Multilingual-Base-BEM)"
-    }
-
-    for model_direcotry in models_directories:
-        meta_data_file = Path(model_direcotry, 'meta.json')
-        model_meta_data = srsly.read_json(meta_data_file)
-        
-        model_name = model_meta_data["name"]
-        
-        language_name = model_meta_data["full_language_name"]
-        bcp_47_code = model_name.split("_")[0]
-        language_code = f'{language_name} ({bcp_47_code})'
-        
-        mwe = ':x:'
-        if 'dual' in model_name:
-            mwe = ':heavy_check_mark:'
-        
+    catalog = read_catalog(models_directory)
+    if not catalog.models:
+        raise FileNotFoundError(f'Cannot find any models within the catalog file '
+                                f'{Path(models_directory, CATALOG_FILE_NAME)}, the '
+                                'catalog is created by the `create-models` command.')
+    evaluated = any('usas_top_1_accuracy' in entry.benchmarks for entry in catalog.models.values())
+    if evaluated:
+        headers.extend(["Top 1 Accuracy", "MWE F1", "Tokens/sec"])
+    catalog_entries = sorted(catalog.models.values(),
+                             key=lambda entry: (entry.language_code,
+                                                entry.name.split('_')[1]))
+
+    for entry in catalog_entries:
+        language_code = f'{entry.language_name} ({entry.language_code})'
+        mwe = ':heavy_check_mark:' if entry.mwe else ':x:'
+
         model_pos_mapper = 'None'
-        if 'upos2usas' in model_name:
-            model_pos_mapper = 'UPOS 2 USAS'
-        elif 'basiccorcencc2usas' in model_name:
-            model_pos_mapper = 'Basic CorCenCC 2 USAS'
-        
-        ranker = model_name.split('_')[-2]
-        if ranker == 'none':
-            ranker = ':x:'
-        else:
-            ranker = ranker.capitalize()
+        if entry.pos_mapper is not None:
+            model_pos_mapper = POS_MAPPER_TO_DISPLAY_NAME[entry.pos_mapper]
 
-        neural_model = model_name.split('_')[-1]
-        if neural_model == 'none':
-            neural_model = ':x:'
-        else:
+        ranker = ':x:'
+        if entry.ranker is not None:
+            ranker = entry.ranker.value.capitalize()
+
+        neural_model = ':x:'
+        if entry.neural_model is not None:
             model_pos_mapper = ':x:'
-            neural_model = neural_model_mapper[neural_model]
-        file_size = model_meta_data['size']
+            neural_model = f'[{entry.neural_model}](https://huggingface.co/{entry.neural_model})'
+        file_size = f'{float(entry.size_bytes) / math.pow(2, 20):.2f}MB'
 
-        table_data.append([language_code, model_name, mwe,
-                           model_pos_mapper, ranker, neural_model, file_size])
+        row = [language_code, entry.name, mwe, model_pos_mapper, ranker,
+               neural_model, file_size]
+        if evaluated:
+            benchmarks = entry.benchmarks
+            row.extend([f'{100 * benchmarks["usas_top_1_accuracy"]:.2f}' if 'usas_top_1_accuracy' in benchmarks else '-',
+                        f'{100 * benchmarks["mwe_f1"]:.2f}' if 'mwe_f1' in benchmarks else '-',
+                        f'{benchmarks["tokens_per_second"]:,.0f}' if 'tokens_per_second' in benchmarks else '-'])
+        table_data.append(row)
 
     md.add(md.table(table_data, headers))
     print(md.text)
 
 
+INDEX_DIRECTORY_HELP = '''
+A path to a directory to create the package index in, an existing package
+index within this directory is updated.
+'''
+
+
+@app.command("package-index")
+def package_index(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                  help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                  exists=True, file_okay=False,
+                                                  dir_okay=True, resolve_path=True),
+                  index_directory: Path = OPTION(Path(REPO_DIRECTORY, 'package_index'),
+                                                 help=INDEX_DIRECTORY_HELP,
+                                                 file_okay=False, dir_okay=True,
+                                                 resolve_path=True)) -> None:
+    '''
+    Creates a static PEP 503 simple package index, with SHA256 hashes, of all
+    of the models, and shared lexicon data packages, within the models
+    catalog, `catalog.json`, of the `models_directory`, along with a `requirements.txt` file that pins every
+    model with its hashes for `pip install --require-hashes`. The index can be
+    used from the local directory or served over HTTP, e.g. with
+    `python -m http.server`.
+    '''
+    catalog = read_catalog(models_directory)
+    if not catalog.models:
+        raise FileNotFoundError(f'Cannot find any models within the catalog file '
+                                f'{Path(models_directory, CATALOG_FILE_NAME)}, the '
+                                'catalog is created by the `create-models` command.')
+    entries = create_package_index(catalog, models_directory, index_directory)
+    typer.echo(f'Created a package index of {len(entries)} packages, use it with: '
+               f'pip install --index-url {Path(index_directory, "simple").as_uri()}/ '
+               '--extra-index-url https://pypi.org/simple/ MODEL_NAME', err=True)
+
+
+SIZE_REPORT_MODEL_HELP = '''
+The name of a model, within the models catalog, to report on, can be given
+more than once, if not given every model is reported on.
+'''
+BY_FILE_HELP = '''
+Break each model down by file rather than by pipeline component.
+'''
+JSON_HELP = '''
+Print the report as JSON rather than as Markdown tables.
+'''
+
+
+@app.command("size-report")
+def size_report(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                exists=True, file_okay=False,
+                                                dir_okay=True, resolve_path=True),
+                model: Optional[List[str]] = OPTION(None, "--model", help=SIZE_REPORT_MODEL_HELP),
+                by_file: bool = OPTION(False, help=BY_FILE_HELP),
+                as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Prints to stdout the size of each model within the models catalog,
+    `catalog.json`, of the `models_directory`, broken down by pipeline
+    component, e.g. the rule based tagger, the tokenizer, and the vocabulary,
+    or by file. Each part has its installed size, its compressed size within
+    the wheel, and its share of the installed size of the model.
+    '''
+    catalog = read_catalog(models_directory)
+    if not catalog.models:
+        raise FileNotFoundError(f'Cannot find any models within the catalog file '
+                                f'{Path(models_directory, CATALOG_FILE_NAME)}, the '
+                                'catalog is created by the `create-models` command.')
+    model_names = model or list(catalog.models)
+    unknown_model_names = [model_name for model_name in model_names if model_name not in catalog.models]
+    if unknown_model_names:
+        raise typer.BadParameter(f'Cannot find the models {unknown_model_names} within the catalog.',
+                                 param_hint='--model')
+    reports = [create_size_report(catalog.models[model_name], models_directory, by_file)
+               for model_name in model_names]
+    if as_json:
+        typer.echo(f'[{", ".join(report.model_dump_json() for report in reports)}]')
+        return
+
+    md = MarkdownRenderer()
+    headers = ["Data", "Files", "Size", "Compressed Size", "Share of Size"]
+    for report in reports:
+        md.add(md.title(3, f'{report.name}: {format_size(report.size_bytes)} installed, '
+                           f'{format_size(report.wheel_size_bytes)} wheel, '
+                           f'{format_size(report.sdist_size_bytes)} sdist'))
+        table_data = [[part.name, str(part.file_count), format_size(part.size_bytes),
+                       format_size(part.compressed_size_bytes),
+                       f'{100 * part.size_bytes / max(report.size_bytes, 1):.1f}%']
+                      for part in report.parts]
+        md.add(md.table(table_data, headers, aligns=('l', 'r', 'r', 'r', 'r')))
+    print(md.text)
+
+
+BENCHMARK_MODEL_HELP = '''
+The name of the rule based model, within the models catalog, to benchmark.
+'''
+LEVEL_HELP = '''
+A zstd compression level, from 1 to 22, to benchmark, can be given more than
+once. Every level is benchmarked with every dictionary size.
+'''
+DICTIONARY_SIZE_HELP = '''
+A size, in bytes, of the zstd dictionary to train on the lexicons, to
+benchmark, can be given more than once, `0` for no dictionary.
+'''
+REPEATS_HELP = '''
+The number of times to install and load the model for each setting, the
+median install and load time is reported.
+'''
+
+
+@app.command("compression-benchmark")
+def compression_benchmark(model: str = OPTION(..., "--model", help=BENCHMARK_MODEL_HELP),
+                          models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                          help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                          exists=True, file_okay=False,
+                                                          dir_okay=True, resolve_path=True),
+                          level: List[int] = OPTION([3, 9, 19], "--level", help=LEVEL_HELP,
+                                                    min=1, max=22),
+                          dictionary_size: List[int] = OPTION([0], "--dictionary-size",
+                                                              help=DICTIONARY_SIZE_HELP, min=0),
+                          repeats: int = OPTION(3, help=REPEATS_HELP, min=1),
+                          as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Prints to stdout the wheel size, installed size, install time, and load
+    time of the rule based `model`, within the models catalog, `catalog.json`,
+    of the `models_directory`, packaged without compressed lexicons and with
+    each combination of the zstd compression `level` and `dictionary_size`,
+    so that the `lexicon_compression` setting of the model, within the
+    language resource file, can be chosen.
+    '''
+    from pymusas_models.compression_benchmark import benchmark_lexicon_compression
+    from pymusas_models.language_resource import LexiconCompression
+
+    catalog = read_catalog(models_directory)
+    if model not in catalog.models:
+        raise typer.BadParameter(f'Cannot find the model {model} within the catalog '
+                                 f'{Path(models_directory, CATALOG_FILE_NAME)}.',
+                                 param_hint='--model')
+    entry = catalog.models[model]
+    if entry.model_type != ModelTypes.RULE:
+        raise typer.BadParameter(f'The model {model} is not a rule based model.',
+                                 param_hint='--model')
+    settings: List[Optional[LexiconCompression]] = [None]
+    settings.extend(LexiconCompression(level=compression_level, dictionary_size_bytes=dictionary_size_bytes)
+                    for compression_level in level for dictionary_size_bytes in dictionary_size)
+    results = benchmark_lexicon_compression(entry, models_directory, settings, repeats)
+    if as_json:
+        typer.echo(f'[{", ".join(result.model_dump_json() for result in results)}]')
+        return
+
+    md = MarkdownRenderer()
+    headers = ["Lexicon Compression", "Wheel Size", "Installed Size", "Install Time (s)",
+               "Load Time (s)"]
+    table_data = [[result.setting, format_size(result.wheel_size_bytes),
+                   format_size(result.installed_size_bytes), f'{result.install_seconds:.2f}',
+                   f'{result.load_seconds:.2f}']
+                  for result in results]
+    md.add(md.title(3, f'{model}'))
+    md.add(md.table(table_data, headers, aligns=('l', 'r', 'r', 'r', 'r')))
+    print(md.text)
+
+
+GOLD_CORPUS_HELP = '''
+A path to the gold standard USAS annotated corpus, a JSONL file in the `jsonl`
+corpus format of `tag-corpus` whereby each object has a `tokens` key and a
+`usas_tags` key, the gold USAS tag of each token, `null` for tokens that are
+not evaluated, and an optional `mwe_indexes` key, the `[start, end]` token
+indexes of each gold MWE.
+'''
+LANGUAGE_HELP = '''
+The language code, e.g. `en`, of the gold standard corpus, the models of this
+language are evaluated.
+'''
+EVALUATE_MODEL_HELP = '''
+The name of a model, within the models catalog, to evaluate, can be given
+more than once, if not given every model of the `--language` is evaluated.
+'''
+EVALUATE_BATCH_SIZE_HELP = '''
+The number of documents to buffer while tagging.
+'''
+
+
+@app.command("evaluate-models")
+def evaluate_models(gold_corpus: Path = typer.Argument(..., help=GOLD_CORPUS_HELP,
+                                                       exists=True, file_okay=True,
+                                                       dir_okay=False, readable=True,
+                                                       resolve_path=True),
+                    language: str = OPTION(..., help=LANGUAGE_HELP),
+                    models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                    help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                    exists=True, file_okay=False,
+                                                    dir_okay=True, resolve_path=True),
+                    model: Optional[List[str]] = OPTION(None, "--model", help=EVALUATE_MODEL_HELP),
+                    batch_size: int = OPTION(1000, min=1, help=EVALUATE_BATCH_SIZE_HELP),
+                    as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Evaluates each model of the `language`, within the models catalog,
+    `catalog.json`, of the `models_directory`, on the gold standard corpus;
+    USAS top 1 and top 5 accuracy, MWE precision, recall, and F1, and tokens
+    per second. The scores are written to the `performance` meta data of the
+    model, and its README, and the sdist and wheel of the model are re-built
+    with them, as well as the `benchmarks` of its catalog entry, therefore
+    they are shown by the `overview-of-models` command. The scores
+    are printed to stdout as a Markdown table, or as JSON with `--json`.
+    '''
+    import spacy
+
+    from pymusas_models.catalog import get_model_distribution_files, update_catalog
+    from pymusas_models.evaluation import EvaluationResult, evaluate_model, read_gold_corpus, write_performance
+    from pymusas_models.lexicon_package import lexicon_packages_importable
+    from pymusas_models.prune import get_load_exclude
+    from pymusas_models.update_lexicon import rebuild_distributions
+
+    catalog = read_catalog(models_directory)
+    language_models = [model_name for model_name, entry in catalog.models.items()
+                       if entry.language_code == language]
+    model_names = model or language_models
+    unknown_model_names = [model_name for model_name in model_names if model_name not in language_models]
+    if unknown_model_names:
+        raise typer.BadParameter(f'Cannot find the {language} models {unknown_model_names} within the catalog '
+                                 f'{Path(models_directory, CATALOG_FILE_NAME)}.', param_hint='--model')
+    if not model_names:
+        raise typer.BadParameter(f'Cannot find any {language} models within the catalog '
+                                 f'{Path(models_directory, CATALOG_FILE_NAME)}.', param_hint='--language')
+
+    results: List[EvaluationResult] = []
+    # The models that use shared rules load them from the lexicon data
+    # package of the language.
+    with lexicon_packages_importable(models_directory, language):
+        for model_name in model_names:
+            entry = catalog.models[model_name]
+            model_path = Path(models_directory, entry.package_name, entry.name,
+                              f'{entry.name}-{entry.version}')
+            nlp = spacy.load(model_path, exclude=get_load_exclude(model_path))
+            with gold_corpus.open('r', encoding='utf-8') as gold_corpus_file:
+                gold_documents = read_gold_corpus(gold_corpus_file, nlp)
+            result = evaluate_model(nlp, gold_documents, name=model_name, corpus=gold_corpus.name,
+                                    batch_size=batch_size)
+            results.append(result)
+
+            write_performance(entry, models_directory, result)
+            # The sdist and wheel contain the meta data and README of the
+            # model, therefore they are re-built with the scores.
+            model_directory = Path(models_directory, entry.package_name)
+            rebuild_distributions(model_directory)
+            add_model_specific_meta_data(model_directory, entry.language_name, entry.package_name)
+            distribution_files = get_model_distribution_files(model_directory)
+            benchmarks = result.model_dump(include={'usas_top_1_accuracy', 'usas_top_5_accuracy',
+                                                    'mwe_precision', 'mwe_recall', 'mwe_f1'})
+            benchmarks['tokens_per_second'] = result.speed
+            update_catalog(models_directory,
+                           entry.model_copy(update={'benchmarks': {**entry.benchmarks, **benchmarks},
+                                                    'wheel': distribution_files['.whl'],
+                                                    'sdist': distribution_files['.gz']}))
+
+    if as_json:
+        typer.echo(f'[{", ".join(result.model_dump_json() for result in results)}]')
+        return
+
+    md = MarkdownRenderer()
+    headers = ["Model Name", "Top 1 Accuracy", "Top 5 Accuracy", "MWE Precision",
+               "MWE Recall", "MWE F1", "Tokens/sec"]
+    table_data = [[result.name, f'{100 * result.usas_top_1_accuracy:.2f}',
+                   f'{100 * result.usas_top_5_accuracy:.2f}', f'{100 * result.mwe_precision:.2f}',
+                   f'{100 * result.mwe_recall:.2f}', f'{100 * result.mwe_f1:.2f}',
+                   f'{result.speed:,.0f}']
+                  for result in results]
+    md.add(md.title(3, f'{gold_corpus.name}: {results[0].documents:,} documents, '
+                       f'{results[0].evaluated_tokens:,} evaluated tokens'))
+    md.add(md.table(table_data, headers, aligns=('l', 'r', 'r', 'r', 'r', 'r', 'r')))
+    print(md.text)
+
+
+MODEL_NAME_HELP = '''
+The name of the PyMUSAS model, e.g. `en_dual_none_contextual_none`, that has
+either been installed, created within `--models-directory`, or a path to the
+model.
+'''
+CORPUS_FILE_HELP = '''
+A path to the corpus to tag.
+'''
+CORPUS_FORMAT_HELP = '''
+The format of the corpus; `text` each non empty line is a document, `jsonl`
+each line is a JSON object with either a `text` key or a `tokens` key (with
+the optional `spaces`, `lemmas`, `pos`, and `tags` keys) and an optional `id`
+key, `conllu` each sentence of the CoNLL-U file is a document.
+'''
+OUTPUT_FILE_HELP = '''
+A path to the file that the tagged documents will be written to, in the same
+order as the corpus.
+'''
+OUTPUT_FORMAT_HELP = '''
+The format of the output file; `jsonl` each line is a JSON object of a tagged
+document, `parquet` or `arrow` (Arrow IPC file) a table with one row per
+token, which requires the `columnar` extra, `pip install pymusas_models[columnar]`.
+'''
+ROW_GROUP_SIZE_HELP = '''
+The number of rows, tokens, within each row group of the `parquet` or `arrow`
+output, only this number of rows are stored in memory before being written.
+'''
+TAG_MODELS_DIRECTORY_HELP = '''
+A path to a directory that is storing the PyMUSAS models created by the
+`create-models` command, if the model is not found within this directory the
+installed model is used.
+'''
+BATCH_SIZE_HELP = '''
+The number of documents to buffer while tagging.
+'''
+N_PROCESS_HELP = '''
+The number of processes to tag with, `-1` uses all of the CPUs.
+'''
+REPORT_EVERY_HELP = '''
+The number of documents between each report of the tokens per second, `0`
+to only report once all of the documents have been tagged.
+'''
+
+
+@app.command("tag-corpus")
+def tag_corpus_command(model_name: str = typer.Argument(..., help=MODEL_NAME_HELP),
+                       corpus_file: Path = typer.Argument(..., help=CORPUS_FILE_HELP,
+                                                          exists=True, file_okay=True,
+                                                          dir_okay=False, readable=True,
+                                                          resolve_path=True),
+                       output_file: Path = typer.Argument(..., help=OUTPUT_FILE_HELP,
+                                                          file_okay=True, dir_okay=False,
+                                                          resolve_path=True),
+                       corpus_format: CorpusFormat = OPTION(CorpusFormat.TEXT,
+                                                            help=CORPUS_FORMAT_HELP),
+                       output_format: OutputFormat = OPTION(OutputFormat.JSONL,
+                                                            help=OUTPUT_FORMAT_HELP),
+                       row_group_size: int = OPTION(100000, min=1, help=ROW_GROUP_SIZE_HELP),
+                       models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                       help=TAG_MODELS_DIRECTORY_HELP,
+                                                       file_okay=False, dir_okay=True,
+                                                       resolve_path=True),
+                       batch_size: int = OPTION(1000, min=1, help=BATCH_SIZE_HELP),
+                       n_process: int = OPTION(1, help=N_PROCESS_HELP),
+                       report_every: int = OPTION(10000, min=0, help=REPORT_EVERY_HELP)
+                       ) -> None:
+    '''
+    Tags the corpus with the PyMUSAS model and writes the tokens, USAS tags,
+    and MWE indexes of each document to the output file, as either JSONL,
+    Parquet, or an Arrow IPC file. The corpus is streamed through the model,
+    therefore only one batch of documents is stored in memory at any one
+    time. The tokens per second are reported to stderr while tagging.
+    '''
+    import spacy
+
+    from pymusas_models.lexicon_package import lexicon_packages_importable
+    from pymusas_models.prune import get_load_exclude
+    from pymusas_models.tag_corpus import get_corpus_writer, get_model_path, read_corpus, tag_corpus
+
+    model_path = get_model_path(model_name, models_directory)
+    with lexicon_packages_importable(models_directory):
+        nlp = spacy.load(model_path, exclude=get_load_exclude(model_path))
+    with corpus_file.open('r', encoding='utf-8') as corpus:
+        with get_corpus_writer(output_file, output_format, row_group_size) as writer:
+            number_documents, number_tokens, tokens_per_second \
+                = tag_corpus(nlp, read_corpus(corpus, corpus_format, nlp), writer,
+                             batch_size=batch_size, n_process=n_process,
+                             report_every=report_every)
+    typer.echo(f'Tagged {number_documents:,} documents, {number_tokens:,} tokens, '
+               f'{tokens_per_second:,.0f} tokens/sec', err=True)
+
+
+PROFILE_CORPUS_FILE_HELP = '''
+A path to the corpus to profile the model on.
+'''
+
+
+@app.command("profile-model")
+def profile_model(model_name: str = typer.Argument(..., help=MODEL_NAME_HELP),
+                  corpus_file: Path = typer.Argument(..., help=PROFILE_CORPUS_FILE_HELP,
+                                                     exists=True, file_okay=True,
+                                                     dir_okay=False, readable=True,
+                                                     resolve_path=True),
+                  corpus_format: CorpusFormat = OPTION(CorpusFormat.TEXT,
+                                                       help=CORPUS_FORMAT_HELP),
+                  models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                  help=TAG_MODELS_DIRECTORY_HELP,
+                                                  file_okay=False, dir_okay=True,
+                                                  resolve_path=True),
+                  as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Profiles the rule based tagger of the PyMUSAS model on the corpus and
+    prints to stdout, for each rule, its time, number of candidate lexicon
+    entry matches, the share of tokens it has candidates for (candidate
+    rate), the share of tokens it tags (hit rate), and the share of tokens
+    that neither it, nor the rules before it, has candidates for (unknown
+    rate), as well as the time of the ranker and of the rest of the tagger.
+    '''
+    import spacy
+
+    from pymusas_models.lexicon_package import lexicon_packages_importable
+    from pymusas_models.prune import get_load_exclude
+    from pymusas_models.rule_profiler import profile_rule_based_tagger
+    from pymusas_models.tag_corpus import get_model_path, read_corpus
+
+    model_path = get_model_path(model_name, models_directory)
+    with lexicon_packages_importable(models_directory):
+        nlp = spacy.load(model_path, exclude=get_load_exclude(model_path))
+    with corpus_file.open('r', encoding='utf-8') as corpus:
+        try:
+            profile = profile_rule_based_tagger(nlp, (document for document, _ in
+                                                      read_corpus(corpus, corpus_format, nlp)),
+                                                name=model_name, corpus=corpus_file.name)
+        except ValueError as error:
+            raise typer.BadParameter(str(error), param_hint='MODEL_NAME') from error
+    if as_json:
+        typer.echo(profile.model_dump_json())
+        return
+
+    md = MarkdownRenderer()
+    total_seconds = max(profile.seconds, 1e-9)
+    headers = ["Step", "Time (s)", "Share of Time", "Candidates", "Candidate Rate",
+               "Hit Rate", "Unknown Rate"]
+    rule_profiles = {rule_profile.name: rule_profile for rule_profile in profile.rules}
+    table_data: List[List[str]] = []
+    for step, seconds in profile.step_seconds.items():
+        row = [step, f'{seconds:.3f}', f'{100 * seconds / total_seconds:.1f}%']
+        rule_profile = rule_profiles.get(step)
+        if rule_profile is None:
+            row.extend(['', '', '', ''])
+        else:
+            row.extend([f'{rule_profile.candidates:,}', f'{100 * rule_profile.candidate_rate:.1f}%',
+                        f'{100 * rule_profile.hit_rate:.1f}%', f'{100 * rule_profile.unknown_rate:.1f}%'])
+        table_data.append(row)
+    table_data.append(['total', f'{profile.seconds:.3f}', '100.0%', '', '', '', ''])
+    md.add(md.title(3, f'{model_name} on {corpus_file.name}: {profile.documents:,} documents, '
+                       f'{profile.tokens:,} tokens, {profile.tokens / total_seconds:,.0f} tokens/sec, '
+                       f'{100 * profile.unknown_rate:.1f}% Z99'))
+    md.add(md.table(table_data, headers, aligns=('l', 'r', 'r', 'r', 'r', 'r', 'r')))
+    print(md.text)
+
+
+SCALING_MODEL_HELP = '''
+The name of a dual rule based model, within the models catalog, to benchmark,
+can be given more than once, if not given every dual rule based model is
+benchmarked.
+'''
+LENGTH_HELP = '''
+A document length, in tokens, to benchmark, can be given more than once, at
+least two different lengths are required.
+'''
+MWE_DENSITY_HELP = '''
+A share of the tokens, from 0 to 1, that are within MWEs, to benchmark, can
+be given more than once. Every density is benchmarked with every length.
+'''
+SCALING_REPEATS_HELP = '''
+The number of times to tag each document, the median time is reported.
+'''
+MAX_EXPONENT_HELP = '''
+The maximum scaling exponent, the slope of the log tagging time against the
+log document length, of any MWE density, whereby 1 is linear, above which
+the command fails.
+'''
+SEED_HELP = '''
+The seed of the random number generator that generates the documents.
+'''
+
+
+@app.command("scaling-benchmark")
+def scaling_benchmark(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                      help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                      exists=True, file_okay=False,
+                                                      dir_okay=True, resolve_path=True),
+                      model: Optional[List[str]] = OPTION(None, "--model", help=SCALING_MODEL_HELP),
+                      length: List[int] = OPTION([500, 2000, 8000], "--length", help=LENGTH_HELP,
+                                                 min=1),
+                      mwe_density: List[float] = OPTION([0.0, 0.25, 0.5], "--mwe-density",
+                                                        help=MWE_DENSITY_HELP, min=0.0, max=1.0),
+                      repeats: int = OPTION(3, help=SCALING_REPEATS_HELP, min=1),
+                      max_exponent: float = OPTION(1.2, help=MAX_EXPONENT_HELP),
+                      seed: int = OPTION(0, help=SEED_HELP),
+                      as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Tags documents, generated from the lexicons of each dual rule based model
+    within the models catalog, `catalog.json`, of the `models_directory`, of
+    every `length` and `mwe_density`, and prints to stdout the tagging time
+    and time per token of each document, and the scaling exponent of each
+    MWE density, as a Markdown table, or as JSON with `--json`. Exits with a
+    non-zero exit code if the time per token of any model grows faster than
+    linearly with the document length, a scaling exponent above
+    `max_exponent`.
+    '''
+    import spacy
+
+    from pymusas_models.lexicon_package import lexicon_packages_importable
+    from pymusas_models.prune import get_load_exclude
+    from pymusas_models.scaling_benchmark import ScalingResult, benchmark_scaling
+
+    if len(set(length)) < 2:
+        raise typer.BadParameter(f'At least two different lengths are required: {length}',
+                                 param_hint='--length')
+    catalog = read_catalog(models_directory)
+    dual_models = [model_name for model_name, entry in catalog.models.items()
+                   if entry.model_type == ModelTypes.RULE and entry.mwe]
+    model_names = model or dual_models
+    unknown_model_names = [model_name for model_name in model_names if model_name not in dual_models]
+    if unknown_model_names:
+        raise typer.BadParameter(f'Cannot find the dual rule based models {unknown_model_names} within '
+                                 f'the catalog {Path(models_directory, CATALOG_FILE_NAME)}.',
+                                 param_hint='--model')
+    if not model_names:
+        raise typer.BadParameter('Cannot find any dual rule based models within the catalog '
+                                 f'{Path(models_directory, CATALOG_FILE_NAME)}.',
+                                 param_hint='--models-directory')
+
+    results: List[ScalingResult] = []
+    # The models that use shared rules load them from the lexicon data
+    # package of their language.
+    with lexicon_packages_importable(models_directory):
+        for model_name in model_names:
+            entry = catalog.models[model_name]
+            model_path = Path(models_directory, entry.package_name, entry.name,
+                              f'{entry.name}-{entry.version}')
+            nlp = spacy.load(model_path, exclude=get_load_exclude(model_path))
+            try:
+                results.append(benchmark_scaling(nlp, model_name, sorted(set(length)), mwe_density,
+                                                 repeats=repeats, max_exponent=max_exponent,
+                                                 seed=seed))
+            except ValueError as error:
+                raise typer.BadParameter(str(error), param_hint='--model') from error
+
+    if as_json:
+        typer.echo(f'[{", ".join(result.model_dump_json() for result in results)}]')
+    else:
+        md = MarkdownRenderer()
+        headers = ["MWE Density", "Length", "MWE Token Share", "Time (s)", "Time/Token (µs)",
+                   "Scaling Exponent"]
+        for result in results:
+            table_data = [[f'{measurement.mwe_density:.2f}', f'{measurement.length:,}',
+                           f'{100 * measurement.mwe_token_share:.1f}%', f'{measurement.seconds:.4f}',
+                           f'{measurement.microseconds_per_token:.1f}',
+                           f'{result.exponents[str(measurement.mwe_density)]:.2f}']
+                          for measurement in result.measurements]
+            md.add(md.title(3, f'{result.name}: {"passed" if result.passed else "failed"}, '
+                               f'maximum scaling exponent {result.max_exponent:.2f}'))
+            md.add(md.table(table_data, headers, aligns=('r', 'r', 'r', 'r', 'r', 'r')))
+        print(md.text)
+    failed_models = [result.name for result in results if not result.passed]
+    if failed_models:
+        typer.echo(f'The tagging time per token of the models {failed_models} grows faster than '
+                   f'linearly, a scaling exponent above {max_exponent}.', err=True)
+        raise typer.Exit(code=1)
+
+
+BASELINE_CORPUS_FILE_HELP = '''
+A path to the corpus to measure the performance of the models on, the same
+corpus has to be used for the baseline and the check.
+'''
+BASELINE_MODEL_HELP = '''
+The name of a model, within the models catalog, to measure, can be given
+more than once, if not given every model is measured.
+'''
+BASELINES_DIRECTORY_HELP = '''
+The directory that stores the performance baselines, one JSON file per model
+version.
+'''
+BASELINE_REPEATS_HELP = '''
+The number of times to measure each model, each time within a new Python
+process, the best tokens per second and load time, and the median peak
+resident set size, are used.
+'''
+
+
+def _get_performance_entries(models_directory: Path, model: Optional[List[str]]) -> List[CatalogEntry]:
+    '''
+    Returns the catalog entries of the `model` names, or of every model
+    within the catalog of the `models_directory` if no names are given.
+    '''
+    catalog = read_catalog(models_directory)
+    model_names = model or sorted(catalog.models)
+    unknown_model_names = [model_name for model_name in model_names if model_name not in catalog.models]
+    if unknown_model_names:
+        raise typer.BadParameter(f'Cannot find the models {unknown_model_names} within the catalog '
+                                 f'{Path(models_directory, CATALOG_FILE_NAME)}.', param_hint='--model')
+    if not model_names:
+        raise typer.BadParameter('Cannot find any models within the catalog '
+                                 f'{Path(models_directory, CATALOG_FILE_NAME)}.',
+                                 param_hint='--models-directory')
+    return [catalog.models[model_name] for model_name in model_names]
+
+
+@app.command("record-baseline")
+def record_baseline(corpus_file: Path = typer.Argument(..., help=BASELINE_CORPUS_FILE_HELP,
+                                                       exists=True, file_okay=True,
+                                                       dir_okay=False, readable=True,
+                                                       resolve_path=True),
+                    corpus_format: CorpusFormat = OPTION(CorpusFormat.TEXT, help=CORPUS_FORMAT_HELP),
+                    models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                    help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                    exists=True, file_okay=False,
+                                                    dir_okay=True, resolve_path=True),
+                    model: Optional[List[str]] = OPTION(None, "--model", help=BASELINE_MODEL_HELP),
+                    baselines_directory: Path = OPTION(Path(REPO_DIRECTORY, 'performance_baselines'),
+                                                       help=BASELINES_DIRECTORY_HELP,
+                                                       file_okay=False, dir_okay=True,
+                                                       resolve_path=True),
+                    repeats: int = OPTION(3, min=1, help=BASELINE_REPEATS_HELP),
+                    batch_size: int = OPTION(1000, min=1, help=BATCH_SIZE_HELP)) -> None:
+    '''
+    Measures the tokens per second, load time, and peak resident set size
+    (RSS) of each model within the models catalog, `catalog.json`, of the
+    `models_directory` on the corpus and stores them as the performance
+    baseline of the model version within the `baselines_directory`, adding
+    to, or replacing the models of, any existing baseline of the version that
+    was measured on the same corpus and host, else replacing it.
+    '''
+    from pymusas_models.performance_baseline import (
+        create_baseline,
+        get_baseline_file,
+        measure_performance,
+        read_baseline,
+        write_baseline,
+    )
+
+    entries = _get_performance_entries(models_directory, model)
+    versions = sorted({entry.version for entry in entries})
+    if len(versions) != 1:
+        raise typer.BadParameter(f'The models have more than one version, {versions}, a baseline '
+                                 'is stored per model version.', param_hint='--model')
+    performances = measure_performance(entries, models_directory, corpus_file, corpus_format,
+                                       repeats=repeats, batch_size=batch_size)
+    baseline = create_baseline(versions[0], corpus_file.name, performances)
+    baseline_file = get_baseline_file(baselines_directory, versions[0])
+    if baseline_file.exists():
+        existing_baseline = read_baseline(baseline_file)
+        # The models measured on a different corpus, or host, are replaced.
+        if (existing_baseline.corpus, existing_baseline.host) == (baseline.corpus, baseline.host):
+            baseline.models = {**existing_baseline.models, **baseline.models}
+    baseline_file = write_baseline(baseline, baselines_directory)
+    typer.echo(f'Stored the performance baseline of {len(performances)} models within {baseline_file}',
+               err=True)
+
+
+MAX_THROUGHPUT_REGRESSION_HELP = '''
+The maximum relative decrease, e.g. `0.2` for 20%, of the tokens per second
+of a model compared to the baseline.
+'''
+MAX_LOAD_TIME_REGRESSION_HELP = '''
+The maximum relative increase, e.g. `0.25` for 25%, of the load time of a model
+compared to the baseline.
+'''
+MAX_RSS_REGRESSION_HELP = '''
+The maximum relative increase, e.g. `0.1` for 10%, of the peak resident set
+size of a model compared to the baseline.
+'''
+BASELINE_FILE_HELP = '''
+The baseline file to compare against, if not given the baseline of the latest
+model version, that is not later than the version of the models, within the
+`--baselines-directory` is used.
+'''
+
+ALLOW_OTHER_HOST_HELP = '''
+Compare against a baseline that was measured on a different host, a
+different CPU, number of CPU cores, or platform, rather than exiting, whereby
+a warning is printed as the measurements are not comparable.
+'''
+
+
+def _format_performance_value(metric: str, value: float) -> str:
+    '''
+    Returns the display value of the performance metric.
+    '''
+    if metric == 'rss_bytes':
+        return format_size(int(value))
+    if metric == 'load_seconds':
+        return f'{value:.2f}s'
+    return f'{value:,.0f}'
+
+
+@app.command("check-performance")
+def check_performance(corpus_file: Path = typer.Argument(..., help=BASELINE_CORPUS_FILE_HELP,
+                                                         exists=True, file_okay=True,
+                                                         dir_okay=False, readable=True,
+                                                         resolve_path=True),
+                      corpus_format: CorpusFormat = OPTION(CorpusFormat.TEXT, help=CORPUS_FORMAT_HELP),
+                      models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                      help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                      exists=True, file_okay=False,
+                                                      dir_okay=True, resolve_path=True),
+                      model: Optional[List[str]] = OPTION(None, "--model", help=BASELINE_MODEL_HELP),
+                      baselines_directory: Path = OPTION(Path(REPO_DIRECTORY, 'performance_baselines'),
+                                                         help=BASELINES_DIRECTORY_HELP,
+                                                         file_okay=False, dir_okay=True,
+                                                         resolve_path=True),
+                      baseline_file: Optional[Path] = OPTION(None, "--baseline", help=BASELINE_FILE_HELP,
+                                                             exists=True, file_okay=True,
+                                                             dir_okay=False, resolve_path=True),
+                      max_throughput_regression: float = OPTION(0.2, min=0.0,
+                                                                help=MAX_THROUGHPUT_REGRESSION_HELP),
+                      max_load_time_regression: float = OPTION(0.25, min=0.0,
+                                                               help=MAX_LOAD_TIME_REGRESSION_HELP),
+                      max_rss_regression: float = OPTION(0.1, min=0.0, help=MAX_RSS_REGRESSION_HELP),
+                      repeats: int = OPTION(3, min=1, help=BASELINE_REPEATS_HELP),
+                      batch_size: int = OPTION(1000, min=1, help=BATCH_SIZE_HELP),
+                      allow_other_host: bool = OPTION(False, help=ALLOW_OTHER_HOST_HELP),
+                      as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Measures the tokens per second, load time, and peak resident set size
+    (RSS) of each model within the models catalog, `catalog.json`, of the
+    `models_directory` on the corpus, the same corpus as the baseline, and
+    prints to stdout the change of each against the baseline, as a Markdown
+    table, or as JSON with `--json`. Exits with a non-zero exit code if any
+    of them has regressed by more than its maximum regression, or if there
+    is no baseline or any model is not within it. The baseline has to have
+    been measured on the same host, the same CPU, number of CPU cores, and
+    platform, unless `--allow-other-host` is given.
+    '''
+    from pymusas_models.performance_baseline import (
+        compare_to_baseline,
+        get_host_fingerprint,
+        get_latest_baseline_file,
+        measure_performance,
+        read_baseline,
+    )
+
+    entries = _get_performance_entries(models_directory, model)
+    if baseline_file is None:
+        baseline_file = get_latest_baseline_file(baselines_directory,
+                                                 max(entry.version for entry in entries))
+    if baseline_file is None:
+        raise typer.BadParameter(f'Cannot find any baselines within {baselines_directory}, '
+                                 'they are stored by the `record-baseline` command.',
+                                 param_hint='--baselines-directory')
+    baseline = read_baseline(baseline_file)
+    models_without_baseline = [entry.name for entry in entries if entry.name not in baseline.models]
+    if models_without_baseline:
+        raise typer.BadParameter(f'The baseline {baseline_file} does not contain the models '
+                                 f'{models_without_baseline}, record their baseline with the '
+                                 '`record-baseline` command, or leave them out with --model.',
+                                 param_hint='--model')
+    if baseline.corpus != corpus_file.name:
+        raise typer.BadParameter(f'The baseline {baseline_file} was measured on the corpus '
+                                 f'{baseline.corpus}, not {corpus_file.name}.',
+                                 param_hint='CORPUS_FILE')
+    host = get_host_fingerprint()
+    if baseline.host != host:
+        baseline_host = ('an unknown host' if baseline.host is None
+                         else f'{baseline.host.cpu}, {baseline.host.cpu_count} cores, {baseline.host.platform}')
+        host_message = (f'The baseline {baseline_file} was measured on {baseline_host}, not on this host, '
+                        f'{host.cpu}, {host.cpu_count} cores, {host.platform}, therefore the measurements '
+                        'are not comparable.')
+        if not allow_other_host:
+            raise typer.BadParameter(f'{host_message} Record a baseline on this host, or use '
+                                     '--allow-other-host to compare against it anyway.',
+                                     param_hint='--baseline')
+        typer.echo(f'Warning: {host_message}', err=True)
+    performances = measure_performance(entries, models_directory, corpus_file, corpus_format,
+                                       repeats=repeats, batch_size=batch_size)
+    regressions = compare_to_baseline(baseline, performances,
+                                      {'tokens_per_second': max_throughput_regression,
+                                       'load_seconds': max_load_time_regression,
+                                       'rss_bytes': max_rss_regression})
+    if as_json:
+        typer.echo(f'[{", ".join(regression.model_dump_json() for regression in regressions)}]')
+    else:
+        md = MarkdownRenderer()
+        headers = ["Model Name", "Metric", "Baseline", "Current", "Regression", "Maximum Regression",
+                   "Regressed"]
+        table_data = [[regression.name, regression.metric,
+                       _format_performance_value(regression.metric, regression.baseline),
+                       _format_performance_value(regression.metric, regression.current),
+                       f'{100 * regression.change:+.1f}%',
+                       f'{100 * regression.max_regression:.1f}%', 'yes' if regression.regressed else 'no']
+                      for regression in regressions]
+        md.add(md.title(3, f'Compared against {baseline_file.name}: PyMUSAS {baseline.pymusas_version}, '
+                           f'spaCy {baseline.spacy_version}, Python {baseline.python_version}'))
+        md.add(md.table(table_data, headers, aligns=('l', 'l', 'r', 'r', 'r', 'r', 'l')))
+        print(md.text)
+    regressed_models = sorted({regression.name for regression in regressions if regression.regressed})
+    if regressed_models:
+        typer.echo(f'The performance of the models {regressed_models} has regressed compared to the '
+                   f'baseline {baseline_file}.', err=True)
+        raise typer.Exit(code=1)
+
+
+MEMORY_MODEL_HELP = '''
+The name of a model, within the models catalog, to load, can be given more
+than once, if not given every model is loaded.
+'''
+MEMORY_REPEATS_HELP = '''
+The number of times to load the models, each time within a new Python
+process, the median peak resident set size is used.
+'''
+
+
+@app.command("memory-benchmark")
+def memory_benchmark(models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                                     help=EXISTING_MODEL_DIRECTORY_HELP,
+                                                     exists=True, file_okay=False,
+                                                     dir_okay=True, resolve_path=True),
+                     model: Optional[List[str]] = OPTION(None, "--model", help=MEMORY_MODEL_HELP),
+                     repeats: int = OPTION(3, min=1, help=MEMORY_REPEATS_HELP),
+                     as_json: bool = OPTION(False, "--json", help=JSON_HELP)) -> None:
+    '''
+    Loads every model within the models catalog, `catalog.json`, of the
+    `models_directory` into one process, like a `serve` worker, once through
+    `spacy.load` for each model and once through `MultiLanguageModels`, each
+    within a new Python process, and prints to stdout the peak resident set
+    size (RSS) of both, as a Markdown table, or as JSON with `--json`.
+    '''
+    from pymusas_models.memory_benchmark import measure_memory
+
+    entries = _get_performance_entries(models_directory, model)
+    result = measure_memory(entries, models_directory, repeats=repeats)
+    if as_json:
+        typer.echo(result.model_dump_json())
+    else:
+        md = MarkdownRenderer()
+        headers = ["Loaded Through", "Peak RSS"]
+        table_data = [['spacy.load', format_size(result.separate_rss_bytes)],
+                      ['MultiLanguageModels', format_size(result.shared_rss_bytes)]]
+        md.add(md.title(3, f'{len(result.models)} models: {100 * result.reduction:.1f}% less memory '
+                           'through MultiLanguageModels'))
+        md.add(md.table(table_data, headers, aligns=('l', 'r')))
+        print(md.text)
+
+
+SERVE_MODEL_HELP = '''
+The name, or Unix shell style pattern of names e.g. `en_dual_*`, of the
+PyMUSAS models to serve, can be given more than once. Patterns are matched
+against the models created within `--models-directory`, a name that does not
+match any created models is loaded as an installed model.
+'''
+HOST_HELP = '''
+The host to bind the server to.
+'''
+PORT_HELP = '''
+The port to bind the server to.
+'''
+SERVE_N_PROCESS_HELP = '''
+The number of worker processes that tag the requests, each worker loads all
+of the models.
+'''
+MAX_BATCH_SIZE_HELP = '''
+The maximum number of requests, for the same model, to tag as one batch.
+'''
+MAX_LATENCY_HELP = '''
+The maximum number of milliseconds to wait, after the first request of a
+batch, for more requests to add to the batch.
+'''
+
+
+@app.command("serve")
+def serve(model: List[str] = OPTION(..., "--model", help=SERVE_MODEL_HELP),
+          models_directory: Path = OPTION(Path(REPO_DIRECTORY, 'models'),
+                                          help=TAG_MODELS_DIRECTORY_HELP,
+                                          file_okay=False, dir_okay=True,
+                                          resolve_path=True),
+          host: str = OPTION('127.0.0.1', help=HOST_HELP),
+          port: int = OPTION(8000, help=PORT_HELP),
+          n_process: int = OPTION(1, min=1, help=SERVE_N_PROCESS_HELP),
+          max_batch_size: int = OPTION(32, min=1, help=MAX_BATCH_SIZE_HELP),
+          max_latency: float = OPTION(5.0, min=0.0, help=MAX_LATENCY_HELP)
+          ) -> None:
+    '''
+    Serves the PyMUSAS models over HTTP. Concurrent requests for the same
+    model are tagged as one batch within a pool of worker processes.
+
+    Endpoints: `POST /tag/{model_name}` with a JSON object containing either a
+    `text` or `tokens` key (see the `jsonl` format of `tag-corpus`),
+    `GET /models`, and `GET /metrics` (Prometheus text format).
+    '''
+    import asyncio
+
+    from pymusas_models.lexicon_package import lexicon_packages_importable
+    from pymusas_models.server import TaggingServer, find_models
+
+    models = find_models(model, models_directory)
+    server = TaggingServer(models, host=host, port=port, n_process=n_process,
+                           max_batch_size=max_batch_size,
+                           max_latency=max_latency / 1000)
+    typer.echo(f'Serving {", ".join(models)} on http://{host}:{port}', err=True)
+    # The worker processes, which load the models, are started with the
+    # `sys.path` of this process.
+    with lexicon_packages_importable(models_directory):
+        asyncio.run(server.serve_forever())
+
+
 if __name__ == '__main__':
     app(prog_name="pymusas-models")  # pragma: no cover
@@ -0,0 +1,233 @@
+'''
+Stores the large files of a pipeline component, e.g. the weights of a
+neural model, within a content addressed artifact store rather than within
+the model package, and fetches them from the store, when the model is
+loaded, into a cache that is shared by every Python environment of the user.
+
+When a model is created, `externalise_files` copies each large file of the
+component into the store, `{store}/sha256/{hash}`, and writes a manifest,
+`external_files.json`, with the path, size, and SHA256 hash of each file
+within the component directory. The `setup.py` of the model package does not
+include the files listed in a manifest, therefore the model package only
+contains the configuration, the small files, and the manifest.
+
+When the model package is loaded, `materialise_component` fetches any file
+that is not within the cache, verifies its hash, and returns a directory
+that contains the component with all of its files, which is then loaded
+through the `from_disk` method of the component. The store is either a local
+directory or an HTTP(S) URL, the default store is recorded within the
+manifest and can be changed through the `PYMUSAS_MODELS_ARTIFACT_STORE`
+environment variable. The cache directory is
+`$XDG_CACHE_HOME/pymusas_models`, `~/.cache/pymusas_models` by default, and
+can be changed through the `PYMUSAS_MODELS_CACHE` environment variable.
+
+This module is copied into every packaged model that uses an artifact store,
+through the `code_paths` argument of `pymusas_models.package.package`,
+therefore it should only import from the Python standard library.
+'''
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname, urlopen
+
+
+MANIFEST_FILE_NAME = 'external_files.json'
+STORE_ENVIRONMENT_VARIABLE = 'PYMUSAS_MODELS_ARTIFACT_STORE'
+CACHE_ENVIRONMENT_VARIABLE = 'PYMUSAS_MODELS_CACHE'
+# Files of at least this size, in bytes, are stored within the artifact store.
+DEFAULT_MIN_SIZE_BYTES = 64 * 1024
+_CHUNK_SIZE_BYTES = 1024 * 1024
+
+
+def _hash_file(file_path: Path) -> str:
+    file_hash = hashlib.sha256()
+    with file_path.open('rb') as file_fp:
+        for chunk in iter(lambda: file_fp.read(_CHUNK_SIZE_BYTES), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def get_cache_directory() -> Path:
+    '''
+    Returns the directory that stores the files fetched from the artifact
+    store, see the module docstring.
+
+    # Returns
+
+    `Path`
+    '''
+    cache_directory = os.environ.get(CACHE_ENVIRONMENT_VARIABLE)
+    if cache_directory:
+        return Path(cache_directory)
+    xdg_cache_directory = os.environ.get('XDG_CACHE_HOME') or Path(Path.home(), '.cache')
+    return Path(xdg_cache_directory, 'pymusas_models')
+
+
+def externalise_files(component_directory: Path, store_directory: Path,
+                      store_url: Optional[str] = None,
+                      min_size_bytes: int = DEFAULT_MIN_SIZE_BYTES) -> Dict[str, Any]:
+    '''
+    Copies every file, of at least `min_size_bytes`, within the
+    `component_directory` into the `store_directory` and writes the manifest
+    of these files to the `component_directory`. The files are kept within
+    the `component_directory`, but are not included in the model package.
+
+    # Parameters
+
+    component_directory : `Path`
+        The directory of the component, created by its `to_disk` method.
+    store_directory : `Path`
+        The local directory of the artifact store.
+    store_url : `str`, optional (default = `None`)
+        The location of the artifact store, a local directory or HTTP(S) URL,
+        that the model fetches the files from by default. If `None` the URI
+        of the `store_directory` is used.
+    min_size_bytes : `int`, optional (default = `DEFAULT_MIN_SIZE_BYTES`)
+        Files smaller than this are kept within the model package.
+
+    # Returns
+
+    `Dict[str, Any]`
+        The manifest.
+    '''
+    files: Dict[str, Dict[str, Any]] = {}
+    for component_file in sorted(component_directory.rglob('*')):
+        if not component_file.is_file() or component_file.stat().st_size < min_size_bytes:
+            continue
+        file_hash = _hash_file(component_file)
+        store_file = Path(store_directory, 'sha256', file_hash)
+        if not store_file.exists():
+            store_file.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(component_file, store_file)
+        files[component_file.relative_to(component_directory).as_posix()] = {
+            'sha256': file_hash, 'size_bytes': component_file.stat().st_size}
+    manifest = {'store_url': store_url or store_directory.resolve().as_uri(), 'files': files}
+    Path(component_directory, MANIFEST_FILE_NAME).write_text(json.dumps(manifest, indent=2),
+                                                             encoding='utf-8')
+    return manifest
+
+
+def fetch_file(store: str, file_hash: str, cache_directory: Path) -> Path:
+    '''
+    Returns the path to the file, with the given SHA256 hash, within the
+    `cache_directory`, fetching the file from the artifact store if it is not
+    within the cache.
+
+    # Parameters
+
+    store : `str`
+        The artifact store, a local directory, `file://` URI, or HTTP(S) URL.
+    file_hash : `str`
+        The SHA256 hash of the file.
+    cache_directory : `Path`
+        The cache directory, see `get_cache_directory`.
+
+    # Returns
+
+    `Path`
+
+    # Raises
+
+    `ValueError`
+        If the SHA256 hash of the fetched file is not `file_hash`.
+    '''
+    cache_file = Path(cache_directory, 'sha256', file_hash)
+    if cache_file.exists():
+        return cache_file
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    store_location = f'{store.rstrip("/")}/sha256/{file_hash}'
+    # The file is written to a temporary file, within the same directory, and
+    # then renamed so that concurrent loads never read a partial file.
+    with tempfile.NamedTemporaryFile(dir=cache_file.parent, delete=False) as temp_fp:
+        temp_file = Path(temp_fp.name)
+        try:
+            if urlparse(store).scheme in ('http', 'https'):
+                with urlopen(store_location) as response:
+                    shutil.copyfileobj(response, temp_fp, _CHUNK_SIZE_BYTES)
+            else:
+                if urlparse(store).scheme == 'file':
+                    store_location = url2pathname(urlparse(store_location).path)
+                with Path(store_location).open('rb') as store_fp:
+                    shutil.copyfileobj(store_fp, temp_fp, _CHUNK_SIZE_BYTES)
+        except BaseException:
+            temp_file.unlink()
+            raise
+    fetched_hash = _hash_file(temp_file)
+    if fetched_hash != file_hash:
+        temp_file.unlink()
+        raise ValueError(f'The file {store_location} fetched from the artifact store has a '
+                         f'SHA256 hash of {fetched_hash} rather than {file_hash}.')
+    os.replace(temp_file, cache_file)
+    return cache_file
+
+
+def materialise_component(component_directory: Path,
+                          store: Optional[str] = None,
+                          cache_directory: Optional[Path] = None) -> Path:
+    '''
+    Returns a directory that contains all of the files of the component,
+    whereby the files within the manifest of the `component_directory` are
+    fetched from the artifact store, if they are not within the cache. If the
+    `component_directory` already contains all of the files, e.g. a model
+    loaded from the models directory, the `component_directory` is returned.
+
+    # Parameters
+
+    component_directory : `Path`
+        The directory of the component, that contains the manifest.
+    store : `str`, optional (default = `None`)
+        The artifact store, a local directory, `file://` URI, or HTTP(S) URL.
+        If `None` the `PYMUSAS_MODELS_ARTIFACT_STORE` environment variable is
+        used, else the store within the manifest.
+    cache_directory : `Path`, optional (default = `None`)
+        The cache directory, if `None` `get_cache_directory` is used.
+
+    # Returns
+
+    `Path`
+    '''
+    manifest_file = Path(component_directory, MANIFEST_FILE_NAME)
+    manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    files: Dict[str, Dict[str, Any]] = manifest['files']
+    if all(Path(component_directory, file_path).is_file()
+           and Path(component_directory, file_path).stat().st_size == file_data['size_bytes']
+           for file_path, file_data in files.items()):
+        return component_directory
+
+    store = store or os.environ.get(STORE_ENVIRONMENT_VARIABLE) or manifest['store_url']
+    cache_directory = cache_directory or get_cache_directory()
+    manifest_hash = _hash_file(manifest_file)
+    materialised_directory = Path(cache_directory, 'components', manifest_hash)
+    if materialised_directory.exists():
+        return materialised_directory
+
+    materialised_directory.parent.mkdir(parents=True, exist_ok=True)
+    temp_directory = Path(tempfile.mkdtemp(dir=materialised_directory.parent))
+    try:
+        shutil.copytree(component_directory, temp_directory, dirs_exist_ok=True)
+        for file_path, file_data in files.items():
+            cache_file = fetch_file(store, file_data['sha256'], cache_directory)
+            component_file = Path(temp_directory, file_path)
+            component_file.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(cache_file, component_file)
+        try:
+            os.rename(temp_directory, materialised_directory)
+        except OSError:
+            # Another process has materialised the component.
+            shutil.rmtree(temp_directory)
+    except BaseException:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        raise
+    return materialised_directory
@@ -0,0 +1,238 @@
+'''
+A spaCy pipeline component that extends the PyMUSAS
+`pymusas.spacy_api.taggers.neural.NeuralTagger` with a bounded Least
+Recently Used (LRU) cache of the tags predicted for each `Doc`.
+
+The factory of the component is registered through the `spacy_factories`
+entry point of `pymusas_models`, so that it is registered once however many
+models that use the component are loaded, therefore the models that use the
+component depend on `pymusas_models`, see
+`pymusas_models.COMPONENT_REQUIREMENT`.
+'''
+from collections import OrderedDict
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from pymusas.spacy_api.taggers.neural import NeuralTagger
+from spacy.language import Language
+from spacy.tokens import Doc
+from spacy.training import Example
+from spacy.util import SimpleFrozenList
+import srsly
+
+
+DocTags = Tuple[Tuple[str, ...], ...]
+
+
+class CachedNeuralTagger(NeuralTagger):
+    '''
+    The same as the PyMUSAS `NeuralTagger` but the tags predicted for a `Doc`
+    are stored in a bounded LRU cache, keyed by a hash of the `Doc`'s token
+    texts, so that a repeated `Doc` is tagged without running the neural
+    model.
+
+    The cache is keyed on the whole `Doc`, as the neural model tags each
+    token within the context of the whole `Doc`, therefore the output is
+    always the same as the `NeuralTagger`. Only a `Doc` whose token texts are
+    the same as a previous `Doc` is found in the cache, e.g. an email footer
+    or disclaimer that is tagged as its own document, whereas a sentence
+    that is repeated within, or across, longer documents is not.
+
+    The cache is cleared whenever the neural model is loaded through the
+    `initialize` or `from_disk` methods.
+
+    # Parameters
+
+    name : `str`, optional (default = `pymusas_neural_tagger`)
+        The component name.
+    pymusas_tags_token_attr : `str`, optional (default = `pymusas_tags`)
+        See `NeuralTagger`.
+    pymusas_mwe_indexes_attr : `str`, optional (default = `pymusas_mwe_indexes`)
+        See `NeuralTagger`.
+    top_n : `int`, optional (default = `5`)
+        See `NeuralTagger`.
+    device : `str`, optional (default = `'cpu'`)
+        See `NeuralTagger`.
+    tokenizer_kwargs : `dict[str, Any] | None` (default = `None`)
+        See `NeuralTagger`.
+    doc_cache_size : `int`, optional (default = `1000`)
+        The maximum number of `Doc`s to store in the cache.
+
+    # Instance Attributes
+
+    cache_hits : `int`
+        Number of `Doc`s that were found in the cache.
+    cache_misses : `int`
+        Number of `Doc`s that were not found in the cache, and therefore
+        were tagged by the neural model.
+
+    # Raises
+
+    `ValueError`
+        If `doc_cache_size` is less than 1.
+    '''
+    COMPONENT_NAME = 'pymusas_cached_neural_tagger'
+
+    def __init__(self,
+                 name: str = 'pymusas_neural_tagger',
+                 pymusas_tags_token_attr: str = 'pymusas_tags',
+                 pymusas_mwe_indexes_attr: str = 'pymusas_mwe_indexes',
+                 top_n: int = 5,
+                 device: str = 'cpu',
+                 tokenizer_kwargs: dict[str, Any] | None = None,
+                 doc_cache_size: int = 1000
+                 ) -> None:
+        if doc_cache_size < 1:
+            raise ValueError('The `doc_cache_size` has to be greater than 0'
+                             f', value given: {doc_cache_size}')
+        super().__init__(name, pymusas_tags_token_attr, pymusas_mwe_indexes_attr,
+                         top_n, device, tokenizer_kwargs)
+        self._doc_cache_size = doc_cache_size
+        self._doc_cache: OrderedDict[bytes, DocTags] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def doc_cache_size(self) -> int:
+        return self._doc_cache_size
+
+    @property
+    def cache_currsize(self) -> int:
+        return len(self._doc_cache)
+
+    @property
+    def cache_hit_rate(self) -> float:
+        '''
+        The fraction of `Doc`s that were found in the cache, `0.0` if no
+        `Doc`s have been tagged.
+        '''
+        total = self.cache_hits + self.cache_misses
+        if total == 0:
+            return 0.0
+        return self.cache_hits / total
+
+    def clear_cache(self) -> None:
+        '''
+        Removes all entries from the cache and resets the `cache_hits` and
+        `cache_misses` counters to 0.
+        '''
+        self._doc_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def doc_key(self, tokens: List[str]) -> bytes:
+        '''
+        Returns the cache key of the `Doc`, a hash of the token texts and the
+        `top_n` value as the number of predicted tags depends on it.
+
+        # Parameters
+
+        tokens : `List[str]`
+            The token texts of the `Doc`.
+
+        # Returns
+
+        `bytes`
+        '''
+        serialised_doc = srsly.msgpack_dumps([self.top_n, tokens])
+        return hashlib.blake2b(serialised_doc, digest_size=16).digest()
+
+    def initialize(self,
+                   get_examples: Optional[Callable[[], Iterable[Example]]] = None,
+                   *,
+                   nlp: Optional[Language] = None,
+                   pretrained_model_name_or_path: Optional[str | Path] = None,
+                   ) -> None:
+        super().initialize(get_examples, nlp=nlp,
+                           pretrained_model_name_or_path=pretrained_model_name_or_path)
+        self.clear_cache()
+
+    def _predict(self, tokens: List[str]) -> DocTags:
+        predicted_tags_candidates = self.wsd_model.predict(tokens,  # type: ignore[union-attr]
+                                                           sub_word_tokenizer=self.tokenizer,
+                                                           top_n=self.top_n)
+        doc_tags: List[Tuple[str, ...]] = []
+        for token, predicted_tag_candidates in zip(tokens, predicted_tags_candidates):
+            if token.strip() == "":
+                doc_tags.append(("Z9",))
+            else:
+                doc_tags.append(tuple(predicted_tag_candidates))
+        return tuple(doc_tags)
+
+    def __call__(self, doc: Doc) -> Doc:
+        '''
+        Applies the tagger to the spaCy document, modifies it in place, and
+        returns it.
+
+        # Parameters
+
+        doc : `Doc`
+            A [spaCy `Doc`](https://spacy.io/api/doc)
+
+        # Returns
+
+        `Doc`
+        '''
+        if not self._validated:
+            self._validate()
+
+        error_handler = self.get_error_handler()
+        try:
+            tokens = [token.text for token in doc]
+            key = self.doc_key(tokens)
+            doc_tags = self._doc_cache.get(key)
+            if doc_tags is not None:
+                self._doc_cache.move_to_end(key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+                doc_tags = self._predict(tokens)
+                self._doc_cache[key] = doc_tags
+                if len(self._doc_cache) > self._doc_cache_size:
+                    self._doc_cache.popitem(last=False)
+
+            for token_index, token_tags in enumerate(doc_tags):
+                token = doc[token_index]
+                setattr(token._, self.pymusas_tags_token_attr, list(token_tags))
+                setattr(token._, self.pymusas_mwe_indexes_attr,
+                        [(token_index, token_index + 1)])
+        except Exception as e:
+            error_handler(self.name, self, [doc], e)
+
+        return doc
+
+    def from_disk(self,
+                  path: Union[str, Path],
+                  *,
+                  exclude: Iterable[str] = SimpleFrozenList()
+                  ) -> "CachedNeuralTagger":
+        super().from_disk(path, exclude=exclude)
+        self.clear_cache()
+        return self
+
+
+@Language.factory(CachedNeuralTagger.COMPONENT_NAME,
+                  assigns=['token._.pymusas_tags', 'token._.pymusas_mwe_indexes'],
+                  default_config={'pymusas_tags_token_attr': 'pymusas_tags',
+                                  'pymusas_mwe_indexes_attr': 'pymusas_mwe_indexes',
+                                  'top_n': 5,
+                                  'device': 'cpu',
+                                  'tokenizer_kwargs': None,
+                                  'doc_cache_size': 1000})
+def make_cached_neural_tagger(nlp: Language,
+                              name: str,
+                              pymusas_tags_token_attr: str,
+                              pymusas_mwe_indexes_attr: str,
+                              top_n: int,
+                              device: str,
+                              tokenizer_kwargs: None | dict[str, Any],
+                              doc_cache_size: int
+                              ) -> CachedNeuralTagger:
+    return CachedNeuralTagger(name,
+                              pymusas_tags_token_attr,
+                              pymusas_mwe_indexes_attr,
+                              top_n,
+                              device,
+                              tokenizer_kwargs,
+                              doc_cache_size)
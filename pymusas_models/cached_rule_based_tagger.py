@@ -0,0 +1,306 @@
+'''
+A spaCy pipeline component that extends the PyMUSAS
+`pymusas.spacy_api.taggers.rule_based.RuleBasedTagger` with a bounded Least
+Recently Used (LRU) cache for the single word lexicon lookups.
+
+The factory of the component is registered through the `spacy_factories`
+entry point of `pymusas_models`, so that it is registered once however many
+models that use the component are loaded, therefore the models that use the
+component depend on `pymusas_models`, see
+`pymusas_models.COMPONENT_REQUIREMENT`.
+'''
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, cast
+
+from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker, LexiconEntryRanker
+from pymusas.rankers.ranking_meta_data import RankingMetaData
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.rule import Rule
+from pymusas.taggers.rules.single_word import SingleWordRule
+from spacy.language import Language
+from spacy.tokens import Doc
+
+
+LookupKey = Tuple[str, str, str]
+
+
+class CachedRuleBasedTagger(RuleBasedTagger):
+    '''
+    The same as the PyMUSAS `RuleBasedTagger` but the result of the single
+    word rules, for a given (text, lemma, POS) triple, is stored in a bounded
+    LRU cache so that frequently occurring tokens skip candidate generation,
+    POS mapping, and ranking.
+
+    Only the single word path is cached, any rule that is not a
+    `SingleWordRule`, e.g. the `MWERule`, is applied to every document as
+    the result of those rules depends on the context of the token. As the
+    `ContextualRuleBasedRanker` always ranks Multi Word Expression (MWE) matches
+    lower than single word matches, a token that is part of a MWE match
+    never reads from nor writes to the cache, therefore a MWE match always
+    overrides the cached single word result for that token. If the `rules`
+    contain a rule that is not a `SingleWordRule` or `MWERule`, or the `ranker`
+    is not a `ContextualRuleBasedRanker`, then the cache is not used and the
+    tagger behaves exactly like the `RuleBasedTagger`.
+
+    The cache is cleared whenever the `rules` or `ranker` attributes are set,
+    this includes when they are set through the `initialize`, `from_bytes`,
+    and `from_disk` methods.
+
+    # Parameters
+
+    name : `str`, optional (default = `pymusas_rule_based_tagger`)
+        The component name.
+    pymusas_tags_token_attr : `str`, optional (default = `pymusas_tags`)
+        See `RuleBasedTagger`.
+    pymusas_mwe_indexes_attr : `str`, optional (default = `pymusas_mwe_indexes`)
+        See `RuleBasedTagger`.
+    pos_attribute : `str`, optional (default = `pos_`)
+        See `RuleBasedTagger`.
+    lemma_attribute : `str`, optional (default = `lemma_`)
+        See `RuleBasedTagger`.
+    lookup_cache_size : `int`, optional (default = `10000`)
+        The maximum number of (text, lemma, POS) triples to store in the cache.
+
+    # Instance Attributes
+
+    cache_hits : `int`
+        Number of single word lookups that were found in the cache.
+    cache_misses : `int`
+        Number of single word lookups that were not found in the cache.
+
+    # Raises
+
+    `ValueError`
+        If `lookup_cache_size` is less than 1.
+    '''
+    COMPONENT_NAME = 'pymusas_cached_rule_based_tagger'
+
+    def __init__(self,
+                 name: str = 'pymusas_rule_based_tagger',
+                 pymusas_tags_token_attr: str = 'pymusas_tags',
+                 pymusas_mwe_indexes_attr: str = 'pymusas_mwe_indexes',
+                 pos_attribute: str = 'pos_',
+                 lemma_attribute: str = 'lemma_',
+                 lookup_cache_size: int = 10000
+                 ) -> None:
+        if lookup_cache_size < 1:
+            raise ValueError('The `lookup_cache_size` has to be greater than 0'
+                             f', value given: {lookup_cache_size}')
+        self._lookup_cache_size = lookup_cache_size
+        self._lookup_cache: OrderedDict[LookupKey, Optional[Tuple[str, ...]]] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._rules: Optional[List[Rule]] = None
+        self._ranker: Optional[LexiconEntryRanker] = None
+        super().__init__(name, pymusas_tags_token_attr, pymusas_mwe_indexes_attr,
+                         pos_attribute, lemma_attribute)
+
+    @property
+    def rules(self) -> Optional[List[Rule]]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: Optional[List[Rule]]) -> None:
+        self._rules = rules
+        self.clear_cache()
+
+    @property
+    def ranker(self) -> Optional[LexiconEntryRanker]:
+        return self._ranker
+
+    @ranker.setter
+    def ranker(self, ranker: Optional[LexiconEntryRanker]) -> None:
+        self._ranker = ranker
+        self.clear_cache()
+
+    @property
+    def lookup_cache_size(self) -> int:
+        return self._lookup_cache_size
+
+    @property
+    def cache_currsize(self) -> int:
+        return len(self._lookup_cache)
+
+    @property
+    def cache_hit_rate(self) -> float:
+        '''
+        The fraction of single word lookups that were found in the cache,
+        `0.0` if no lookups have been made.
+        '''
+        total = self.cache_hits + self.cache_misses
+        if total == 0:
+            return 0.0
+        return self.cache_hits / total
+
+    def clear_cache(self) -> None:
+        '''
+        Removes all entries from the cache and resets the `cache_hits` and
+        `cache_misses` counters to 0.
+        '''
+        self._lookup_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _can_use_cache(self) -> bool:
+        '''
+        Returns `True` if the single word results are independent of the
+        context of the token, which is only guaranteed for
+        `SingleWordRule` and `MWERule` rules ranked by a
+        `ContextualRuleBasedRanker`.
+        '''
+        if not isinstance(self.ranker, ContextualRuleBasedRanker):
+            return False
+        rules = cast(List[Rule], self.rules)
+        return all(isinstance(rule, (SingleWordRule, MWERule)) for rule in rules)
+
+    def _lookup_single_word_tags(self, keys: List[LookupKey]
+                                 ) -> List[Optional[Tuple[str, ...]]]:
+        '''
+        Returns the semantic tags of the best single word match for each
+        (text, lemma, POS) key, `None` if no match can be found, using the
+        cache where possible and storing any new results in the cache.
+        '''
+        ranker = cast(LexiconEntryRanker, self.ranker)
+        single_word_rules = [rule for rule in cast(List[Rule], self.rules)
+                             if isinstance(rule, SingleWordRule)]
+
+        results: List[Optional[Tuple[str, ...]]] = [None for _ in keys]
+        missed_key_indexes: Dict[LookupKey, List[int]] = {}
+        for index, key in enumerate(keys):
+            if key in self._lookup_cache:
+                self._lookup_cache.move_to_end(key)
+                results[index] = self._lookup_cache[key]
+                self.cache_hits += 1
+                continue
+            # Repeated keys within the same lookup are only computed once.
+            if key in missed_key_indexes:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+            missed_key_indexes.setdefault(key, []).append(index)
+
+        if not missed_key_indexes:
+            return results
+
+        missed_keys = list(missed_key_indexes)
+        tokens = [key[0] for key in missed_keys]
+        lemmas = [key[1] for key in missed_keys]
+        pos_tags = [key[2] for key in missed_keys]
+        token_ranking_meta_data: List[List[RankingMetaData]] \
+            = [[] for _ in range(len(missed_keys))]
+        for rule in single_word_rules:
+            rule_ranking_meta_data = rule(tokens, lemmas, pos_tags)
+            for token_index, ranking_meta_data in enumerate(rule_ranking_meta_data):
+                token_ranking_meta_data[token_index].extend(ranking_meta_data)
+        # Single word matches only cover one token, therefore the best match
+        # for each missed key is independent of all the other missed keys.
+        _, token_best_rank = ranker(token_ranking_meta_data)
+
+        for key, best_rank in zip(missed_keys, token_best_rank):
+            tags: Optional[Tuple[str, ...]] = None
+            if best_rank is not None:
+                tags = best_rank.semantic_tags
+            for index in missed_key_indexes[key]:
+                results[index] = tags
+            self._lookup_cache[key] = tags
+            if len(self._lookup_cache) > self._lookup_cache_size:
+                self._lookup_cache.popitem(last=False)
+        return results
+
+    def __call__(self, doc: Doc) -> Doc:
+        '''
+        Applies the tagger to the spaCy document, modifies it in place, and
+        returns it.
+
+        # Parameters
+
+        doc : `Doc`
+            A [spaCy `Doc`](https://spacy.io/api/doc)
+
+        # Returns
+
+        `Doc`
+        '''
+        if not self._validated:
+            self._validate()
+
+        if not self._can_use_cache():
+            return super().__call__(doc)
+
+        ranker = cast(LexiconEntryRanker, self.ranker)
+        context_rules = [rule for rule in cast(List[Rule], self.rules)
+                         if not isinstance(rule, SingleWordRule)]
+
+        error_handler = self.get_error_handler()
+        try:
+            tokens: List[str] = []
+            lemmas: List[str] = []
+            pos_tags: List[str] = []
+            for token in doc:
+                tokens.append(token.text)
+                lemmas.append(getattr(token, self.lemma_attribute))
+                pos_tags.append(getattr(token, self.pos_attribute))
+
+            token_best_rank: List[Optional[RankingMetaData]] = [None for _ in tokens]
+            if context_rules:
+                token_ranking_meta_data: List[List[RankingMetaData]] \
+                    = [[] for _ in range(len(tokens))]
+                for rule in context_rules:
+                    rule_ranking_meta_data = rule(tokens, lemmas, pos_tags)
+                    for token_index, ranking_meta_data in enumerate(rule_ranking_meta_data):
+                        token_ranking_meta_data[token_index].extend(ranking_meta_data)
+                _, token_best_rank = ranker(token_ranking_meta_data)
+
+            single_word_indexes = [token_index for token_index, best_rank
+                                   in enumerate(token_best_rank) if best_rank is None]
+            single_word_keys = [(tokens[token_index], lemmas[token_index], pos_tags[token_index])
+                                for token_index in single_word_indexes]
+            single_word_tags = self._lookup_single_word_tags(single_word_keys)
+
+            for token_index, best_rank in enumerate(token_best_rank):
+                if best_rank is None:
+                    continue
+                token = doc[token_index]
+                setattr(token._, self.pymusas_tags_token_attr, list(best_rank.semantic_tags))
+                setattr(token._, self.pymusas_mwe_indexes_attr,
+                        [(best_rank.token_match_start_index,
+                          best_rank.token_match_end_index)])
+
+            for token_index, tags in zip(single_word_indexes, single_word_tags):
+                token = doc[token_index]
+                if tags is None:
+                    pos_tag = pos_tags[token_index]
+                    if pos_tag in self.default_punctuation_tags:
+                        tags = ('PUNCT',)
+                    elif pos_tag in self.default_number_tags:
+                        tags = ('N1',)
+                    else:
+                        tags = ('Z99',)
+                setattr(token._, self.pymusas_tags_token_attr, list(tags))
+                setattr(token._, self.pymusas_mwe_indexes_attr,
+                        [(token_index, token_index + 1)])
+        except Exception as e:
+            error_handler(self.name, self, [doc], e)
+
+        return doc
+
+
+@Language.factory(CachedRuleBasedTagger.COMPONENT_NAME, requires=['token.pos', 'token.lemma'],
+                  assigns=['token._.pymusas_tags', 'token._.pymusas_mwe_indexes'],
+                  default_config={'pymusas_tags_token_attr': 'pymusas_tags',
+                                  'pymusas_mwe_indexes_attr': 'pymusas_mwe_indexes',
+                                  'pos_attribute': 'pos_',
+                                  'lemma_attribute': 'lemma_',
+                                  'lookup_cache_size': 10000})
+def make_cached_rule_based_tagger(nlp: Language, name: str,
+                                  pymusas_tags_token_attr: str,
+                                  pymusas_mwe_indexes_attr: str,
+                                  pos_attribute: str,
+                                  lemma_attribute: str,
+                                  lookup_cache_size: int
+                                  ) -> CachedRuleBasedTagger:
+    return CachedRuleBasedTagger(name, pymusas_tags_token_attr,
+                                 pymusas_mwe_indexes_attr,
+                                 pos_attribute, lemma_attribute,
+                                 lookup_cache_size)
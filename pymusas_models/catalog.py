@@ -0,0 +1,333 @@
+'''
+The machine readable catalog, `catalog.json`, of all of the models, and
+shared lexicon data packages, created within a models directory by the
+`create-models` command.
+
+Each entry contains the structured attributes of the model, taken from the
+language resource meta data rather than the model name, the size and SHA256
+checksum of its build files, and any benchmark results, so that the
+`overview-of-models` command, the release script, and consumers of the models
+can read one file rather than every model package.
+'''
+import hashlib
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pymusas_models.language_resource import (
+    LexiconCompression,
+    Model,
+    ModelTypes,
+    MWERule,
+    NeuralModel,
+    POSMapper,
+    RuleModel,
+    RuleRankers,
+    RuleType,
+    SingleRule,
+)
+from pymusas_models.lexicon_compression import get_compressed_files
+
+
+CATALOG_FILE_NAME = 'catalog.json'
+
+
+class DistributionFile(BaseModel):
+    file_name: str
+    size_bytes: int
+    sha256: str
+
+
+class CatalogEntry(BaseModel):
+    name: str
+    version: str
+    package_name: str
+    language_code: str
+    language_name: str
+    model_type: ModelTypes
+    mwe: bool
+    pos_mapper: POSMapper | None
+    ranker: RuleRankers | None
+    neural_model: str | None
+    lexicon_urls: list[str]
+    spacy_version: str
+    requirements: list[str]
+    wheel: DistributionFile
+    sdist: DistributionFile
+    pipeline_size_bytes: int
+    lexicon_compression: LexiconCompression | None = None
+    benchmarks: dict[str, float] = {}
+
+    @property
+    def size_bytes(self) -> int:
+        '''
+        The size of the largest build file, `.whl` or `.tar.gz`, in bytes.
+        '''
+        return max(self.wheel.size_bytes, self.sdist.size_bytes)
+
+
+class LexiconPackageEntry(BaseModel):
+    name: str
+    version: str
+    package_name: str
+    language_code: str
+    wheel: DistributionFile
+    sdist: DistributionFile
+
+
+class ModelCatalog(BaseModel):
+    models: dict[str, CatalogEntry] = {}
+    lexicon_packages: dict[str, LexiconPackageEntry] = {}
+
+    def find(self, language_code: str | None = None,
+             model_type: ModelTypes | None = None,
+             mwe: bool | None = None) -> list[CatalogEntry]:
+        '''
+        Returns the models that meet all of the given requirements, a
+        requirement of `None` is not used, sorted by the size of the model
+        so that the first model is the cheapest to download and load.
+
+        # Parameters
+
+        language_code : `str`, optional (default = `None`)
+            The language code of the model, e.g. `en`.
+        model_type : `ModelTypes`, optional (default = `None`)
+            The type of the model.
+        mwe : `bool`, optional (default = `None`)
+            Whether the model can tag Multi Word Expressions (MWE).
+
+        # Returns
+
+        `list[CatalogEntry]`
+        '''
+        models: list[CatalogEntry] = []
+        for entry in self.models.values():
+            if language_code is not None and entry.language_code != language_code:
+                continue
+            if model_type is not None and entry.model_type != model_type:
+                continue
+            if mwe is not None and entry.mwe != mwe:
+                continue
+            models.append(entry)
+        return sorted(models, key=lambda entry: (entry.pipeline_size_bytes, entry.size_bytes,
+                                                 entry.name))
+
+
+def read_catalog(models_directory: Path) -> ModelCatalog:
+    '''
+    Returns the catalog within the `models_directory`, an empty catalog if
+    the catalog file does not exist.
+
+    # Parameters
+
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+
+    # Returns
+
+    `ModelCatalog`
+    '''
+    catalog_file = Path(models_directory, CATALOG_FILE_NAME)
+    if not catalog_file.exists():
+        return ModelCatalog()
+    return ModelCatalog.model_validate_json(catalog_file.read_text(encoding='utf-8'))
+
+
+def write_catalog(catalog: ModelCatalog, models_directory: Path) -> None:
+    '''
+    Writes the catalog, with the models sorted by name, to the catalog file
+    within the `models_directory`.
+
+    # Parameters
+
+    catalog : `ModelCatalog`
+        The catalog to write.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+
+    # Returns
+
+    `None`
+    '''
+    # srsly is imported here, rather than at the top of the module, as it
+    # imports numpy, which would slow down the `overview-of-models` and
+    # `package-index` commands that only read the catalog.
+    import srsly
+
+    catalog_data = catalog.model_dump(mode='json')
+    catalog_data['models'] = dict(sorted(catalog_data['models'].items()))
+    catalog_data['lexicon_packages'] = dict(sorted(catalog_data['lexicon_packages'].items()))
+    srsly.write_json(Path(models_directory, CATALOG_FILE_NAME), catalog_data)
+
+
+def get_model_distribution_files(model_directory: Path) -> dict[str, DistributionFile]:
+    '''
+    Returns the wheel, key `.whl`, and sdist, key `.gz`, of the model that
+    has been packaged within `model_directory`, whereby the SHA256 checksums
+    are those added to the `meta.json` file of the model by
+    `pymusas_models.__main__.add_model_specific_meta_data`.
+
+    # Parameters
+
+    model_directory : `Path`
+        The directory of the packaged model, e.g.
+        `./models/en_dual_none_contextual_none-0.4.0`.
+
+    # Returns
+
+    `dict[str, DistributionFile]`
+    '''
+    import srsly
+
+    meta_data = srsly.read_json(Path(model_directory, 'meta.json'))
+    distribution_files: dict[str, DistributionFile] = {}
+    for dist_file in Path(model_directory, 'dist').iterdir():
+        checksum_key = 'checksum_whl' if dist_file.suffix == '.whl' else 'checksum'
+        distribution_files[dist_file.suffix] = DistributionFile(file_name=dist_file.name,
+                                                                size_bytes=dist_file.stat().st_size,
+                                                                sha256=meta_data[checksum_key])
+    return distribution_files
+
+
+def create_catalog_entry(model_directory: Path, model: Model,
+                         language_code: str) -> CatalogEntry:
+    '''
+    Returns the catalog entry of the model that has been packaged within
+    `model_directory`, whereby the `meta.json` file of the model contains the
+    meta data added by `pymusas_models.__main__.add_model_specific_meta_data`.
+
+    # Parameters
+
+    model_directory : `Path`
+        The directory of the packaged model, e.g.
+        `./models/en_dual_none_contextual_none-0.4.0`.
+    model : `Model`
+        The language resource meta data of the model.
+    language_code : `str`
+        The language code of the model, e.g. `en`.
+
+    # Returns
+
+    `CatalogEntry`
+    '''
+    import srsly
+
+    meta_data = srsly.read_json(Path(model_directory, 'meta.json'))
+    model_name = meta_data['name']
+    version = meta_data['version']
+
+    distribution_files = get_model_distribution_files(model_directory)
+
+    pipeline_directory = Path(model_directory, model_name, f'{model_name}-{version}')
+    # The uncompressed lexicons of a model that compresses its lexicons are
+    # not within its package.
+    compressed_files = get_compressed_files(pipeline_directory)
+    pipeline_size_bytes = sum(pipeline_file.stat().st_size
+                              for pipeline_file in pipeline_directory.rglob('*')
+                              if pipeline_file.is_file() and pipeline_file not in compressed_files)
+
+    mwe = False
+    pos_mapper: POSMapper | None = None
+    ranker: RuleRankers | None = None
+    neural_model: str | None = None
+    lexicon_urls: list[str] = []
+    lexicon_compression: LexiconCompression | None = None
+    if isinstance(model, RuleModel):
+        ranker = model.resources.ranker
+        lexicon_compression = model.lexicon_compression
+        for rule in model.resources.rules:
+            assert isinstance(rule, (SingleRule, MWERule))
+            if rule.rule_type == RuleType.MWE:
+                mwe = True
+            if pos_mapper is None:
+                pos_mapper = rule.pos_mapper
+            lexicon_urls.append(rule.lexicon_url)
+    elif isinstance(model, NeuralModel):
+        neural_model = model.pretrained_model_name_or_path
+
+    return CatalogEntry(name=model_name, version=version,
+                        package_name=model_directory.name,
+                        language_code=language_code,
+                        language_name=meta_data['full_language_name'],
+                        model_type=model.model_type, mwe=mwe,
+                        pos_mapper=pos_mapper, ranker=ranker,
+                        neural_model=neural_model, lexicon_urls=lexicon_urls,
+                        spacy_version=meta_data['spacy_version'],
+                        requirements=meta_data['requirements'],
+                        wheel=distribution_files['.whl'],
+                        sdist=distribution_files['.gz'],
+                        pipeline_size_bytes=pipeline_size_bytes,
+                        lexicon_compression=lexicon_compression)
+
+
+def create_lexicon_package_entry(package_directory: Path, name: str, version: str,
+                                 language_code: str) -> LexiconPackageEntry:
+    '''
+    Returns the catalog entry of the shared lexicon data package that has
+    been created within `package_directory`, see
+    `pymusas_models.lexicon_package.create_lexicon_package`.
+
+    # Parameters
+
+    package_directory : `Path`
+        The directory of the data package, e.g.
+        `./models/pymusas_lexicon_en-0.4.0`.
+    name : `str`
+        The name of the data package, e.g. `pymusas_lexicon_en`.
+    version : `str`
+        The version of the data package.
+    language_code : `str`
+        The language code of the data package, e.g. `en`.
+
+    # Returns
+
+    `LexiconPackageEntry`
+    '''
+    distribution_files: dict[str, DistributionFile] = {}
+    for dist_file in Path(package_directory, 'dist').iterdir():
+        distribution_files[dist_file.suffix] = DistributionFile(file_name=dist_file.name,
+                                                                size_bytes=dist_file.stat().st_size,
+                                                                sha256=hashlib.sha256(dist_file.read_bytes()).hexdigest())
+    return LexiconPackageEntry(name=name, version=version,
+                               package_name=package_directory.name,
+                               language_code=language_code,
+                               wheel=distribution_files['.whl'],
+                               sdist=distribution_files['.gz'])
+
+
+def update_catalog(models_directory: Path, entry: CatalogEntry | LexiconPackageEntry) -> None:
+    '''
+    Adds, or replaces, the `entry`, of either a model or a shared lexicon
+    data package, within the catalog of the `models_directory` and removes
+    the entries of models and data packages that no longer exist within the
+    `models_directory`. The benchmark results of a replaced model entry are
+    kept if the wheel of the model has not changed.
+
+    # Parameters
+
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    entry : `CatalogEntry | LexiconPackageEntry`
+        The entry of the model, or data package, to add.
+
+    # Returns
+
+    `None`
+    '''
+    catalog = read_catalog(models_directory)
+    if isinstance(entry, LexiconPackageEntry):
+        catalog.lexicon_packages[entry.name] = entry
+    else:
+        existing_entry = catalog.models.get(entry.name)
+        if existing_entry is not None and existing_entry.wheel.sha256 == entry.wheel.sha256:
+            entry.benchmarks = {**existing_entry.benchmarks, **entry.benchmarks}
+        catalog.models[entry.name] = entry
+    catalog.models = {model_name: model_entry for model_name, model_entry in catalog.models.items()
+                      if Path(models_directory, model_entry.package_name).exists()}
+    catalog.lexicon_packages = {package_name: package_entry
+                                for package_name, package_entry in catalog.lexicon_packages.items()
+                                if Path(models_directory, package_entry.package_name).exists()}
+    write_catalog(catalog, models_directory)
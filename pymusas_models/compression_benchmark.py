@@ -0,0 +1,163 @@
+'''
+Benchmarks the lexicon compression settings, see
+`pymusas_models.lexicon_compression`, of a model created by the
+`create-models` command, used by the `compression-benchmark` command.
+
+For each setting the pipeline data of the model is packaged into a wheel,
+which is installed, without its dependencies, into a new directory through
+`pip`, and the model is then loaded, through the `load` function of its
+package, within a new Python process, therefore the wheel size, installed
+size, install time, and load time of each setting can be compared.
+'''
+import os
+from pathlib import Path
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from pydantic import BaseModel
+import srsly
+
+from pymusas_models import lexicon_compression
+from pymusas_models.catalog import CatalogEntry
+from pymusas_models.language_resource import LexiconCompression
+
+
+# Prints the number of seconds that it takes to import and load the model,
+# argv[1] is the name of the model.
+LOAD_SCRIPT = '''
+import importlib
+import sys
+import time
+
+start_time = time.perf_counter()
+importlib.import_module(sys.argv[1]).load()
+print(time.perf_counter() - start_time)
+'''
+
+
+class CompressionBenchmarkResult(BaseModel):
+    setting: str
+    lexicon_compression: LexiconCompression | None
+    wheel_size_bytes: int
+    installed_size_bytes: int
+    install_seconds: float
+    load_seconds: float
+
+
+def get_setting_name(setting: Optional[LexiconCompression]) -> str:
+    '''
+    Returns the display name of the lexicon compression setting.
+
+    # Parameters
+
+    setting : `LexiconCompression`, optional
+        The setting, `None` for no compression.
+
+    # Returns
+
+    `str`
+    '''
+    if setting is None:
+        return 'none'
+    if setting.dictionary_size_bytes:
+        return f'zstd {setting.level}, {setting.dictionary_size_bytes // 1024}KB dictionary'
+    return f'zstd {setting.level}'
+
+
+def _build_wheel(entry: CatalogEntry, models_directory: Path,
+                 setting: Optional[LexiconCompression], output_directory: Path) -> Path:
+    '''
+    Returns the wheel of the model packaged with the lexicon compression
+    setting.
+    '''
+    from pymusas_models.package import package
+
+    package_directory = Path(models_directory, entry.package_name, entry.name)
+    pipeline_directory = Path(package_directory, f'{entry.name}-{entry.version}')
+    input_directory = Path(output_directory, 'pipeline')
+    # The pipeline data without any existing compressed lexicons.
+    shutil.copytree(pipeline_directory, input_directory,
+                    ignore=shutil.ignore_patterns(f'*{lexicon_compression.COMPRESSED_SUFFIX}',
+                                                  lexicon_compression.MANIFEST_FILE_NAME,
+                                                  lexicon_compression.DICTIONARY_FILE_NAME))
+    code_paths = [code_path for code_path in sorted(package_directory.glob('*.py'))
+                  if code_path.name not in ('__init__.py', Path(lexicon_compression.__file__).name)]
+    meta_path = Path(input_directory, 'meta.json')
+    meta = srsly.read_json(meta_path)
+    meta['requirements'] = [requirement for requirement in meta['requirements']
+                            if requirement != lexicon_compression.REQUIREMENT]
+    if setting is not None:
+        lexicon_compression.compress_files(Path(input_directory, entry.model_type.value),
+                                           setting.level, setting.dictionary_size_bytes)
+        code_paths.append(Path(lexicon_compression.__file__))
+        meta['requirements'].append(lexicon_compression.REQUIREMENT)
+    srsly.write_json(meta_path, meta)
+
+    package(input_directory, output_directory, code_paths=code_paths,
+            create_sdist=False, create_wheel=False, name=entry.name,
+            version=entry.version)
+    main_directory = Path(output_directory, f'{entry.name}-{entry.version}')
+    subprocess.run([sys.executable, 'setup.py', 'bdist_wheel'], cwd=main_directory,
+                   check=True, capture_output=True)
+    return next(Path(main_directory, 'dist').glob('*.whl'))
+
+
+def benchmark_lexicon_compression(entry: CatalogEntry, models_directory: Path,
+                                  settings: List[Optional[LexiconCompression]],
+                                  repeats: int = 3) -> List[CompressionBenchmarkResult]:
+    '''
+    Returns the wheel size, installed size, install time, and load time of
+    the model packaged with each of the lexicon compression `settings`,
+    whereby the times are the median of `repeats` installs and loads.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    settings : `List[Optional[LexiconCompression]]`
+        The lexicon compression settings, `None` for no compression.
+    repeats : `int`, optional (default = `3`)
+        The number of times to install and load the model for each setting.
+
+    # Returns
+
+    `List[CompressionBenchmarkResult]`
+    '''
+    results: List[CompressionBenchmarkResult] = []
+    for setting in settings:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            wheel_file = _build_wheel(entry, models_directory, setting, Path(temp_directory, 'build'))
+            install_times: List[float] = []
+            load_times: List[float] = []
+            installed_size_bytes = 0
+            for repeat in range(repeats):
+                target_directory = Path(temp_directory, f'target_{repeat}')
+                start_time = time.perf_counter()
+                subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-deps',
+                                '--no-cache-dir', '--no-compile', '--target',
+                                str(target_directory), str(wheel_file)],
+                               check=True, capture_output=True)
+                install_times.append(time.perf_counter() - start_time)
+                installed_size_bytes = sum(installed_file.stat().st_size for installed_file
+                                           in Path(target_directory, entry.name).rglob('*')
+                                           if installed_file.is_file())
+                completed_process = subprocess.run([sys.executable, '-c', LOAD_SCRIPT, entry.name],
+                                                   cwd=temp_directory, check=True,
+                                                   capture_output=True, text=True,
+                                                   env={**os.environ, 'PYTHONPATH': str(target_directory)})
+                load_times.append(float(completed_process.stdout))
+            results.append(CompressionBenchmarkResult(setting=get_setting_name(setting),
+                                                      lexicon_compression=setting,
+                                                      wheel_size_bytes=wheel_file.stat().st_size,
+                                                      installed_size_bytes=installed_size_bytes,
+                                                      install_seconds=statistics.median(install_times),
+                                                      load_seconds=statistics.median(load_times)))
+    return results
@@ -0,0 +1,18 @@
+'''
+The corpus and output formats of the `tag-corpus` command, which are within
+their own module so that the command line interface can be built without
+importing spaCy, see `pymusas_models.tag_corpus`.
+'''
+from enum import Enum
+
+
+class CorpusFormat(str, Enum):
+    TEXT = 'text'
+    JSONL = 'jsonl'
+    CONLLU = 'conllu'
+
+
+class OutputFormat(str, Enum):
+    JSONL = 'jsonl'
+    PARQUET = 'parquet'
+    ARROW = 'arrow'
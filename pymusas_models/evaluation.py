@@ -0,0 +1,225 @@
+'''
+Evaluates the models, created by the `create-models` command, against a
+local gold standard USAS annotated corpus, used by the `evaluate-models`
+command.
+
+The gold standard corpus is a JSONL file in the `jsonl` corpus format of the
+`tag-corpus` command, whereby each object has the `tokens` key, with the
+optional `spaces`, `lemmas`, `pos`, and `tags` keys, as the rule based models
+require the lemmas and POS tags of the tokens, and:
+
+* `usas_tags`, a list, the same length as `tokens`, of the gold USAS tag of
+each token, `null` for a token that is not evaluated.
+* `mwe_indexes`, optional, a list of the `[start, end]` token indexes, end
+exclusive, of each gold Multi Word Expression (MWE).
+
+Each model is scored on:
+
+* `usas_top_1_accuracy`, the share of the evaluated tokens whereby the most
+likely predicted tag is the gold tag.
+* `usas_top_5_accuracy`, the share of the evaluated tokens whereby the gold
+tag is one of the 5 most likely predicted tags.
+* `mwe_precision`, `mwe_recall`, and `mwe_f1` of the predicted MWEs, the
+`pymusas_mwe_indexes` that cover more than one token, against the gold MWEs.
+* `speed`, the tokens per second of tagging the corpus through `nlp.pipe`,
+the documents are created before the tagging is timed.
+
+Like the spaCy models, the scores are stored within the `performance` meta
+data of the model, see `write_performance`, which is shown, without the
+`speed`, within the accuracy table of the README of the model.
+'''
+from dataclasses import dataclass
+from pathlib import Path
+import time
+from typing import IO, Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from spacy.language import Language
+from spacy.tokens import Doc
+import srsly
+
+from pymusas_models.catalog import CatalogEntry
+from pymusas_models.tag_corpus import json_to_document
+from pymusas_models.update_lexicon import get_meta_files
+
+
+# The number of predicted tags of the `usas_top_5_accuracy` score.
+TOP_N = 5
+# The keys of `EvaluationResult` that are stored within the `performance`
+# meta data of the model.
+PERFORMANCE_KEYS = ('usas_top_1_accuracy', 'usas_top_5_accuracy', 'mwe_precision',
+                    'mwe_recall', 'mwe_f1', 'speed')
+
+
+@dataclass
+class GoldDocument:
+    '''
+    A tokenised document, and its gold USAS tags and MWEs.
+    '''
+    doc: Doc
+    usas_tags: List[Optional[str]]
+    mwe_indexes: Set[Tuple[int, int]]
+
+
+class EvaluationResult(BaseModel):
+    name: str
+    corpus: str
+    documents: int
+    tokens: int
+    evaluated_tokens: int
+    usas_top_1_accuracy: float
+    usas_top_5_accuracy: float
+    mwe_precision: float
+    mwe_recall: float
+    mwe_f1: float
+    speed: float
+
+
+def read_gold_corpus(corpus_file: IO[str], nlp: Language) -> List[GoldDocument]:
+    '''
+    Returns the documents of the gold standard corpus, see the module
+    docstring for the format.
+
+    # Parameters
+
+    corpus_file : `IO[str]`
+        The JSONL gold standard corpus opened in text mode.
+    nlp : `Language`
+        The pipeline that will tag the documents, its vocabulary is used to
+        create the tokenised documents.
+
+    # Returns
+
+    `List[GoldDocument]`
+
+    # Raises
+
+    `ValueError`
+        If an object does not have the `tokens` key, or its `usas_tags` are
+        not the same length as its `tokens`.
+    '''
+    gold_documents: List[GoldDocument] = []
+    for line_number, line in enumerate(corpus_file, start=1):
+        if not line.strip():
+            continue
+        data: Dict[str, Any] = srsly.json_loads(line)
+        tokens = data.get('tokens')
+        usas_tags = data.get('usas_tags')
+        if tokens is None:
+            raise ValueError(f'Line {line_number} of the gold standard corpus requires '
+                             'a `tokens` key.')
+        if usas_tags is None or len(usas_tags) != len(tokens):
+            raise ValueError(f'Line {line_number} of the gold standard corpus requires '
+                             'a `usas_tags` key that is the same length as `tokens`.')
+        doc = json_to_document(data, nlp)
+        assert isinstance(doc, Doc)
+        mwe_indexes = {(start, end) for start, end in data.get('mwe_indexes', [])}
+        gold_documents.append(GoldDocument(doc, usas_tags, mwe_indexes))
+    return gold_documents
+
+
+def _f1(precision: float, recall: float) -> float:
+    if precision + recall == 0:
+        return 0.0
+    return 2 * precision * recall / (precision + recall)
+
+
+def evaluate_model(nlp: Language, gold_documents: List[GoldDocument], name: str = '',
+                   corpus: str = '', batch_size: int = 1000) -> EvaluationResult:
+    '''
+    Returns the scores of the model on the gold standard documents, see the
+    module docstring for the scores.
+
+    # Parameters
+
+    nlp : `Language`
+        The PyMUSAS model.
+    gold_documents : `List[GoldDocument]`
+        The gold standard documents, created with the vocabulary of `nlp`,
+        see `read_gold_corpus`.
+    name : `str`, optional (default = `''`)
+        The name of the model.
+    corpus : `str`, optional (default = `''`)
+        The name of the gold standard corpus.
+    batch_size : `int`, optional (default = `1000`)
+        The number of documents to buffer, see `Language.pipe`.
+
+    # Returns
+
+    `EvaluationResult`
+    '''
+    start_time = time.perf_counter()
+    docs = list(nlp.pipe((gold_document.doc for gold_document in gold_documents),
+                         batch_size=batch_size))
+    elapsed_time = time.perf_counter() - start_time
+
+    number_tokens = 0
+    evaluated_tokens = 0
+    top_1_correct = 0
+    top_n_correct = 0
+    predicted_mwes = 0
+    gold_mwes = 0
+    correct_mwes = 0
+    for doc, gold_document in zip(docs, gold_documents):
+        number_tokens += len(doc)
+        # Each access of `token._` creates a new object, therefore it is only
+        # accessed once per token.
+        token_extensions = [token._ for token in doc]
+        for extensions, gold_tag in zip(token_extensions, gold_document.usas_tags):
+            if gold_tag is None:
+                continue
+            evaluated_tokens += 1
+            predicted_tags = extensions.pymusas_tags
+            if predicted_tags[:1] == [gold_tag]:
+                top_1_correct += 1
+            if gold_tag in predicted_tags[:TOP_N]:
+                top_n_correct += 1
+        mwe_indexes = {(start, end) for extensions in token_extensions
+                       for start, end in extensions.pymusas_mwe_indexes if end - start > 1}
+        predicted_mwes += len(mwe_indexes)
+        gold_mwes += len(gold_document.mwe_indexes)
+        correct_mwes += len(mwe_indexes & gold_document.mwe_indexes)
+
+    mwe_precision = correct_mwes / predicted_mwes if predicted_mwes else 0.0
+    mwe_recall = correct_mwes / gold_mwes if gold_mwes else 0.0
+    return EvaluationResult(name=name, corpus=corpus, documents=len(docs), tokens=number_tokens,
+                            evaluated_tokens=evaluated_tokens,
+                            usas_top_1_accuracy=top_1_correct / max(evaluated_tokens, 1),
+                            usas_top_5_accuracy=top_n_correct / max(evaluated_tokens, 1),
+                            mwe_precision=mwe_precision, mwe_recall=mwe_recall,
+                            mwe_f1=_f1(mwe_precision, mwe_recall),
+                            speed=number_tokens / elapsed_time if elapsed_time > 0 else 0.0)
+
+
+def write_performance(entry: CatalogEntry, models_directory: Path,
+                      result: EvaluationResult) -> None:
+    '''
+    Writes the scores of the model to the `performance` meta data, and the
+    gold standard corpus, number of documents and tokens to the `evaluation`
+    meta data, of every `meta.json` file of the model, see
+    `pymusas_models.update_lexicon.get_meta_files`. The wheel and sdist of the
+    model are not re-built, see
+    `pymusas_models.update_lexicon.rebuild_distributions`.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    result : `EvaluationResult`
+        The scores of the model.
+
+    # Returns
+
+    `None`
+    '''
+    performance = result.model_dump(include=set(PERFORMANCE_KEYS))
+    evaluation = result.model_dump(include={'corpus', 'documents', 'tokens', 'evaluated_tokens'})
+    for meta_file in get_meta_files(entry, models_directory):
+        meta = srsly.read_json(meta_file)
+        meta['performance'] = {key: performance[key] for key in PERFORMANCE_KEYS}
+        meta['evaluation'] = evaluation
+        meta.pop('requires_evaluation', None)
+        srsly.write_json(meta_file, meta)
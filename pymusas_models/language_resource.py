@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Annotated, Any
 
-from pydantic import BaseModel, PlainValidator
+from pydantic import BaseModel, Field, PlainValidator
 
 
 class ModelTypes(str, Enum):
@@ -71,6 +71,7 @@ class RuleConfig(BaseModel):
     pymusas_mwe_indexes_attr: str = 'pymusas_mwe_indexes'
     pos_attribute: str = 'pos_'
     lemma_attribute: str = 'lemma_'
+    lookup_cache_size: int | None = None
 
 
 class NeuralConfig(BaseModel):
@@ -79,12 +80,25 @@ class NeuralConfig(BaseModel):
     top_n: int = 5
     device: str = 'cpu'
     tokenizer_kwargs: dict[str, Any] | None = None
+    doc_cache_size: int | None = None
+
+
+class LexiconCompression(BaseModel):
+    level: int = Field(default=19, ge=1, le=22)
+    dictionary_size_bytes: int = Field(default=0, ge=0)
+
+
+class LiteVariant(BaseModel):
+    frequency_list: str
+    coverage: float = Field(default=0.99, gt=0, le=1)
 
 
 class RuleModel(Model):
     model_type: ModelTypes = ModelTypes.RULE
     resources: RuleResources
     config: RuleConfig = RuleConfig()
+    lexicon_compression: LexiconCompression | None = None
+    lite: LiteVariant | None = None
 
 
 class NeuralModel(Model):
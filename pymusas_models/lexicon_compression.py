@@ -0,0 +1,182 @@
+'''
+Stores the lexicon payloads of a rule based tagger, the serialised rules,
+`rules.bin`, zstd compressed within the model package, and decompresses them
+when the model is loaded.
+
+When a model is created, `compress_files` writes a zstd compressed copy,
+`{file}.zst`, of each payload within the component directory, optionally
+with a zstd dictionary, `zstd_dictionary.bin`, trained on the payloads, and a
+manifest, `compressed_files.json`, with the path and size of each
+uncompressed payload. The `setup.py` of the model package does not include
+the uncompressed payloads listed in a manifest, therefore the model package
+only contains the compressed payloads.
+
+When the model package is loaded, `decompressed_component` decompresses the
+payloads into a temporary directory that contains all of the files of the
+component, which is then loaded through the `from_disk` method of the
+component. If the component directory already contains the uncompressed
+payloads, e.g. a model loaded from the models directory, the component
+directory is used.
+
+A trained dictionary only reduces the size of the payloads when there are
+many small payloads, for a single large payload it adds its own size to the
+package, therefore it is not used by default.
+
+This module is copied into every packaged model that compresses its
+lexicons, through the `code_paths` argument of
+`pymusas_models.package.package`, therefore it should only import from the
+Python standard library and `zstandard`, which is imported when it is used.
+'''
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+
+MANIFEST_FILE_NAME = 'compressed_files.json'
+DICTIONARY_FILE_NAME = 'zstd_dictionary.bin'
+COMPRESSED_SUFFIX = '.zst'
+# The lexicon payloads of the rule based tagger.
+PAYLOAD_FILE_NAMES = ('rules.bin',)
+DEFAULT_LEVEL = 19
+# The requirement added to the models that compress their lexicons.
+REQUIREMENT = 'zstandard>=0.22.0,<1.0.0'
+# The size of the samples, that the payloads are split into, to train the
+# dictionary on.
+_SAMPLE_SIZE_BYTES = 4096
+
+
+def compress_files(component_directory: Path,
+                   level: int = DEFAULT_LEVEL,
+                   dictionary_size_bytes: int = 0,
+                   file_names: Iterable[str] = PAYLOAD_FILE_NAMES) -> Dict[str, Any]:
+    '''
+    Writes a zstd compressed copy of each of the `file_names` within the
+    `component_directory`, and the manifest of these files. The uncompressed
+    files are kept within the `component_directory`, but are not included in
+    the model package.
+
+    # Parameters
+
+    component_directory : `Path`
+        The directory of the component, created by its `to_disk` method.
+    level : `int`, optional (default = `DEFAULT_LEVEL`)
+        The zstd compression level, from 1 to 22.
+    dictionary_size_bytes : `int`, optional (default = `0`)
+        The size of the zstd dictionary to train on the files, and compress
+        them with. If `0` no dictionary is used.
+    file_names : `Iterable[str]`, optional (default = `PAYLOAD_FILE_NAMES`)
+        The names of the files to compress, names of files that are not
+        within the `component_directory` are ignored.
+
+    # Returns
+
+    `Dict[str, Any]`
+        The manifest.
+    '''
+    import zstandard
+
+    payload_files = [Path(component_directory, file_name) for file_name in file_names
+                     if Path(component_directory, file_name).is_file()]
+    dictionary_data: Optional[zstandard.ZstdCompressionDict] = None
+    dictionary_file_name: Optional[str] = None
+    if dictionary_size_bytes:
+        samples: List[Union[bytes, bytearray, memoryview]] = []
+        for payload_file in payload_files:
+            payload = payload_file.read_bytes()
+            samples.extend(payload[index: index + _SAMPLE_SIZE_BYTES]
+                           for index in range(0, len(payload), _SAMPLE_SIZE_BYTES))
+        dictionary_data = zstandard.train_dictionary(dictionary_size_bytes, samples, level=level)
+        dictionary_file_name = DICTIONARY_FILE_NAME
+        Path(component_directory, dictionary_file_name).write_bytes(dictionary_data.as_bytes())
+
+    compressor = zstandard.ZstdCompressor(level=level, dict_data=dictionary_data)
+    files: Dict[str, Dict[str, int]] = {}
+    for payload_file in payload_files:
+        compressed_payload = compressor.compress(payload_file.read_bytes())
+        Path(f'{payload_file}{COMPRESSED_SUFFIX}').write_bytes(compressed_payload)
+        files[payload_file.relative_to(component_directory).as_posix()] = {
+            'size_bytes': payload_file.stat().st_size,
+            'compressed_size_bytes': len(compressed_payload)}
+    manifest = {'level': level, 'dictionary': dictionary_file_name, 'files': files}
+    Path(component_directory, MANIFEST_FILE_NAME).write_text(json.dumps(manifest, indent=2),
+                                                             encoding='utf-8')
+    return manifest
+
+
+def get_compressed_files(directory: Path) -> Set[Path]:
+    '''
+    Returns the paths of the uncompressed files, within the manifests of all
+    of the components within the `directory`, that are not included in the
+    model package.
+
+    # Parameters
+
+    directory : `Path`
+        A pipeline or component directory.
+
+    # Returns
+
+    `Set[Path]`
+    '''
+    compressed_files: Set[Path] = set()
+    for manifest_file in directory.rglob(MANIFEST_FILE_NAME):
+        manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+        compressed_files.update(Path(manifest_file.parent, file_path) for file_path in manifest['files'])
+    return compressed_files
+
+
+@contextmanager
+def decompressed_component(component_directory: Path) -> Iterator[Path]:
+    '''
+    A context manager that returns a directory that contains all of the
+    files of the component, whereby the files within the manifest of the
+    `component_directory` are decompressed into a temporary directory, which
+    is deleted on exit. If the `component_directory` already contains all of
+    the uncompressed files the `component_directory` is returned.
+
+    # Parameters
+
+    component_directory : `Path`
+        The directory of the component, that contains the manifest.
+
+    # Returns
+
+    `Iterator[Path]`
+
+    # Raises
+
+    `ValueError`
+        If a decompressed file does not have the size within the manifest.
+    '''
+    manifest = json.loads(Path(component_directory, MANIFEST_FILE_NAME).read_text(encoding='utf-8'))
+    files: Dict[str, Dict[str, int]] = manifest['files']
+    if all(Path(component_directory, file_path).is_file()
+           and Path(component_directory, file_path).stat().st_size == file_data['size_bytes']
+           for file_path, file_data in files.items()):
+        yield component_directory
+        return
+
+    import zstandard
+
+    dictionary_data: Optional[zstandard.ZstdCompressionDict] = None
+    if manifest['dictionary']:
+        dictionary_data = zstandard.ZstdCompressionDict(
+            Path(component_directory, manifest['dictionary']).read_bytes())
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary_data)
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_component_directory = Path(temp_directory, component_directory.name)
+        shutil.copytree(component_directory, temp_component_directory,
+                        ignore=shutil.ignore_patterns(f'*{COMPRESSED_SUFFIX}'))
+        for file_path, file_data in files.items():
+            decompressed_file = Path(temp_component_directory, file_path)
+            with Path(component_directory, f'{file_path}{COMPRESSED_SUFFIX}').open('rb') as compressed_fp:
+                with decompressed_file.open('wb') as decompressed_fp:
+                    decompressor.copy_stream(compressed_fp, decompressed_fp)
+            if decompressed_file.stat().st_size != file_data['size_bytes']:
+                raise ValueError(f'The decompressed file {file_path} of {component_directory} has '
+                                 f'{decompressed_file.stat().st_size} bytes rather than '
+                                 f'{file_data["size_bytes"]}.')
+        yield temp_component_directory
@@ -0,0 +1,230 @@
+'''
+Fetches the lexicons of all of the models, used by the `create-models`
+command, before any of the models are created.
+
+The `lexicon_url` of every rule within the language resource file is
+collected, `get_lexicon_urls`, and each distinct URL is downloaded once,
+concurrently with a bounded number of workers, `prefetch_lexicons`. A
+download is retried, with an exponential backoff, if the connection fails,
+the server returns a 5XX or 429 status, or the downloaded file is not
+complete or not a lexicon, see `check_lexicon_file`. The lexicons are
+cached, by the SHA256 hash of their URL, within the `lexicons` directory of
+`pymusas_models.artifact_store.get_cache_directory`, therefore the lexicons
+are only downloaded once for all runs of the command, and the models are
+created from the local lexicon files.
+'''
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from pymusas_models.language_resource import LanguageResources, MWERule, RuleModel, SingleRule
+
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BACKOFF_SECONDS = 1.0
+TIMEOUT_SECONDS = 30
+# The field headings that the first line of a single word and MWE lexicon
+# must contain respectively.
+LEXICON_FIELD_NAMES = [{'lemma', 'semantic_tags'}, {'mwe_template', 'semantic_tags'}]
+_CHUNK_SIZE_BYTES = 1024 * 1024
+
+
+def is_url(lexicon_url: str) -> bool:
+    '''
+    Returns `True` if the `lexicon_url` is a HTTP(S) URL rather than a local
+    file path.
+
+    # Parameters
+
+    lexicon_url : `str`
+        The `lexicon_url` of a rule.
+
+    # Returns
+
+    `bool`
+    '''
+    return urlparse(lexicon_url).scheme in ('http', 'https')
+
+
+def get_lexicon_urls(language_resources: LanguageResources) -> List[str]:
+    '''
+    Returns every distinct HTTP(S) lexicon URL used by the rules of the
+    models, in the order that they first occur.
+
+    # Parameters
+
+    language_resources : `LanguageResources`
+        The language resource meta data.
+
+    # Returns
+
+    `List[str]`
+    '''
+    lexicon_urls: Dict[str, None] = {}
+    for language_resource in language_resources.language_resources.values():
+        for model in language_resource.models:
+            if not isinstance(model, RuleModel):
+                continue
+            for rule in model.resources.rules:
+                if isinstance(rule, (SingleRule, MWERule)) and is_url(rule.lexicon_url):
+                    lexicon_urls[rule.lexicon_url] = None
+    return list(lexicon_urls)
+
+
+def check_lexicon_file(lexicon_file: Path, expected_size_bytes: Optional[int] = None) -> None:
+    '''
+    Checks that the downloaded `lexicon_file` is complete, has the
+    `expected_size_bytes` if it is given, and is a single word or MWE
+    lexicon, the first line is UTF-8 and contains the field headings of a
+    lexicon, see `LEXICON_FIELD_NAMES`.
+
+    # Parameters
+
+    lexicon_file : `Path`
+        The downloaded lexicon.
+    expected_size_bytes : `int`, optional (default = `None`)
+        The size of the lexicon, e.g. from the `Content-Length` header.
+
+    # Raises
+
+    `ValueError`
+        If the lexicon is not complete or not a lexicon.
+    '''
+    size_bytes = lexicon_file.stat().st_size
+    if expected_size_bytes is not None and size_bytes != expected_size_bytes:
+        raise ValueError(f'Downloaded {size_bytes} bytes rather than {expected_size_bytes} bytes.')
+    with lexicon_file.open('rb') as lexicon_fp:
+        first_line = lexicon_fp.readline()
+    try:
+        field_names = set(first_line.decode('utf-8-sig').strip().split('\t'))
+    except UnicodeDecodeError as error:
+        raise ValueError(f'The first line is not UTF-8: {error}') from error
+    if not any(lexicon_field_names <= field_names for lexicon_field_names in LEXICON_FIELD_NAMES):
+        raise ValueError(f'The first line does not contain the field headings of a lexicon: '
+                         f'{first_line[:200]!r}')
+
+
+def fetch_lexicon(lexicon_url: str, cache_directory: Path,
+                  attempts: int = DEFAULT_ATTEMPTS,
+                  backoff_seconds: float = DEFAULT_BACKOFF_SECONDS) -> Path:
+    '''
+    Returns the path to the lexicon, within the `cache_directory`,
+    downloading the lexicon if it is not within the cache.
+
+    # Parameters
+
+    lexicon_url : `str`
+        The HTTP(S) URL of the lexicon.
+    cache_directory : `Path`
+        The directory that the lexicons are cached within.
+    attempts : `int`, optional (default = `DEFAULT_ATTEMPTS`)
+        The maximum number of times to download the lexicon.
+    backoff_seconds : `float`, optional (default = `DEFAULT_BACKOFF_SECONDS`)
+        The time to wait before the second download, this doubles before
+        each subsequent download.
+
+    # Returns
+
+    `Path`
+
+    # Raises
+
+    `OSError`
+        If the lexicon cannot be downloaded, e.g. a `urllib.error.URLError`,
+        a `HTTPError` with a 4XX status, other than 429, is not retried.
+    `ValueError`
+        If the lexicon is not complete or not a lexicon, see
+        `check_lexicon_file`, after every attempt.
+    '''
+    url_hash = hashlib.sha256(lexicon_url.encode('utf-8')).hexdigest()
+    cache_file = Path(cache_directory, f'{url_hash}.tsv')
+    if cache_file.exists():
+        return cache_file
+    cache_directory.mkdir(parents=True, exist_ok=True)
+
+    for attempt in range(1, attempts + 1):
+        # The lexicon is written to a temporary file, within the same
+        # directory, and then renamed so that the cache never contains a
+        # partial file.
+        with tempfile.NamedTemporaryFile(dir=cache_directory, delete=False) as temp_fp:
+            temp_file = Path(temp_fp.name)
+            try:
+                with urlopen(lexicon_url, timeout=TIMEOUT_SECONDS) as response:
+                    content_length = response.headers.get('Content-Length')
+                    shutil.copyfileobj(response, temp_fp, _CHUNK_SIZE_BYTES)
+                temp_fp.close()
+                check_lexicon_file(temp_file,
+                                   int(content_length) if content_length is not None else None)
+                os.replace(temp_file, cache_file)
+                return cache_file
+            except (OSError, ValueError) as error:
+                temp_fp.close()
+                temp_file.unlink(missing_ok=True)
+                retry = not (isinstance(error, HTTPError) and error.code < 500 and error.code != 429)
+                if not retry or attempt == attempts:
+                    if isinstance(error, ValueError):
+                        raise ValueError(f'Cannot download the lexicon {lexicon_url}: {error}') from error
+                    raise
+            except BaseException:
+                temp_fp.close()
+                temp_file.unlink(missing_ok=True)
+                raise
+        time.sleep(backoff_seconds * 2 ** (attempt - 1))
+    raise ValueError(f'The number of attempts has to be at least 1, not {attempts}.')
+
+
+def prefetch_lexicons(lexicon_urls: List[str], cache_directory: Path,
+                      max_workers: int = DEFAULT_MAX_WORKERS,
+                      attempts: int = DEFAULT_ATTEMPTS,
+                      backoff_seconds: float = DEFAULT_BACKOFF_SECONDS) -> Dict[str, Path]:
+    '''
+    Downloads the lexicons, that are not within the `cache_directory`,
+    concurrently, see `fetch_lexicon`, and returns the path to each lexicon
+    within the cache.
+
+    # Parameters
+
+    lexicon_urls : `List[str]`
+        The HTTP(S) URLs of the lexicons, see `get_lexicon_urls`.
+    cache_directory : `Path`
+        The directory that the lexicons are cached within.
+    max_workers : `int`, optional (default = `DEFAULT_MAX_WORKERS`)
+        The maximum number of lexicons to download at the same time.
+    attempts : `int`, optional (default = `DEFAULT_ATTEMPTS`)
+        The maximum number of times to download each lexicon.
+    backoff_seconds : `float`, optional (default = `DEFAULT_BACKOFF_SECONDS`)
+        The time to wait before the second download of a lexicon, this
+        doubles before each subsequent download.
+
+    # Returns
+
+    `Dict[str, Path]`
+        The lexicon URL to the path of the lexicon.
+
+    # Raises
+
+    `OSError`
+        If a lexicon cannot be downloaded, no more lexicons are downloaded.
+    `ValueError`
+        If a lexicon is not complete or not a lexicon, no more lexicons are
+        downloaded.
+    '''
+    if not lexicon_urls:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(lexicon_urls))))
+    try:
+        futures = {lexicon_url: executor.submit(fetch_lexicon, lexicon_url, cache_directory,
+                                                attempts, backoff_seconds)
+                   for lexicon_url in lexicon_urls}
+        return {lexicon_url: future.result() for lexicon_url, future in futures.items()}
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
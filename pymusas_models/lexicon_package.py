@@ -0,0 +1,245 @@
+'''
+Creates the shared lexicon data packages, e.g. `pymusas_lexicon_en`, used
+by the `create-models` command when the `--shared-lexicons` option is given.
+
+The models of a language, e.g. the `single` and `dual` models, contain the
+same single word lexicon, therefore without a data package each model wheel
+contains its own copy of the lexicon. A data package stores each rule that
+is used by more than one model of the language once, see
+`pymusas_models.shared_rule`, and the models that use the rule depend on the
+data package and only store a reference to the rule.
+'''
+from contextlib import contextmanager
+import hashlib
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+from typing import Iterator, Optional
+
+import srsly
+
+from pymusas_models import shared_rule
+from pymusas_models.catalog import read_catalog
+from pymusas_models.reproducible_build import normalise_distributions
+
+
+TEMPLATE_LEXICON_SETUP = '''
+#!/usr/bin/env python
+from pathlib import Path
+
+from setuptools import setup
+
+
+setup(
+    name={name!r},
+    description={description!r},
+    long_description=Path(Path(__file__).parent, 'README.md').read_text(encoding='utf-8'),
+    long_description_content_type='text/markdown',
+    author='UCREL Research Centre',
+    author_email='ucrel@lancaster.ac.uk',
+    url='https://ucrel.github.io/pymusas/',
+    version={version!r},
+    license='CC BY-NC-SA 4.0',
+    packages=[{name!r}],
+    package_data={{{name!r}: ['rules/*.bin']}},
+    install_requires={requirements!r},
+    zip_safe=False,
+)
+'''.lstrip()
+
+
+TEMPLATE_LEXICON_MANIFEST = '''
+include README.md
+recursive-include {name}/rules *.bin
+'''.strip()
+
+
+def get_lexicon_package_name(language_code: str) -> str:
+    '''
+    Returns the name of the shared lexicon data package of the language, e.g.
+    `pymusas_lexicon_en`.
+
+    # Parameters
+
+    language_code : `str`
+        The language code of the models, e.g. `en`.
+
+    # Returns
+
+    `str`
+    '''
+    return f'pymusas_lexicon_{language_code}'
+
+
+def get_rule_id(serialised_rule: bytes) -> str:
+    '''
+    Returns the ID of the rule, the SHA256 hash of the rule serialised
+    through `Rule.serialise_object_to_bytes`.
+
+    # Parameters
+
+    serialised_rule : `bytes`
+        The serialised rule.
+
+    # Returns
+
+    `str`
+    '''
+    return hashlib.sha256(serialised_rule).hexdigest()
+
+
+def create_lexicon_package(models_directory: Path, language_code: str,
+                           language_name: str, version: str,
+                           serialised_rules: list[bytes], requirements: list[str],
+                           model_names: list[str]) -> Path:
+    '''
+    Creates the shared lexicon data package of the language, with a `.whl`
+    and `.tar.gz` build file in its `dist` folder, within
+    `{models_directory}/{package name}-{version}`, any existing data package
+    with the same name and version is overwritten.
+
+    # Parameters
+
+    models_directory : `Path`
+        The directory that stores the models created by the `create-models`
+        command.
+    language_code : `str`
+        The language code of the models, e.g. `en`.
+    language_name : `str`
+        The name of the language, e.g. `English`.
+    version : `str`
+        The version of the data package, the same as the version of the
+        models that use it.
+    serialised_rules : `list[bytes]`
+        The rules to store, each serialised through
+        `Rule.serialise_object_to_bytes`.
+    requirements : `list[str]`
+        The requirements of the data package, e.g. `pymusas>=0.4.0,<0.5.0`.
+    model_names : `list[str]`
+        The names of the models that use the data package, these are listed
+        within the README of the data package.
+
+    # Returns
+
+    `Path`
+        The directory of the data package.
+    '''
+    name = get_lexicon_package_name(language_code)
+    package_directory = Path(models_directory, f'{name}-{version}')
+    if package_directory.exists():
+        shutil.rmtree(package_directory)
+    rules_directory = Path(package_directory, name, 'rules')
+    rules_directory.mkdir(parents=True)
+    shutil.copyfile(shared_rule.__file__, Path(package_directory, name, '__init__.py'))
+    for serialised_rule in serialised_rules:
+        Path(rules_directory, f'{get_rule_id(serialised_rule)}.bin').write_bytes(serialised_rule)
+
+    description = f'The shared lexicons of the {language_name} PyMUSAS models.'
+    used_by = ''.join(f'* `{model_name}`\n' for model_name in model_names)
+    readme = (f'# {name}\n\n{description} This package is a dependency of, and is '
+              f'loaded by, the following models:\n\n{used_by}')
+    Path(package_directory, 'README.md').write_text(readme, encoding='utf-8')
+    Path(package_directory, 'setup.py').write_text(TEMPLATE_LEXICON_SETUP.format(name=name,
+                                                                                 description=description,
+                                                                                 version=version,
+                                                                                 requirements=requirements),
+                                                   encoding='utf-8')
+    Path(package_directory, 'MANIFEST.in').write_text(TEMPLATE_LEXICON_MANIFEST.format(name=name),
+                                                      encoding='utf-8')
+    for build_command in ['sdist', 'bdist_wheel']:
+        subprocess.run([sys.executable, 'setup.py', '--quiet', build_command],
+                       cwd=package_directory, check=True)
+    normalise_distributions(Path(package_directory, 'dist'))
+    return package_directory
+
+
+def share_rules(component_directory: Path, package_name: str,
+                rule_ids: set[str]) -> int:
+    '''
+    Replaces every rule, within the serialised rules (`rules.bin`) of the
+    rule based tagger saved to `component_directory`, that is stored within
+    the data package, `rule_ids`, with a `SharedRule` reference to the rule
+    within the data package.
+
+    # Parameters
+
+    component_directory : `Path`
+        The directory of the rule based tagger, created by its `to_disk`
+        method.
+    package_name : `str`
+        The name of the data package, e.g. `pymusas_lexicon_en`.
+    rule_ids : `set[str]`
+        The IDs of the rules stored within the data package.
+
+    # Returns
+
+    `int`
+        The number of rules that were replaced.
+    '''
+    rules_file = Path(component_directory, 'rules.bin')
+    serialised_rules: list[bytes] = srsly.msgpack_loads(srsly.read_msgpack(rules_file))
+    number_shared_rules = 0
+    for index, serialised_rule in enumerate(serialised_rules):
+        rule_id = get_rule_id(serialised_rule)
+        if rule_id not in rule_ids:
+            continue
+        serialised_rules[index] = srsly.msgpack_dumps((rule_id.encode('utf-8'),
+                                                       (shared_rule.SharedRule.__name__, package_name)))
+        number_shared_rules += 1
+    srsly.write_msgpack(rules_file, srsly.msgpack_dumps(serialised_rules))
+    return number_shared_rules
+
+
+@contextmanager
+def lexicon_packages_importable(models_directory: Optional[Path],
+                                language_code: Optional[str] = None) -> Iterator[list[Path]]:
+    '''
+    A context manager within which the shared lexicon data packages, within
+    the model catalog of the `models_directory`, can be imported, so that
+    the models that use shared rules can be loaded from the
+    `models_directory`. On exit the directories of the data packages are
+    removed from `sys.path` and the data packages, and the rules they have
+    loaded, from `sys.modules`, whereby any data package that had been
+    imported before is restored.
+
+    New Python processes that are started within the context, through
+    `subprocess` with `sys.path` passed on or through `multiprocessing`
+    with the `spawn` start method, can also import the data packages.
+
+    # Parameters
+
+    models_directory : `Path`, optional
+        A directory that stores the models created by the `create-models`
+        command, if `None`, or it does not exist, no data packages are made
+        importable.
+    language_code : `str`, optional (default = `None`)
+        Only make the data package of this language importable, e.g. `en`.
+
+    # Returns
+
+    `Iterator[list[Path]]`
+        The directories of the data packages.
+    '''
+    package_directories: list[Path] = []
+    package_names: list[str] = []
+    if models_directory is not None and models_directory.exists():
+        for lexicon_package in read_catalog(models_directory).lexicon_packages.values():
+            if language_code is not None and lexicon_package.language_code != language_code:
+                continue
+            package_directories.append(Path(models_directory, lexicon_package.package_name))
+            package_names.append(lexicon_package.name)
+    imported_packages = {package_name: sys.modules[package_name] for package_name in package_names
+                         if package_name in sys.modules}
+    for package_name in package_names:
+        sys.modules.pop(package_name, None)
+    sys.path[:0] = [str(package_directory) for package_directory in package_directories]
+    try:
+        yield package_directories
+    finally:
+        for package_directory in package_directories:
+            if str(package_directory) in sys.path:
+                sys.path.remove(str(package_directory))
+        for package_name in package_names:
+            sys.modules.pop(package_name, None)
+        sys.modules.update(imported_packages)
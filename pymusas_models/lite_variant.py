@@ -0,0 +1,283 @@
+'''
+Creates the "lite" variant of a rule based model, used by the
+`create-models` command for the rule based models with `lite` in the
+language resource file.
+
+The lite variant only keeps the single word lexicon entries whose lemma is
+one of the most frequent words, within a local frequency list, that
+together cover the `coverage` target of the tokens within the frequency
+list, e.g. the words that cover 99% of the tokens, as the rare entries take
+most of the memory of the rule based tagger but are seldom matched. The MWE
+lexicons are kept as they are. The lite variant is a separate model package
+named `{model name}_lite`, whose meta data, `nlp.meta['lite']`, records the
+token coverage and memory, of the rules when loaded, of both the lite and
+full model, see `LiteVariantMeta`.
+
+The frequency list is a TSV file with the header fields `word` and
+`frequency`. The words are compared, lower cased, to the lower cased lemmas
+of the lexicon entries, therefore a lemma frequency list is best.
+'''
+import csv
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Union
+
+from pydantic import BaseModel
+
+from pymusas_models.language_resource import LiteVariant
+
+
+if TYPE_CHECKING:
+    from pymusas.taggers.rules.rule import Rule
+
+
+LITE_SUFFIX = '_lite'
+# Prints the memory, in bytes, that the serialised rules, within the files
+# argv[1:], use once loaded.
+MEMORY_SCRIPT = '''
+import gc
+from pathlib import Path
+import sys
+import tracemalloc
+
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.rule import Rule
+from pymusas.taggers.rules.single_word import SingleWordRule
+
+serialised_rules = [Path(rule_file).read_bytes() for rule_file in sys.argv[1:]]
+gc.collect()
+tracemalloc.start()
+rules = [Rule.serialise_object_from_bytes(serialised_rule) for serialised_rule in serialised_rules]
+gc.collect()
+print(tracemalloc.get_traced_memory()[0])
+'''
+
+
+class LiteVariantMeta(BaseModel):
+    frequency_list: str
+    coverage: float
+    covering_words: int
+    lexicon_entries: int
+    full_lexicon_entries: int
+    token_coverage: float
+    full_token_coverage: float
+    coverage_loss: float
+    memory_bytes: int
+    full_memory_bytes: int
+    memory_saving: float
+
+
+def get_lite_model_name(model_name: str) -> str:
+    '''
+    Returns the name of the lite variant of the model.
+
+    # Parameters
+
+    model_name : `str`
+        The name of the model, e.g. `en_single_none_contextual_none`.
+
+    # Returns
+
+    `str`
+    '''
+    return f'{model_name}{LITE_SUFFIX}'
+
+
+def read_frequency_list(frequency_list: Union[str, Path]) -> Dict[str, int]:
+    '''
+    Returns the frequency of each lower cased word within the frequency list,
+    the frequencies of words that are the same once lower cased are summed.
+
+    # Parameters
+
+    frequency_list : `Union[str, Path]`
+        Path to the TSV frequency list, with the header fields `word` and
+        `frequency`.
+
+    # Returns
+
+    `Dict[str, int]`
+
+    # Raises
+
+    `ValueError`
+        If the frequency list does not have the `word` and `frequency` fields.
+    '''
+    frequencies: Dict[str, int] = {}
+    with Path(frequency_list).open('r', encoding='utf-8', newline='') as frequency_fp:
+        csv_reader = csv.DictReader(frequency_fp, delimiter='\t', quoting=csv.QUOTE_NONE)
+        if not {'word', 'frequency'}.issubset(csv_reader.fieldnames or []):
+            raise ValueError(f'The frequency list {frequency_list} should have a header with the '
+                             f'fields word and frequency, found: {csv_reader.fieldnames}')
+        for row in csv_reader:
+            word = row['word'].lower()
+            frequencies[word] = frequencies.get(word, 0) + int(row['frequency'])
+    return frequencies
+
+
+def get_covering_words(frequencies: Dict[str, int], coverage: float) -> Set[str]:
+    '''
+    Returns the fewest most frequent words that together have at least the
+    `coverage` of the total frequency.
+
+    # Parameters
+
+    frequencies : `Dict[str, int]`
+        The frequency of each word, see `read_frequency_list`.
+    coverage : `float`
+        The share of the total frequency to cover, e.g. `0.99`.
+
+    # Returns
+
+    `Set[str]`
+    '''
+    target_frequency = coverage * sum(frequencies.values())
+    covering_words: Set[str] = set()
+    covered_frequency = 0
+    for word, frequency in sorted(frequencies.items(), key=lambda item: (-item[1], item[0])):
+        if covered_frequency >= target_frequency:
+            break
+        covering_words.add(word)
+        covered_frequency += frequency
+    return covering_words
+
+
+def get_token_coverage(frequencies: Dict[str, int], words: Set[str]) -> float:
+    '''
+    Returns the share of the total frequency of the `words`.
+
+    # Parameters
+
+    frequencies : `Dict[str, int]`
+        The frequency of each word, see `read_frequency_list`.
+    words : `Set[str]`
+        Lower cased words, e.g. the lemmas of a lexicon.
+
+    # Returns
+
+    `float`
+    '''
+    total_frequency = sum(frequencies.values())
+    if not total_frequency:
+        return 0.0
+    return sum(frequency for word, frequency in frequencies.items() if word in words) / total_frequency
+
+
+def _get_lemma(lexicon_key: str, include_pos: bool) -> str:
+    if include_pos:
+        return lexicon_key.rsplit('|', 1)[0]
+    return lexicon_key
+
+
+def prune_lexicon(lexicon: Dict[str, List[str]], words: Set[str],
+                  include_pos: bool) -> Dict[str, List[str]]:
+    '''
+    Returns the entries of the lexicon whose lower cased lemma is one of the
+    `words`.
+
+    # Parameters
+
+    lexicon : `Dict[str, List[str]]`
+        A lexicon, whereby the keys are either lemmas or, if `include_pos`,
+        `{lemma}|{POS}`, see `pymusas.lexicon_collection.LexiconCollection`.
+    words : `Set[str]`
+        The lower cased words to keep.
+    include_pos : `bool`
+        Whether the keys of the lexicon include the POS tag.
+
+    # Returns
+
+    `Dict[str, List[str]]`
+    '''
+    return {lexicon_key: semantic_tags for lexicon_key, semantic_tags in lexicon.items()
+            if _get_lemma(lexicon_key, include_pos).lower() in words}
+
+
+def get_rules_memory_bytes(rules: List["Rule"]) -> int:
+    '''
+    Returns the memory, in bytes, that the rules use once loaded from their
+    serialised form, as the rule based tagger loads them, measured through
+    `tracemalloc` within a new Python process, as a worker that loads the
+    model would.
+
+    # Parameters
+
+    rules : `List[Rule]`
+        The PyMUSAS rules.
+
+    # Returns
+
+    `int`
+    '''
+    from pymusas.taggers.rules.rule import Rule
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        rule_files: List[str] = []
+        for index, rule in enumerate(rules):
+            rule_file = Path(temp_directory, f'{index}.bin')
+            rule_file.write_bytes(Rule.serialise_object_to_bytes(rule))
+            rule_files.append(str(rule_file))
+        completed_process = subprocess.run([sys.executable, '-c', MEMORY_SCRIPT, *rule_files],
+                                           check=True, capture_output=True, text=True)
+    return int(completed_process.stdout)
+
+
+def create_lite_rules(rules: List["Rule"], lite_variant: LiteVariant
+                      ) -> Tuple[List["Rule"], LiteVariantMeta]:
+    '''
+    Returns the rules of the lite variant, whereby the single word rules only
+    keep the lexicon entries of the words that cover the `coverage` target of
+    the frequency list, and the meta data of the lite variant.
+
+    # Parameters
+
+    rules : `List[Rule]`
+        The PyMUSAS rules of the full model.
+    lite_variant : `LiteVariant`
+        The frequency list and coverage target of the lite variant.
+
+    # Returns
+
+    `Tuple[List[Rule], LiteVariantMeta]`
+    '''
+    from pymusas.taggers.rules.single_word import SingleWordRule
+
+    frequencies = read_frequency_list(lite_variant.frequency_list)
+    covering_words = get_covering_words(frequencies, lite_variant.coverage)
+    lite_rules: List["Rule"] = []
+    lexicon_words: Set[str] = set()
+    lite_lexicon_words: Set[str] = set()
+    lexicon_entries = 0
+    lite_lexicon_entries = 0
+    for rule in rules:
+        if not isinstance(rule, SingleWordRule):
+            lite_rules.append(rule)
+            continue
+        lexicon = dict(rule.lexicon_collection)
+        lemma_lexicon = dict(rule.lemma_lexicon_collection)
+        lite_lexicon = prune_lexicon(lexicon, covering_words, include_pos=True)
+        lite_lemma_lexicon = prune_lexicon(lemma_lexicon, covering_words, include_pos=False)
+        lite_rules.append(SingleWordRule(lite_lexicon, lite_lemma_lexicon, pos_mapper=rule.pos_mapper))
+        lexicon_words.update(lemma.lower() for lemma in lemma_lexicon)
+        lite_lexicon_words.update(lemma.lower() for lemma in lite_lemma_lexicon)
+        lexicon_entries += len(lexicon) + len(lemma_lexicon)
+        lite_lexicon_entries += len(lite_lexicon) + len(lite_lemma_lexicon)
+
+    token_coverage = get_token_coverage(frequencies, lite_lexicon_words)
+    full_token_coverage = get_token_coverage(frequencies, lexicon_words)
+    memory_bytes = get_rules_memory_bytes(lite_rules)
+    full_memory_bytes = get_rules_memory_bytes(rules)
+    lite_meta = LiteVariantMeta(frequency_list=Path(lite_variant.frequency_list).name,
+                                coverage=lite_variant.coverage,
+                                covering_words=len(covering_words),
+                                lexicon_entries=lite_lexicon_entries,
+                                full_lexicon_entries=lexicon_entries,
+                                token_coverage=token_coverage,
+                                full_token_coverage=full_token_coverage,
+                                coverage_loss=full_token_coverage - token_coverage,
+                                memory_bytes=memory_bytes,
+                                full_memory_bytes=full_memory_bytes,
+                                memory_saving=1 - memory_bytes / max(full_memory_bytes, 1))
+    return lite_rules, lite_meta
@@ -0,0 +1,122 @@
+'''
+Measures the memory of a process that loads many models, used by the
+`memory-benchmark` command, so that the memory a `serve` worker saves by
+loading its models through `pymusas_models.multi_language.MultiLanguageModels`,
+rather than through `spacy.load` for each model, can be reproduced.
+
+All of the models are loaded within a new Python process, `repeats` times
+for each way of loading them, and, like `pymusas_models.performance_baseline`,
+the median peak resident set size of the processes, after loading all of the
+models, is used:
+
+* `separate_rss_bytes`, each model is loaded through `spacy.load`, with its
+own `Vocab` and rules.
+* `shared_rss_bytes`, the models are loaded through `MultiLanguageModels`,
+which shares the `Vocab` of each spaCy language and the identical rules
+between the models.
+'''
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+from typing import List
+
+from pydantic import BaseModel
+import srsly
+
+from pymusas_models.catalog import CatalogEntry
+
+
+# Prints, as JSON, the peak resident set size of the process after loading
+# the models, argv[1] is either `separate` or `shared`, argv[2] the models
+# directory, whose shared lexicon data packages the models may load their
+# rules from, and argv[3] a JSON list of the name and pipeline data of each
+# model. Both ways of loading import the same modules so that only the
+# loading differs.
+MEASURE_SCRIPT = '''
+import json
+from pathlib import Path
+import resource
+import sys
+
+import spacy
+
+from pymusas_models.lexicon_package import lexicon_packages_importable
+from pymusas_models.multi_language import MultiLanguageModels
+from pymusas_models.prune import get_load_exclude
+
+multi_language_models = MultiLanguageModels()
+separate_models = []
+with lexicon_packages_importable(Path(sys.argv[2])):
+    for model_name, model_path in json.loads(sys.argv[3]):
+        if sys.argv[1] == 'shared':
+            multi_language_models.load(model_name, Path(model_path))
+        else:
+            separate_models.append(spacy.load(model_path, exclude=get_load_exclude(Path(model_path))))
+
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# The peak resident set size is in kilobytes on Linux and in bytes on macOS.
+rss_bytes = max_rss if sys.platform == 'darwin' else max_rss * 1024
+print(json.dumps({'rss_bytes': rss_bytes}))
+'''
+
+
+class MemoryBenchmarkResult(BaseModel):
+    models: List[str]
+    separate_rss_bytes: int
+    shared_rss_bytes: int
+
+    @property
+    def reduction(self) -> float:
+        '''
+        The share of the separate memory that is saved by sharing.
+        '''
+        if not self.separate_rss_bytes:
+            return 0.0
+        return 1 - self.shared_rss_bytes / self.separate_rss_bytes
+
+
+def _measure_rss(loader: str, entries: List[CatalogEntry], models_directory: Path,
+                 repeats: int) -> int:
+    '''
+    Returns the median peak resident set size of `repeats` new Python
+    processes that load the models, either `separate` or `shared`.
+    '''
+    models = [[entry.name, str(Path(models_directory, entry.package_name, entry.name,
+                                    f'{entry.name}-{entry.version}'))]
+              for entry in entries]
+    measurements = []
+    for _ in range(repeats):
+        process = subprocess.run([sys.executable, '-c', MEASURE_SCRIPT, loader, str(models_directory),
+                                  srsly.json_dumps(models)],
+                                 check=True, capture_output=True, text=True)
+        measurements.append(srsly.json_loads(process.stdout.strip().splitlines()[-1])['rss_bytes'])
+    return int(statistics.median(measurements))
+
+
+def measure_memory(entries: List[CatalogEntry], models_directory: Path,
+                   repeats: int = 3) -> MemoryBenchmarkResult:
+    '''
+    Returns the memory of a process that loads all of the models separately,
+    and through `MultiLanguageModels`, see the module docstring.
+
+    # Parameters
+
+    entries : `List[CatalogEntry]`
+        The catalog entries of the models.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    repeats : `int`, optional (default = `3`)
+        The number of processes to measure each way of loading the models
+        with, see the module docstring.
+
+    # Returns
+
+    `MemoryBenchmarkResult`
+    '''
+    return MemoryBenchmarkResult(models=[entry.name for entry in entries],
+                                 separate_rss_bytes=_measure_rss('separate', entries,
+                                                                 models_directory, repeats),
+                                 shared_rss_bytes=_measure_rss('shared', entries,
+                                                               models_directory, repeats))
@@ -0,0 +1,245 @@
+'''
+Loads the PyMUSAS models of many languages into one process, e.g. a worker
+process of the `serve` command, and routes documents to the model of their
+language.
+
+Each model created by the `create-models` command starts from its own
+`spacy.blank` pipeline, therefore loading every model separately keeps a
+`Vocab`, `StringStore`, and copy of the lexicon data per model. The
+`MultiLanguageModels` loader instead shares:
+
+* one `Vocab`, and therefore one `StringStore`, between all of the models of
+the same spaCy language. spaCy does not allow a `Vocab` to be shared between
+languages, as the lexeme attributes are language specific.
+* one copy of every lexicon entry and semantic tag string, through
+`sys.intern`, and one list of semantic tags per distinct list, between all of
+the models of all of the languages.
+* one rule object between all of the models whose rules are identical, e.g.
+the single word rule of the `single` and `dual` models of a language.
+'''
+import hashlib
+from pathlib import Path
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
+
+from pymusas.lexicon_collection import LexiconCollection, LexiconMetaData
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.rule import Rule
+from pymusas.taggers.rules.single_word import SingleWordRule
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+from spacy.vocab import Vocab
+
+from pymusas_models.prune import get_load_exclude
+
+
+# A document, either as text to tokenise or as a tokenised `Doc`, and its
+# language code.
+LanguageDocument = Tuple[Union[str, Doc], str]
+
+
+def get_language_code(model_name: str) -> str:
+    '''
+    Returns the PyMUSAS language code of the model, which is the start of
+    the model name, e.g. `cy` for `cy_dual_basiccorcencc2usas_contextual_none`.
+
+    # Parameters
+
+    model_name : `str`
+        Name of the model.
+
+    # Returns
+
+    `str`
+    '''
+    return model_name.split('_', 1)[0]
+
+
+def get_spacy_language(model: Union[str, Path]) -> str:
+    '''
+    Returns the spaCy language code, from the meta data, of the installed
+    model or model path.
+
+    # Parameters
+
+    model : `Union[str, Path]`
+        Name of an installed model or path to the model's pipeline data.
+
+    # Returns
+
+    `str`
+    '''
+    if isinstance(model, str) and spacy.util.is_package(model):
+        model = spacy.util.get_package_path(model)
+    return str(spacy.util.get_model_meta(Path(model))['lang'])
+
+
+class MultiLanguageModels:
+    '''
+    Loads PyMUSAS models, of one or more languages, into one process sharing
+    the `Vocab`, strings, and rules between the models, see the module
+    docstring, and routes documents to a model by language code.
+
+    # Instance Attributes
+
+    models : `Dict[str, Language]`
+        The name of each loaded model and the model.
+    language_models : `Dict[str, str]`
+        The language code of each loaded language and the name of the model
+        that documents of that language are routed to, by default the first
+        model loaded for the language.
+    '''
+    def __init__(self) -> None:
+        self.models: Dict[str, Language] = {}
+        self.language_models: Dict[str, str] = {}
+        self._vocabs: Dict[str, Vocab] = {}
+        self._semantic_tags: Dict[Tuple[str, ...], List[str]] = {}
+        self._rules: Dict[Tuple[str, bytes], Rule] = {}
+
+    def load(self, model_name: str, model: Optional[Union[str, Path]] = None,
+             language_code: Optional[str] = None) -> Language:
+        '''
+        Loads the model, through `spacy.load`, with the shared `Vocab` of its
+        spaCy language and replaces the rules of its rule based taggers with
+        the shared rules.
+
+        # Parameters
+
+        model_name : `str`
+            Name of the model.
+        model : `Union[str, Path]`, optional (default = `None`)
+            Name of the installed model or path to the model's pipeline data,
+            see `pymusas_models.tag_corpus.get_model_path`, if `None` the
+            installed model called `model_name` is loaded.
+        language_code : `str`, optional (default = `None`)
+            The language code to route documents to the model with, if `None`
+            it is the start of the model name, see `get_language_code`.
+
+        # Returns
+
+        `Language`
+        '''
+        if model is None:
+            model = model_name
+        spacy_language = get_spacy_language(model)
+        nlp = spacy.load(model, vocab=self._vocabs.get(spacy_language, True),
+                         exclude=get_load_exclude(model))
+        self._vocabs.setdefault(spacy_language, nlp.vocab)
+
+        for _, component in nlp.pipeline:
+            if isinstance(component, RuleBasedTagger) and component.rules is not None:
+                component.rules = [self._share_rule(rule) for rule in component.rules]
+
+        self.models[model_name] = nlp
+        if language_code is None:
+            language_code = get_language_code(model_name)
+        self.language_models.setdefault(language_code, model_name)
+        return nlp
+
+    def get_model(self, language_code: str) -> Language:
+        '''
+        Returns the model that documents of the given language are routed to.
+
+        # Parameters
+
+        language_code : `str`
+            Language code, e.g. `en`.
+
+        # Returns
+
+        `Language`
+
+        # Raises
+
+        `ValueError`
+            If no model has been loaded for the language.
+        '''
+        if language_code not in self.language_models:
+            raise ValueError(f'No model has been loaded for the language: {language_code}, '
+                             f'the languages loaded are: {sorted(self.language_models)}')
+        return self.models[self.language_models[language_code]]
+
+    def pipe(self, documents: Iterable[LanguageDocument],
+             batch_size: int = 1000) -> Iterator[Doc]:
+        '''
+        Tags the documents, each with the model of its language, and yields
+        the tagged documents in the same order as `documents`. The documents
+        are read `batch_size` at a time and each batch is tagged with one
+        `nlp.pipe` call per language.
+
+        A `Doc` has to be created with the `Vocab` of the model of its
+        language, see `get_model`.
+
+        # Parameters
+
+        documents : `Iterable[LanguageDocument]`
+            The documents and their language codes.
+        batch_size : `int`, optional (default = `1000`)
+            The number of documents to tag at a time.
+
+        # Returns
+
+        `Iterator[Doc]`
+
+        # Raises
+
+        `ValueError`
+            If no model has been loaded for the language of a document.
+        '''
+        batch: List[LanguageDocument] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) == batch_size:
+                yield from self._pipe_batch(batch)
+                batch = []
+        if batch:
+            yield from self._pipe_batch(batch)
+
+    def _pipe_batch(self, batch: List[LanguageDocument]) -> List[Doc]:
+        language_batches: Dict[str, List[Tuple[Union[str, Doc], int]]] = {}
+        for index, (document, language_code) in enumerate(batch):
+            language_batches.setdefault(language_code, []).append((document, index))
+
+        tagged_documents: List[Optional[Doc]] = [None for _ in batch]
+        for language_code, language_batch in language_batches.items():
+            nlp = self.get_model(language_code)
+            for doc, index in nlp.pipe(language_batch, as_tuples=True,
+                                       batch_size=len(language_batch)):
+                tagged_documents[index] = doc
+        return cast(List[Doc], tagged_documents)
+
+    def _share_rule(self, rule: Rule) -> Rule:
+        '''
+        Returns the shared rule that is identical to `rule`, else interns the
+        strings and semantic tags of `rule` and returns it as the shared rule.
+        '''
+        key = (type(rule).__name__, hashlib.sha256(rule.to_bytes()).digest())
+        if key in self._rules:
+            return self._rules[key]
+
+        if isinstance(rule, SingleWordRule):
+            self._share_lexicon_collection(rule.lexicon_collection)
+            self._share_lexicon_collection(rule.lemma_lexicon_collection)
+        elif isinstance(rule, MWERule):
+            mwe_lexicon_collection = rule.mwe_lexicon_collection
+            mwe_lexicon_collection.meta_data = {
+                sys.intern(mwe_template): LexiconMetaData(self._share_semantic_tags(meta_data.semantic_tags),
+                                                          meta_data.n_gram_length,
+                                                          meta_data.lexicon_type,
+                                                          meta_data.wildcard_count)
+                for mwe_template, meta_data in mwe_lexicon_collection.meta_data.items()
+            }
+        self._rules[key] = rule
+        return rule
+
+    def _share_lexicon_collection(self, lexicon_collection: LexiconCollection) -> None:
+        lexicon_collection.data = {sys.intern(lexicon_entry): self._share_semantic_tags(semantic_tags)
+                                   for lexicon_entry, semantic_tags in lexicon_collection.data.items()}
+
+    def _share_semantic_tags(self, semantic_tags: List[str]) -> List[str]:
+        key = tuple(semantic_tags)
+        if key not in self._semantic_tags:
+            self._semantic_tags[key] = [sys.intern(semantic_tag) for semantic_tag in semantic_tags]
+        return self._semantic_tags[key]
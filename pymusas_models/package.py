@@ -13,7 +13,15 @@ model name. This is to overcome the problem when the model name starts with the
 `lang` it can cause errors in the package creation process.
 3. The `TEMPLATE_INIT` has been changed so that it uses a custom
 `load_model_from_init_py` function that does not require the `lang` from the
-meta file to be the first word in the name of the model directory.
+meta file to be the first word in the name of the model directory. Importing
+the model package does not import spaCy, or the custom code, and the data of
+the pipeline components can be loaded on first use through `load(lazy=True)`.
+A pipeline whose tokenizer has been pruned, see `pymusas_models.prune`, is
+loaded with the tokenizer created from its config, and a component with
+compressed lexicons, see `pymusas_models.lexicon_compression`, is loaded from
+its decompressed files.
+4. The sdist and wheel are re-written so that packaging the same pipeline
+twice creates byte identical files, see `pymusas_models.reproducible_build`.
 '''
 from collections import defaultdict
 from pathlib import Path
@@ -30,6 +38,9 @@ import srsly
 from thinc.api import Config
 from wasabi import MarkdownRenderer, Printer, get_raw_input
 
+from pymusas_models.prune import get_load_exclude
+from pymusas_models.reproducible_build import normalise_distributions
+
 
 @app.command("package")
 def package_cli(
@@ -189,9 +200,7 @@ def package(
     create_file(main_path / "meta.json", srsly.json_dumps(meta, indent=2))
     create_file(main_path / "setup.py", TEMPLATE_SETUP)
     create_file(main_path / "MANIFEST.in", TEMPLATE_MANIFEST)
-    init_py = TEMPLATE_INIT.format(
-        imports="\n".join(f"from . import {m}" for m in imports)
-    )
+    init_py = TEMPLATE_INIT.format(code_modules=repr(imports))
     create_file(package_path / "__init__.py", init_py)
     msg.good(f"Successfully created package directory '{model_name_v}'", main_path)
     if create_sdist:
@@ -205,6 +214,9 @@ def package(
         wheel_name_squashed = re.sub("_+", "_", model_name_v)
         wheel = main_path / "dist" / f"{wheel_name_squashed}{WHEEL_SUFFIX}"
         msg.good("Successfully created binary wheel", wheel)
+    if create_sdist or create_wheel:
+        normalise_distributions(main_path / "dist")
+        msg.good("Re-wrote the package artifacts so that they are reproducible")
     if "__" in model_name:
         msg.warn(
             f"Model name ('{model_name}') contains a run of underscores. "
@@ -307,7 +319,7 @@ def get_meta(
         "url": "",
         "license": "MIT",
     }
-    nlp = util.load_model_from_path(Path(model_path))
+    nlp = util.load_model_from_path(Path(model_path), exclude=get_load_exclude(model_path))
     meta.update(nlp.meta)
     meta.update(existing_meta)
     meta["spacy_version"] = existing_meta['spacy_version']
@@ -393,6 +405,10 @@ def generate_readme(meta: Dict[str, Any]) -> str:
     if accuracy:
         md.add(md.title(3, "Accuracy"))
         md.add(accuracy)
+    elif meta.get("requires_evaluation"):
+        md.add(md.title(3, "Accuracy"))
+        md.add("The lexicons of this model have changed since it was last evaluated, "
+               "therefore it has to be re-evaluated.")
     if notes:
         md.add(notes)
     return cast(str, md.text)  # type: ignore
@@ -483,10 +499,21 @@ def load_readme(fp):
     return ""
 def list_files(data_dir):
     output = []
+    # Files stored within an artifact store, see `pymusas_models.artifact_store`,
+    # and the uncompressed files of compressed files, see
+    # `pymusas_models.lexicon_compression`.
+    external_files = set()
+    for root, _, filenames in walk(data_dir):
+        for manifest_name in ('external_files.json', 'compressed_files.json'):
+            if manifest_name in filenames:
+                manifest = load_meta(path.join(root, manifest_name))
+                external_files.update(path.join(root, *file_path.split('/'))
+                                      for file_path in manifest['files'])
     for root, _, filenames in walk(data_dir):
         for filename in filenames:
-            if not filename.startswith('.'):
-                output.append(path.join(root, filename))
+            file_path = path.join(root, filename)
+            if not filename.startswith('.') and file_path not in external_files:
+                output.append(file_path)
     output = [path.relpath(p, path.dirname(data_dir)) for p in output]
     output.append('meta.json')
     return output
@@ -537,21 +564,71 @@ include README.md
 
 
 TEMPLATE_INIT = """
-from typing import Union, Iterable, Dict, Any
+'''
+Importing this model package only uses the Python standard library, spaCy,
+the custom pipeline components, and the pipeline data are only imported and
+loaded when `load` is called. The meta data of the model can be read, without
+importing spaCy, through `get_meta`.
+'''
+import importlib
+import json
 from pathlib import Path
-from spacy.util import get_model_meta, SimpleFrozenList, SimpleFrozenDict, load_model_from_path
-from thinc.api import Config
-{imports}
-__version__ = get_model_meta(Path(__file__).parent)['version']
+from typing import Any, Callable, Dict, Iterable, Union
+
+# The Python modules, containing custom pipeline components, that are copied
+# into this package and have to be imported before the pipeline is loaded.
+CODE_MODULES = {code_modules}
+
+
+def get_meta() -> Dict[str, Any]:
+    '''Returns the meta data of the model from the `meta.json` file of the
+    package, without importing spaCy.
+    '''
+    with Path(Path(__file__).parent, 'meta.json').open('r', encoding='utf-8') as meta_file:
+        return json.load(meta_file)
+
+
+__version__ = get_meta()['version']
+
+
+def _defer_loading(component: Any, load_data: Callable[[], None]) -> bool:
+    '''Changes the class of the component so that `load_data` is called, and
+    the original class is restored, the first time that the component is used
+    or serialised. Returns `False`, without changing the component, if the
+    class of the component cannot be changed, e.g. Cython components.
+    '''
+    component_class = type(component)
+
+    def materialise(self: Any) -> None:
+        self.__class__ = component_class
+        load_data()
+
+    def deferred_method(method_name: str) -> Callable[..., Any]:
+        def method(self: Any, *args: Any, **kwargs: Any) -> Any:
+            materialise(self)
+            return getattr(self, method_name)(*args, **kwargs)
+        return method
+
+    method_names = ['__call__', 'pipe', 'to_disk', 'to_bytes', '__reduce_ex__']
+    deferred_class = type(component_class.__name__, (component_class,),
+                          {{method_name: deferred_method(method_name)
+                           for method_name in method_names}})
+    try:
+        component.__class__ = deferred_class
+    except TypeError:
+        return False
+    return True
+
 
 def load_model_from_init_py(
     init_file: Union[Path, str],
     *,
     vocab: Union["Vocab", bool] = True,
-    disable: Iterable[str] = SimpleFrozenList(),
-    enable: Iterable[str] = SimpleFrozenList(),
-    exclude: Iterable[str] = SimpleFrozenList(),
-    config: Union[Dict[str, Any], Config] = SimpleFrozenDict(),
+    disable: Iterable[str] = (),
+    enable: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+    config: Union[Dict[str, Any], "Config"] = {{}},
+    lazy: bool = False,
 ) -> "Language":
     '''Helper function to use in the `load()` method of a model package's
     __init__.py.
@@ -566,26 +643,67 @@ def load_model_from_init_py(
         components won't be loaded.
     config (Dict[str, Any] / Config): Config overrides as nested dict or dict
         keyed by section values in dot notation.
+    lazy (bool): If True the data of each pipeline component, e.g. lexicons
+        and neural model weights, is only loaded the first time the component
+        is used or serialised, rather than when the pipeline is loaded. This
+        includes fetching any files that are stored within an artifact store,
+        and decompressing any compressed lexicons.
     RETURNS (Language): The loaded nlp object.
     '''
+    from spacy.errors import Errors
+    from spacy.util import dict_to_dot, get_model_meta, load_config, load_model_from_config
+
+    for code_module in CODE_MODULES:
+        importlib.import_module(f'.{{code_module}}', __name__)
+
     model_path = Path(init_file).parent
+    # Unlike `get_meta`, validates the meta data and warns if the model is
+    # not compatible with the installed version of spaCy.
     meta = get_model_meta(model_path)
-    data_dir = meta['name'] + '-' + meta['version']
-    data_path = model_path / data_dir
-    if not model_path.exists():
+    data_path = model_path / f"{{meta['name']}}-{{meta['version']}}"
+    if not data_path.exists():
         raise IOError(Errors.E052.format(path=data_path))
-    return load_model_from_path(
-        data_path,
-        vocab=vocab,
-        meta=meta,
-        enable=enable,
-        disable=disable,
-        exclude=exclude,
-        config=config,
-    )
-
+    # A pruned tokenizer is the tokenizer created from the config.
+    if not (data_path / 'tokenizer').exists():
+        exclude = [*exclude, 'tokenizer']
+    overrides = dict_to_dot(config, for_overrides=True)
+    nlp_config = load_config(data_path / 'config.cfg', overrides=overrides)
+    nlp = load_model_from_config(nlp_config, vocab=vocab, disable=disable,
+                                 enable=enable, exclude=exclude, meta=meta)
+    deferred_names = []
+    for name, component in nlp.components:
+        component_data_path = data_path / name
+        if not hasattr(component, 'from_disk') or not component_data_path.exists():
+            continue
+        # Components with files within an artifact store, or with compressed
+        # files, are loaded from the directory that the artifact store, or
+        # lexicon compression, module creates.
+        external = (component_data_path / 'external_files.json').exists()
+        compressed = (component_data_path / 'compressed_files.json').exists()
+        if not lazy and not external and not compressed:
+            continue
 
-def load(**overrides):
+        def load_data(component: Any = component, component_data_path: Path = component_data_path,
+                      external: bool = external, compressed: bool = compressed) -> None:
+            if external:
+                artifact_store = importlib.import_module('.artifact_store', __name__)
+                component_data_path = artifact_store.materialise_component(component_data_path)
+            if compressed:
+                lexicon_compression = importlib.import_module('.lexicon_compression', __name__)
+                with lexicon_compression.decompressed_component(component_data_path) as decompressed_path:
+                    component.from_disk(decompressed_path, exclude=['vocab'])
+            else:
+                component.from_disk(component_data_path, exclude=['vocab'])
+
+        if lazy and _defer_loading(component, load_data):
+            deferred_names.append(name)
+        elif external or compressed:
+            load_data()
+            deferred_names.append(name)
+    return nlp.from_disk(data_path, exclude=[*exclude, *deferred_names], overrides=overrides)
+
+
+def load(**overrides: Any) -> "Language":
     return load_model_from_init_py(__file__, **overrides)
 """.lstrip()
 
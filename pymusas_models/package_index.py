@@ -0,0 +1,151 @@
+'''
+Creates a static [PEP 503](https://peps.python.org/pep-0503/) simple package
+index of the models within a models directory, used by the `package-index`
+command.
+
+The index can be used by `pip` either directly from the local directory,
+`--index-url file:///path/to/index/simple/`, or once served over HTTP, e.g.
+through `python -m http.server`, so that the models can be installed through
+the `pip` cache and a local mirror rather than from the GitHub releases.
+'''
+from html import escape
+import os
+from pathlib import Path
+import re
+import shutil
+
+from pymusas_models.catalog import CatalogEntry, LexiconPackageEntry, ModelCatalog
+
+
+def normalize_project_name(name: str) -> str:
+    '''
+    Returns the [PEP 503 normalized](https://peps.python.org/pep-0503/#normalized-names)
+    name of the project, e.g. `en-dual-none-contextual-none` for
+    `en_dual_none_contextual_none`.
+
+    # Parameters
+
+    name : `str`
+        Name of the project.
+
+    # Returns
+
+    `str`
+    '''
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def create_html_page(title: str, links: list[tuple[str, str]]) -> str:
+    '''
+    Returns a PEP 503 HTML page with the given title and links.
+
+    # Parameters
+
+    title : `str`
+        Title of the page.
+    links : `list[tuple[str, str]]`
+        The URL and text of each link.
+
+    # Returns
+
+    `str`
+    '''
+    anchors = ''.join(f'    <a href="{escape(url)}">{escape(text)}</a><br/>\n'
+                      for url, text in links)
+    return ('<!DOCTYPE html>\n<html>\n  <head>\n'
+            '    <meta name="pypi:repository-version" content="1.0">\n'
+            f'    <title>{escape(title)}</title>\n  </head>\n  <body>\n'
+            f'    <h1>{escape(title)}</h1>\n{anchors}  </body>\n</html>\n')
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    '''
+    Hard links the `source` file to `destination`, to save disk space, or
+    copies it if the file system does not support hard links.
+    '''
+    if destination.exists():
+        if os.path.samefile(source, destination):
+            return
+        destination.unlink()
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def create_package_index(catalog: ModelCatalog, models_directory: Path,
+                         index_directory: Path) -> list[CatalogEntry | LexiconPackageEntry]:
+    '''
+    Creates, or updates, a PEP 503 simple package index of all of the models,
+    and shared lexicon data packages, within the `catalog` in
+    `index_directory`. Any files within an existing index that are not in the
+    `catalog` are removed.
+
+    The index contains:
+
+    * `simple/index.html` - the root page that links to every project.
+    * `simple/{project}/index.html` - the project page that links to the
+    `.whl` and `.tar.gz` files of the model, or data package, with their SHA256 hashes, which
+    are stored within the same directory.
+    * `requirements.txt` - a pinned requirement, with hashes, for every model
+    and data package, to be used with `pip install --require-hashes`.
+
+    # Parameters
+
+    catalog : `ModelCatalog`
+        The catalog of the models within `models_directory`, see
+        `pymusas_models.catalog.read_catalog`.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    index_directory : `Path`
+        The directory to create the index in.
+
+    # Returns
+
+    `list[CatalogEntry | LexiconPackageEntry]`
+        The models and data packages within the index.
+    '''
+    entries: list[CatalogEntry | LexiconPackageEntry] = [*catalog.models.values(),
+                                                         *catalog.lexicon_packages.values()]
+    entries.sort(key=lambda entry: normalize_project_name(entry.name))
+    project_files = {normalize_project_name(entry.name): {entry.wheel.file_name, entry.sdist.file_name,
+                                                          'index.html'}
+                     for entry in entries}
+
+    simple_directory = Path(index_directory, 'simple')
+    simple_directory.mkdir(parents=True, exist_ok=True)
+    for existing_path in simple_directory.iterdir():
+        if not existing_path.is_dir():
+            continue
+        if existing_path.name not in project_files:
+            shutil.rmtree(existing_path)
+            continue
+        for existing_file in existing_path.iterdir():
+            if existing_file.name not in project_files[existing_path.name]:
+                existing_file.unlink()
+
+    project_links: list[tuple[str, str]] = []
+    requirements: list[str] = []
+    for entry in entries:
+        project_name = normalize_project_name(entry.name)
+        project_directory = Path(simple_directory, project_name)
+        project_directory.mkdir(exist_ok=True)
+        file_links: list[tuple[str, str]] = []
+        for dist_file in [entry.wheel, entry.sdist]:
+            _link_or_copy(Path(models_directory, entry.package_name, 'dist', dist_file.file_name),
+                          Path(project_directory, dist_file.file_name))
+            file_links.append((f'{dist_file.file_name}#sha256={dist_file.sha256}',
+                               dist_file.file_name))
+        Path(project_directory, 'index.html').write_text(create_html_page(f'Links for {project_name}',
+                                                                          file_links),
+                                                         encoding='utf-8')
+        project_links.append((f'{project_name}/', project_name))
+        requirements.append(f'{entry.name}=={entry.version} \\\n'
+                            f'    --hash=sha256:{entry.wheel.sha256} \\\n'
+                            f'    --hash=sha256:{entry.sdist.sha256}\n')
+
+    Path(simple_directory, 'index.html').write_text(create_html_page('Simple index', project_links),
+                                                    encoding='utf-8')
+    Path(index_directory, 'requirements.txt').write_text(''.join(requirements), encoding='utf-8')
+    return entries
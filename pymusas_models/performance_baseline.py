@@ -0,0 +1,397 @@
+'''
+Stores the performance of the models, created by the `create-models`
+command, as a baseline for each model version, and compares the performance
+of newly created models against a baseline, used by the `record-baseline`
+and `check-performance` commands, so that a new PyMUSAS release, which
+rebuilds the models, cannot make them slower without being noticed.
+
+The performance of each model on a corpus is measured within a new Python
+process, `repeats` times, whereby the best of the times, as the slower
+times are mostly due to other processes, like `timeit`, and the median of
+the memory measurements are used:
+
+* `tokens_per_second`, the tokens per second of tagging the corpus through
+`nlp.pipe`, the documents are read before the tagging is timed.
+* `load_seconds`, the seconds that `spacy.load` takes to load the pipeline
+data of the model.
+* `rss_bytes`, the peak resident set size of the process, after loading the
+model and tagging the corpus.
+
+The baselines are stored as JSON within the baselines directory, one file per
+model version, e.g. `0.4.0.json`, which records the PyMUSAS, spaCy, and
+Python versions, the host the models were measured on, see
+`HostFingerprint`, the corpus, and the performance of each model. The
+measurements are only comparable on the same host.
+'''
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+import pymusas
+import spacy
+from spacy.tokens import Doc, DocBin
+import srsly
+
+from pymusas_models.catalog import CatalogEntry
+from pymusas_models.corpus_format import CorpusFormat
+from pymusas_models.tag_corpus import read_corpus
+
+
+# Prints, as JSON, the load time, tokens per second, and peak resident set
+# size of the model, argv[1] is the pipeline data of the model, argv[2] and
+# argv[3] the text and tokenised documents, argv[4] the batch size, and
+# argv[5] the models directory, whose shared lexicon data packages the model
+# may load its rules from.
+MEASURE_SCRIPT = '''
+import json
+from pathlib import Path
+import resource
+import sys
+import time
+
+import spacy
+from spacy.tokens import DocBin
+
+from pymusas_models.lexicon_package import lexicon_packages_importable
+from pymusas_models.prune import get_load_exclude
+
+model_path = Path(sys.argv[1])
+with lexicon_packages_importable(Path(sys.argv[5])):
+    start_time = time.perf_counter()
+    nlp = spacy.load(model_path, exclude=get_load_exclude(model_path))
+    load_seconds = time.perf_counter() - start_time
+
+documents = json.loads(Path(sys.argv[2]).read_text(encoding='utf-8'))
+documents.extend(DocBin().from_disk(sys.argv[3]).get_docs(nlp.vocab))
+start_time = time.perf_counter()
+tokens = sum(len(doc) for doc in nlp.pipe(documents, batch_size=int(sys.argv[4])))
+tagging_seconds = time.perf_counter() - start_time
+
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# The peak resident set size is in kilobytes on Linux and in bytes on macOS.
+rss_bytes = max_rss if sys.platform == 'darwin' else max_rss * 1024
+print(json.dumps({'tokens': tokens, 'load_seconds': load_seconds, 'rss_bytes': rss_bytes,
+                  'tokens_per_second': tokens / tagging_seconds if tagging_seconds > 0 else 0.0}))
+'''
+# The measurements of `ModelPerformance` that are compared against the
+# baseline, and whether a higher value is better.
+PERFORMANCE_METRICS: Dict[str, bool] = {'tokens_per_second': True, 'load_seconds': False,
+                                        'rss_bytes': False}
+
+
+class ModelPerformance(BaseModel):
+    name: str
+    version: str
+    tokens: int
+    tokens_per_second: float
+    load_seconds: float
+    rss_bytes: int
+
+
+class HostFingerprint(BaseModel):
+    cpu: str
+    cpu_count: int
+    platform: str
+
+
+class PerformanceBaseline(BaseModel):
+    version: str
+    pymusas_version: str
+    spacy_version: str
+    python_version: str
+    # `None` for the baselines recorded before the host was recorded.
+    host: Optional[HostFingerprint] = None
+    corpus: str
+    models: Dict[str, ModelPerformance] = {}
+
+
+class PerformanceRegression(BaseModel):
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    max_regression: float
+    regressed: bool
+
+
+def _get_cpu_name() -> str:
+    '''
+    Returns the model name of the CPU, from `/proc/cpuinfo` on Linux, else
+    from `platform.processor`, or the machine type if that is empty.
+    '''
+    cpu_info_file = Path('/proc/cpuinfo')
+    if cpu_info_file.exists():
+        for line in cpu_info_file.read_text(encoding='utf-8', errors='replace').splitlines():
+            if line.startswith('model name'):
+                return line.split(':', 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+
+def get_host_fingerprint() -> HostFingerprint:
+    '''
+    Returns the CPU model name, number of CPU cores, and operating system and
+    machine type of this host, the performance of the models is only
+    comparable between hosts with the same fingerprint.
+
+    # Returns
+
+    `HostFingerprint`
+    '''
+    return HostFingerprint(cpu=_get_cpu_name(), cpu_count=os.cpu_count() or 1,
+                           platform=f'{platform.system()} {platform.machine()}')
+
+
+def get_baseline_file(baselines_directory: Path, version: str) -> Path:
+    '''
+    Returns the baseline file of the model version.
+
+    # Parameters
+
+    baselines_directory : `Path`
+        The directory that stores the baselines.
+    version : `str`
+        The model version, e.g. `0.4.0`.
+
+    # Returns
+
+    `Path`
+    '''
+    return Path(baselines_directory, f'{version}.json')
+
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) if part.isdigit() else -1 for part in version.split('.'))
+
+
+def get_latest_baseline_file(baselines_directory: Path,
+                             before_version: Optional[str] = None) -> Optional[Path]:
+    '''
+    Returns the baseline file of the latest model version, or of the latest
+    model version that is not later than `before_version`, `None` if there
+    are no baselines.
+
+    # Parameters
+
+    baselines_directory : `Path`
+        The directory that stores the baselines.
+    before_version : `str`, optional (default = `None`)
+        The latest model version to consider.
+
+    # Returns
+
+    `Optional[Path]`
+    '''
+    baseline_files = [baseline_file for baseline_file in baselines_directory.glob('*.json')
+                      if before_version is None
+                      or _version_key(baseline_file.stem) <= _version_key(before_version)]
+    if not baseline_files:
+        return None
+    return max(baseline_files, key=lambda baseline_file: _version_key(baseline_file.stem))
+
+
+def get_models_without_baseline(entries: List[CatalogEntry], baselines_directory: Path) -> List[str]:
+    '''
+    Returns the names of the models that are not within the baseline of their
+    model version, including the models whose model version has no baseline.
+
+    # Parameters
+
+    entries : `List[CatalogEntry]`
+        The catalog entries of the models.
+    baselines_directory : `Path`
+        The directory that stores the baselines.
+
+    # Returns
+
+    `List[str]`
+    '''
+    baselines: Dict[str, PerformanceBaseline] = {}
+    models_without_baseline: List[str] = []
+    for entry in entries:
+        if entry.version not in baselines:
+            baseline_file = get_baseline_file(baselines_directory, entry.version)
+            if not baseline_file.exists():
+                models_without_baseline.append(entry.name)
+                continue
+            baselines[entry.version] = read_baseline(baseline_file)
+        if entry.name not in baselines[entry.version].models:
+            models_without_baseline.append(entry.name)
+    return models_without_baseline
+
+
+def read_baseline(baseline_file: Path) -> PerformanceBaseline:
+    '''
+    Returns the baseline stored within the `baseline_file`.
+
+    # Parameters
+
+    baseline_file : `Path`
+        The baseline file.
+
+    # Returns
+
+    `PerformanceBaseline`
+    '''
+    return PerformanceBaseline.model_validate_json(baseline_file.read_text(encoding='utf-8'))
+
+
+def write_baseline(baseline: PerformanceBaseline, baselines_directory: Path) -> Path:
+    '''
+    Writes the baseline, with the models sorted by name, to the baseline file
+    of its model version within the `baselines_directory`, replacing any
+    existing baseline of the model version.
+
+    # Parameters
+
+    baseline : `PerformanceBaseline`
+        The baseline to write.
+    baselines_directory : `Path`
+        The directory that stores the baselines, created if it does not
+        exist.
+
+    # Returns
+
+    `Path`
+        The baseline file.
+    '''
+    baselines_directory.mkdir(parents=True, exist_ok=True)
+    baseline_data = baseline.model_dump(mode='json')
+    baseline_data['models'] = dict(sorted(baseline_data['models'].items()))
+    baseline_file = get_baseline_file(baselines_directory, baseline.version)
+    srsly.write_json(baseline_file, baseline_data)
+    return baseline_file
+
+
+def create_baseline(version: str, corpus: str,
+                    performances: List[ModelPerformance]) -> PerformanceBaseline:
+    '''
+    Returns the baseline of the model performances with the current PyMUSAS,
+    spaCy, and Python versions, and the fingerprint of this host.
+
+    # Parameters
+
+    version : `str`
+        The model version.
+    corpus : `str`
+        The name of the corpus the performance was measured on.
+    performances : `List[ModelPerformance]`
+        The performance of each model.
+
+    # Returns
+
+    `PerformanceBaseline`
+    '''
+    return PerformanceBaseline(version=version, pymusas_version=pymusas.__version__,
+                               spacy_version=spacy.__version__,
+                               python_version=platform.python_version(),
+                               host=get_host_fingerprint(), corpus=corpus,
+                               models={performance.name: performance for performance in performances})
+
+
+def measure_performance(entries: List[CatalogEntry], models_directory: Path, corpus_file: Path,
+                        corpus_format: CorpusFormat, repeats: int = 3,
+                        batch_size: int = 1000) -> List[ModelPerformance]:
+    '''
+    Returns the performance of each model on the corpus, see the module
+    docstring.
+
+    # Parameters
+
+    entries : `List[CatalogEntry]`
+        The catalog entries of the models.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    corpus_file : `Path`
+        The corpus.
+    corpus_format : `CorpusFormat`
+        The format of the corpus.
+    repeats : `int`, optional (default = `3`)
+        The number of times to measure each model, see the module docstring.
+    batch_size : `int`, optional (default = `1000`)
+        The number of documents to buffer while tagging, see `Language.pipe`.
+
+    # Returns
+
+    `List[ModelPerformance]`
+    '''
+    performances: List[ModelPerformance] = []
+    with tempfile.TemporaryDirectory() as temp_directory:
+        texts_file = Path(temp_directory, 'texts.json')
+        docs_file = Path(temp_directory, 'docs.spacy')
+        texts: List[str] = []
+        doc_bin = DocBin(store_user_data=False)
+        with corpus_file.open('r', encoding='utf-8') as corpus:
+            for document, _ in read_corpus(corpus, corpus_format, spacy.blank('xx')):
+                if isinstance(document, Doc):
+                    doc_bin.add(document)
+                else:
+                    texts.append(document)
+        srsly.write_json(texts_file, texts)
+        doc_bin.to_disk(docs_file)
+
+        for entry in entries:
+            model_path = Path(models_directory, entry.package_name, entry.name,
+                              f'{entry.name}-{entry.version}')
+            measurements = []
+            for _ in range(repeats):
+                process = subprocess.run([sys.executable, '-c', MEASURE_SCRIPT, str(model_path),
+                                          str(texts_file), str(docs_file), str(batch_size),
+                                          str(models_directory)],
+                                         check=True, capture_output=True, text=True)
+                measurements.append(srsly.json_loads(process.stdout.strip().splitlines()[-1]))
+            performances.append(ModelPerformance(
+                name=entry.name, version=entry.version, tokens=measurements[0]['tokens'],
+                tokens_per_second=max(measurement['tokens_per_second'] for measurement in measurements),
+                load_seconds=min(measurement['load_seconds'] for measurement in measurements),
+                rss_bytes=int(statistics.median(measurement['rss_bytes'] for measurement in measurements))))
+    return performances
+
+
+def compare_to_baseline(baseline: PerformanceBaseline, performances: List[ModelPerformance],
+                        max_regressions: Dict[str, float]) -> List[PerformanceRegression]:
+    '''
+    Returns, for each model that is within the baseline, the relative change
+    of each of its `PERFORMANCE_METRICS` against the baseline, whereby a
+    positive change is a regression, a lower `tokens_per_second` or a higher
+    `load_seconds` or `rss_bytes`. A metric has regressed if its change is
+    greater than its maximum regression.
+
+    # Parameters
+
+    baseline : `PerformanceBaseline`
+        The baseline.
+    performances : `List[ModelPerformance]`
+        The current performance of each model.
+    max_regressions : `Dict[str, float]`
+        The maximum relative regression, e.g. `0.1` for 10%, of each of the
+        `PERFORMANCE_METRICS`.
+
+    # Returns
+
+    `List[PerformanceRegression]`
+    '''
+    regressions: List[PerformanceRegression] = []
+    for performance in performances:
+        baseline_performance = baseline.models.get(performance.name)
+        if baseline_performance is None:
+            continue
+        for metric, higher_is_better in PERFORMANCE_METRICS.items():
+            baseline_value = float(getattr(baseline_performance, metric))
+            current_value = float(getattr(performance, metric))
+            change = (current_value - baseline_value) / baseline_value if baseline_value else 0.0
+            if higher_is_better:
+                change = -change
+            regressions.append(PerformanceRegression(name=performance.name, metric=metric,
+                                                     baseline=baseline_value, current=current_value,
+                                                     change=change,
+                                                     max_regression=max_regressions[metric],
+                                                     regressed=change > max_regressions[metric]))
+    return regressions
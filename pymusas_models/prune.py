@@ -0,0 +1,108 @@
+'''
+Prunes the pipeline data, written by `Language.to_disk`, that the PyMUSAS
+components never use, used by the `create-models` command when the `--prune`
+option is given.
+
+* `vocab` - the strings, vectors, and lookup tables of the vocabulary. The
+PyMUSAS components do not use vectors or lookup tables, and the strings are
+added to the vocabulary as the text is tagged, therefore the vocabulary is
+pruned if it has no vectors or lookup tables. spaCy does not load the
+vocabulary of a pipeline without a `vocab` directory.
+* `tokenizer` - the tokenizer of the pipeline is the tokenizer created from
+the config of the pipeline, the language defaults, therefore the tokenizer
+is pruned if it serialises to the same data as the tokenizer created from the
+config. A pipeline without a `tokenizer` file has to be loaded with
+`exclude=['tokenizer']`, see `get_load_exclude`, the `load` function of the
+model packages does this.
+'''
+from pathlib import Path
+import shutil
+from typing import TYPE_CHECKING, Any, List, Union, cast
+
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+
+PRUNABLE_DATA = ['tokenizer', 'vocab']
+
+
+def get_prunable_data(nlp: "Language") -> List[str]:
+    '''
+    Returns the names of the pipeline data, from `PRUNABLE_DATA`, of the
+    pipeline that the PyMUSAS components do not use.
+
+    # Parameters
+
+    nlp : `Language`
+        The pipeline.
+
+    # Returns
+
+    `List[str]`
+    '''
+    import spacy
+
+    prunable_data: List[str] = []
+    nlp_config = nlp.config['nlp']
+    config_nlp = spacy.blank(nlp_config['lang'], config={'nlp': {'tokenizer': nlp_config['tokenizer']}})
+    # The tokenizer can be any callable, e.g. `ChineseTokenizer`, all of the
+    # spaCy tokenizers have a `to_bytes` method.
+    tokenizer_data = cast(Any, nlp.tokenizer).to_bytes(exclude=['vocab'])
+    if tokenizer_data == cast(Any, config_nlp.tokenizer).to_bytes(exclude=['vocab']):
+        prunable_data.append('tokenizer')
+    vectors = nlp.vocab.vectors
+    if vectors.n_keys == 0 and len(vectors) == 0 and not nlp.vocab.lookups.tables:
+        prunable_data.append('vocab')
+    return prunable_data
+
+
+def prune_pipeline(nlp: "Language", pipeline_directory: Path) -> List[str]:
+    '''
+    Deletes the pipeline data, that the PyMUSAS components do not use, see
+    `get_prunable_data`, from the `pipeline_directory`.
+
+    # Parameters
+
+    nlp : `Language`
+        The pipeline.
+    pipeline_directory : `Path`
+        The directory that the pipeline was saved to, through `nlp.to_disk`.
+
+    # Returns
+
+    `List[str]`
+        The names of the pipeline data that were deleted.
+    '''
+    pruned_data: List[str] = []
+    for data_name in get_prunable_data(nlp):
+        data_path = Path(pipeline_directory, data_name)
+        if data_path.is_dir():
+            shutil.rmtree(data_path)
+        elif data_path.exists():
+            data_path.unlink()
+        else:
+            continue
+        pruned_data.append(data_name)
+    return pruned_data
+
+
+def get_load_exclude(model: Union[str, Path]) -> List[str]:
+    '''
+    Returns the names of the pipeline data that have to be excluded when
+    loading the model through `spacy.load`, `tokenizer` if the model is a
+    pipeline directory whose tokenizer has been pruned.
+
+    # Parameters
+
+    model : `Union[str, Path]`
+        Name of the installed model or path to the model's pipeline data.
+
+    # Returns
+
+    `List[str]`
+    '''
+    model_path = Path(model)
+    if Path(model_path, 'config.cfg').is_file() and not Path(model_path, 'tokenizer').exists():
+        return ['tokenizer']
+    return []
@@ -0,0 +1,203 @@
+'''
+Re-writes the sdist and wheel of a package, after they have been built, so
+that building the same package twice creates byte identical files, used by
+`pymusas_models.package.package`, the shared lexicon data packages, and the
+`update-lexicon` command. The checksums within the README of a model, and
+within the model catalog, therefore only change when the content of the
+model changes, so that pip caches and the release of unchanged models can
+be skipped.
+
+The contents of the files that setuptools and wheel add to the archives are
+the same for the same package, but the archives are not: the modification
+time of every file, and of the gzip header of the sdist, is the time of the
+build, and the sdist records the owner of every file. The archives are
+re-written with:
+
+* the members sorted by name, whereby the `.dist-info` files of a wheel
+come last and its `RECORD` file is the last file, as recommended by the
+wheel specification.
+* the modification time of every member, and of the gzip header, set to the
+`SOURCE_DATE_EPOCH` environment variable, if set, else
+`DEFAULT_SOURCE_DATE_EPOCH`.
+* the permissions of every member set to `0o644`, or `0o755` for
+directories and executable files, and the owner of every sdist member set
+to root.
+
+The file contents of the archives are not changed, therefore the hashes
+within the `RECORD` file of a wheel are still valid.
+'''
+import gzip
+import io
+import os
+from pathlib import Path
+import shutil
+import tarfile
+import tempfile
+import time
+from typing import List, Optional, Tuple
+import zipfile
+
+
+# 1980-01-01T00:00:00Z, the earliest modification time of a ZIP file member.
+DEFAULT_SOURCE_DATE_EPOCH = 315532800
+WHEEL_SUFFIX = '.whl'
+SDIST_SUFFIX = '.tar.gz'
+
+
+def get_source_date_epoch() -> int:
+    '''
+    Returns the modification time, as seconds since the Unix epoch, of the
+    members of the re-written archives, the `SOURCE_DATE_EPOCH` environment
+    variable, if set, else `DEFAULT_SOURCE_DATE_EPOCH`.
+
+    # Returns
+
+    `int`
+
+    # Raises
+
+    `ValueError`
+        If the `SOURCE_DATE_EPOCH` environment variable is not an integer.
+    '''
+    source_date_epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if not source_date_epoch:
+        return DEFAULT_SOURCE_DATE_EPOCH
+    try:
+        return int(source_date_epoch)
+    except ValueError as error:
+        raise ValueError('The SOURCE_DATE_EPOCH environment variable has to be an integer number '
+                         f'of seconds, not: {source_date_epoch}') from error
+
+
+def _get_mode(mode: int, is_directory: bool) -> int:
+    '''
+    Returns `0o755` for directories and files executable by their owner, else
+    `0o644`.
+    '''
+    return 0o755 if is_directory or mode & 0o100 else 0o644
+
+
+def _replace_file(file_path: Path, content: bytes) -> None:
+    '''
+    Replaces the content of `file_path` through a temporary file within the
+    same directory, so that the file is never partially written.
+    '''
+    with tempfile.NamedTemporaryFile(dir=file_path.parent, suffix='.tmp', delete=False) as temp_file:
+        temp_file.write(content)
+    shutil.copymode(file_path, temp_file.name)
+    os.replace(temp_file.name, file_path)
+
+
+def _wheel_member_key(name: str) -> Tuple[bool, bool, str]:
+    top_directory = name.split('/', 1)[0]
+    return (top_directory.endswith('.dist-info'),
+            top_directory.endswith('.dist-info') and name.endswith('/RECORD'), name)
+
+
+def normalise_wheel(wheel_file: Path, source_date_epoch: Optional[int] = None) -> None:
+    '''
+    Re-writes the wheel, in place, so that it is byte identical for the same
+    file contents, see the module docstring.
+
+    # Parameters
+
+    wheel_file : `Path`
+        The wheel, `.whl`, file.
+    source_date_epoch : `int`, optional (default = `None`)
+        The modification time of the members, if `None` the value of
+        `get_source_date_epoch` is used. A time before 1980 is stored as
+        1980-01-01, the earliest time a ZIP file supports.
+
+    # Returns
+
+    `None`
+    '''
+    if source_date_epoch is None:
+        source_date_epoch = get_source_date_epoch()
+    date_time = time.gmtime(max(source_date_epoch, DEFAULT_SOURCE_DATE_EPOCH))[:6]
+    wheel_bytes = io.BytesIO()
+    with zipfile.ZipFile(wheel_file, 'r') as wheel, \
+            zipfile.ZipFile(wheel_bytes, 'w', compression=zipfile.ZIP_DEFLATED) as normalised_wheel:
+        for member in sorted(wheel.infolist(), key=lambda member: _wheel_member_key(member.filename)):
+            normalised_member = zipfile.ZipInfo(member.filename, date_time=date_time)
+            normalised_member.create_system = 3
+            normalised_member.compress_type = zipfile.ZIP_DEFLATED
+            mode = _get_mode(member.external_attr >> 16, member.is_dir())
+            directory_mode = 0o040000 if member.is_dir() else 0o100000
+            normalised_member.external_attr = (directory_mode | mode) << 16
+            normalised_wheel.writestr(normalised_member, wheel.read(member))
+    _replace_file(wheel_file, wheel_bytes.getvalue())
+
+
+def normalise_sdist(sdist_file: Path, source_date_epoch: Optional[int] = None) -> None:
+    '''
+    Re-writes the gzip compressed tar sdist, in place, so that it is byte
+    identical for the same file contents, see the module docstring.
+
+    # Parameters
+
+    sdist_file : `Path`
+        The sdist, `.tar.gz`, file.
+    source_date_epoch : `int`, optional (default = `None`)
+        The modification time of the members and of the gzip header, if
+        `None` the value of `get_source_date_epoch` is used.
+
+    # Returns
+
+    `None`
+    '''
+    if source_date_epoch is None:
+        source_date_epoch = get_source_date_epoch()
+    # The members are read in the order they are stored, as reading a member
+    # of a gzip compressed tar file out of order decompresses it from the start.
+    members: List[Tuple[tarfile.TarInfo, Optional[bytes]]] = []
+    with tarfile.open(sdist_file, 'r:gz') as sdist:
+        for member in sdist:
+            file_object = sdist.extractfile(member) if member.isfile() else None
+            members.append((member, file_object.read() if file_object is not None else None))
+    tar_bytes = io.BytesIO()
+    with tarfile.open(fileobj=tar_bytes, mode='w', format=tarfile.PAX_FORMAT) as normalised_sdist:
+        for member, content in sorted(members, key=lambda member_content: member_content[0].name):
+            member.mtime = source_date_epoch
+            member.uid = member.gid = 0
+            member.uname = member.gname = 'root'
+            member.mode = _get_mode(member.mode, member.isdir())
+            # The PAX headers store the modification time of the build with a
+            # sub second precision.
+            member.pax_headers = {}
+            normalised_sdist.addfile(member, io.BytesIO(content) if content is not None else None)
+    sdist_bytes = io.BytesIO()
+    # An empty file name and a fixed modification time within the gzip header.
+    with gzip.GzipFile(filename='', mode='wb', fileobj=sdist_bytes, mtime=source_date_epoch) as gzip_file:
+        gzip_file.write(tar_bytes.getvalue())
+    _replace_file(sdist_file, sdist_bytes.getvalue())
+
+
+def normalise_distributions(dist_directory: Path, source_date_epoch: Optional[int] = None) -> List[Path]:
+    '''
+    Re-writes every wheel and sdist within the `dist_directory`, see
+    `normalise_wheel` and `normalise_sdist`.
+
+    # Parameters
+
+    dist_directory : `Path`
+        The `dist` directory of a package.
+    source_date_epoch : `int`, optional (default = `None`)
+        The modification time of the archive members, if `None` the value of
+        `get_source_date_epoch` is used.
+
+    # Returns
+
+    `List[Path]`
+        The re-written files, sorted.
+    '''
+    normalised_files: List[Path] = []
+    for dist_file in sorted(dist_directory.iterdir()):
+        if dist_file.name.endswith(WHEEL_SUFFIX):
+            normalise_wheel(dist_file, source_date_epoch)
+        elif dist_file.name.endswith(SDIST_SUFFIX):
+            normalise_sdist(dist_file, source_date_epoch)
+        else:
+            continue
+        normalised_files.append(dist_file)
+    return normalised_files
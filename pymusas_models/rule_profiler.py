@@ -0,0 +1,261 @@
+'''
+Profiles the rule based tagger of a model on a corpus, used by the
+`profile-model` command.
+
+The profiler runs the rule based tagger component of the model on each
+document, whereby the rules and the ranker of the tagger are temporarily
+replaced by profiled copies of themselves, that time each call and count,
+for each rule, the lexicon entry matches, candidates, that it generates and
+the tokens whereby its candidate is the best ranked match, hits. As the
+component itself is run, a `pymusas_models.cached_rule_based_tagger.CachedRuleBasedTagger`
+is profiled as it runs, with its cache, which starts empty. The steps are:
+
+* Each rule, e.g. `0: SingleWordRule` and `1: MWERule`.
+* `ranker`, ranking the candidates of all of the rules.
+* `other`, the rest of the time of the tagger, e.g. reading the token
+attributes, assigning the tags, and the cache lookups of a cached tagger.
+
+The unknown rate of each rule is the share of the tokens that neither the
+rule, nor any of the rules before it, has a candidate for, therefore the
+unknown rate of the last rule is the share of the tokens that are tagged
+`Z99`, or as punctuation or a number through the default POS tags, by the
+tagger. The rules and the ranker only see the tokens that the tagger gives
+them, therefore for a cached tagger the candidates, hits, and unknown rates
+of the single word rules only count the tokens that are not found in the
+cache.
+'''
+import copy
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from pydantic import BaseModel
+from pymusas.rankers.lexicon_entry import LexiconEntryRanker
+from pymusas.rankers.ranking_meta_data import RankingMetaData
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.rule import Rule
+from spacy.language import Language
+from spacy.tokens import Doc
+
+
+RANKER_STEP = 'ranker'
+OTHER_STEP = 'other'
+
+ComponentT = TypeVar('ComponentT', Rule, LexiconEntryRanker)
+
+
+class RuleProfile(BaseModel):
+    name: str
+    seconds: float
+    candidates: int
+    tokens_with_candidates: int
+    hits: int
+    candidate_rate: float
+    hit_rate: float
+    unknown_rate: float
+
+
+class ModelProfile(BaseModel):
+    name: str
+    corpus: str
+    documents: int
+    tokens: int
+    seconds: float
+    step_seconds: Dict[str, float]
+    unknown_tokens: int
+    punctuation_tokens: int
+    numeric_tokens: int
+    unknown_rate: float
+    rules: List[RuleProfile]
+
+
+def get_rule_based_tagger(nlp: Language) -> RuleBasedTagger:
+    '''
+    Returns the rule based tagger component of the model.
+
+    # Parameters
+
+    nlp : `Language`
+        The PyMUSAS model.
+
+    # Returns
+
+    `RuleBasedTagger`
+
+    # Raises
+
+    `ValueError`
+        If the model does not have a rule based tagger component.
+    '''
+    for _, component in nlp.pipeline:
+        if isinstance(component, RuleBasedTagger):
+            return component
+    raise ValueError(f'The model {nlp.meta.get("name")} does not have a rule based tagger, '
+                     f'its components are: {nlp.pipe_names}')
+
+
+def _profiled_copy(component: ComponentT, call: Callable[..., Any]) -> ComponentT:
+    '''
+    Returns a shallow copy of the rule or ranker, whereby calling the copy
+    calls `call`. The class of the copy is a sub class of the class of the
+    `component`, therefore the tagger treats the copy the same as the
+    `component`, e.g. the `CachedRuleBasedTagger` still uses its cache.
+    '''
+    component_class = type(component)
+    profiled_class = type(component_class.__name__, (component_class,),
+                          {'__call__': lambda _, *args: call(*args)})
+    profiled_component = copy.copy(component)
+    profiled_component.__class__ = profiled_class
+    return profiled_component
+
+
+def profile_rule_based_tagger(nlp: Language, documents: Iterable[Union[str, Doc]],
+                              name: str = '', corpus: str = '') -> ModelProfile:
+    '''
+    Returns the profile of the rule based tagger of the model on the
+    documents, see the module docstring. The components of the model before
+    the rule based tagger are applied to each document, but are not profiled.
+    The rules and ranker of the tagger are restored afterwards, which clears
+    the cache of a `CachedRuleBasedTagger`.
+
+    # Parameters
+
+    nlp : `Language`
+        The PyMUSAS model.
+    documents : `Iterable[Union[str, Doc]]`
+        The documents, either as text to tokenise or as a tokenised `Doc`.
+    name : `str`, optional (default = `''`)
+        The name of the model.
+    corpus : `str`, optional (default = `''`)
+        The name of the corpus.
+
+    # Returns
+
+    `ModelProfile`
+
+    # Raises
+
+    `ValueError`
+        If the model does not have a rule based tagger component, or its
+        `rules` or `ranker` are `None`.
+    '''
+    tagger = get_rule_based_tagger(nlp)
+    rules = tagger.rules
+    ranker = tagger.ranker
+    if rules is None or ranker is None:
+        raise ValueError(f'The rule based tagger of the model {nlp.meta.get("name")} has not been '
+                         'initialised, its `rules` and `ranker` cannot be `None`.')
+    preceding_components = []
+    for _, component in nlp.pipeline:
+        if component is tagger:
+            break
+        preceding_components.append(component)
+
+    rule_names = [f'{rule_index}: {type(rule).__name__}' for rule_index, rule in enumerate(rules)]
+    step_seconds: Dict[str, float] = {**{rule_name: 0.0 for rule_name in rule_names},
+                                      RANKER_STEP: 0.0, OTHER_STEP: 0.0}
+    candidates = [0 for _ in rules]
+    tokens_with_candidates = [0 for _ in rules]
+    hits = [0 for _ in rules]
+    unknown_tokens_by_rule = [0 for _ in rules]
+    # For the current document, the index of the rule that generated each
+    # candidate, the candidates are kept so that their ids are not re-used.
+    candidate_rule_index: Dict[int, int] = {}
+    document_candidates: List[RankingMetaData] = []
+    # For the current document, each list of tokens that the rules have been
+    # applied to, and whether any of the rules so far has a candidate for
+    # each of its tokens.
+    token_has_candidates: List[Tuple[List[str], List[bool]]] = []
+
+    def get_token_has_candidate(tokens: List[str]) -> List[bool]:
+        for rule_tokens, token_has_candidate in token_has_candidates:
+            if rule_tokens is tokens:
+                return token_has_candidate
+        token_has_candidate = [False for _ in tokens]
+        token_has_candidates.append((tokens, token_has_candidate))
+        return token_has_candidate
+
+    def profile_rule(rule_index: int, rule: Rule) -> Rule:
+        rule_name = rule_names[rule_index]
+
+        def call(tokens: List[str], lemmas: List[str], pos_tags: List[str]
+                 ) -> List[List[RankingMetaData]]:
+            start_time = time.perf_counter()
+            rule_ranking_meta_data = rule(tokens, lemmas, pos_tags)
+            step_seconds[rule_name] += time.perf_counter() - start_time
+            token_has_candidate = get_token_has_candidate(tokens)
+            for token_index, ranking_meta_data in enumerate(rule_ranking_meta_data):
+                if ranking_meta_data:
+                    tokens_with_candidates[rule_index] += 1
+                    candidates[rule_index] += len(ranking_meta_data)
+                    token_has_candidate[token_index] = True
+                for candidate in ranking_meta_data:
+                    candidate_rule_index[id(candidate)] = rule_index
+                    document_candidates.append(candidate)
+            unknown_tokens_by_rule[rule_index] += token_has_candidate.count(False)
+            return rule_ranking_meta_data
+        return _profiled_copy(rule, call)
+
+    def rank(token_ranking_meta_data: List[List[RankingMetaData]]
+             ) -> Tuple[List[List[int]], List[Optional[RankingMetaData]]]:
+        start_time = time.perf_counter()
+        token_ranks, token_best_rank = ranker(token_ranking_meta_data)
+        step_seconds[RANKER_STEP] += time.perf_counter() - start_time
+        for best_rank in token_best_rank:
+            best_rule_index = candidate_rule_index.get(id(best_rank))
+            if best_rank is not None and best_rule_index is not None:
+                hits[best_rule_index] += 1
+        return token_ranks, token_best_rank
+
+    number_documents = 0
+    number_tokens = 0
+    unknown_tokens = 0
+    punctuation_tokens = 0
+    numeric_tokens = 0
+    tagger_seconds = 0.0
+    tagger.rules = [profile_rule(rule_index, rule) for rule_index, rule in enumerate(rules)]
+    tagger.ranker = _profiled_copy(ranker, rank)
+    try:
+        for document in documents:
+            doc = nlp.make_doc(document) if isinstance(document, str) else document
+            for component in preceding_components:
+                doc = component(doc)
+            number_documents += 1
+            number_tokens += len(doc)
+            candidate_rule_index.clear()
+            document_candidates.clear()
+            token_has_candidates.clear()
+
+            start_time = time.perf_counter()
+            doc = tagger(doc)
+            tagger_seconds += time.perf_counter() - start_time
+
+            for token in doc:
+                tags = getattr(token._, tagger.pymusas_tags_token_attr)
+                pos_tag = getattr(token, tagger.pos_attribute)
+                if tags == ['PUNCT'] and pos_tag in tagger.default_punctuation_tags:
+                    punctuation_tokens += 1
+                elif tags == ['N1'] and pos_tag in tagger.default_number_tags:
+                    numeric_tokens += 1
+                elif tags == ['Z99']:
+                    unknown_tokens += 1
+    finally:
+        tagger.rules = rules
+        tagger.ranker = ranker
+    step_seconds[OTHER_STEP] = tagger_seconds - sum(step_seconds.values())
+
+    total_tokens = max(number_tokens, 1)
+    rule_profiles = [RuleProfile(name=rule_name, seconds=step_seconds[rule_name],
+                                 candidates=candidates[rule_index],
+                                 tokens_with_candidates=tokens_with_candidates[rule_index],
+                                 hits=hits[rule_index],
+                                 candidate_rate=tokens_with_candidates[rule_index] / total_tokens,
+                                 hit_rate=hits[rule_index] / total_tokens,
+                                 unknown_rate=unknown_tokens_by_rule[rule_index] / total_tokens)
+                     for rule_index, rule_name in enumerate(rule_names)]
+    return ModelProfile(name=name, corpus=corpus, documents=number_documents,
+                        tokens=number_tokens, seconds=tagger_seconds,
+                        step_seconds=step_seconds, unknown_tokens=unknown_tokens,
+                        punctuation_tokens=punctuation_tokens,
+                        numeric_tokens=numeric_tokens,
+                        unknown_rate=unknown_tokens / total_tokens,
+                        rules=rule_profiles)
@@ -0,0 +1,278 @@
+'''
+Benchmarks how the tagging time of the dual, single word and Multi Word
+Expression (MWE), rule based models scales with the length of a document
+and its MWE density, used by the `scaling-benchmark` command.
+
+For each model, documents of each length and MWE density are generated from
+the lexicons of the model: the MWE density is the share of the tokens that
+are within an MWE, whereby each MWE is a MWE template of the MWE lexicon
+without wildcards or curly braces, and all of the other tokens are single
+word lexicon entries. The lemma of each token is the token, and its POS tag
+is the POS tag of the lexicon entry, mapped to the POS tagset of the tagged
+text through the POS mapper of the rule, or `X` if the tagger reads the
+Universal Dependencies POS tags, `pos_`, and the POS tag is not one of them.
+
+The tagging time of each document is the median of `repeats` runs of the
+model on the document. The scaling exponent of each MWE density is the
+slope of the least squares line of the log tagging time against the log
+document length, therefore an exponent of 1 is linear, the time per token
+is the same for every length, and an exponent of 2 is quadratic. A model
+fails the benchmark if the exponent of any MWE density is greater than the
+maximum exponent.
+'''
+import math
+import random
+import statistics
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from pydantic import BaseModel
+from pymusas.lexicon_collection import LexiconType
+from pymusas.taggers.rules.mwe import MWERule
+from pymusas.taggers.rules.single_word import SingleWordRule
+from spacy.language import Language
+from spacy.tokens import Doc
+
+from pymusas_models.rule_profiler import get_rule_based_tagger
+
+
+# A lexicon entry as a sequence of (token, POS tag) pairs.
+LexiconEntry = Tuple[Tuple[str, str], ...]
+# The POS tags that spaCy accepts as the `pos` of a token.
+UNIVERSAL_POS_TAGS = {'ADJ', 'ADP', 'ADV', 'AUX', 'CCONJ', 'CONJ', 'DET', 'EOL', 'INTJ', 'NOUN',
+                      'NUM', 'PART', 'PRON', 'PROPN', 'PUNCT', 'SCONJ', 'SPACE', 'SYM', 'VERB', 'X'}
+# The POS tag of the tokens whose POS tag is not a Universal Dependencies
+# POS tag, when the tagger reads the `pos_` attribute.
+UNKNOWN_UNIVERSAL_POS_TAG = 'X'
+
+
+class ScalingMeasurement(BaseModel):
+    mwe_density: float
+    length: int
+    seconds: float
+    microseconds_per_token: float
+    mwe_token_share: float
+
+
+class ScalingResult(BaseModel):
+    name: str
+    exponents: Dict[str, float]
+    max_exponent: float
+    passed: bool
+    measurements: List[ScalingMeasurement]
+
+
+def get_scaling_exponent(lengths: Sequence[int], seconds: Sequence[float]) -> float:
+    '''
+    Returns the slope of the least squares line of the log `seconds` against
+    the log `lengths`, whereby `1` is linear scaling.
+
+    # Parameters
+
+    lengths : `Sequence[int]`
+        The document lengths, at least two of which have to be different.
+    seconds : `Sequence[float]`
+        The tagging time of each document length, greater than 0.
+
+    # Returns
+
+    `float`
+
+    # Raises
+
+    `ValueError`
+        If fewer than two different lengths are given, or the number of
+        lengths and times are not the same.
+    '''
+    if len(lengths) != len(seconds) or len(set(lengths)) < 2:
+        raise ValueError('At least two different lengths, and a time for each length, are '
+                         f'required, lengths: {list(lengths)}, seconds: {list(seconds)}')
+    log_lengths = [math.log(length) for length in lengths]
+    log_seconds = [math.log(max(second, 1e-9)) for second in seconds]
+    mean_log_length = statistics.fmean(log_lengths)
+    mean_log_seconds = statistics.fmean(log_seconds)
+    covariance = sum((log_length - mean_log_length) * (log_second - mean_log_seconds)
+                     for log_length, log_second in zip(log_lengths, log_seconds))
+    variance = sum((log_length - mean_log_length) ** 2 for log_length in log_lengths)
+    return covariance / variance
+
+
+def _get_tagger_pos(lexicon_pos: str, lexicon_to_tagger_pos: Dict[str, str],
+                    universal_pos: bool) -> str:
+    '''
+    Returns the POS tag, of the tagset of the tagged text, of the lexicon POS
+    tag.
+    '''
+    pos_tag = lexicon_to_tagger_pos.get(lexicon_pos, lexicon_pos)
+    if universal_pos and pos_tag not in UNIVERSAL_POS_TAGS:
+        return UNKNOWN_UNIVERSAL_POS_TAG
+    return pos_tag
+
+
+def get_lexicon_entries(nlp: Language) -> Tuple[List[LexiconEntry], List[LexiconEntry]]:
+    '''
+    Returns the single word and MWE lexicon entries, as (token, POS tag)
+    pairs, of the rule based tagger of the model, see the module docstring.
+
+    # Parameters
+
+    nlp : `Language`
+        The PyMUSAS model.
+
+    # Returns
+
+    `Tuple[List[LexiconEntry], List[LexiconEntry]]`
+
+    # Raises
+
+    `ValueError`
+        If the model does not have a rule based tagger, or it does not have
+        both single word and MWE lexicon entries.
+    '''
+    tagger = get_rule_based_tagger(nlp)
+    universal_pos = tagger.pos_attribute == 'pos_'
+    single_word_entries: List[LexiconEntry] = []
+    mwe_entries: List[LexiconEntry] = []
+    for rule in tagger.rules or []:
+        if isinstance(rule, SingleWordRule):
+            # The single word POS mapper maps the tagset of the tagged text to
+            # the lexicon POS tags.
+            lexicon_to_tagger_pos: Dict[str, str] = {}
+            for tagger_pos, lexicon_pos_tags in sorted((rule.pos_mapper or {}).items()):
+                for lexicon_pos in lexicon_pos_tags:
+                    lexicon_to_tagger_pos.setdefault(lexicon_pos, tagger_pos)
+            for lexicon_key in rule.lexicon_collection:
+                lemma, lexicon_pos = lexicon_key.rsplit('|', 1)
+                single_word_entries.append(((lemma, _get_tagger_pos(lexicon_pos, lexicon_to_tagger_pos,
+                                                                    universal_pos)),))
+            if not rule.lexicon_collection:
+                single_word_entries.extend(((lemma, UNKNOWN_UNIVERSAL_POS_TAG),)
+                                           for lemma in rule.lemma_lexicon_collection)
+        elif isinstance(rule, MWERule):
+            # The MWE POS mapper maps the lexicon POS tags to the tagset of
+            # the tagged text.
+            lexicon_to_tagger_pos = {lexicon_pos: tagger_pos_tags[0] for lexicon_pos, tagger_pos_tags
+                                     in rule.mwe_lexicon_collection.pos_mapper.items() if tagger_pos_tags}
+            for mwe_template, meta_data in rule.mwe_lexicon_collection.meta_data.items():
+                if meta_data.lexicon_type != LexiconType.MWE_NON_SPECIAL:
+                    continue
+                mwe_entry: List[Tuple[str, str]] = []
+                for token_pos in mwe_template.split():
+                    token, lexicon_pos = token_pos.rsplit('_', 1)
+                    mwe_entry.append((token, _get_tagger_pos(lexicon_pos, lexicon_to_tagger_pos,
+                                                             universal_pos)))
+                mwe_entries.append(tuple(mwe_entry))
+    if not single_word_entries or not mwe_entries:
+        raise ValueError(f'The model {nlp.meta.get("name")} requires both single word and MWE '
+                         'lexicon entries, without wildcards or curly braces, to be benchmarked.')
+    return sorted(single_word_entries), sorted(mwe_entries)
+
+
+def generate_document(single_word_entries: List[LexiconEntry], mwe_entries: List[LexiconEntry],
+                      length: int, mwe_density: float, random_generator: random.Random
+                      ) -> List[Tuple[str, str]]:
+    '''
+    Returns the (token, POS tag) pairs of a document of `length` tokens
+    whereby about `mwe_density` of the tokens are within MWEs.
+
+    # Parameters
+
+    single_word_entries : `List[LexiconEntry]`
+        The single word lexicon entries, see `get_lexicon_entries`.
+    mwe_entries : `List[LexiconEntry]`
+        The MWE lexicon entries, see `get_lexicon_entries`.
+    length : `int`
+        The number of tokens.
+    mwe_density : `float`
+        The share of the tokens within MWEs, from 0 to 1.
+    random_generator : `random.Random`
+        The random number generator that selects the entries.
+
+    # Returns
+
+    `List[Tuple[str, str]]`
+    '''
+    segments: List[LexiconEntry] = []
+    mwe_tokens = 0
+    while mwe_tokens < round(length * mwe_density):
+        mwe_entry = random_generator.choice(mwe_entries)
+        segments.append(mwe_entry)
+        mwe_tokens += len(mwe_entry)
+    segments.extend(random_generator.choice(single_word_entries)
+                    for _ in range(max(length - mwe_tokens, 0)))
+    random_generator.shuffle(segments)
+    return [token_pos for segment in segments for token_pos in segment][:length]
+
+
+def benchmark_scaling(nlp: Language, name: str, lengths: Sequence[int],
+                      mwe_densities: Sequence[float], repeats: int = 3,
+                      max_exponent: float = 1.2, seed: int = 0) -> ScalingResult:
+    '''
+    Returns the tagging time of the documents, generated from the lexicons
+    of the model, of each length and MWE density, and the scaling exponent
+    of each MWE density, see the module docstring.
+
+    # Parameters
+
+    nlp : `Language`
+        The dual rule based PyMUSAS model.
+    name : `str`
+        The name of the model.
+    lengths : `Sequence[int]`
+        The document lengths, in tokens.
+    mwe_densities : `Sequence[float]`
+        The MWE densities, from 0 to 1.
+    repeats : `int`, optional (default = `3`)
+        The number of times to tag each document, the median time is used.
+    max_exponent : `float`, optional (default = `1.2`)
+        The maximum scaling exponent that passes the benchmark.
+    seed : `int`, optional (default = `0`)
+        The seed of the random number generator that generates the documents.
+
+    # Returns
+
+    `ScalingResult`
+
+    # Raises
+
+    `ValueError`
+        If the model is not a dual rule based model, or fewer than two
+        different lengths are given.
+    '''
+    tagger = get_rule_based_tagger(nlp)
+    single_word_entries, mwe_entries = get_lexicon_entries(nlp)
+    random_generator = random.Random(seed)
+    measurements: List[ScalingMeasurement] = []
+    exponents: Dict[str, float] = {}
+    for mwe_density in mwe_densities:
+        density_measurements: List[ScalingMeasurement] = []
+        for length in lengths:
+            token_pos = generate_document(single_word_entries, mwe_entries, length,
+                                          mwe_density, random_generator)
+            words = [token for token, _ in token_pos]
+            pos_tags = [pos_tag for _, pos_tag in token_pos]
+            times: List[float] = []
+            doc = nlp.make_doc('')
+            for _ in range(repeats):
+                if tagger.pos_attribute == 'pos_':
+                    doc = Doc(nlp.vocab, words=words, lemmas=words, pos=pos_tags)
+                else:
+                    doc = Doc(nlp.vocab, words=words, lemmas=words, tags=pos_tags)
+                start_time = time.perf_counter()
+                doc = nlp(doc)
+                times.append(time.perf_counter() - start_time)
+            mwe_tokens = sum(1 for token in doc
+                             if any(end - start > 1 for start, end
+                                    in getattr(token._, tagger.pymusas_mwe_indexes_attr)))
+            seconds = statistics.median(times)
+            density_measurements.append(ScalingMeasurement(mwe_density=mwe_density, length=length,
+                                                           seconds=seconds,
+                                                           microseconds_per_token=1e6 * seconds / length,
+                                                           mwe_token_share=mwe_tokens / length))
+        exponents[str(mwe_density)] = get_scaling_exponent(
+            [measurement.length for measurement in density_measurements],
+            [measurement.seconds for measurement in density_measurements])
+        measurements.extend(density_measurements)
+    return ScalingResult(name=name, exponents=exponents, max_exponent=max_exponent,
+                         passed=all(exponent <= max_exponent for exponent in exponents.values()),
+                         measurements=measurements)
@@ -0,0 +1,415 @@
+'''
+A local HTTP server, used by the `serve` command, that tags documents with
+one or more PyMUSAS models.
+
+The server is an asyncio front end, only using the Python standard library,
+that micro-batches the concurrent requests for each model, waiting at most
+`max_latency` seconds after the first request of a batch, and tags each batch
+through `nlp.pipe` within a process pool of which every worker process loads
+all of the models once.
+
+Endpoints:
+
+* `POST /tag/{model_name}` - the body is a JSON object, see
+`pymusas_models.tag_corpus.json_to_document`, the response is the tagged
+document, see `pymusas_models.tag_corpus.doc_to_json`.
+* `GET /models` - a JSON list of the model names being served.
+* `GET /metrics` - the queue depth, batch size, and request latency of each
+model in the Prometheus text format.
+'''
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+import multiprocessing
+from multiprocessing.managers import SyncManager
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union, cast
+
+import srsly
+
+from pymusas_models.multi_language import MultiLanguageModels
+from pymusas_models.tag_corpus import doc_to_json, get_model_path, json_to_document
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HTTP_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+# The models loaded within each worker process, see `_load_worker_models`.
+_WORKER_MODELS = MultiLanguageModels()
+
+
+def find_models(model_patterns: Sequence[str],
+                models_directory: Optional[Path]) -> Dict[str, Union[str, Path]]:
+    '''
+    Returns the name and path, see `pymusas_models.tag_corpus.get_model_path`,
+    of every model created within `models_directory` whose name matches one
+    of the Unix shell style `model_patterns`, e.g. `en_dual_*`. A pattern
+    without any wildcards that does not match a created model is assumed to
+    be the name of an installed model.
+
+    # Parameters
+
+    model_patterns : `Sequence[str]`
+        Model names or Unix shell style patterns of model names.
+    models_directory : `Path`, optional
+        A directory that stores the models created by the `create-models`
+        command.
+
+    # Returns
+
+    `Dict[str, Union[str, Path]]`
+
+    # Raises
+
+    `ValueError`
+        If a pattern with wildcards does not match any created models.
+    '''
+    created_model_names: List[str] = []
+    if models_directory is not None and models_directory.exists():
+        created_model_names = sorted({config_file.parent.parent.name for config_file
+                                      in models_directory.glob('*/*/*/config.cfg')})
+
+    models: Dict[str, Union[str, Path]] = {}
+    for model_pattern in model_patterns:
+        matched_model_names = [model_name for model_name in created_model_names
+                               if fnmatch(model_name, model_pattern)]
+        if not matched_model_names:
+            if any(wildcard in model_pattern for wildcard in '*?['):
+                raise ValueError(f'Cannot find any models that match: {model_pattern} '
+                                 f'within: {models_directory}')
+            matched_model_names = [model_pattern]
+        for model_name in matched_model_names:
+            models[model_name] = get_model_path(model_name, models_directory)
+    return models
+
+
+def _load_worker_models(models: Dict[str, Union[str, Path]], ready: Any) -> None:
+    '''
+    Initializer of each worker process, loads all of the models sharing the
+    vocabularies, strings, and rules between them, see
+    `pymusas_models.multi_language.MultiLanguageModels`, and then waits on
+    the `ready` barrier, a `multiprocessing.Manager().Barrier` shared with
+    the other workers and the server, so that the server only accepts
+    requests once every worker has loaded the models. If the models cannot
+    be loaded the barrier is aborted, so that the server does not wait
+    forever.
+    '''
+    try:
+        for model_name, model_path in models.items():
+            _WORKER_MODELS.load(model_name, model_path)
+    except BaseException:
+        ready.abort()
+        raise
+    ready.wait()
+
+
+def _tag_batch(model_name: str, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    '''
+    Tags the batch of JSON objects with the model, within a worker process,
+    returning either the tagged document, see `doc_to_json`, or an `error`
+    for each JSON object.
+    '''
+    nlp = _WORKER_MODELS.models[model_name]
+    results: List[Optional[Dict[str, Any]]] = [None for _ in batch]
+    documents = []
+    for index, data in enumerate(batch):
+        try:
+            documents.append((json_to_document(data, nlp), index))
+        except (ValueError, TypeError) as error:
+            results[index] = {'error': str(error)}
+    for doc, index in nlp.pipe(documents, as_tuples=True):
+        results[index] = doc_to_json(doc, str(batch[index].get('id', index)))
+    return cast(List[Dict[str, Any]], results)
+
+
+class Histogram:
+    '''
+    A cumulative histogram, in the Prometheus sense, of observed values.
+
+    # Parameters
+
+    buckets : `Sequence[float]`
+        The upper bounds of the buckets, in ascending order, the `+Inf` bucket
+        is always added.
+    '''
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0 for _ in self.buckets]
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[index] += 1
+
+    def to_prometheus(self, metric_name: str, labels: str) -> List[str]:
+        lines = [f'{metric_name}_bucket{{{labels},le="{upper_bound}"}} {count}'
+                 for upper_bound, count in zip(self.buckets, self.bucket_counts)]
+        lines.append(f'{metric_name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{metric_name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{metric_name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+@dataclass
+class ModelQueue:
+    '''
+    The pending requests and metrics of one model.
+    '''
+    queue: 'asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future[Dict[str, Any]], float]]' \
+        = field(default_factory=asyncio.Queue)
+    batch_sizes: Histogram = field(default_factory=lambda: Histogram(BATCH_SIZE_BUCKETS))
+    latencies: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+
+
+class TaggingServer:
+    '''
+    Serves the models over HTTP, see the module docstring for the endpoints.
+
+    # Parameters
+
+    models : `Dict[str, Union[str, Path]]`
+        The name and path of each model to serve, see `find_models`.
+    host : `str`, optional (default = `127.0.0.1`)
+        The host to bind to.
+    port : `int`, optional (default = `8000`)
+        The port to bind to, `0` binds to a free port, see the `port`
+        attribute once started.
+    n_process : `int`, optional (default = `1`)
+        The number of worker processes.
+    max_batch_size : `int`, optional (default = `32`)
+        The maximum number of requests in a batch.
+    max_latency : `float`, optional (default = `0.005`)
+        The maximum number of seconds to wait, after the first request of a
+        batch, for more requests to add to the batch.
+
+    # Raises
+
+    `ValueError`
+        If `n_process` or `max_batch_size` is less than 1, or `max_latency` is
+        less than 0.
+    '''
+    def __init__(self, models: Dict[str, Union[str, Path]],
+                 host: str = '127.0.0.1', port: int = 8000,
+                 n_process: int = 1, max_batch_size: int = 32,
+                 max_latency: float = 0.005) -> None:
+        if n_process < 1:
+            raise ValueError(f'The `n_process` has to be greater than 0, value given: {n_process}')
+        if max_batch_size < 1:
+            raise ValueError('The `max_batch_size` has to be greater than 0'
+                             f', value given: {max_batch_size}')
+        if max_latency < 0:
+            raise ValueError('The `max_latency` has to be greater than or equal to 0'
+                             f', value given: {max_latency}')
+        self.models = models
+        self.host = host
+        self.port = port
+        self.n_process = n_process
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._model_queues: Dict[str, ModelQueue] = {}
+        self._batcher_tasks: List['asyncio.Task[None]'] = []
+        self._tagging_tasks: Set['asyncio.Task[None]'] = set()
+        self._executor: Optional[Executor] = None
+        self._manager: Optional[SyncManager] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        '''
+        Starts the worker processes, once all of the models have been loaded
+        by every worker, and then starts listening for requests.
+
+        # Raises
+
+        `concurrent.futures.process.BrokenProcessPool`
+            If a worker process cannot load the models.
+        '''
+        mp_context = multiprocessing.get_context('spawn')
+        self._manager = mp_context.Manager()
+        # Every worker, and this process, waits on the barrier, so that it is
+        # only passed once every worker has loaded the models.
+        ready = self._manager.Barrier(self.n_process + 1)
+        self._executor = ProcessPoolExecutor(max_workers=self.n_process, mp_context=mp_context,
+                                             initializer=_load_worker_models,
+                                             initargs=(self.models, ready))
+        loop = asyncio.get_running_loop()
+        # The worker processes are only started when tasks are submitted, each
+        # task starts a worker until there are `n_process` workers.
+        worker_tasks = [loop.run_in_executor(self._executor, os.getpid)
+                        for _ in range(self.n_process)]
+        try:
+            try:
+                await loop.run_in_executor(None, ready.wait)
+            except threading.BrokenBarrierError:
+                # A worker could not load the models, the error is raised by
+                # the worker tasks.
+                pass
+            await asyncio.gather(*worker_tasks)
+        except BaseException:
+            await self.stop()
+            raise
+        for model_name in self.models:
+            self._model_queues[model_name] = ModelQueue()
+            self._batcher_tasks.append(asyncio.create_task(self._batcher(model_name)))
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        '''
+        Stops listening for requests, and stops the worker processes.
+        '''
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher_task in self._batcher_tasks:
+            batcher_task.cancel()
+        await asyncio.gather(*self._batcher_tasks, *self._tagging_tasks,
+                             return_exceptions=True)
+        self._batcher_tasks = []
+        if self._executor is not None:
+            self._executor.shutdown()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def tag(self, model_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+        Adds the JSON object to the queue of the model and returns it tagged,
+        see `doc_to_json`, once its batch has been tagged.
+        '''
+        future: 'asyncio.Future[Dict[str, Any]]' = asyncio.get_running_loop().create_future()
+        await self._model_queues[model_name].queue.put((data, future, time.perf_counter()))
+        return await future
+
+    async def _batcher(self, model_name: str) -> None:
+        model_queue = self._model_queues[model_name]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await model_queue.queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(model_queue.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            model_queue.batch_sizes.observe(len(batch))
+            # The batch is tagged in the background so that the next batch can
+            # be collected while the worker processes are tagging.
+            tagging_task = asyncio.create_task(self._tag_batch(model_name, batch))
+            self._tagging_tasks.add(tagging_task)
+            tagging_task.add_done_callback(self._tagging_tasks.discard)
+
+    async def _tag_batch(self, model_name: str,
+                         batch: List[Tuple[Dict[str, Any], 'asyncio.Future[Dict[str, Any]]', float]]
+                         ) -> None:
+        model_queue = self._model_queues[model_name]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _tag_batch, model_name, [data for data, _, _ in batch])
+        except Exception as error:
+            results = [{'error': f'{type(error).__name__}: {error}'} for _ in batch]
+        end_time = time.perf_counter()
+        for (_, future, start_time), result in zip(batch, results):
+            model_queue.latencies.observe(end_time - start_time)
+            if not future.done():
+                future.set_result(result)
+
+    def metrics(self) -> str:
+        '''
+        Returns the metrics in the Prometheus text format.
+        '''
+        lines = ['# HELP pymusas_queue_depth Number of requests waiting to be batched.',
+                 '# TYPE pymusas_queue_depth gauge']
+        for model_name, model_queue in self._model_queues.items():
+            lines.append(f'pymusas_queue_depth{{model="{model_name}"}} {model_queue.queue.qsize()}')
+        lines.extend(['# HELP pymusas_batch_size Number of requests within each batch.',
+                      '# TYPE pymusas_batch_size histogram'])
+        for model_name, model_queue in self._model_queues.items():
+            lines.extend(model_queue.batch_sizes.to_prometheus('pymusas_batch_size',
+                                                               f'model="{model_name}"'))
+        lines.extend(['# HELP pymusas_request_latency_seconds Time from queuing to tagging a request.',
+                      '# TYPE pymusas_request_latency_seconds histogram'])
+        for model_name, model_queue in self._model_queues.items():
+            lines.extend(model_queue.latencies.to_prometheus('pymusas_request_latency_seconds',
+                                                             f'model="{model_name}"'))
+        return '\n'.join(lines) + '\n'
+
+    async def _handle_request(self, method: str, path: str,
+                              body: bytes) -> Tuple[int, str, bytes]:
+        '''
+        Returns the status code, content type, and body of the response.
+        '''
+        json_type = 'application/json'
+        if path == '/metrics' and method == 'GET':
+            return 200, 'text/plain; version=0.0.4', self.metrics().encode('utf-8')
+        if path == '/models' and method == 'GET':
+            return 200, json_type, srsly.json_dumps(list(self.models)).encode('utf-8')
+        if path.startswith('/tag/'):
+            model_name = path[len('/tag/'):]
+            if model_name not in self._model_queues:
+                return 404, json_type, srsly.json_dumps({'error': f'Unknown model: {model_name}'}).encode('utf-8')
+            if method != 'POST':
+                return 405, json_type, srsly.json_dumps({'error': 'Use POST'}).encode('utf-8')
+            try:
+                data = srsly.json_loads(body)
+                if not isinstance(data, dict):
+                    raise ValueError('The body has to be a JSON object.')
+            except ValueError as error:
+                return 400, json_type, srsly.json_dumps({'error': str(error)}).encode('utf-8')
+            result = await self.tag(model_name, data)
+            status = 400 if 'error' in result else 200
+            return status, json_type, srsly.json_dumps(result).encode('utf-8')
+        return 404, json_type, srsly.json_dumps({'error': f'Unknown path: {path}'}).encode('utf-8')
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers: Dict[str, str] = {}
+                while True:
+                    header_line = await reader.readline()
+                    if header_line in (b'\r\n', b'\n', b''):
+                        break
+                    header_name, _, header_value = header_line.decode('latin-1').partition(':')
+                    headers[header_name.strip().lower()] = header_value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', '0')))
+
+                status, content_type, response_body = await self._handle_request(method, path, body)
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                writer.write((f'HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n'
+                              f'Content-Type: {content_type}\r\n'
+                              f'Content-Length: {len(response_body)}\r\n'
+                              f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+                              '\r\n').encode('latin-1') + response_body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,55 @@
+'''
+The `__init__.py` of the shared lexicon data packages, e.g.
+`pymusas_lexicon_en`, see `pymusas_models.lexicon_package`.
+
+A data package stores the PyMUSAS rules, and therefore the lexicons, that
+are used by more than one model of a language, whereby each rule is
+serialised, through `Rule.serialise_object_to_bytes`, to
+`rules/{rule_id}.bin` within the package. The models that use a shared rule
+store a `SharedRule` reference to it within their rule based tagger, which
+is replaced by the rule from the data package when the model is loaded.
+
+This module is copied into every data package, therefore it should only
+import from `pymusas` and never from `pymusas_models`.
+'''
+from pathlib import Path
+from typing import Dict, cast
+
+from pymusas.taggers.rules.rule import Rule
+
+
+RULES_DIRECTORY = Path(Path(__file__).parent, 'rules')
+# The rules loaded within this process, keyed by rule ID, so that all of the
+# models that share a rule also share the lexicons of the rule in memory.
+_LOADED_RULES: Dict[str, Rule] = {}
+
+
+class SharedRule:
+    '''
+    A reference, within the serialised rules of a rule based tagger, to a
+    rule stored within this data package. The serialised data of the
+    reference is the rule ID, the SHA256 hash of the serialised rule, and
+    `Rule.serialise_object_from_bytes` calls `SharedRule.from_bytes` when it
+    loads the reference, which returns the rule itself.
+    '''
+
+    @staticmethod
+    def from_bytes(bytes_data: bytes) -> Rule:
+        '''
+        Returns the rule, stored within this data package, of the given rule
+        ID.
+
+        # Parameters
+
+        bytes_data : `bytes`
+            The UTF-8 encoded rule ID.
+
+        # Returns
+
+        `Rule`
+        '''
+        rule_id = bytes_data.decode('utf-8')
+        if rule_id not in _LOADED_RULES:
+            rule_file = Path(RULES_DIRECTORY, f'{rule_id}.bin')
+            _LOADED_RULES[rule_id] = cast(Rule, Rule.serialise_object_from_bytes(rule_file.read_bytes()))
+        return _LOADED_RULES[rule_id]
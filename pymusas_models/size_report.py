@@ -0,0 +1,99 @@
+'''
+Breaks the size of each model, created by the `create-models` command, down
+by the pipeline data, e.g. each component, the tokenizer, and the
+vocabulary, or by file, used by the `size-report` command.
+
+The sizes are read from the wheel of the model, therefore each part has
+both its installed size and its compressed size, the number of bytes that
+it adds to the download of the model.
+'''
+from pathlib import Path
+import zipfile
+
+from pydantic import BaseModel
+
+from pymusas_models.catalog import CatalogEntry
+
+
+# The name of the part of the wheel that is not pipeline data, e.g. the
+# Python code, README, and `.dist-info` files of the model package.
+PACKAGE_PART_NAME = '(package files)'
+
+
+class PartSize(BaseModel):
+    name: str
+    file_count: int
+    size_bytes: int
+    compressed_size_bytes: int
+
+
+class ModelSizeReport(BaseModel):
+    name: str
+    wheel_size_bytes: int
+    sdist_size_bytes: int
+    size_bytes: int
+    parts: list[PartSize]
+
+
+def format_size(size_bytes: int) -> str:
+    '''
+    Returns the size in KB, or MB if the size is at least 1MB.
+
+    # Parameters
+
+    size_bytes : `int`
+        The size in bytes.
+
+    # Returns
+
+    `str`
+    '''
+    if size_bytes >= 2 ** 20:
+        return f'{size_bytes / 2 ** 20:.2f}MB'
+    return f'{size_bytes / 2 ** 10:.1f}KB'
+
+
+def create_size_report(entry: CatalogEntry, models_directory: Path,
+                       by_file: bool = False) -> ModelSizeReport:
+    '''
+    Returns the size report of the model from its wheel, whereby the parts
+    are sorted from the largest to the smallest installed size.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    by_file : `bool`, optional (default = `False`)
+        If `True` each file of the pipeline data is a part, else each
+        component, the tokenizer, the vocabulary, and each other file within
+        the pipeline directory is a part.
+
+    # Returns
+
+    `ModelSizeReport`
+    '''
+    wheel_file = Path(models_directory, entry.package_name, 'dist', entry.wheel.file_name)
+    pipeline_prefix = f'{entry.name}/{entry.name}-{entry.version}/'
+    parts: dict[str, PartSize] = {}
+    with zipfile.ZipFile(wheel_file) as wheel_zip:
+        for file_info in wheel_zip.infolist():
+            if file_info.is_dir():
+                continue
+            part_name = PACKAGE_PART_NAME
+            if file_info.filename.startswith(pipeline_prefix):
+                part_name = file_info.filename[len(pipeline_prefix):]
+                if not by_file:
+                    part_name = part_name.split('/')[0]
+            part = parts.setdefault(part_name, PartSize(name=part_name, file_count=0, size_bytes=0,
+                                                        compressed_size_bytes=0))
+            part.file_count += 1
+            part.size_bytes += file_info.file_size
+            part.compressed_size_bytes += file_info.compress_size
+    sorted_parts = sorted(parts.values(), key=lambda part: (-part.size_bytes, part.name))
+    return ModelSizeReport(name=entry.name, wheel_size_bytes=entry.wheel.size_bytes,
+                           sdist_size_bytes=entry.sdist.size_bytes,
+                           size_bytes=sum(part.size_bytes for part in sorted_parts),
+                           parts=sorted_parts)
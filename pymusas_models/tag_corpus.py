@@ -0,0 +1,482 @@
+'''
+Reads a corpus, in one of the `CorpusFormat` formats, and tags it with a
+PyMUSAS model, writing the tags in one of the `OutputFormat` formats. Used by
+the `tag-corpus` command.
+
+All of the functions stream the corpus, therefore only the documents within
+the current `nlp.pipe` batch are stored in memory.
+'''
+from abc import ABC, abstractmethod
+from pathlib import Path
+import sys
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
+
+from spacy.language import Language
+from spacy.tokens import Doc
+import srsly
+
+from pymusas_models.corpus_format import CorpusFormat, OutputFormat
+
+
+# A document, either as text to tokenise or as a tokenised `Doc`, and its ID.
+CorpusDocument = Tuple[Union[str, Doc], str]
+
+
+def get_model_path(model_name: str, models_directory: Optional[Path]) -> Union[str, Path]:
+    '''
+    Returns the path to the pipeline data of the model called `model_name`
+    if the model has been created, through the `create-models` command,
+    within `models_directory`, else returns `model_name` so that it is
+    loaded as an installed model, or as a path, by `spacy.load`.
+
+    # Parameters
+
+    model_name : `str`
+        Name of the model, e.g. `en_dual_none_contextual_none`.
+    models_directory : `Path`, optional
+        A directory that stores the models created by the `create-models`
+        command.
+
+    # Returns
+
+    `Union[str, Path]`
+    '''
+    if models_directory is None or Path(model_name).name != model_name:
+        return model_name
+    # The pipeline data is stored in: `{name}-{version}/{name}/{name}-{version}`
+    model_paths = sorted(models_directory.glob(f'{model_name}-*/{model_name}/{model_name}-*/config.cfg'))
+    if not model_paths:
+        return model_name
+    return model_paths[-1].parent
+
+
+def read_text(corpus_file: IO[str]) -> Iterator[CorpusDocument]:
+    '''
+    Yields each non empty line of the text file as a document, of which the
+    ID is the line number, starting from 1.
+    '''
+    for line_number, line in enumerate(corpus_file, start=1):
+        text = line.rstrip('\r\n')
+        if text.strip():
+            yield text, str(line_number)
+
+
+def json_to_document(data: Dict[str, Any], nlp: Language) -> Union[str, Doc]:
+    '''
+    Returns the document represented by the JSON object, which has to
+    contain either:
+
+    * `text`, a string that is tokenised by the `nlp` pipeline.
+    * `tokens`, a list of token strings, with the optional lists `spaces`,
+    `lemmas`, `pos`, and `tags` that are the same length as `tokens`.
+
+    # Parameters
+
+    data : `Dict[str, Any]`
+        The JSON object.
+    nlp : `Language`
+        The pipeline that will tag the document, its vocabulary is used to
+        create the tokenised document.
+
+    # Returns
+
+    `Union[str, Doc]`
+
+    # Raises
+
+    `ValueError`
+        If the object does not contain a `text` or `tokens` key.
+    '''
+    if 'text' in data:
+        return cast(str, data['text'])
+    elif 'tokens' in data:
+        return Doc(nlp.vocab, words=data['tokens'],
+                   spaces=data.get('spaces'),
+                   lemmas=data.get('lemmas'),
+                   pos=data.get('pos'),
+                   tags=data.get('tags'))
+    raise ValueError('The JSON object requires either a `text` or `tokens` key.')
+
+
+def read_jsonl(corpus_file: IO[str], nlp: Language) -> Iterator[CorpusDocument]:
+    '''
+    Yields each JSON object in the JSONL file as a document, see
+    `json_to_document` for the keys each object has to contain. The optional
+    `id` key is used as the document ID, else the ID is the line number,
+    starting from 1.
+
+    # Raises
+
+    `ValueError`
+        If an object does not contain a `text` or `tokens` key.
+    '''
+    for line_number, line in enumerate(corpus_file, start=1):
+        if not line.strip():
+            continue
+        data: Dict[str, Any] = srsly.json_loads(line)
+        document_id = str(data.get('id', line_number))
+        try:
+            document = json_to_document(data, nlp)
+        except ValueError as error:
+            raise ValueError(f'Line {line_number} of the JSONL file: {error}') from error
+        yield document, document_id
+
+
+def _conllu_sentence_to_doc(nlp: Language, token_lines: List[List[str]]) -> Doc:
+    words: List[str] = []
+    spaces: List[bool] = []
+    lemmas: List[str] = []
+    pos_tags: List[str] = []
+    tags: List[str] = []
+    for fields in token_lines:
+        words.append(fields[1])
+        lemmas.append(fields[2] if fields[2] != '_' else '')
+        pos_tags.append(fields[3] if fields[3] != '_' else '')
+        tags.append(fields[4] if fields[4] != '_' else '')
+        spaces.append('SpaceAfter=No' not in fields[9].split('|'))
+    sent_starts: List[Union[bool, int, None]] = [False] * len(words)
+    sent_starts[0] = True
+    return Doc(nlp.vocab, words=words, spaces=spaces, lemmas=lemmas,
+               pos=pos_tags, tags=tags, sent_starts=sent_starts)
+
+
+def read_conllu(corpus_file: IO[str], nlp: Language) -> Iterator[CorpusDocument]:
+    '''
+    Yields each sentence in the CoNLL-U file as a document, using the `FORM`,
+    `LEMMA`, `UPOS`, `XPOS`, and `SpaceAfter=No` of the `MISC` field. The
+    `sent_id` comment is used as the document ID, else the ID is the sentence
+    number, starting from 1. Multi word token ranges and empty nodes are
+    skipped.
+    '''
+    sentence_number = 0
+    sentence_id: Optional[str] = None
+    token_lines: List[List[str]] = []
+    for line in corpus_file:
+        line = line.rstrip('\r\n')
+        if line.startswith('#'):
+            comment = line.lstrip('#').strip()
+            if comment.startswith('sent_id') and '=' in comment:
+                sentence_id = comment.split('=', 1)[1].strip()
+            continue
+        if line.strip():
+            fields = line.split('\t')
+            if '-' in fields[0] or '.' in fields[0]:
+                continue
+            token_lines.append(fields)
+            continue
+        if token_lines:
+            sentence_number += 1
+            yield (_conllu_sentence_to_doc(nlp, token_lines),
+                   sentence_id if sentence_id is not None else str(sentence_number))
+        sentence_id = None
+        token_lines = []
+    if token_lines:
+        sentence_number += 1
+        yield (_conllu_sentence_to_doc(nlp, token_lines),
+               sentence_id if sentence_id is not None else str(sentence_number))
+
+
+def read_corpus(corpus_file: IO[str], corpus_format: CorpusFormat,
+                nlp: Language) -> Iterator[CorpusDocument]:
+    '''
+    Yields each document, and its ID, in the corpus.
+
+    # Parameters
+
+    corpus_file : `IO[str]`
+        The corpus file opened in text mode.
+    corpus_format : `CorpusFormat`
+        The format of the corpus file.
+    nlp : `Language`
+        The pipeline that will tag the documents, its vocabulary is used to
+        create the tokenised documents.
+
+    # Returns
+
+    `Iterator[CorpusDocument]`
+    '''
+    if corpus_format == CorpusFormat.TEXT:
+        return read_text(corpus_file)
+    elif corpus_format == CorpusFormat.JSONL:
+        return read_jsonl(corpus_file, nlp)
+    elif corpus_format == CorpusFormat.CONLLU:
+        return read_conllu(corpus_file, nlp)
+    raise ValueError(f'Cannot find this corpus format: {corpus_format}')
+
+
+def doc_to_json(doc: Doc, document_id: str) -> Dict[str, Any]:
+    '''
+    Returns the tokens, USAS tags, and MWE indexes of the tagged document.
+    '''
+    # Each access of `token._` creates a new object, therefore it is only
+    # accessed once per token.
+    token_extensions = [token._ for token in doc]
+    return {'id': document_id,
+            'tokens': [token.text for token in doc],
+            'pymusas_tags': [extensions.pymusas_tags for extensions in token_extensions],
+            'pymusas_mwe_indexes': [[list(mwe_index) for mwe_index in extensions.pymusas_mwe_indexes]
+                                    for extensions in token_extensions]}
+
+
+class CorpusWriter(ABC):
+    '''
+    Writes tagged documents to a file, closing the file when used as a
+    context manager.
+    '''
+    @abstractmethod
+    def write(self, doc: Doc, document_id: str) -> None:
+        '''
+        Writes the tagged document.
+
+        # Parameters
+
+        doc : `Doc`
+            The tagged document.
+        document_id : `str`
+            The ID of the document.
+
+        # Returns
+
+        `None`
+        '''
+
+    @abstractmethod
+    def close(self) -> None:
+        '''
+        Writes any buffered documents and closes the file.
+
+        # Returns
+
+        `None`
+        '''
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class JSONLCorpusWriter(CorpusWriter):
+    '''
+    Writes each tagged document, through `doc_to_json`, as a JSON object on
+    its own line.
+
+    # Parameters
+
+    output_file : `Path`
+        The JSONL file to write to.
+    '''
+    def __init__(self, output_file: Path) -> None:
+        self._output_file = output_file.open('w', encoding='utf-8')
+
+    def write(self, doc: Doc, document_id: str) -> None:
+        self._output_file.write(srsly.json_dumps(doc_to_json(doc, document_id)))
+        self._output_file.write('\n')
+
+    def close(self) -> None:
+        self._output_file.close()
+
+
+class ArrowCorpusWriter(CorpusWriter):
+    '''
+    Writes the tagged documents as a table with one row per token, to either
+    a Parquet file or an Arrow IPC file, the latter can be memory mapped and
+    read without copying through `pyarrow.ipc.open_file`. The table has the
+    following columns:
+
+    * `id` : `string`, document ID.
+    * `token_index` : `int32`, index of the token within the document.
+    * `start_char` : `int32`, character offset of the start of the token.
+    * `end_char` : `int32`, character offset of the end of the token.
+    * `text` : `string`
+    * `lemma` : `string`
+    * `pos` : `string`
+    * `pymusas_tags` : `list<string>`, USAS tags, most likely tag first.
+    * `pymusas_mwe_indexes` : `list<struct<start: int32, end: int32>>`, the
+    token spans of the MWEs the token is part of.
+
+    The rows are buffered and written as a record batch, which for Parquet
+    files is also a row group, every `row_group_size` rows, therefore only
+    `row_group_size` rows are stored in memory at any one time.
+
+    Requires [pyarrow](https://arrow.apache.org/docs/python/), which can be
+    installed through `pip install pymusas_models[columnar]`.
+
+    # Parameters
+
+    output_file : `Path`
+        The file to write to.
+    output_format : `OutputFormat`
+        Either `OutputFormat.PARQUET` or `OutputFormat.ARROW`.
+    row_group_size : `int`, optional (default = `100000`)
+        The number of rows, tokens, within each record batch.
+
+    # Raises
+
+    `ImportError`
+        If pyarrow is not installed.
+    `ValueError`
+        If the `output_format` is not `OutputFormat.PARQUET` or
+        `OutputFormat.ARROW`, or `row_group_size` is less than 1.
+    '''
+    COLUMNS = ['id', 'token_index', 'start_char', 'end_char', 'text',
+               'lemma', 'pos', 'pymusas_tags', 'pymusas_mwe_indexes']
+
+    def __init__(self, output_file: Path, output_format: OutputFormat,
+                 row_group_size: int = 100000) -> None:
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError as import_error:
+            raise ImportError('pyarrow is required to write Parquet or Arrow files, '
+                              'it can be installed through `pip install pymusas_models[columnar]`'
+                              ) from import_error
+        if row_group_size < 1:
+            raise ValueError('The `row_group_size` has to be greater than 0'
+                             f', value given: {row_group_size}')
+        self._pyarrow = pyarrow
+        self.row_group_size = row_group_size
+        self.schema = pyarrow.schema([
+            ('id', pyarrow.string()),
+            ('token_index', pyarrow.int32()),
+            ('start_char', pyarrow.int32()),
+            ('end_char', pyarrow.int32()),
+            ('text', pyarrow.string()),
+            ('lemma', pyarrow.string()),
+            ('pos', pyarrow.string()),
+            ('pymusas_tags', pyarrow.list_(pyarrow.string())),
+            ('pymusas_mwe_indexes', pyarrow.list_(pyarrow.struct([('start', pyarrow.int32()),
+                                                                  ('end', pyarrow.int32())])))
+        ])
+        if output_format == OutputFormat.PARQUET:
+            self._writer = pyarrow.parquet.ParquetWriter(str(output_file), self.schema)
+        elif output_format == OutputFormat.ARROW:
+            self._sink = pyarrow.OSFile(str(output_file), 'wb')
+            self._writer = pyarrow.ipc.new_file(self._sink, self.schema)
+        else:
+            raise ValueError(f'Cannot write the output format {output_format} '
+                             'with the ArrowCorpusWriter')
+        self._output_format = output_format
+        self._columns: Dict[str, List[Any]] = {column: [] for column in self.COLUMNS}
+        self._number_rows = 0
+
+    def write(self, doc: Doc, document_id: str) -> None:
+        columns = self._columns
+        number_tokens = len(doc)
+        tokens = list(doc)
+        # Each access of `token._` creates a new object, therefore it is only
+        # accessed once per token.
+        token_extensions = [token._ for token in tokens]
+        columns['id'].extend([document_id] * number_tokens)
+        columns['token_index'].extend(range(number_tokens))
+        start_chars = [token.idx for token in tokens]
+        columns['start_char'].extend(start_chars)
+        columns['end_char'].extend([start_char + len(token)
+                                    for start_char, token in zip(start_chars, tokens)])
+        columns['text'].extend([token.text for token in tokens])
+        columns['lemma'].extend([token.lemma_ for token in tokens])
+        columns['pos'].extend([token.pos_ for token in tokens])
+        columns['pymusas_tags'].extend([extensions.pymusas_tags
+                                        for extensions in token_extensions])
+        columns['pymusas_mwe_indexes'].extend([extensions.pymusas_mwe_indexes
+                                               for extensions in token_extensions])
+        self._number_rows += number_tokens
+        while self._number_rows >= self.row_group_size:
+            self._flush(self.row_group_size)
+
+    def _flush(self, number_rows: int) -> None:
+        '''
+        Writes the first `number_rows` buffered rows as a record batch.
+        '''
+        if number_rows == 0:
+            return
+        record_batch = self._pyarrow.record_batch(
+            [self._columns[column][:number_rows] for column in self.COLUMNS],
+            schema=self.schema)
+        self._writer.write_batch(record_batch)
+        for column_values in self._columns.values():
+            del column_values[:number_rows]
+        self._number_rows -= number_rows
+
+    def close(self) -> None:
+        self._flush(self._number_rows)
+        self._writer.close()
+        if self._output_format == OutputFormat.ARROW:
+            self._sink.close()
+
+
+def get_corpus_writer(output_file: Path, output_format: OutputFormat,
+                      row_group_size: int = 100000) -> CorpusWriter:
+    '''
+    Returns the writer for the `output_format`.
+
+    # Parameters
+
+    output_file : `Path`
+        The file to write to.
+    output_format : `OutputFormat`
+        The format to write the tagged documents in.
+    row_group_size : `int`, optional (default = `100000`)
+        See `ArrowCorpusWriter`, not used for the `OutputFormat.JSONL` format.
+
+    # Returns
+
+    `CorpusWriter`
+    '''
+    if output_format == OutputFormat.JSONL:
+        return JSONLCorpusWriter(output_file)
+    return ArrowCorpusWriter(output_file, output_format, row_group_size)
+
+
+def tag_corpus(nlp: Language, documents: Iterable[CorpusDocument],
+               writer: CorpusWriter, batch_size: int = 1000,
+               n_process: int = 1, report_every: int = 10000
+               ) -> Tuple[int, int, float]:
+    '''
+    Tags the documents through `nlp.pipe` and writes each tagged document,
+    through the `writer`, in the same order as the `documents`. The tokens
+    per second are reported, to `stderr`, after every `report_every`
+    documents.
+
+    # Parameters
+
+    nlp : `Language`
+        The PyMUSAS model.
+    documents : `Iterable[CorpusDocument]`
+        The documents, and their IDs, to tag.
+    writer : `CorpusWriter`
+        The writer of the tagged documents.
+    batch_size : `int`, optional (default = `1000`)
+        The number of documents to buffer, see `Language.pipe`.
+    n_process : `int`, optional (default = `1`)
+        The number of processes to use, see `Language.pipe`.
+    report_every : `int`, optional (default = `10000`)
+        The number of documents between each report of the tokens per second,
+        `0` to not report.
+
+    # Returns
+
+    `Tuple[int, int, float]`
+
+    The number of documents, number of tokens, and tokens per second.
+    '''
+    number_documents = 0
+    number_tokens = 0
+    start_time = time.perf_counter()
+
+    def tokens_per_second() -> float:
+        elapsed_time = time.perf_counter() - start_time
+        return number_tokens / elapsed_time if elapsed_time > 0 else 0.0
+
+    for doc, document_id in nlp.pipe(documents, as_tuples=True,
+                                     batch_size=batch_size, n_process=n_process):
+        writer.write(doc, document_id)
+        number_documents += 1
+        number_tokens += len(doc)
+        if report_every > 0 and number_documents % report_every == 0:
+            print(f'{number_documents:,} documents, {number_tokens:,} tokens, '
+                  f'{tokens_per_second():,.0f} tokens/sec', file=sys.stderr)
+    return number_documents, number_tokens, tokens_per_second()
@@ -0,0 +1,356 @@
+'''
+Updates the lexicons of the rule based models, created by the
+`create-models` command, within their existing packages, used by the
+`update-lexicon` command.
+
+Re-creating a model through `create-models` creates a blank pipeline,
+initialises it, and packages it, which loads the model, copies all of its
+pipeline data, and builds its sdist and wheel in two processes. When only the
+lexicons of a model have changed, e.g. a new commit of the Multilingual-USAS
+lexicons, the rest of its pipeline data and package files are unchanged,
+therefore `update_model_lexicons` only re-writes the data of the rule based
+tagger, the rules and the ranker that is constructed from them, keeping the
+lite variant and lexicon compression of the model, and `rebuild_distributions`
+re-builds the sdist and wheel in one process.
+
+A released sdist or wheel is never re-built with different contents under
+the same file name, as that would break the pip caches and package index
+hashes of anyone that has installed it. Therefore a model whose rule data
+has changed is updated within a copy of its package with a new model
+version, see `get_updated_version` and `copy_model_package`, and a model
+whose rule data has not changed is not updated.
+
+A model whose rules are stored within a shared lexicon data package, created
+with `create-models --shared-lexicons`, cannot be updated, as the data package
+and every model that shares its rules have to be re-created.
+'''
+import filecmp
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional
+
+import pymusas
+from pymusas.rankers.lexicon_entry import ContextualRuleBasedRanker
+from pymusas.spacy_api.taggers.rule_based import RuleBasedTagger
+from pymusas.taggers.rules.rule import Rule
+import srsly
+
+from pymusas_models import lexicon_compression
+from pymusas_models.catalog import CatalogEntry
+from pymusas_models.language_resource import ModelTypes, MWERule, RuleModel, RuleRankers, SingleRule
+from pymusas_models.lexicon_package import get_lexicon_package_name
+from pymusas_models.lite_variant import LiteVariantMeta, create_lite_rules, get_lite_model_name
+from pymusas_models.package import generate_readme
+from pymusas_models.reproducible_build import normalise_distributions
+
+
+# The meta data that `add_model_specific_meta_data`, of
+# `pymusas_models.__main__`, adds to the `meta.json` of the model package after
+# its sdist and wheel have been built.
+POST_BUILD_META_DATA_KEYS = ('checksum', 'checksum_whl', 'size', 'full_language_name')
+
+
+def get_meta_files(entry: CatalogEntry, models_directory: Path) -> List[Path]:
+    '''
+    Returns the `meta.json` files of the model: the model package, the Python
+    package, and the pipeline data, that exist.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+
+    # Returns
+
+    `List[Path]`
+    '''
+    model_directory = Path(models_directory, entry.package_name)
+    meta_files = [Path(model_directory, 'meta.json'),
+                  Path(model_directory, entry.name, 'meta.json'),
+                  Path(model_directory, entry.name, f'{entry.name}-{entry.version}', 'meta.json')]
+    return [meta_file for meta_file in meta_files if meta_file.exists()]
+
+
+def get_model_lexicon_urls(model: RuleModel) -> List[str]:
+    '''
+    Returns the lexicon URL, or file path, of each rule of the model, in the
+    same order as the `lexicon_urls` of its catalog entry.
+
+    # Parameters
+
+    model : `RuleModel`
+        The language resource meta data of the model.
+
+    # Returns
+
+    `List[str]`
+    '''
+    lexicon_urls: List[str] = []
+    for rule in model.resources.rules:
+        assert isinstance(rule, (SingleRule, MWERule))
+        lexicon_urls.append(rule.lexicon_url)
+    return lexicon_urls
+
+
+def check_updatable(entry: CatalogEntry) -> None:
+    '''
+    Checks that the lexicons of the model can be updated within its existing
+    package.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model.
+
+    # Returns
+
+    `None`
+
+    # Raises
+
+    `ValueError`
+        If the model is not a rule based model, its rules are stored within a
+        shared lexicon data package, or it was created with a different minor
+        version of PyMUSAS than the installed version.
+    '''
+    if entry.model_type != ModelTypes.RULE:
+        raise ValueError(f'The model {entry.name} is not a rule based model.')
+    lexicon_package_name = get_lexicon_package_name(entry.language_code)
+    if any(requirement.startswith(f'{lexicon_package_name}=') for requirement in entry.requirements):
+        raise ValueError(f'The rules of the model {entry.name} are stored within the shared lexicon '
+                         f'data package {lexicon_package_name}, the models of the language have to be '
+                         're-created with `create-models --shared-lexicons`.')
+    if entry.version.split('.')[:2] != pymusas.__version__.split('.')[:2]:
+        raise ValueError(f'The model {entry.name}, version {entry.version}, was created with a '
+                         f'different version of PyMUSAS than the installed {pymusas.__version__}, '
+                         'the model has to be re-created with `create-models`.')
+
+
+def get_updated_version(version: str, model_version: Optional[str] = None) -> str:
+    '''
+    Returns the version of a model whose lexicons have been updated, the
+    version with the model version, the `c` element of `a.b.c`, replaced by
+    `model_version`, or if `model_version` is `None` incremented by one.
+
+    # Parameters
+
+    version : `str`
+        The current version of the model, e.g. `0.4.0`.
+    model_version : `str`, optional (default = `None`)
+        The new model version, e.g. `1`.
+
+    # Returns
+
+    `str`
+
+    # Raises
+
+    `ValueError`
+        If the new version is the same as the current version, or
+        `model_version` is `None` and the current model version is not a
+        number.
+    '''
+    version_parts = version.split('.')
+    if model_version is None:
+        if not version_parts[-1].isdigit():
+            raise ValueError(f'Cannot increment the model version of {version}, give the new model '
+                             'version instead.')
+        model_version = str(int(version_parts[-1]) + 1)
+    updated_version = '.'.join([*version_parts[:-1], model_version])
+    if updated_version == version:
+        raise ValueError(f'The model version of an updated model has to differ from its current '
+                         f'version {version}.')
+    return updated_version
+
+
+def _same_files(directory: Path, other_directory: Path) -> bool:
+    '''
+    Returns `True` if both directories contain the same files with the same
+    contents.
+    '''
+    files = sorted(file.relative_to(directory) for file in directory.rglob('*') if file.is_file())
+    other_files = sorted(file.relative_to(other_directory) for file in other_directory.rglob('*')
+                         if file.is_file())
+    if files != other_files:
+        return False
+    _, mismatches, errors = filecmp.cmpfiles(directory, other_directory, [str(file) for file in files],
+                                             shallow=False)
+    return not mismatches and not errors
+
+
+def copy_model_package(entry: CatalogEntry, models_directory: Path, version: str) -> CatalogEntry:
+    '''
+    Copies the existing package of the model, without its built sdist and
+    wheel, to a new package with the given version, within the
+    `models_directory`, e.g. `en_dual_none_contextual_none-0.4.0` to
+    `en_dual_none_contextual_none-0.4.1`, renaming its pipeline data and
+    setting the `version` of its `meta.json` files. The existing package is
+    kept as it is.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    version : `str`
+        The version of the new package.
+
+    # Returns
+
+    `CatalogEntry`
+        The catalog entry of the model with the version and package name of
+        the new package, its files are not updated.
+
+    # Raises
+
+    `ValueError`
+        If the new package already exists, e.g. the version has already
+        been created or released.
+    '''
+    package_name = f'{entry.name}-{version}'
+    new_model_directory = Path(models_directory, package_name)
+    if new_model_directory.exists():
+        raise ValueError(f'The package {new_model_directory} already exists, the version {version} of '
+                         f'the model {entry.name} may have been released, give a new model version.')
+    shutil.copytree(Path(models_directory, entry.package_name), new_model_directory,
+                    ignore=shutil.ignore_patterns('dist', 'build', '*.egg-info'))
+    Path(new_model_directory, entry.name, f'{entry.name}-{entry.version}').rename(
+        Path(new_model_directory, entry.name, package_name))
+    new_entry = entry.model_copy(update={'version': version, 'package_name': package_name})
+    for meta_file in get_meta_files(new_entry, models_directory):
+        meta = srsly.read_json(meta_file)
+        meta['version'] = version
+        srsly.write_json(meta_file, meta)
+    return new_entry
+
+
+def update_model_lexicons(entry: CatalogEntry, model: RuleModel, models_directory: Path,
+                          rules: List[Rule], model_version: Optional[str] = None) -> Optional[CatalogEntry]:
+    '''
+    Re-writes the rules, and the ranker constructed from them, of the rule
+    based tagger of the model, if they differ from those within its existing
+    package, within a copy of the package with a new version, see
+    `get_updated_version` and `copy_model_package`. If the model is the lite
+    variant of `model` the lite variant rules are created from the `rules`,
+    and if `model` compresses its lexicons they are compressed. The
+    evaluation scores of the model, the `performance` and `evaluation` meta
+    data, no longer apply to the new lexicons, therefore they are removed,
+    and if the model had been evaluated the `requires_evaluation` meta data
+    is set, so that its README states that it has to be re-evaluated, see the
+    `evaluate-models` command. The sdist and wheel of the new package are not
+    built, see `rebuild_distributions`.
+
+    # Parameters
+
+    entry : `CatalogEntry`
+        The catalog entry of the model, either `model` or its lite variant.
+    model : `RuleModel`
+        The language resource meta data of the model.
+    models_directory : `Path`
+        A directory that stores the models created by the `create-models`
+        command.
+    rules : `List[Rule]`
+        The PyMUSAS rules, with the updated lexicons, of `model`.
+    model_version : `str`, optional (default = `None`)
+        The model version of the new package, see `get_updated_version`.
+
+    # Returns
+
+    `Optional[CatalogEntry]`
+        The catalog entry of the model with the version and package name of
+        the new package, or `None` if the rule data has not changed and the
+        model has not been updated.
+
+    # Raises
+
+    `ValueError`
+        If the lexicons of the model cannot be updated, see `check_updatable`,
+        its ranker is not supported, or the new package already exists.
+    '''
+    check_updatable(entry)
+    if model.resources.ranker != RuleRankers.CONTEXTUAL:
+        raise ValueError(f"Ranker found: {model.resources.ranker} "
+                         f"the only rankers supported are {list(RuleRankers)} "
+                         f"for: {entry.name}")
+    lite_meta: Optional[LiteVariantMeta] = None
+    if entry.name == get_lite_model_name(model.name):
+        assert model.lite is not None
+        rules, lite_meta = create_lite_rules(rules, model.lite)
+    ranker = ContextualRuleBasedRanker(*ContextualRuleBasedRanker.get_construction_arguments(rules))
+    tagger = RuleBasedTagger()
+    tagger.initialize(rules=rules, ranker=ranker,
+                      default_punctuation_tags=model.resources.default_punctuation_tags,
+                      default_number_tags=model.resources.default_number_tags)
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        tagger_directory = Path(temp_directory, ModelTypes.RULE.value)
+        tagger.to_disk(tagger_directory)
+        if model.lexicon_compression is not None:
+            lexicon_compression.compress_files(tagger_directory, model.lexicon_compression.level,
+                                               model.lexicon_compression.dictionary_size_bytes)
+        component_directory = Path(models_directory, entry.package_name, entry.name,
+                                   f'{entry.name}-{entry.version}', ModelTypes.RULE.value)
+        if _same_files(tagger_directory, component_directory):
+            return None
+
+        entry = copy_model_package(entry, models_directory,
+                                   get_updated_version(entry.version, model_version))
+        for meta_file in get_meta_files(entry, models_directory):
+            meta = srsly.read_json(meta_file)
+            if lite_meta is not None:
+                meta['lite'] = lite_meta.model_dump()
+            if 'performance' in meta or 'evaluation' in meta:
+                meta['requires_evaluation'] = True
+            meta.pop('performance', None)
+            meta.pop('evaluation', None)
+            srsly.write_json(meta_file, meta)
+        component_directory = Path(models_directory, entry.package_name, entry.name,
+                                   f'{entry.name}-{entry.version}', ModelTypes.RULE.value)
+        shutil.rmtree(component_directory)
+        shutil.copytree(tagger_directory, component_directory)
+    return entry
+
+
+def rebuild_distributions(model_directory: Path) -> None:
+    '''
+    Re-builds the sdist and wheel, within the `dist` directory, of the
+    existing model package, through its `setup.py`, so that they are
+    reproducible, see `pymusas_models.reproducible_build`. The `setup.py`
+    packages the `meta.json` and `README.md` of the model package, therefore
+    the meta data that is added after the package is built, see
+    `POST_BUILD_META_DATA_KEYS`, is removed and the README is re-generated
+    first, so that the sdist and wheel are the same as those created by the
+    `create-models` command.
+
+    # Parameters
+
+    model_directory : `Path`
+        The directory of the packaged model, e.g.
+        `./models/en_dual_none_contextual_none-0.4.0`.
+
+    # Returns
+
+    `None`
+    '''
+    meta_file = Path(model_directory, 'meta.json')
+    meta = srsly.read_json(meta_file)
+    for meta_data_key in POST_BUILD_META_DATA_KEYS:
+        meta.pop(meta_data_key, None)
+    srsly.write_json(meta_file, meta)
+    Path(model_directory, 'README.md').write_text(generate_readme(meta), encoding='utf-8')
+
+    for build_directory in [Path(model_directory, 'dist'), Path(model_directory, 'build'),
+                            *model_directory.glob('*.egg-info')]:
+        if build_directory.exists():
+            shutil.rmtree(build_directory)
+    subprocess.run([sys.executable, 'setup.py', 'sdist', 'bdist_wheel'], cwd=model_directory,
+                   check=True, capture_output=True)
+    normalise_distributions(Path(model_directory, 'dist'))